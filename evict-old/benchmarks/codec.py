@@ -0,0 +1,148 @@
+"""
+Compare the namespace codecs against the legacy JSON strings.
+
+Usage:
+    python -m benchmarks.codec [redis://host]
+
+Without a Redis URL only encode/decode time and payload size are
+reported. With one, every payload is also stored both ways under a
+temporary key and compared with `MEMORY USAGE`.
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+from json import dumps, loads
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.client.codec import JSON, MSGPACK, STRING, Namespace
+
+ROUNDS = 2_000
+
+now = datetime.now(timezone.utc)
+
+
+def snipe(index: int) -> Dict[str, Any]:
+    return {
+        "guild_id": 892675627373699072,
+        "channel_id": 1203410582950137946,
+        "message_id": 1203410582950137946 + index,
+        "user_id": 461914901624127489,
+        "user_name": f"member{index}",
+        "user_avatar": "https://cdn.discordapp.com/avatars/461914901624127489/a_4d8e1c.gif",
+        "created_at": now - timedelta(minutes=index),
+        "deleted_at": now,
+        "content": "the quick brown fox jumps over the lazy dog " * (1 + index % 6),
+        "attachments": [
+            {
+                "url": f"https://media.discordapp.net/attachments/1/{index}/image.png",
+                "size": 482_113,
+                "filename": "image.png",
+                "content_type": "image/png",
+                "key": f"{index}_image.png",
+            }
+        ]
+        if index % 3 == 0
+        else [],
+        "stickers": [],
+    }
+
+
+ANTINUKE = {
+    "whitelist": list(range(1_000_000_000_000_000, 1_000_000_000_000_040)),
+    "trusted_admins": [461914901624127489, 1203410582950137946],
+    "bot": True,
+    **{
+        module: {"threshold": 3, "duration": 60, "punishment": "ban", "command": False}
+        for module in ("ban", "kick", "role", "channel", "webhook", "emoji")
+    },
+}
+
+PAYLOADS: List[Tuple[str, Namespace, Any]] = [
+    ("snipe", Namespace("bench:snipe", MSGPACK), snipe(0)),
+    ("snipe ring", Namespace("bench:snipes", MSGPACK), [snipe(i) for i in range(100)]),
+    ("antinuke", Namespace("bench:antinuke", MSGPACK), ANTINUKE),
+    ("antinuke json", Namespace("bench:antinuke:json", JSON), ANTINUKE),
+    ("prefix", Namespace("bench:prefix", STRING), ";"),
+]
+
+
+def legacy_dumps(value: Any) -> str:
+    if isinstance(value, (dict, list)):
+        return dumps(value, separators=(",", ":"), default=str)
+
+    return str(value)
+
+
+def legacy_loads(data: str) -> Any:
+    if data.isnumeric():
+        return int(data)
+
+    try:
+        return loads(data)
+    except ValueError:
+        return data
+
+
+def measure(function: Callable[[], object]) -> float:
+    started = perf_counter()
+    for _ in range(ROUNDS):
+        function()
+
+    return (perf_counter() - started) / ROUNDS * 1e6
+
+
+async def memory(url: str) -> Dict[str, Tuple[int, int]]:
+    from redis.asyncio import Redis
+
+    redis = Redis.from_url(url)
+    usage: Dict[str, Tuple[int, int]] = {}
+    try:
+        for name, namespace, value in PAYLOADS:
+            legacy_key = f"bench:legacy:{name}"
+            codec_key = namespace.key(name)
+            await redis.set(legacy_key, legacy_dumps(value))
+            await redis.set(codec_key, namespace.encode(value))
+            usage[name] = (
+                await redis.memory_usage(legacy_key) or 0,
+                await redis.memory_usage(codec_key) or 0,
+            )
+            await redis.delete(legacy_key, codec_key)
+    finally:
+        await redis.aclose()
+
+    return usage
+
+
+def main(url: Optional[str]) -> None:
+    usage = asyncio.run(memory(url)) if url else {}
+    print(
+        f"{'payload':<14} {'variant':<8} {'encode':>10} {'decode':>10} "
+        f"{'size':>10} {'redis':>10}"
+    )
+    for name, namespace, value in PAYLOADS:
+        legacy = legacy_dumps(value)
+        encoded = namespace.encode(value)
+        rows = {
+            "legacy": (
+                measure(lambda: legacy_dumps(value)),
+                measure(lambda: legacy_loads(legacy)),
+                len(legacy.encode()),
+            ),
+            "codec": (
+                measure(lambda: namespace.encode(value)),
+                measure(lambda: namespace.decode(encoded)),
+                len(encoded),
+            ),
+        }
+        for index, (variant, (encode, decode, size)) in enumerate(rows.items()):
+            stored = usage.get(name, (0, 0))[index]
+            print(
+                f"{name:<14} {variant:<8} {encode:>8.1f}μs {decode:>8.1f}μs "
+                f"{size:>9}B {f'{stored}B' if stored else '-':>10}"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -32,6 +32,7 @@ from pomice import LoopMode, Playlist, SearchType, Track, Player
 from pomice.enums import URLRegex as regex
 
 from cogs.audio import Client, Percentage, Position
+from cogs.audio.core.state import states
 from main import Evict
 from core.client import Context as DefaultContext
 from tools.formatter import duration, plural, shorten
@@ -197,6 +198,9 @@ class Audio(Cog):
         except Exception as e:
             log.error(f"{Fore.RED}Error in periodic cleanup task: {e}", exc_info=True)
 
+    async def cog_load(self) -> None:
+        states.start(self.bot)
+
     async def cog_before_invoke(self, ctx: Context) -> None:
         ctx.voice = await self.get_player(ctx)
 
@@ -601,6 +605,10 @@ class Audio(Cog):
             
         await client.do_next()
 
+    @Cog.listener()
+    async def on_nodes_ready(self):
+        await states.restore_all()
+
     @Cog.listener()
     async def on_pomice_track_stuck(self, client: Client, track: Track, _):
         await client.do_next()
@@ -1172,7 +1180,7 @@ class Audio(Cog):
 
         track = queue[position - 1]
         queue.remove(track)
-        queue._queue.insert(new_position - 1, track)
+        queue.put_at_index(new_position - 1, track)
 
         return await ctx.approve(
             f"Moved [**{shorten(track.title)}**]({track.uri}) to `{ordinal(new_position)}` in the queue"
@@ -1957,26 +1965,15 @@ class Audio(Cog):
         """
         Adjust the bass boost level.
         """
-        async with aiohttp.ClientSession() as session:
-            if percentage == 0:
-                async with session.patch(
-                    f"http://localhost:2333/v4/sessions/pomice/players/{ctx.guild.id}",
-                    headers={"Authorization": "youshallnotpass"},
-                    json={"filters": {}}
-                ) as response:
-                    await response.read()
-                return await ctx.approve("Reset audio filters")
-
-            gain = (percentage / 100) * 0.25
-            bands = [{"band": i, "gain": gain} for i in range(2)]
-            
-            async with session.patch(
-                f"http://localhost:2333/v4/sessions/pomice/players/{ctx.guild.id}",
-                headers={"Authorization": "youshallnotpass"},
-                json={"filters": {"equalizer": bands}}
-            ) as response:
-                await response.read()
-            return await ctx.approve(f"Set bass boost to `{percentage}%`")
+        if percentage == 0:
+            await ctx.voice.apply_filters({})
+            return await ctx.approve("Reset audio filters")
+
+        gain = (percentage / 100) * 0.25
+        bands = [{"band": i, "gain": gain} for i in range(2)]
+
+        await ctx.voice.apply_filters({"equalizer": bands})
+        return await ctx.approve(f"Set bass boost to `{percentage}%`")
 
     @filter_group.command(aliases=["nc"], example="50")
     async def nightcore(
@@ -1987,26 +1984,15 @@ class Audio(Cog):
         """
         Adjust the nightcore effect level.
         """
-        async with aiohttp.ClientSession() as session:
-            if percentage == 0:
-                async with session.patch(
-                    f"http://localhost:2333/v4/sessions/pomice/players/{ctx.guild.id}",
-                    headers={"Authorization": "youshallnotpass"},
-                    json={"filters": {}}
-                ) as response:
-                    await response.read()
-                return await ctx.approve("Reset nightcore filter")
-
-            speed = 1 + (percentage / 100) * 0.5
-            pitch = 1 + (percentage / 100) * 0.5
-            
-            async with session.patch(
-                f"http://localhost:2333/v4/sessions/pomice/players/{ctx.guild.id}",
-                headers={"Authorization": "youshallnotpass"},
-                json={"filters": {"timescale": {"speed": speed, "pitch": pitch}}}
-            ) as response:
-                await response.read()
-            return await ctx.approve(f"Set nightcore to `{percentage}%`")
+        if percentage == 0:
+            await ctx.voice.apply_filters({})
+            return await ctx.approve("Reset nightcore filter")
+
+        speed = 1 + (percentage / 100) * 0.5
+        pitch = 1 + (percentage / 100) * 0.5
+
+        await ctx.voice.apply_filters({"timescale": {"speed": speed, "pitch": pitch}})
+        return await ctx.approve(f"Set nightcore to `{percentage}%`")
 
     @filter_group.command(aliases=["rv"], example="50")
     async def reverb(
@@ -2017,42 +2003,27 @@ class Audio(Cog):
         """
         Adjust the reverb effect level.
         """
-        async with aiohttp.ClientSession() as session:
-            if percentage == 0:
-                async with session.patch(
-                    f"http://localhost:2333/v4/sessions/pomice/players/{ctx.guild.id}",
-                    headers={"Authorization": "youshallnotpass"},
-                    json={"filters": {}}
-                ) as response:
-                    await response.read()
-                return await ctx.approve("Reset reverb filter")
-
-            level = percentage / 100
-            async with session.patch(
-                f"http://localhost:2333/v4/sessions/pomice/players/{ctx.guild.id}",
-                headers={"Authorization": "youshallnotpass"},
-                json={"filters": {
-                    "equalizer": [
-                        {"band": 0, "gain": level * 0.6},
-                        {"band": 1, "gain": level * 0.8}
-                    ]
-                }}
-            ) as response:
-                await response.read()
-            return await ctx.approve(f"Set reverb to `{percentage}%`")
+        if percentage == 0:
+            await ctx.voice.apply_filters({})
+            return await ctx.approve("Reset reverb filter")
+
+        level = percentage / 100
+        await ctx.voice.apply_filters(
+            {
+                "equalizer": [
+                    {"band": 0, "gain": level * 0.6},
+                    {"band": 1, "gain": level * 0.8},
+                ]
+            }
+        )
+        return await ctx.approve(f"Set reverb to `{percentage}%`")
 
     @filter_group.command(name="reset")
     async def filter_reset(self, ctx: Context) -> Message:
         """
         Reset all audio filters.
         """
-        async with aiohttp.ClientSession() as session:
-            async with session.patch(
-                f"http://localhost:2333/v4/sessions/pomice/players/{ctx.guild.id}",
-                headers={"Authorization": "youshallnotpass"},
-                json={"filters": {}}
-            ) as response:
-                await response.read()
+        await ctx.voice.apply_filters({})
         return await ctx.approve("Reset all audio filters")
 
     @filter_group.command(aliases=["vib"], example="50")
@@ -2062,26 +2033,15 @@ class Audio(Cog):
         percentage: Annotated[int, Percentage] = 100,
     ) -> Message:
         """Adjust the vibrato effect level."""
-        async with aiohttp.ClientSession() as session:
-            if percentage == 0:
-                async with session.patch(
-                    f"http://localhost:2333/v4/sessions/pomice/players/{ctx.guild.id}",
-                    headers={"Authorization": "youshallnotpass"},
-                    json={"filters": {}}
-                ) as response:
-                    await response.read()
-                return await ctx.approve("Reset vibrato filter")
-
-            frequency = 2 + (percentage / 100) * 12  
-            depth = 0.2 + (percentage / 100) * 0.5   
-            
-            async with session.patch(
-                f"http://localhost:2333/v4/sessions/pomice/players/{ctx.guild.id}",
-                headers={"Authorization": "youshallnotpass"},
-                json={"filters": {"vibrato": {"frequency": frequency, "depth": depth}}}
-            ) as response:
-                await response.read()
-            return await ctx.approve(f"Set vibrato to `{percentage}%`")
+        if percentage == 0:
+            await ctx.voice.apply_filters({})
+            return await ctx.approve("Reset vibrato filter")
+
+        frequency = 2 + (percentage / 100) * 12
+        depth = 0.2 + (percentage / 100) * 0.5
+
+        await ctx.voice.apply_filters({"vibrato": {"frequency": frequency, "depth": depth}})
+        return await ctx.approve(f"Set vibrato to `{percentage}%`")
 
     @filter_group.command(aliases=["trem"], example="50")
     async def tremolo(
@@ -2090,26 +2050,15 @@ class Audio(Cog):
         percentage: Annotated[int, Percentage] = 100,
     ) -> Message:
         """Adjust the tremolo effect level."""
-        async with aiohttp.ClientSession() as session:
-            if percentage == 0:
-                async with session.patch(
-                    f"http://localhost:2333/v4/sessions/pomice/players/{ctx.guild.id}",
-                    headers={"Authorization": "youshallnotpass"},
-                    json={"filters": {}}
-                ) as response:
-                    await response.read()
-                return await ctx.approve("Reset tremolo filter")
-
-            frequency = 2 + (percentage / 100) * 12
-            depth = 0.2 + (percentage / 100) * 0.5
-            
-            async with session.patch(
-                f"http://localhost:2333/v4/sessions/pomice/players/{ctx.guild.id}",
-                headers={"Authorization": "youshallnotpass"},
-                json={"filters": {"tremolo": {"frequency": frequency, "depth": depth}}}
-            ) as response:
-                await response.read()
-            return await ctx.approve(f"Set tremolo to `{percentage}%`")
+        if percentage == 0:
+            await ctx.voice.apply_filters({})
+            return await ctx.approve("Reset tremolo filter")
+
+        frequency = 2 + (percentage / 100) * 12
+        depth = 0.2 + (percentage / 100) * 0.5
+
+        await ctx.voice.apply_filters({"tremolo": {"frequency": frequency, "depth": depth}})
+        return await ctx.approve(f"Set tremolo to `{percentage}%`")
 
     @filter_group.command(aliases=["dist"], example="50")
     async def distortion(
@@ -2118,21 +2067,14 @@ class Audio(Cog):
         percentage: Annotated[int, Percentage] = 100,
     ) -> Message:
         """Adjust the distortion effect level."""
-        async with aiohttp.ClientSession() as session:
-            if percentage == 0:
-                async with session.patch(
-                    f"http://localhost:2333/v4/sessions/pomice/players/{ctx.guild.id}",
-                    headers={"Authorization": "youshallnotpass"},
-                    json={"filters": {}}
-                ) as response:
-                    await response.read()
-                return await ctx.approve("Reset distortion filter")
-
-            scale = percentage / 100
-            async with session.patch(
-                f"http://localhost:2333/v4/sessions/pomice/players/{ctx.guild.id}",
-                headers={"Authorization": "youshallnotpass"},
-                json={"filters": {"distortion": {
+        if percentage == 0:
+            await ctx.voice.apply_filters({})
+            return await ctx.approve("Reset distortion filter")
+
+        scale = percentage / 100
+        await ctx.voice.apply_filters(
+            {
+                "distortion": {
                     "sinOffset": scale * 0.5,
                     "sinScale": scale * 0.5,
                     "cosOffset": scale * 0.5,
@@ -2140,11 +2082,11 @@ class Audio(Cog):
                     "tanOffset": scale * 0.5,
                     "tanScale": scale * 0.5,
                     "offset": scale * 0.5,
-                    "scale": scale * 0.5
-                }}}
-            ) as response:
-                await response.read()
-            return await ctx.approve(f"Set distortion to `{percentage}%`")
+                    "scale": scale * 0.5,
+                }
+            }
+        )
+        return await ctx.approve(f"Set distortion to `{percentage}%`")
 
     @filter_group.command(aliases=["rot"], example="50")
     async def rotation(
@@ -2153,24 +2095,13 @@ class Audio(Cog):
         percentage: Annotated[int, Percentage] = 100,
     ) -> Message:
         """Adjust the rotation effect level."""
-        async with aiohttp.ClientSession() as session:
-            if percentage == 0:
-                async with session.patch(
-                    f"http://localhost:2333/v4/sessions/pomice/players/{ctx.guild.id}",
-                    headers={"Authorization": "youshallnotpass"},
-                    json={"filters": {}}
-                ) as response:
-                    await response.read()
-                return await ctx.approve("Reset rotation filter")
-
-            speed = (percentage / 100) * 0.5 
-            async with session.patch(
-                f"http://localhost:2333/v4/sessions/pomice/players/{ctx.guild.id}",
-                headers={"Authorization": "youshallnotpass"},
-                json={"filters": {"rotation": {"rotationHz": speed}}}
-            ) as response:
-                await response.read()
-            return await ctx.approve(f"Set rotation to `{percentage}%`")
+        if percentage == 0:
+            await ctx.voice.apply_filters({})
+            return await ctx.approve("Reset rotation filter")
+
+        speed = (percentage / 100) * 0.5
+        await ctx.voice.apply_filters({"rotation": {"rotationHz": speed}})
+        return await ctx.approve(f"Set rotation to `{percentage}%`")
 
     async def schedule_autoplay(self, client: Client, current_track: Track, delay_ms: int):
         """Schedule fetching and queueing of autoplay recommendations"""
@@ -2679,6 +2610,13 @@ class Audio(Cog):
         self._track_spam_count.clear()
         self.track_info.clear()
         self.lyrics_cache.clear()
+
+        # Snapshot every player before disconnecting so they can be resumed
+        for guild in self.bot.guilds:
+            if isinstance(guild.voice_client, Client):
+                states.touch(guild.id)
+
+        await states.stop()
         
         # Clean up voice clients
         for guild in self.bot.guilds:
@@ -12,6 +12,7 @@ from .queue import Queue
 from tools.formatter import shorten
 
 from .panel import Panel
+from .state import states
 
 if TYPE_CHECKING:
     from cogs.audio.audio import Context
@@ -25,15 +26,20 @@ class Client(Player):
     timeout_task: Optional[asyncio.Task]
     controller: Optional[Message]
     context: Optional[Context]
+    filter_payload: dict
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
-        self.queue = Queue()
+        self.queue = Queue(on_change=self.changed)
         self.auto_queue = Queue()
         self.timeout_task = None
         self.message = None
         self.context = None
         self.controller = None
+        self.filter_payload = {}
+
+    def changed(self) -> None:
+        states.touch(self.guild.id)
 
     async def set_context(self, ctx: Context):
         self.context = ctx
@@ -85,11 +91,42 @@ class Client(Player):
                 view=Panel(self.context) if self.context.settings.play_panel else None,  # type: ignore
             )
 
+    async def play(self, track: Track, **kwargs) -> Track:
+        track = await super().play(track, **kwargs)
+        self.changed()
+        return track
+
+    async def seek(self, position: float) -> float:
+        position = await super().seek(position)
+        self.changed()
+        return position
+
+    async def set_volume(self, volume: int) -> int:
+        volume = await super().set_volume(volume)
+        self.changed()
+        return volume
+
     async def set_pause(self, pause: bool) -> bool:
         status = await super().set_pause(pause)
+        self.changed()
         await self.refresh_panel()
         return status
 
+    async def apply_filters(self, filters: dict) -> None:
+        """
+        Replace the filters on the node and remember them,
+        so they're reapplied when the player is restored.
+        """
+
+        await self.node.send(
+            method="PATCH",
+            path=self._player_endpoint_uri,
+            guild_id=self.guild.id,
+            data={"filters": filters},
+        )
+        self.filter_payload = filters
+        self.changed()
+
     async def refresh_panel(self):
         if self.controller and self.context and self.context.settings.play_panel:
             with suppress(HTTPException):
@@ -115,6 +152,11 @@ class Client(Player):
         if self.timeout_task:
             self.timeout_task.cancel()
 
+        # A node which drops its websocket destroys every player,
+        # keep their snapshots so they resume once it reconnects.
+        if self.node.is_connected:
+            states.forget(self.guild.id)
+
         return await super().destroy()
 
     async def set_filter(self, filter_type=None):
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-from typing import Optional
-from pomice import Queue as DefaultQueue
+from typing import Callable, Optional
+from pomice import LoopMode, Queue as DefaultQueue
 from pomice.objects import Track
 
 
 class Queue(DefaultQueue):
     history: Optional[Queue]
+    on_change: Optional[Callable[[], None]]
 
     def __init__(
         self,
@@ -14,15 +15,63 @@ class Queue(DefaultQueue):
         *,
         overflow: bool = True,
         history: bool = True,
+        on_change: Optional[Callable[[], None]] = None,
     ):
         super().__init__(max_size, overflow=overflow)
+        self.on_change = on_change
         self.history = None
         if history:
             self.history = Queue(history=False)
 
+    def changed(self) -> None:
+        if self.on_change:
+            self.on_change()
+
     def get(self) -> Track:
         track = super().get()
         if self.history:
             self.history.put(track)
 
+        self.changed()
+        return track
+
+    def put(self, item: Track) -> None:
+        super().put(item)
+        self.changed()
+
+    def put_at_index(self, index: int, item: Track) -> None:
+        super().put_at_index(index, item)
+        self.changed()
+
+    def pop(self) -> Track:
+        track = super().pop()
+        self.changed()
         return track
+
+    def __delitem__(self, index: int) -> None:
+        super().__delitem__(index)
+        self.changed()
+
+    def remove(self, item: Track) -> None:
+        super().remove(item)
+        self.changed()
+
+    def clear(self) -> None:
+        super().clear()
+        self.changed()
+
+    def shuffle(self) -> None:
+        super().shuffle()
+        self.changed()
+
+    def set_loop_mode(self, mode: LoopMode) -> None:
+        super().set_loop_mode(mode)
+        self.changed()
+
+    def disable_loop(self) -> None:
+        super().disable_loop()
+        self.changed()
+
+    def jump(self, item: Track) -> None:
+        super().jump(item)
+        self.changed()
@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from logging import getLogger
+from typing import TYPE_CHECKING, List, Optional, Set, TypedDict
+
+from discord import Guild, VoiceChannel
+from pomice import LoopMode, NodePool, Track
+
+from core.client.codec import MSGPACK, Namespace
+
+if TYPE_CHECKING:
+    from main import Evict
+
+    from .player import Client
+
+log = getLogger("evict/audio")
+
+PLAYER_STATE = Namespace("audio:player", MSGPACK, ttl=60 * 60 * 6)
+ACTIVE_PLAYERS = "audio:players"
+
+
+class TrackState(TypedDict):
+    track_id: str
+    requester_id: Optional[int]
+
+
+class PlayerState(TypedDict):
+    guild_id: int
+    channel_id: int
+    text_channel_id: Optional[int]
+    current: Optional[TrackState]
+    position: int
+    updated_at: float
+    paused: bool
+    volume: int
+    loop_mode: Optional[str]
+    filters: dict
+    queue: List[TrackState]
+
+
+def dump_track(track: Track) -> TrackState:
+    return {
+        "track_id": track.track_id,
+        "requester_id": track.requester.id if track.requester else None,
+    }
+
+
+def snapshot(client: Client) -> PlayerState:
+    """
+    Capture everything needed to resume a player elsewhere.
+    """
+
+    current = client.current
+    return {
+        "guild_id": client.guild.id,
+        "channel_id": client.channel.id,
+        "text_channel_id": client.context.channel.id if client.context else None,
+        "current": dump_track(current) if current else None,
+        "position": int(client.position),
+        "updated_at": time.time(),
+        "paused": client.is_paused,
+        "volume": client.volume,
+        "loop_mode": client.queue.loop_mode.value if client.queue.loop_mode else None,
+        "filters": client.filter_payload,
+        "queue": [dump_track(track) for track in client.queue],
+    }
+
+
+def resume_position(state: PlayerState, now: Optional[float] = None) -> int:
+    """
+    The position the current track would have reached by now.
+    """
+
+    if state["paused"] or not state["current"]:
+        return state["position"]
+
+    now = time.time() if now is None else now
+    return state["position"] + int((now - state["updated_at"]) * 1000)
+
+
+class PlayerStore:
+    """
+    Coalesced snapshots of every active player.
+
+    Players only mark themselves as changed, and changed players are
+    written together once per interval, so a burst of skips or queue
+    edits costs a single write per guild. Snapshots are resumed once
+    the Lavalink nodes are connected, on startup or after a failover.
+    Pomice has no node events, so the store watches the connection
+    itself and dispatches `nodes_ready` once a lost node comes back.
+    """
+
+    def __init__(self, interval: float = 2.0):
+        self.interval = interval
+        self.bot: Optional[Evict] = None
+        self.changed: Set[int] = set()
+        self.removed: Set[int] = set()
+        self.restoring: Set[int] = set()
+        self.connected: Optional[bool] = None
+        self.lock = asyncio.Lock()
+        self.task: Optional[asyncio.Task] = None
+
+    def __repr__(self) -> str:
+        return f"<PlayerStore changed={len(self.changed)} removed={len(self.removed)}>"
+
+    def start(self, bot: Evict) -> None:
+        self.bot = bot
+        if not self.task or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+        await self.flush()
+
+    def touch(self, guild_id: int) -> None:
+        if guild_id not in self.restoring:
+            self.removed.discard(guild_id)
+            self.changed.add(guild_id)
+
+    def forget(self, guild_id: int) -> None:
+        self.changed.discard(guild_id)
+        self.removed.add(guild_id)
+
+    @staticmethod
+    def nodes_connected() -> bool:
+        return any(node.is_connected for node in NodePool().nodes.values())
+
+    def watch(self) -> None:
+        connected = self.nodes_connected()
+        if connected == self.connected:
+            return
+
+        if connected and self.connected is False and self.bot:
+            log.info("Lavalink nodes reconnected, restoring players")
+            self.bot.dispatch("nodes_ready")
+        elif not connected and self.connected:
+            log.warning("Lost the connection to every Lavalink node")
+
+        self.connected = connected
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self.watch()
+            try:
+                await self.flush()
+            except Exception:
+                log.exception("Failed to flush player snapshots")
+
+    async def flush(self) -> None:
+        """
+        Write the changed snapshots.
+        Nothing is written while the nodes are down, as every player
+        has been dropped and would otherwise lose its snapshot.
+        """
+
+        if not self.bot or not (self.changed or self.removed):
+            return
+
+        if not self.nodes_connected():
+            return
+
+        changed, self.changed = self.changed, set()
+        removed, self.removed = self.removed, set()
+        redis = self.bot.redis
+        async with redis.pipeline(transaction=False) as pipe:
+            for guild_id in changed:
+                guild = self.bot.get_guild(guild_id)
+                client = guild.voice_client if guild else None
+                if not client or not client.channel:
+                    removed.add(guild_id)
+                    continue
+
+                pipe.set(
+                    PLAYER_STATE.key(guild_id),
+                    PLAYER_STATE.encode(snapshot(client)),  # type: ignore
+                    ex=PLAYER_STATE.ttl,
+                )
+                pipe.sadd(ACTIVE_PLAYERS, guild_id)
+
+            for guild_id in removed:
+                pipe.delete(PLAYER_STATE.key(guild_id))
+                pipe.srem(ACTIVE_PLAYERS, guild_id)
+
+            await pipe.execute()
+
+    @staticmethod
+    def stale(guild: Guild) -> bool:
+        """
+        Whether the voice client was left behind by a node which dropped it.
+        """
+
+        from .player import Client
+
+        client = guild.voice_client
+        return isinstance(client, Client) and guild.id not in client.node.players
+
+    async def restore_all(self) -> None:
+        """
+        Resume every snapshot of a guild served by this process.
+        """
+
+        if not self.bot:
+            return
+
+        async with self.lock:
+            guild_ids = [
+                int(guild_id)
+                for guild_id in await self.bot.redis.smembers(ACTIVE_PLAYERS)
+            ]
+            guilds = [
+                guild
+                for guild_id in guild_ids
+                if (guild := self.bot.get_guild(guild_id))
+                and (not guild.voice_client or self.stale(guild))
+            ]
+            if not guilds:
+                return
+
+            states = await self.bot.redis.fetch_many(
+                PLAYER_STATE, *(guild.id for guild in guilds)
+            )
+            for guild, state in zip(guilds, states):
+                if not state:
+                    await self.bot.redis.srem(ACTIVE_PLAYERS, guild.id)
+                    continue
+
+                try:
+                    if guild.voice_client:
+                        await guild.voice_client.disconnect(force=True)
+
+                    await self.restore(guild, state)
+                except Exception:
+                    log.exception("Failed to restore the player in %s", guild)
+                    self.forget(guild.id)
+
+    async def build(self, guild: Guild, state: TrackState) -> Optional[Track]:
+        try:
+            track = await NodePool.get_node().build_track(state["track_id"])
+        except Exception:
+            log.debug("Failed to rebuild track %s", state["track_id"])
+            return None
+
+        if state["requester_id"]:
+            track.requester = guild.get_member(state["requester_id"])
+
+        return track
+
+    async def restore(self, guild: Guild, state: PlayerState) -> Optional[Client]:
+        from .player import Client
+
+        channel = guild.get_channel(state["channel_id"])
+        if not isinstance(channel, VoiceChannel) or not any(
+            not member.bot for member in channel.members
+        ):
+            self.forget(guild.id)
+            return None
+
+        self.restoring.add(guild.id)
+        try:
+            client = await channel.connect(cls=Client, self_deaf=True)
+            await client.set_volume(state["volume"])
+            if state["filters"]:
+                await client.apply_filters(state["filters"])
+
+            current = (
+                await self.build(guild, state["current"]) if state["current"] else None
+            )
+            queue = await asyncio.gather(
+                *(self.build(guild, track) for track in state["queue"])
+            )
+
+            for track in queue:
+                if track:
+                    client.queue.put(track)
+
+            if state["loop_mode"]:
+                client.queue.set_loop_mode(LoopMode(state["loop_mode"]))
+
+            if current:
+                await client.play(current, start=resume_position(state))
+                if state["paused"]:
+                    await client.set_pause(True)
+            else:
+                await client.do_next()
+        finally:
+            self.restoring.discard(guild.id)
+
+        self.touch(guild.id)
+        log.info(
+            "Restored the player in %s with %s queued tracks",
+            guild,
+            client.queue.count,
+        )
+        return client
+
+
+states = PlayerStore()
@@ -31,7 +31,7 @@ from discord.ext.commands import (
     BadArgument
 )
 
-from core.client.prefix import update_guild_prefix, update_user_prefix
+from core.client.prefix import PREFIX, update_guild_prefix, update_user_prefix
 
 poj_cache = {}
 
@@ -46,7 +46,7 @@ class Config(Extended, Cog):
         """
         View the current server prefixes.
         """
-        guild_prefix = await self.bot.redis.get(f"prefix:guild:{ctx.guild.id}")
+        guild_prefix = await self.bot.redis.fetch(PREFIX, f"guild:{ctx.guild.id}")
         
         if guild_prefix is None:
             guild = await self.bot.db.fetch(
@@ -93,7 +93,7 @@ class Config(Extended, Cog):
         from core.client.prefix import update_user_prefix
         
         if prefix.lower() == "none":
-            user_prefix = await self.bot.redis.get(f"prefix:user:{ctx.author.id}")
+            user_prefix = await self.bot.redis.fetch(PREFIX, f"user:{ctx.author.id}")
             if user_prefix is None:
                 check = await self.bot.db.fetchrow(
                     """
@@ -44,6 +44,9 @@ class Alias(MixinMeta, metaclass=CompositeMetaClass):
         Invokes an alias if one is provided.
         """
 
+        if not ctx.guild or not self.bot.features.active("alias", ctx.guild.id):
+            return
+
         prefix = ctx.prefix or ctx.clean_prefix
 
         try:
@@ -110,6 +113,8 @@ class Alias(MixinMeta, metaclass=CompositeMetaClass):
         except UniqueViolationError:
             return await ctx.warn(f"An alias with the name **{name}** already exists!")
 
+        await self.bot.features.refresh("alias", ctx.guild.id)
+
         return await ctx.approve(f"Added shortcut **{name}** for `{invoke}`")
 
     @alias.command(
@@ -158,6 +163,8 @@ class Alias(MixinMeta, metaclass=CompositeMetaClass):
             ctx.guild.id,
             alias.lower(),
         )
+        await self.bot.features.refresh("alias", ctx.guild.id)
+
         if result == "DELETE 0":
             return await ctx.warn(f"An alias matching **{alias}** doesn't exist!")
 
@@ -184,6 +191,8 @@ class Alias(MixinMeta, metaclass=CompositeMetaClass):
             """,
             ctx.guild.id,
         )
+        await self.bot.features.refresh("alias", ctx.guild.id)
+
         if result == "DELETE 0":
             return await ctx.warn("No aliases exist for this server!")
 
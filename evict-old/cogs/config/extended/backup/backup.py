@@ -190,9 +190,9 @@ class Backup(MixinMeta, metaclass=CompositeMetaClass):
         options = BooleanArgs(["channels", "roles", "settings"] + list(options))
         warnings: list[str] = []
         if options.channels:
-            warnings.append("Channels will be deleted")
+            warnings.append("Channels which aren't in the backup will be deleted")
         if options.roles:
-            warnings.append("Roles will be deleted")
+            warnings.append("Roles which aren't in the backup will be deleted")
         if options.bans:
             warnings.append("Bans will be restored")
         if options.settings:
@@ -209,7 +209,7 @@ class Backup(MixinMeta, metaclass=CompositeMetaClass):
             "\n".join(warnings),
         )
 
-        backup = BackupLoader(self.bot, ctx.guild, record["data"])
+        backup = BackupLoader(self.bot, ctx.guild, record["data"], key)
 
         await ctx.neutral(f"Preparing to load backup `{key}`..")
         await backup.load(ctx.author, options)
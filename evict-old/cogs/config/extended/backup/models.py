@@ -1,10 +1,21 @@
 import asyncio
 from asyncio import Semaphore
 from base64 import b64decode, b64encode
+from collections import defaultdict
 from contextlib import suppress
 from json import loads
 from logging import getLogger
-from typing import Any, Coroutine, Dict, List, Optional
+from typing import (
+    Any,
+    Awaitable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
 
 from discord import (
     CategoryChannel,
@@ -14,7 +25,6 @@ from discord import (
     Guild,
     HTTPException,
     Member,
-    NotFound,
     Object,
     PermissionOverwrite,
     Permissions,
@@ -23,14 +33,17 @@ from discord import (
     TextChannel,
     VerificationLevel,
 )
-from discord.utils import get
 
+from core.client.codec import MSGPACK, Namespace
 from main import Evict
 from tools import capture_time
 
 from .types import BackupData, BooleanArgs
 
 log = getLogger("evict/backup")
+T = TypeVar("T")
+
+CHECKPOINTS = Namespace("backup:restore", MSGPACK, ttl=60 * 60 * 24)
 
 
 async def dump(guild: Guild) -> BackupData:
@@ -174,79 +187,180 @@ class BackupViewer:
         return ret[: limit - 10] + "```"
 
 
+class RouteScheduler:
+    """
+    Bound concurrent REST calls per Discord route bucket.
+
+    Calls sharing a bucket queue behind each other, while calls
+    for different buckets (such as member edits and channel creation)
+    run side by side instead of sharing a single semaphore.
+    """
+
+    limits: Dict[str, int] = {"member": 2, "role": 1, "channel": 1, "ban": 1}
+
+    def __init__(self) -> None:
+        self.buckets: Dict[str, Semaphore] = {}
+        self.tasks: Set[asyncio.Task] = set()
+
+    def bucket(self, route: str) -> Semaphore:
+        if route not in self.buckets:
+            self.buckets[route] = Semaphore(self.limits.get(route, 1))
+
+        return self.buckets[route]
+
+    async def run(self, route: str, coro: Awaitable[T]) -> Optional[T]:
+        async with self.bucket(route):
+            try:
+                return await coro
+            except HTTPException as exc:
+                log.debug("Restore call on the %s bucket failed: %s", route, exc)
+                return None
+
+    def schedule(self, route: str, coros: Iterable[Awaitable[Any]]) -> None:
+        for coro in coros:
+            task = asyncio.create_task(self.run(route, coro))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def wait(self) -> None:
+        if self.tasks:
+            await asyncio.wait(self.tasks)
+
+
 class BackupLoader:
+    """
+    Restore a backup by diffing it against the live guild.
+
+    Roles and channels are matched by their original ID, then by name,
+    and only the objects which differ are created, edited or deleted.
+    Progress is checkpointed in Redis after every step and object,
+    along with the member role grants still pending, so an interrupted
+    restore resumes where it left off.
+    """
+
     bot: Evict
     guild: Guild
+    key: str
     data: BackupData
     options: BooleanArgs
-    semaphore: Semaphore
+    scheduler: RouteScheduler
     reason: str
     id_translator: dict[int, int]
+    completed: List[str]
+    grants: Dict[int, List[int]]
 
-    def __init__(self, bot: Evict, guild: Guild, data: str):
+    def __init__(self, bot: Evict, guild: Guild, data: str, key: str = ""):
         self.bot = bot
         self.guild = guild
+        self.key = key
         self.data = loads(data)
         self.options = BooleanArgs([])
-        self.semaphore = Semaphore(4)
+        self.scheduler = RouteScheduler()
         self.reason = "Backup loaded by evict"
         self.id_translator = {}
+        self.completed = []
+        self.grants = {}
+
+    @property
+    def checkpoint(self) -> str:
+        return f"{self.guild.id}:{self.key}"
+
+    async def restore_checkpoint(self) -> None:
+        state = await self.bot.redis.fetch(CHECKPOINTS, self.checkpoint)
+        if not state:
+            return
+
+        self.id_translator = {int(old): int(new) for old, new in state["translator"]}
+        self.completed = list(state["completed"])
+        self.grants = {
+            int(member_id): [int(role_id) for role_id in role_ids]
+            for member_id, role_ids in state.get("grants", [])
+        }
+        log.info(
+            "Resuming backup restore for %s (%s) after %s.",
+            self.guild,
+            self.guild.id,
+            ", ".join(self.completed) or "nothing",
+        )
+
+    async def save_checkpoint(self) -> None:
+        await self.bot.redis.store(
+            CHECKPOINTS,
+            self.checkpoint,
+            {
+                "translator": list(self.id_translator.items()),
+                "completed": self.completed,
+                "grants": list(self.grants.items()),
+            },
+        )
+
+    def translate(self, object_id: Optional[int]) -> Optional[int]:
+        if object_id is None:
+            return None
+
+        return self.id_translator.get(object_id)
+
+    def get_overwrites(self, data: dict[str, dict[str, Optional[bool]]]):
+        """
+        Resolve overwrite targets from the member cache and restored roles.
+        The guild is chunked once beforehand instead of fetching each member.
+        """
 
-    async def get_overwrites(self, data: dict[str, dict[str, Optional[bool]]]):
         overwrites: Dict[Member | Role, PermissionOverwrite] = {}
         for union_id, overwrite in data.items():
-            try:
-                union = await self.guild.fetch_member(int(union_id))
-            except NotFound:
-                union = get(self.guild.roles, id=self.id_translator.get(int(union_id)))
-
+            union = self.guild.get_member(int(union_id)) or self.guild.get_role(
+                self.translate(int(union_id)) or 0
+            )
             if union:
                 overwrites[union] = PermissionOverwrite(**overwrite)
 
         return overwrites
 
-    async def run_tasks(
-        self,
-        coros: List[Coroutine[Any, Any, None]],
-        wait: bool = False,
-    ) -> None:
-        async def exec(_coro: Coroutine[Any, Any, None]) -> None:
-            try:
-                await _coro
-            except Exception:
-                ...
-            finally:
-                self.semaphore.release()
-
-        tasks: List[asyncio.Task] = []
-        for coro in coros:
-            await self.semaphore.acquire()
-            tasks.append(self.bot.loop.create_task(exec(coro)))
+    @staticmethod
+    def differs(current: Any, kwargs: dict[str, Any]) -> dict[str, Any]:
+        """
+        Keep the keyword arguments which don't match the current object.
+        """
+
+        changes = {}
+        for key, value in kwargs.items():
+            if key == "overwrites":
+                existing = {target.id: overwrite for target, overwrite in current.overwrites.items()}
+                desired = {target.id: overwrite for target, overwrite in value.items()}
+                if existing != desired:
+                    changes[key] = value
+
+            elif key == "category":
+                if current.category_id != (value.id if value else None):
+                    changes[key] = value
+
+            elif key in ("color", "permissions"):
+                if getattr(current, key) != value:
+                    changes[key] = value
+
+            elif not hasattr(current, key):
+                continue
 
-        if wait and tasks:
-            await asyncio.wait(tasks)
+            elif getattr(current, key) != value:
+                changes[key] = value
 
-    async def prepare(self):
-        if self.options.roles:
-            log.debug("Deleting roles for %s (%s).", self.guild, self.guild.id)
-            for role in self.guild.roles:
-                if not role.is_assignable():
-                    continue
+        return changes
 
-                with suppress(HTTPException):
-                    await role.delete(reason=self.reason)
+    def match(
+        self,
+        data: Dict[str, Any],
+        candidates: Dict[int, Any],
+        claimed: Set[int],
+    ) -> Optional[Any]:
+        for object_id in (self.translate(data["id"]), data["id"]):
+            if object_id and object_id in candidates and object_id not in claimed:
+                return candidates[object_id]
 
-        if self.options.channels:
-            log.debug("Deleting channels for %s (%s).", self.guild, self.guild.id)
-            for channel in self.guild.channels:
-                with suppress(HTTPException):
-                    if channel in (
-                        self.guild.public_updates_channel,
-                        self.guild.rules_channel,
-                    ):
-                        await self.guild.edit(community=False)
+        for candidate in candidates.values():
+            if candidate.id not in claimed and candidate.name == data["name"]:
+                return candidate
 
-                    await channel.delete(reason=self.reason)
+        return None
 
     async def load_settings(self):
         design: dict[str, bytes] = {
@@ -256,10 +370,10 @@ class BackupLoader:
         }
 
         rules_channel: TextChannel = self.guild.get_channel(
-            self.id_translator.get(self.data["rules_channel"])  # type: ignore
+            self.translate(self.data["rules_channel"])  # type: ignore
         )
         updates_channel: TextChannel = self.guild.get_channel(
-            self.id_translator.get(self.data["community_updates"])  # type: ignore
+            self.translate(self.data["community_updates"])  # type: ignore
         )
         community = bool(rules_channel and updates_channel)
 
@@ -270,11 +384,11 @@ class BackupLoader:
             splash=design.get("splash"),
             discovery_splash=design.get("discovery_splash"),
             afk_channel=self.guild.get_channel(
-                self.id_translator.get(self.data["afk_channel"])  # type: ignore
+                self.translate(self.data["afk_channel"])  # type: ignore
             ),
             afk_timeout=self.data["afk_timeout"],
             system_channel=self.guild.get_channel(
-                self.id_translator.get(self.data["system"]["channel"])  # type: ignore
+                self.translate(self.data["system"]["channel"])  # type: ignore
             ),
             system_channel_flags=SystemChannelFlags._from_value(
                 self.data["system"]["flags"]
@@ -296,16 +410,44 @@ class BackupLoader:
                 ):
                     continue
 
-                channel = self.guild.get_channel(self.id_translator.get(data["id"]))  # type: ignore
-                if not channel:
+                channel = self.guild.get_channel(self.translate(data["id"]))  # type: ignore
+                if not channel or channel.type.value == data["type"]:
                     continue
 
                 with suppress(HTTPException):
                     await channel.edit(type=ChannelType(data["type"]))  # type: ignore
 
+    async def grant(self, member: Member, roles: List[Role]) -> None:
+        await member.add_roles(*roles, reason=self.reason, atomic=False)
+        self.grants.pop(member.id, None)
+        await self.save_checkpoint()
+
+    def schedule_grants(self) -> None:
+        for member_id, role_ids in list(self.grants.items()):
+            member = self.guild.get_member(member_id)
+            roles = [
+                role
+                for role_id in role_ids
+                if (role := self.guild.get_role(role_id))
+                and role.is_assignable()
+                and member
+                and role not in member.roles
+            ]
+            if not member or not roles:
+                self.grants.pop(member_id, None)
+                continue
+
+            self.scheduler.schedule("member", [self.grant(member, roles)])
+
     async def load_roles(self):
-        tasks: List[Coroutine[Any, Any, None]] = []
-        members: Dict[Member, List[Role]] = {}
+        members: Dict[int, List[int]] = defaultdict(list)
+        candidates = {
+            role.id: role
+            for role in self.guild.roles
+            if role.is_assignable() or role.is_default() or role.is_premium_subscriber()
+        }
+        claimed: Set[int] = set()
+        positions: Dict[Role, int] = {}
 
         for data in reversed(self.data["roles"]):
             kwargs = {
@@ -314,7 +456,6 @@ class BackupLoader:
                 "mentionable": data["mentionable"],
                 "color": Color(data["color"]),
                 "permissions": Permissions(data["permissions"]),
-                "reason": self.reason,
             }
             role: Optional[Role] = None
             if data["default"]:
@@ -324,112 +465,215 @@ class BackupLoader:
             elif data["premium"]:
                 role = self.guild.premium_subscriber_role
 
-            with suppress(HTTPException):
-                if role and role.is_assignable():
-                    await role.edit(**kwargs)
+            else:
+                role = self.match(data, candidates, claimed)
 
-                elif not role:
-                    try:
-                        role = await asyncio.wait_for(
-                            self.guild.create_role(**kwargs), 10
-                        )
-                    except asyncio.TimeoutError:
-                        break
+            try:
+                if role:
+                    claimed.add(role.id)
+                    changes = self.differs(role, kwargs)
+                    if changes and role.is_assignable():
+                        await role.edit(**changes, reason=self.reason)
+
+                else:
+                    role = await asyncio.wait_for(
+                        self.guild.create_role(**kwargs, reason=self.reason), 10
+                    )
+            except asyncio.TimeoutError:
+                break
+            except HTTPException:
+                continue
 
-                    for member_id in data["members"]:
-                        member = self.guild.get_member(member_id)
-                        if not member:
-                            continue
+            self.id_translator[data["id"]] = role.id
+            if role.is_assignable() and role.position != data["position"]:
+                positions[role] = data["position"]
 
-                        if member not in members:
-                            members[member] = []
+            for member_id in data["members"]:
+                member = self.guild.get_member(member_id)
+                if member and role.is_assignable() and role not in member.roles:
+                    members[member.id].append(role.id)
 
-                        members[member].append(role)
+            await self.save_checkpoint()
 
-                self.id_translator[data["id"]] = role.id
+        if positions:
+            with suppress(HTTPException):
+                await self.guild.edit_role_positions(positions, reason=self.reason)
 
-        tasks.extend(
-            member.add_roles(*roles, reason=self.reason)
-            for member, roles in members.items()
-        )
-        await self.run_tasks(tasks)
+        for role in list(self.guild.roles):
+            if role.id not in claimed and role.is_assignable():
+                self.scheduler.schedule("role", [role.delete(reason=self.reason)])
 
-    async def load_categories(self):
+        self.grants = dict(members)
+        await self.save_checkpoint()
+        self.schedule_grants()
+
+    def plan_channels(self) -> List[Tuple[Dict[str, Any], Optional[Any]]]:
+        """
+        Pair every category and channel in the backup with a live match.
+        Categories come first so channels can resolve their parent.
+        """
+
+        plan: List[Tuple[Dict[str, Any], Optional[Any]]] = []
+        claimed: Set[int] = set()
+
+        candidates = {category.id: category for category in self.guild.categories}
         for data in self.data["categories"]:
+            category = self.match(data, candidates, claimed)
+            if category:
+                claimed.add(category.id)
+
+            plan.append((data, category))
+
+        candidates = {
+            channel.id: channel
+            for channel in self.guild.channels
+            if channel.type != ChannelType.category
+        }
+        for data in self.data["channels"]:
+            channel = self.match(data, candidates, claimed)
+            if channel and channel.type.value != data["type"] and not (
+                channel.type == ChannelType.text
+                and data["type"] in (ChannelType.news.value, ChannelType.forum.value)
+            ):
+                channel = None
+
+            if channel:
+                claimed.add(channel.id)
+
+            plan.append((data, channel))
+
+        return plan
+
+    async def delete_unclaimed(self, claimed: Set[int]):
+        """
+        Delete the channels which no backup entry matched.
+        This runs before anything is created to stay under the channel limit.
+        """
+
+        unclaimed = [
+            channel for channel in self.guild.channels if channel.id not in claimed
+        ]
+        if any(
+            channel in (self.guild.public_updates_channel, self.guild.rules_channel)
+            for channel in unclaimed
+        ):
             with suppress(HTTPException):
-                overwrites = await self.get_overwrites(data["overwrites"])
-                category = await self.guild.create_category(
-                    name=data["name"],
-                    overwrites=overwrites,
-                    reason=self.reason,
-                )
+                await self.guild.edit(community=False)
 
-                self.id_translator[data["id"]] = category.id
+        await asyncio.gather(
+            *(
+                self.scheduler.run("channel", channel.delete(reason=self.reason))
+                for channel in unclaimed
+            )
+        )
 
-    async def load_channels(self):
-        await self.load_categories()
+    async def load_category(self, data: Dict[str, Any], category: Optional[Any]):
+        overwrites = self.get_overwrites(data["overwrites"])
+        if category:
+            changes = self.differs(
+                category,
+                {"name": data["name"], "overwrites": overwrites},
+            )
+            if changes:
+                await category.edit(**changes, reason=self.reason)
+
+            return category
+
+        return await self.guild.create_category(
+            name=data["name"],
+            overwrites=overwrites,
+            reason=self.reason,
+        )
 
-        for data in self.data["channels"]:
-            try:
-                overwrites = await self.get_overwrites(data["overwrites"])
-                coro = (
-                    self.guild.create_voice_channel
-                    if data["type"] == ChannelType.voice.value
-                    else (
-                        self.guild.create_stage_channel
-                        if data["type"] == ChannelType.stage_voice.value
-                        else self.guild.create_text_channel
-                    )
-                )
-
-                kwargs = {
-                    "name": data["name"],
-                    "overwrites": overwrites,
-                    "position": data["position"],
-                    "reason": self.reason,
-                }
-                if (
-                    data["category_id"]
-                    and (
-                        channel := self.guild.get_channel(
-                            self.id_translator.get(data["category_id"])  # type: ignore
-                        )
-                    )
-                    and isinstance(channel, CategoryChannel)
-                ):
-                    kwargs["category"] = channel
-
-                for key, value in (
-                    ("topic", data["topic"]),
-                    ("nsfw", data["nsfw"]),
-                    ("slowmode_delay", data["slowmode_delay"]),
-                    (
-                        "bitrate",
-                        (
-                            data["bitrate"]
-                            if data["bitrate"]
-                            and data["bitrate"] <= self.guild.bitrate_limit
-                            else None
-                        ),
-                    ),
-                    ("user_limit", data["user_limit"]),
-                ):
-                    if not value:
-                        continue
+    async def load_channel(self, data: Dict[str, Any], channel: Optional[Any]):
+        category = self.guild.get_channel(self.translate(data["category_id"]) or 0)
+        kwargs: Dict[str, Any] = {
+            "name": data["name"],
+            "overwrites": self.get_overwrites(data["overwrites"]),
+            "position": data["position"],
+            "category": category if isinstance(category, CategoryChannel) else None,
+        }
+        for key, value in (
+            ("topic", data["topic"]),
+            ("nsfw", data["nsfw"]),
+            ("slowmode_delay", data["slowmode_delay"]),
+            (
+                "bitrate",
+                (
+                    data["bitrate"]
+                    if data["bitrate"] and data["bitrate"] <= self.guild.bitrate_limit
+                    else None
+                ),
+            ),
+            ("user_limit", data["user_limit"]),
+        ):
+            if not value:
+                continue
+
+            kwargs[key] = value
 
-                    kwargs[key] = value
+        if channel:
+            changes = self.differs(channel, kwargs)
+            if changes:
+                await channel.edit(**changes, reason=self.reason)
+
+            return channel
+
+        coro = (
+            self.guild.create_voice_channel
+            if data["type"] == ChannelType.voice.value
+            else (
+                self.guild.create_stage_channel
+                if data["type"] == ChannelType.stage_voice.value
+                else self.guild.create_text_channel
+            )
+        )
+        if not kwargs["category"]:
+            kwargs.pop("category")
+
+        return await coro(**kwargs, reason=self.reason)
+
+    async def load_channels(self):
+        plan = self.plan_channels()
+        await self.delete_unclaimed({match.id for _, match in plan if match})
 
-                channel = await coro(**kwargs)
-                self.id_translator[data["id"]] = channel.id
+        categories = {data["id"] for data in self.data["categories"]}
+        for data, match in plan:
+            try:
+                if data["id"] in categories:
+                    channel = await self.load_category(data, match)
+                else:
+                    channel = await self.load_channel(data, match)
             except HTTPException as exc:
                 log.error(exc)
+                continue
+
+            self.id_translator[data["id"]] = channel.id
+            await self.save_checkpoint()
 
     async def load_bans(self):
-        tasks = [
-            self.guild.ban(Object(int(user_id)), reason=reason)
-            for user_id, reason in self.data["bans"].items()
-        ]
-        await self.run_tasks(tasks)
+        """
+        Ban everyone missing from the ban list through the bulk ban endpoint.
+        """
+
+        banned = {entry.user.id async for entry in self.guild.bans(limit=None)}
+        reasons: Dict[Optional[str], List[Object]] = defaultdict(list)
+        for user_id, reason in self.data["bans"].items():
+            if int(user_id) not in banned:
+                reasons[reason].append(Object(int(user_id)))
+
+        for reason, users in reasons.items():
+            self.scheduler.schedule(
+                "ban",
+                (
+                    self.guild.bulk_ban(
+                        users[index : index + 200],
+                        reason=reason or self.reason,
+                        delete_message_seconds=0,
+                    )
+                    for index in range(0, len(users), 200)
+                ),
+            )
 
     async def load(self, loader: Member, options: BooleanArgs):
         self.options = options
@@ -440,7 +684,13 @@ class BackupLoader:
             f"Finished loading backup for {self.guild} ({self.guild.id})",
             log,
         ):
-            await self.prepare()
+            await self.restore_checkpoint()
+            if not self.guild.chunked:
+                await self.guild.chunk(cache=True)
+
+            if "roles" in self.completed and self.grants:
+                self.schedule_grants()
+
             steps = [
                 ("roles", self.load_roles),
                 ("channels", self.load_channels),
@@ -448,8 +698,13 @@ class BackupLoader:
                 ("bans", self.load_bans),
             ]
             for option, coro in steps:
-                if self.options.get(option):
-                    log.debug(
-                        "Loading %s for %s (%s).", option, self.guild, self.guild.id
-                    )
-                    await coro()
+                if not self.options.get(option) or option in self.completed:
+                    continue
+
+                log.debug("Loading %s for %s (%s).", option, self.guild, self.guild.id)
+                await coro()
+                self.completed.append(option)
+                await self.save_checkpoint()
+
+            await self.scheduler.wait()
+            await self.bot.redis.delete(CHECKPOINTS.key(self.checkpoint))
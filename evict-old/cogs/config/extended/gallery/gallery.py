@@ -53,6 +53,8 @@ class Gallery(MixinMeta, metaclass=CompositeMetaClass):
         except UniqueViolationError:
             return await ctx.warn("That channel is already a gallery channel!")
 
+        await self.bot.features.refresh("gallery", ctx.guild.id)
+
         return await ctx.approve(
             f"Now restricting {channel.mention} to only allow images"
         )
@@ -77,6 +79,8 @@ class Gallery(MixinMeta, metaclass=CompositeMetaClass):
             ctx.guild.id,
             channel.id,
         )
+        await self.bot.features.refresh("gallery", ctx.guild.id)
+
         if result == "DELETE 0":
             return await ctx.warn("That channel isn't a gallery channel!")
 
@@ -101,6 +105,8 @@ class Gallery(MixinMeta, metaclass=CompositeMetaClass):
             """,
             ctx.guild.id,
         )
+        await self.bot.features.refresh("gallery", ctx.guild.id)
+
         if result == "DELETE 0":
             return await ctx.warn("No gallery channels exist for this server!")
 
@@ -151,6 +157,7 @@ class Gallery(MixinMeta, metaclass=CompositeMetaClass):
                 message.channel,
                 TextChannel,
             )
+            or not self.bot.features.active("gallery", message.channel.id)
         ):
             return
 
@@ -170,7 +177,7 @@ class Gallery(MixinMeta, metaclass=CompositeMetaClass):
             return
 
         key = xxh32_hexdigest(f"gallery:{message.channel.id}")
-        if not await self.bot.redis.ratelimited(key, 6, 10):
+        if not await self.bot.ratelimits.limited(key, 6, 10):
             await quietly_delete(message)
 
         locked = await self.bot.redis.get(key)
@@ -8,6 +8,8 @@ from managers.paginator import Paginator
 from core.client.context import Context
 import discord
 
+from .tracker import InviteTracker
+
 class Invites(MixinMeta, metaclass=CompositeMetaClass):
     """
     Track and manage server invites.
@@ -16,7 +18,24 @@ class Invites(MixinMeta, metaclass=CompositeMetaClass):
     def __init__(self, bot):
         super().__init__()
         self.bot = bot
-        self.invite_cache = {}
+        self.tracker = InviteTracker()
+
+    async def cog_load(self) -> None:
+        self.bot.loop.create_task(self.prime_invites())
+        return await super().cog_load()
+
+    async def prime_invites(self) -> None:
+        """
+        Cache the invites of every tracked guild on this cluster,
+        so the first joins after a restart can be attributed.
+        """
+        await self.bot.wait_until_ready()
+        guild_ids = await self.bot.db.fetch(
+            "SELECT guild_id FROM invite_config WHERE is_enabled = true"
+        )
+        for record in guild_ids:
+            if guild := self.bot.get_guild(record["guild_id"]):
+                await self.tracker.prime(guild)
 
     def _parse_duration(self, duration: str) -> float:
         """
@@ -198,6 +217,7 @@ class Invites(MixinMeta, metaclass=CompositeMetaClass):
             """,
             ctx.guild.id
         )
+        await self.tracker.prime(ctx.guild)
 
         return await ctx.approve("Invite tracking has been enabled")
 
@@ -216,6 +236,7 @@ class Invites(MixinMeta, metaclass=CompositeMetaClass):
             """,
             ctx.guild.id
         )
+        self.tracker.forget(ctx.guild.id)
 
         return await ctx.approve("Invite tracking has been disabled")
 
@@ -879,33 +900,22 @@ class Invites(MixinMeta, metaclass=CompositeMetaClass):
         """Initialize invite cache for new guilds"""
         if not await self._is_tracking_enabled(guild.id):
             return
-            
-        try:
-            self.invite_cache[guild.id] = {
-                invite.code: invite.uses 
-                for invite in await guild.invites()
-            }
-        except discord.HTTPException:
-            pass
+
+        await self.tracker.prime(guild)
+
+    @Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.tracker.forget(guild.id)
 
     @Cog.listener()
     async def on_invite_create(self, invite: discord.Invite):
         """Cache new invites when they're created"""
-        if not await self._is_tracking_enabled(invite.guild.id):
-            return
-            
-        if invite.guild.id not in self.invite_cache:
-            self.invite_cache[invite.guild.id] = {}
-        self.invite_cache[invite.guild.id][invite.code] = invite.uses
+        self.tracker.create(invite)
 
     @Cog.listener()
     async def on_invite_delete(self, invite: discord.Invite):
         """Remove deleted invites from cache"""
-        if not await self._is_tracking_enabled(invite.guild.id):
-            return
-            
-        if invite.guild.id in self.invite_cache:
-            self.invite_cache[invite.guild.id].pop(invite.code, None)
+        self.tracker.delete(invite)
 
     @Cog.listener()
     async def on_member_join(self, member: discord.Member):
@@ -930,25 +940,7 @@ class Invites(MixinMeta, metaclass=CompositeMetaClass):
         if not config:
             return
 
-        try:
-            current_invites = {
-                invite.code: invite.uses 
-                for invite in await member.guild.invites()
-            }
-        except discord.HTTPException:
-            return
-
-        used_invite = None
-        inviter = None
-
-        for code, uses in current_invites.items():
-            cached_uses = self.invite_cache.get(member.guild.id, {}).get(code, 0)
-            if uses > cached_uses:
-                used_invite = next((inv for inv in await member.guild.invites() if inv.code == code), None)
-                break
-
-        self.invite_cache[member.guild.id] = current_invites
-
+        used_invite = await self.tracker.attribute(member)
         if not used_invite or not used_invite.inviter:
             return
 
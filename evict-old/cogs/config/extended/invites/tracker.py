@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from itertools import zip_longest
+from logging import getLogger
+from typing import Deque, Dict, List, Optional, Tuple
+
+from discord import Guild, HTTPException, Invite, Member, User
+from discord.utils import utcnow
+
+log = getLogger("evict/invites")
+
+
+class CachedInvite:
+    """
+    The parts of an invite needed to attribute joins.
+    """
+
+    __slots__ = ("code", "inviter", "uses", "max_uses", "expires_at")
+
+    def __init__(
+        self,
+        code: str,
+        inviter: Optional[User],
+        uses: int,
+        max_uses: int,
+        expires_at: Optional[datetime],
+    ):
+        self.code = code
+        self.inviter = inviter
+        self.uses = uses
+        self.max_uses = max_uses
+        self.expires_at = expires_at
+
+    def __repr__(self) -> str:
+        return f"<CachedInvite code={self.code!r} uses={self.uses}/{self.max_uses or '∞'}>"
+
+    @classmethod
+    def from_invite(cls, invite: Invite) -> CachedInvite:
+        expires_at = invite.expires_at
+        if not expires_at and invite.max_age and invite.created_at:
+            expires_at = invite.created_at + timedelta(seconds=invite.max_age)
+
+        return cls(
+            code=invite.code,
+            inviter=invite.inviter,
+            uses=invite.uses or 0,
+            max_uses=invite.max_uses or 0,
+            expires_at=expires_at,
+        )
+
+    def expired(self, now: datetime) -> bool:
+        return bool(self.expires_at and self.expires_at <= now)
+
+    @property
+    def remaining(self) -> Optional[int]:
+        return self.max_uses - self.uses if self.max_uses else None
+
+
+class GuildInvites:
+    def __init__(self):
+        self.invites: Optional[Dict[str, CachedInvite]] = None
+        self.spent: Deque[Tuple[float, CachedInvite]] = deque()
+        self.unclaimed: Deque[Tuple[float, CachedInvite]] = deque()
+        self.waiting: List[Tuple[Member, asyncio.Future]] = []
+        self.task: Optional[asyncio.Task] = None
+
+
+class InviteTracker:
+    """
+    Per guild invite state kept up to date from gateway events.
+
+    A join is attributed without any request when only one invite could
+    have been used, or when a limited invite was deleted as it ran out.
+    Otherwise joins wait for a refresh shared by the whole burst, at most
+    one per `window` seconds, and the use counts it returns are handed
+    out to the waiting members in join order. Uses seen before their join
+    event arrives are held for the next joins instead of being lost.
+    """
+
+    def __init__(self, window: float = 1.5, grace: float = 30.0):
+        self.window = window
+        self.grace = grace
+        self.guilds: Dict[int, GuildInvites] = {}
+        self.refreshes = 0
+
+    def __repr__(self) -> str:
+        return f"<InviteTracker guilds={len(self.guilds)} refreshes={self.refreshes}>"
+
+    async def prime(self, guild: Guild) -> bool:
+        state = self.guilds.setdefault(guild.id, GuildInvites())
+        if state.invites is not None:
+            return True
+
+        try:
+            invites = await guild.invites()
+        except HTTPException:
+            return False
+
+        self.refreshes += 1
+        state.invites = {
+            invite.code: CachedInvite.from_invite(invite) for invite in invites
+        }
+        return True
+
+    def forget(self, guild_id: int) -> None:
+        state = self.guilds.pop(guild_id, None)
+        if state and state.task:
+            state.task.cancel()
+
+    def create(self, invite: Invite) -> None:
+        state = self.guilds.get(invite.guild.id) if invite.guild else None
+        if state and state.invites is not None:
+            state.invites[invite.code] = CachedInvite.from_invite(invite)
+
+    def delete(self, invite: Invite) -> None:
+        """
+        Drop a deleted invite, remembering limited invites for a moment
+        as Discord deletes them once their last use is consumed.
+        Invites with more than one use left were deleted by hand.
+        """
+
+        state = self.guilds.get(invite.guild.id) if invite.guild else None
+        if not state or state.invites is None:
+            return
+
+        cached = state.invites.pop(invite.code, None)
+        if (
+            cached
+            and cached.max_uses
+            and cached.uses + 1 >= cached.max_uses
+            and not cached.expired(utcnow())
+        ):
+            state.spent.append((time.monotonic(), cached))
+
+    def prune(self, state: GuildInvites, now: float) -> None:
+        for queue in (state.spent, state.unclaimed):
+            while queue and now - queue[0][0] > self.grace:
+                queue.popleft()
+
+    def deduce(self, guild: Guild, state: GuildInvites) -> Optional[CachedInvite]:
+        """
+        Attribute a join from cached state alone, if it's unambiguous.
+        """
+
+        if state.unclaimed:
+            return state.unclaimed.popleft()[1]
+
+        if state.spent:
+            invite = state.spent.popleft()[1]
+            invite.uses += 1
+            return invite
+
+        if state.task or state.invites is None:
+            return None
+
+        now = utcnow()
+        for code, invite in list(state.invites.items()):
+            if invite.expired(now):
+                del state.invites[code]
+
+        if len(state.invites) != 1 or {"VANITY_URL", "DISCOVERABLE"} & set(guild.features):
+            return None
+
+        invite = next(iter(state.invites.values()))
+        invite.uses += 1
+        if invite.remaining == 0:
+            del state.invites[invite.code]
+
+        return invite
+
+    def diff(
+        self,
+        state: GuildInvites,
+        fresh: Dict[str, CachedInvite],
+    ) -> List[CachedInvite]:
+        """
+        One entry per use between the cached and fresh invites.
+        """
+
+        cached = state.invites or {}
+        now = utcnow()
+        uses: List[CachedInvite] = []
+        for code, invite in fresh.items():
+            before = cached[code].uses if code in cached else 0
+            uses.extend([invite] * max(invite.uses - before, 0))
+
+        exhausted = [
+            invite
+            for code, invite in cached.items()
+            if code not in fresh and invite.max_uses and not invite.expired(now)
+        ]
+        exhausted.extend(invite for _, invite in state.spent)
+        state.spent.clear()
+        for invite in exhausted:
+            uses.extend([invite] * (invite.remaining or 0))
+
+        return uses
+
+    async def refresh(self, guild: Guild, state: GuildInvites) -> None:
+        batch: List[Tuple[Member, asyncio.Future]] = []
+        try:
+            while state.waiting:
+                await asyncio.sleep(self.window)
+                batch, state.waiting = state.waiting, []
+                try:
+                    invites = await guild.invites()
+                except HTTPException as exc:
+                    log.warning("Failed to refresh the invites of %s: %s", guild, exc)
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_result(None)
+                    continue
+
+                self.refreshes += 1
+                fresh = {
+                    invite.code: CachedInvite.from_invite(invite) for invite in invites
+                }
+                if state.invites is None:
+                    state.invites = fresh
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_result(None)
+                    continue
+
+                now = time.monotonic()
+                self.prune(state, now)
+                uses = [invite for _, invite in state.unclaimed] + self.diff(state, fresh)
+                state.unclaimed.clear()
+                state.invites = fresh
+
+                for entry, invite in zip_longest(batch, uses):
+                    if entry is None:
+                        state.unclaimed.append((now, invite))
+                    elif not entry[1].done():
+                        entry[1].set_result(invite)
+
+        finally:
+            state.task = None
+            for _, future in batch + state.waiting:
+                if not future.done():
+                    future.set_result(None)
+
+            state.waiting.clear()
+
+    async def attribute(self, member: Member) -> Optional[CachedInvite]:
+        """
+        Find the invite a member joined with.
+        """
+
+        guild = member.guild
+        state = self.guilds.setdefault(guild.id, GuildInvites())
+        self.prune(state, time.monotonic())
+        if invite := self.deduce(guild, state):
+            return invite
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        state.waiting.append((member, future))
+        if not state.task:
+            state.task = asyncio.create_task(self.refresh(guild, state))
+
+        return await future
@@ -202,12 +202,15 @@ class Level(MixinMeta, metaclass=CompositeMetaClass):
         Award XP to members for sending messages.
         """
 
+        if not ctx.guild or not self.bot.features.active("level", ctx.guild.id):
+            return
+
         config = await LevelConfig.fetch(ctx)
         if not config:
             return
 
         data = await LevelData.fetch(ctx)
-        # if await self.bot.redis.ratelimited(
+        # if await self.bot.ratelimits.limited(
         #     f"level:{ctx.guild.id}:{ctx.author.id}",
         #     1,
         #     config.cooldown,
@@ -393,6 +396,7 @@ class Level(MixinMeta, metaclass=CompositeMetaClass):
                 ctx.guild.id,
             ),
         )
+        await self.bot.features.refresh("level", ctx.guild.id)
 
         return await ctx.approve(
             f"The level system has been {'enabled' if status else 'disabled'}"
@@ -436,6 +440,7 @@ class Level(MixinMeta, metaclass=CompositeMetaClass):
                 ctx.guild.id,
             ),
         )
+        await self.bot.features.refresh("level", ctx.guild.id)
 
         return await ctx.approve(
             f"{'Now' if stack_roles else 'No longer'} stacking level roles"
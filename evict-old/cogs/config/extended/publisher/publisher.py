@@ -23,7 +23,11 @@ class Publisher(MixinMeta, metaclass=CompositeMetaClass):
         Automatically publish an announcment message.
         """
 
-        if not message.guild or message.channel.type != ChannelType.news:
+        if (
+            not message.guild
+            or message.channel.type != ChannelType.news
+            or not self.bot.features.active("publisher", message.channel.id)
+        ):
             return
 
         watched = await self.bot.db.fetch(
@@ -53,6 +57,7 @@ class Publisher(MixinMeta, metaclass=CompositeMetaClass):
                 """,
                 message.channel.id,
             )
+            await self.bot.features.refresh("publisher", message.guild.id)
         else:
             log.debug(
                 "Published message %s in guild %s (%s).",
@@ -102,6 +107,8 @@ class Publisher(MixinMeta, metaclass=CompositeMetaClass):
         except UniqueViolationError:
             return await ctx.warn(f"Already publishing messages in {channel.mention}!")
 
+        await self.bot.features.refresh("publisher", ctx.guild.id)
+
         return await ctx.approve(
             f"Now automatically publishing messages in {channel.mention}"
         )
@@ -131,6 +138,8 @@ class Publisher(MixinMeta, metaclass=CompositeMetaClass):
             ctx.guild.id,
             channel.id,
         )
+        await self.bot.features.refresh("publisher", ctx.guild.id)
+
         if result == "DELETE 0":
             return await ctx.warn(f"Channel {channel.mention} isn't being watched!")
 
@@ -157,6 +166,8 @@ class Publisher(MixinMeta, metaclass=CompositeMetaClass):
             """,
             ctx.guild.id,
         )
+        await self.bot.features.refresh("publisher", ctx.guild.id)
+
         if result == "DELETE 0":
             return await ctx.warn("No channels are being watched!")
 
@@ -29,6 +29,7 @@ from config import CLIENT
 from main import Evict
 from tools import CompositeMetaClass, MixinMeta
 from core.client import Context, FlagConverter
+from core.client.codec import MSGPACK, Namespace
 from tools.conversion import Duration, Status
 from tools.formatter import codeblock, plural
 from managers.paginator import Paginator
@@ -44,6 +45,8 @@ from processors.antinuke import (
 
 log = getLogger("evict/nuke")
 
+CACHE = Namespace("antinuke", MSGPACK, hasher=xxh32_hexdigest)
+
 
 class Flags(FlagConverter):
     threshold: Range[int, 1, 12] = flag(
@@ -202,8 +205,7 @@ class Settings(BaseModel):
         This will update the cache in redis.
         """
 
-        key = xxh32_hexdigest(f"antinuke:{guild.id}")
-        await bot.redis.delete(key)
+        await bot.redis.delete(CACHE.key(guild.id))
 
         record = await bot.db.fetchrow(
             """
@@ -217,7 +219,7 @@ class Settings(BaseModel):
             return
 
         settings = cls(**record, guild=guild)
-        await bot.redis.set(key, settings.dict(exclude={"guild"}))
+        await bot.redis.store(CACHE, guild.id, settings.dict(exclude={"guild"}))
         return settings
 
     @classmethod
@@ -227,10 +229,9 @@ class Settings(BaseModel):
         This will cache the settings in redis.
         """
 
-        key = xxh32_hexdigest(f"antinuke:{guild.id}")
         cached = cast(
             Optional[dict],
-            await bot.redis.get(key),
+            await bot.redis.fetch(CACHE, guild.id),
         )
         if cached:
             return cls(**cached, guild=guild)
@@ -254,7 +255,7 @@ class Settings(BaseModel):
             )
 
         settings = cls(**record or {}, guild=guild)
-        await bot.redis.set(key, settings.dict(exclude={"guild"}))
+        await bot.redis.store(CACHE, guild.id, settings.dict(exclude={"guild"}))
         return settings
 
     class Config(BaseConfig):
@@ -173,6 +173,7 @@ class AntiRaid(MixinMeta, metaclass=CompositeMetaClass):
                 """,
                 ctx.guild.id,
             )
+            await self.bot.features.refresh("antiraid.mentions", ctx.guild.id)
             return await ctx.approve("Mention spam protection has been disabled")
 
         await self.bot.db.execute(
@@ -186,6 +187,7 @@ class AntiRaid(MixinMeta, metaclass=CompositeMetaClass):
             ctx.guild.id,
             dict(flags),
         )
+        await self.bot.features.refresh("antiraid.mentions", ctx.guild.id)
         return await ctx.approve(
             "Mention spam protection has been enabled.",
             f"Threshold set as `{flags.amount}` "
@@ -755,6 +757,9 @@ class AntiRaid(MixinMeta, metaclass=CompositeMetaClass):
         if not mentions or mentions <= 2:
             return
 
+        if not self.bot.features.active("antiraid.mentions", message.guild.id):
+            return
+
         config = cast(
             Optional[AmountFlags.Schema],
             await self.bot.db.fetchval(
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from logging import getLogger
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from discord import HTTPException, Message, PartialMessage, TextChannel, Thread
+from discord.utils import find
+
+from tools import quietly_delete
+
+if TYPE_CHECKING:
+    from main import Evict
+
+    from .starboard import StarboardConfig
+
+log = getLogger("evict/star")
+
+Key = Tuple[int, str]
+
+
+class Tally:
+    """
+    The reaction count of one emoji on one message.
+
+    `count` is seeded from the fetched message and then follows
+    gateway events. Messages in the bot's cache are read directly,
+    as discord.py already keeps their reactions current.
+    """
+
+    def __init__(
+        self,
+        starboard: StarboardConfig,
+        channel: TextChannel | Thread,
+        message_id: int,
+    ):
+        self.starboard = starboard
+        self.channel = channel
+        self.message_id = message_id
+        self.message: Optional[Message] = None
+        self.count: Optional[int] = None
+        self.posted: Optional[int] = None
+        self.star: Optional[PartialMessage | Message] = None
+        self.looked_up = False
+        self.task: Optional[asyncio.Task] = None
+        self.lock = asyncio.Lock()
+        self.touched = time.monotonic()
+
+    def __repr__(self) -> str:
+        return f"<Tally message={self.message_id} emoji={self.starboard.emoji!r} count={self.count}>"
+
+    def apply(self, delta: int) -> None:
+        self.touched = time.monotonic()
+        if self.count is not None:
+            self.count = max(self.count + delta, 0)
+
+    def reactions(self, message: Message) -> int:
+        reaction = find(
+            lambda reaction: str(reaction.emoji) == self.starboard.emoji,
+            message.reactions,
+        )
+        return reaction.count if reaction else 0
+
+
+class StarboardEngine:
+    """
+    Debounced starboard updates driven by reaction events.
+
+    Reactions only adjust a tally and schedule a flush for their message,
+    so a reaction storm results in one board update per `delay` seconds.
+    A message is fetched at most once per flush, and only while its
+    tally hasn't been seeded. Flushes of one message are serialized by
+    that message's lock, leaving every other message in the guild free.
+    """
+
+    def __init__(
+        self,
+        bot: Evict,
+        delay: float = 2.0,
+        ttl: float = 900,
+        capacity: int = 4096,
+    ):
+        self.bot = bot
+        self.delay = delay
+        self.ttl = ttl
+        self.capacity = capacity
+        self.tallies: OrderedDict[Key, Tally] = OrderedDict()
+        self.fetches = 0
+
+    def __repr__(self) -> str:
+        return f"<StarboardEngine tallies={len(self.tallies)} fetches={self.fetches}>"
+
+    def get(self, message_id: int, emoji: str) -> Optional[Tally]:
+        tally = self.tallies.get((message_id, emoji))
+        if not tally:
+            return None
+
+        if not tally.task and time.monotonic() - tally.touched > self.ttl:
+            del self.tallies[message_id, emoji]
+            return None
+
+        self.tallies.move_to_end((message_id, emoji))
+        return tally
+
+    def track(
+        self,
+        starboard: StarboardConfig,
+        channel: TextChannel | Thread,
+        message_id: int,
+    ) -> Tally:
+        tally = self.tallies[message_id, starboard.emoji] = Tally(
+            starboard,
+            channel,
+            message_id,
+        )
+        while len(self.tallies) > self.capacity:
+            key, evicted = next(iter(self.tallies.items()))
+            if evicted.task:
+                break
+
+            del self.tallies[key]
+
+        return tally
+
+    def discard(self, message_id: int) -> None:
+        for key in [key for key in self.tallies if key[0] == message_id]:
+            tally = self.tallies.pop(key)
+            if tally.task:
+                tally.task.cancel()
+
+    def forget(self, guild_id: int) -> None:
+        for key, tally in list(self.tallies.items()):
+            if tally.starboard.guild_id == guild_id:
+                del self.tallies[key]
+                if tally.task:
+                    tally.task.cancel()
+
+    def react(self, tally: Tally, delta: int, *, flush: bool = True) -> None:
+        tally.apply(delta)
+        if flush and not tally.task:
+            tally.task = asyncio.create_task(self.flush_later(tally))
+
+    async def flush_later(self, tally: Tally) -> None:
+        await asyncio.sleep(self.delay)
+        tally.task = None
+        try:
+            await self.flush(tally)
+        except Exception:
+            log.exception("Failed to update the starboard entry for %s", tally.message_id)
+
+    async def resolve(self, tally: Tally) -> Optional[Message]:
+        if message := self.bot.get_message(tally.message_id):
+            tally.message = message
+            tally.count = tally.reactions(message)
+            return message
+
+        if tally.message and tally.count is not None:
+            return tally.message
+
+        try:
+            message = await tally.channel.fetch_message(tally.message_id)
+        except HTTPException:
+            return None
+
+        self.fetches += 1
+        tally.message = message
+        tally.count = tally.reactions(message)
+        return message
+
+    async def flush(self, tally: Tally) -> None:
+        async with tally.lock:
+            message = await self.resolve(tally)
+            if not message:
+                self.tallies.pop((tally.message_id, tally.starboard.emoji), None)
+                return
+
+            count = tally.count or 0
+            if count == tally.posted:
+                return
+
+            starboard = tally.starboard
+            if not tally.looked_up:
+                tally.star = await starboard.get_star(message)
+                tally.looked_up = True
+
+            if count >= starboard.threshold:
+                tally.star = await starboard.save_star(
+                    stars=count,
+                    message=message,
+                    star_message=tally.star,
+                )
+
+            elif tally.star:
+                await quietly_delete(tally.star)
+                await self.bot.db.execute(
+                    """
+                    DELETE FROM starboard_entry
+                    WHERE star_id = $1
+                    """,
+                    tally.star.id,
+                )
+                tally.star = None
+
+            tally.posted = count
+
+    async def close(self) -> None:
+        pending = [tally for tally in self.tallies.values() if tally.task]
+        for tally in pending:
+            if tally.task:
+                tally.task.cancel()
+                tally.task = None
+
+        await asyncio.gather(
+            *(self.flush(tally) for tally in pending),
+            return_exceptions=True,
+        )
@@ -1,6 +1,6 @@
 from logging import getLogger
 from sys import getsizeof
-from typing import TYPE_CHECKING, List, Optional, Tuple, TypedDict, cast
+from typing import List, Optional, Tuple, TypedDict, cast
 
 from discord import (
     Color,
@@ -10,7 +10,6 @@ from discord import (
     File,
     Guild,
     HTTPException,
-    Member,
     Message,
     PartialMessage,
     RawReactionActionEvent,
@@ -21,11 +20,11 @@ from discord import (
 )
 from discord.abc import GuildChannel
 from discord.ext.commands import Cog, Range, flag, group, has_permissions
-from discord.utils import find
 
 from main import Evict
 from tools import quietly_delete
 from core.client import Context, FlagConverter
+from .engine import StarboardEngine
 from tools.conversion import Status
 from tools.formatter import plural, shorten
 from managers.paginator import Paginator
@@ -152,7 +151,10 @@ class StarboardConfig:
             inline=False,
         )
 
-        return f"{self.emoji} **#{stars:,}**", embed, files
+        return self.header(stars), embed, files
+
+    def header(self, stars: int) -> str:
+        return f"{self.emoji} **#{stars:,}**"
 
     async def get_star(self, message: Message) -> Optional[PartialMessage]:
         if not self.channel:
@@ -182,21 +184,19 @@ class StarboardConfig:
         self,
         stars: int,
         message: Message,
+        star_message: Optional[PartialMessage | Message] = None,
     ) -> Optional[Message]:
         if not self.channel:
             return
 
-        content, embed, files = await self.build_entry(message, stars)
-
-        star_message = await self.get_star(message)
+        star_message = star_message or await self.get_star(message)
         if star_message:
             try:
-                star_message = await star_message.edit(content=content)
+                return await star_message.edit(content=self.header(stars))
             except HTTPException:
                 pass
-            else:
-                return star_message
 
+        content, embed, files = await self.build_entry(message, stars)
         star_message = await self.channel.send(
             content=content,
             embed=embed,
@@ -236,13 +236,6 @@ class StarboardConfig:
         return star_message
 
 
-if TYPE_CHECKING:
-
-    class CompleteStarboardConfig(StarboardConfig):
-        guild: Guild
-        channel: TextChannel
-
-
 class Flags(FlagConverter):
     threshold: Range[int, 1, 12] = flag(
         aliases=["limit"],
@@ -263,6 +256,10 @@ class Starboard(Cog):
 
     def __init__(self, bot: Evict):
         self.bot: Evict = bot
+        self.engine = StarboardEngine(bot)
+
+    async def cog_unload(self) -> None:
+        await self.engine.close()
 
     @group(
         aliases=["star", "board", "sb"],
@@ -316,6 +313,7 @@ class Starboard(Cog):
             flags.threshold,
             emoji,
         )
+        self.engine.forget(ctx.guild.id)
 
         return await ctx.approve(f"Added a starboard for {emoji} in {channel.mention}")
 
@@ -351,6 +349,8 @@ class Starboard(Cog):
                 f"A starboard for **{emoji}** in {channel.mention} doesn't exist!"
             )
 
+        self.engine.forget(ctx.guild.id)
+
         return await ctx.approve(
             f"Removed the starboard for {emoji} in {channel.mention}"
         )
@@ -379,6 +379,7 @@ class Starboard(Cog):
         if result == "DELETE 0":
             return await ctx.warn("No starboards exist for this server!")
 
+        self.engine.forget(ctx.guild.id)
         return await ctx.approve(
             f"Successfully  removed {plural(result, md='`'):starboard}"
         )
@@ -436,110 +437,49 @@ class Starboard(Cog):
 
     async def reaction_action(
         self,
-        fmt: str,
+        delta: int,
         payload: RawReactionActionEvent,
     ):
         guild = payload.guild_id and self.bot.get_guild(payload.guild_id)
         if not guild or guild.me.is_timed_out():
             return
 
-        channel = guild.get_channel_or_thread(payload.channel_id)
-        if not isinstance(channel, (TextChannel, Thread)):
-            return
-
-        starboard = await self.get_starboard(guild, str(payload.emoji))
-        if (
-            not starboard
-            or not starboard.channel
-            or starboard.channel == channel
-            or not starboard.channel.permissions_for(guild.me).send_messages
-            or not starboard.channel.permissions_for(guild.me).embed_links
-        ):
-            return
-
-        member = guild.get_member(payload.user_id)
-        if not member:
-            return
-
-        message = self.bot.get_message(payload.message_id)
-        if not message:
-            try:
-                message = await channel.fetch_message(payload.message_id)
-            except HTTPException:
+        emoji = str(payload.emoji)
+        tally = self.engine.get(payload.message_id, emoji)
+        if not tally:
+            channel = guild.get_channel_or_thread(payload.channel_id)
+            if not isinstance(channel, (TextChannel, Thread)):
                 return
 
-        lock = self.bot.redis.get_lock(f"starboard:{guild.id}")
-        async with lock:
-            method = getattr(self, f"{fmt}_message")
-
-            await method(
-                starboard,
-                channel=channel,
-                member=member,
-                message=message,
-            )
-
-    async def star_message(
-        self,
-        starboard: "CompleteStarboardConfig",
-        *,
-        channel: TextChannel | Thread,
-        member: Member,
-        message: Message,
-    ):
-        if channel.is_nsfw() and not starboard.channel.is_nsfw():
-            return
-
-        if message.author.id == member.id and not starboard.self_star:
-            return
-
-        reaction = find(
-            lambda reaction: str(reaction.emoji) == starboard.emoji,
-            message.reactions,
-        )
-        if not reaction or reaction.count < starboard.threshold:
-            return
-
-        await starboard.save_star(
-            stars=reaction.count,
-            message=message,
-        )
-
-    async def unstar_message(
-        self,
-        starboard: "CompleteStarboardConfig",
-        *,
-        channel: TextChannel | Thread,
-        member: Member,
-        message: Message,
-    ):
-        star_message = await starboard.get_star(message)
-        if not star_message:
-            return
+            starboard = await self.get_starboard(guild, emoji)
+            if (
+                not starboard
+                or not starboard.channel
+                or starboard.channel == channel
+                or not starboard.channel.permissions_for(guild.me).send_messages
+                or not starboard.channel.permissions_for(guild.me).embed_links
+                or (channel.is_nsfw() and not starboard.channel.is_nsfw())
+            ):
+                return
 
-        reaction = find(
-            lambda reaction: str(reaction.emoji) == starboard.emoji,
-            message.reactions,
-        )
-        if not reaction or reaction.count < starboard.threshold:
-            await quietly_delete(star_message)
+            tally = self.engine.track(starboard, channel, payload.message_id)
 
-            await self.bot.db.execute(
-                """
-                DELETE FROM starboard_entry
-                WHERE star_id = $1
-                """,
-                star_message.id,
-            )
+        if not guild.get_member(payload.user_id):
             return
 
-        await starboard.save_star(
-            stars=reaction.count,
-            message=message,
+        self.engine.react(
+            tally,
+            delta,
+            flush=not (
+                delta > 0
+                and payload.message_author_id == payload.user_id
+                and not tally.starboard.self_star
+            ),
         )
 
     @Cog.listener("on_guild_channel_delete")
     async def starboard_channel_delete(self, channel: GuildChannel):
+        self.engine.forget(channel.guild.id)
         await self.bot.db.execute(
             """
             DELETE FROM starboard
@@ -561,6 +501,7 @@ class Starboard(Cog):
 
     @Cog.listener("on_raw_reaction_clear")
     async def starboard_reaction_clear(self, payload: RawReactionClearEmojiEvent):
+        self.engine.discard(payload.message_id)
         entries = await self.bot.db.fetch(
             """
             DELETE FROM starboard_entry
@@ -591,8 +532,8 @@ class Starboard(Cog):
 
     @Cog.listener("on_raw_reaction_add")
     async def starboard_reaction_add(self, payload: RawReactionActionEvent):
-        await self.reaction_action("star", payload)
+        await self.reaction_action(1, payload)
 
     @Cog.listener("on_raw_reaction_remove")
     async def starboard_reaction_remove(self, payload: RawReactionActionEvent):
-        await self.reaction_action("unstar", payload)
+        await self.reaction_action(-1, payload)
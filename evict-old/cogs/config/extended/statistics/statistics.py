@@ -49,7 +49,7 @@ class Statistics(MixinMeta, metaclass=CompositeMetaClass):
     @loop(minutes=10)
     async def update_statistics(self) -> None:
         """
-        Update all statistic channels.
+        Update the statistic channels of guilds on this cluster.
         """
 
         records = await self.bot.db.fetch(
@@ -58,7 +58,10 @@ class Statistics(MixinMeta, metaclass=CompositeMetaClass):
             FROM counter
             WHERE last_update < NOW() - INTERVAL '10 minutes'
             AND (rate_limited_until IS NULL OR rate_limited_until < NOW())
-            """
+            AND (guild_id >> 22) % $1 = ANY($2::INTEGER[])
+            """,
+            self.bot.shard_count or 1,
+            self.bot.owned_shards,
         )
 
         scheduled_deletion: List[int] = []
@@ -144,10 +147,21 @@ class Statistics(MixinMeta, metaclass=CompositeMetaClass):
                 """
                 DELETE FROM counter
                 WHERE channel_id = ANY($1::BIGINT[])
+                AND (guild_id >> 22) % $2 = ANY($3::INTEGER[])
                 """,
                 scheduled_deletion,
+                self.bot.shard_count or 1,
+                self.bot.owned_shards,
             )
 
+    @update_statistics.before_loop
+    async def before_update_statistics(self) -> None:
+        """
+        Wait for the guild cache so missing channels aren't deleted early.
+        """
+
+        await self.bot.wait_until_ready()
+
     @group(
         aliases=["counter", "stats"],
         invoke_without_command=True,
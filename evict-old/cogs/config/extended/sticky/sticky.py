@@ -34,6 +34,7 @@ class Sticky(MixinMeta, metaclass=CompositeMetaClass):
                 message.channel,
                 TextChannel,
             )
+            or not self.bot.features.active("sticky", message.channel.id)
         ):
             return
 
@@ -81,6 +82,7 @@ class Sticky(MixinMeta, metaclass=CompositeMetaClass):
                 guild.id,
                 channel.id,
             )
+            await self.bot.features.refresh("sticky", guild.id)
         else:
             await self.bot.db.execute(
                 """
@@ -155,6 +157,7 @@ class Sticky(MixinMeta, metaclass=CompositeMetaClass):
                 "Your sticky message wasn't able to be sent!", codeblock(exc.text)
             )
 
+        await self.bot.features.refresh("sticky", ctx.guild.id)
         return await ctx.approve(
             f"Added {vowel(script.format)} sticky message to {channel.mention}",
         )
@@ -271,6 +274,7 @@ class Sticky(MixinMeta, metaclass=CompositeMetaClass):
         if not message_id:
             return await ctx.warn(f"{channel.mention} doesn't have a sticky message!")
 
+        await self.bot.features.refresh("sticky", ctx.guild.id)
         message = channel.get_partial_message(message_id)
         await quietly_delete(message)
 
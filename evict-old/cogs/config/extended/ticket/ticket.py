@@ -1,9 +1,7 @@
 import chat_exporter
 import secrets
-import os
 import json
 
-import discord
 import config
 import datetime
 import asyncio
@@ -14,6 +12,7 @@ from contextlib import suppress
 from secrets import token_urlsafe
 from typing import Annotated, Dict, List, Literal, Optional, TypedDict, cast, overload
 from logging import getLogger
+from pathlib import Path
 
 from discord import (
     ActionRow,
@@ -35,7 +34,7 @@ from discord import (
 from core.client import FlagConverter, Context as OriginalContext
 
 from discord.ui import View, Button, button
-from discord import Emoji, ComponentType
+from discord import Emoji
 from discord.utils import find
 from discord.components import Button as ButtonComponent
 from discord.ext.commands import group, has_permissions, Cog, flag, check, Range
@@ -47,7 +46,10 @@ from tools import CompositeMetaClass, MixinMeta
 
 from managers.paginator import Paginator
 
+from .transcript import Transcript
+
 log = getLogger("evict/ticket")
+TRANSCRIPTS = Path("/root/tickets")
 
 
 class Context(OriginalContext):
@@ -132,220 +134,13 @@ class Ticket(MixinMeta, metaclass=CompositeMetaClass):
     Create tickets for users to contact the staff.
     """
 
-    @staticmethod
-    def sanitize_data(data):
-        if isinstance(data, dict):
-            return {k: Ticket.sanitize_data(v) for k, v in data.items()}
-        elif isinstance(data, list):
-            return [Ticket.sanitize_data(item) for item in data]
-        elif isinstance(data, discord.PartialEmoji):
-            return str(data)
-        elif isinstance(data, discord.Emoji):
-            return str(data)
-        elif hasattr(data, 'id'):
-            return str(data.id)
-        elif hasattr(data, '__dict__'):
-            return str(data)
-        return data
-
-    async def get_buttons_data(self, channel):
-        messages = [message async for message in channel.history(limit=50)]
-        buttons_data = []
-
-        for message in messages:
-            if message.components:
-                for row in message.components:
-                    for component in row.children:
-                        if component.type == ComponentType.button:
-                            label = component.label if component.label else ""
-                            emoji_url = component.emoji.url if component.emoji else None
-
-                            buttons_data.append(
-                                {
-                                    "label": label or emoji_url,
-                                    "type": "button",
-                                    "style": str(component.style),
-                                    "custom_id": component.custom_id,
-                                    "url": (
-                                        component.url
-                                        if component.style == ButtonStyle.link
-                                        else None
-                                    ),
-                                }
-                            )
-
-        return buttons_data
-
-    async def export_transcript(self, ctx, channel: TextChannel):
+    async def export_transcript(self, ctx: Context, channel: Optional[TextChannel] = None):
         channel = channel or ctx.channel
         log_id = secrets.token_hex(8)
-        logs_directory = "/root/tickets"
-        file_path = f"{logs_directory}/{log_id}.json"
-        os.makedirs(logs_directory, exist_ok=True)
-
-        transcript_data = await self.generate_transcript(channel)
-
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(transcript_data, f, indent=4, ensure_ascii=False)
 
+        await Transcript(channel).write(TRANSCRIPTS / f"{log_id}.json")
         await ctx.send(f"Transcript saved: https://logs.evict.bot/{log_id}")
 
-    async def generate_transcript(self, channel: TextChannel):
-        transcript = {
-            "channel": self.get_channel_data(channel),
-            "embeds": [],
-            "mentions": [],
-            "messages": [],
-            "reactions": [],
-            "buttons": [],
-            "ticket": self.get_ticket_data(channel),
-            "users": [],
-            "attachments": [],
-        }
-
-        messages = [msg async for msg in channel.history(limit=None, oldest_first=True)]
-
-        for message in messages:
-            transcript["messages"].append(self.get_message_data(message))
-            transcript["embeds"].extend(self.get_embed_data(message))
-            transcript["mentions"].extend(self.get_mention_data(message))
-            transcript["reactions"].extend(self.get_reaction_data(message))
-            transcript["buttons"].extend(await self.get_buttons_data(channel))
-            transcript["attachments"].extend(self.get_attachment_data(message))
-
-        transcript["users"] = self.get_users_data(messages)
-
-        return transcript
-
-    def get_channel_data(self, channel):
-        return {
-            "created_at": channel.created_at.isoformat(),
-            "id": str(channel.id),
-            "name": channel.name,
-            "type": str(channel.type),
-        }
-
-    def get_ticket_data(self, channel):
-        return {
-            "channel_id": channel.id,
-            "closed_at": None,
-            "closed_by_id": None,
-            "guild_id": channel.guild.id,
-            "opened_by_id": None,
-            "reason": "Assistance requested",
-        }
-
-    def get_message_data(self, message):
-        return {
-            "id": message.id,
-            "author_id": message.author.id,
-            "channel_id": message.channel.id,
-            "content": message.content,
-            "created_at": message.created_at.isoformat(),
-            "edited_timestamp": (
-                message.edited_at.isoformat() if message.edited_at else None
-            ),
-            "pinned": message.pinned,
-            "timestamp": message.created_at.isoformat(),
-            "mentions": self.get_mention_data(message),
-        }
-
-    def get_embed_data(self, message):
-        embeds = []
-        for embed in message.embeds:
-            embed_data = {
-                "title": embed.title,
-                "description": embed.description,
-                "url": embed.url,
-                "color": embed.color.value if embed.color else None,
-                "message_id": message.id,
-                "author": {
-                    "name": embed.author.name if embed.author else None,
-                    "icon_url": embed.author.icon_url if embed.author else None,
-                    "url": embed.author.url if embed.author else None,
-                },
-                "footer": {
-                    "text": embed.footer.text if embed.footer else None,
-                    "icon_url": embed.footer.icon_url if embed.footer else None,
-                },
-                "timestamp": embed.timestamp.isoformat() if embed.timestamp else None,
-                "thumbnail": {"url": embed.thumbnail.url if embed.thumbnail else None},
-                "image": {"url": embed.image.url if embed.image else None},
-                "fields": [
-                    {"name": field.name, "value": field.value, "inline": field.inline}
-                    for field in embed.fields
-                ],
-            }
-            embeds.append(embed_data)
-        return embeds
-
-    def get_mention_data(self, message):
-        return [
-            {"message_id": message.id, "user_id": mention.id}
-            for mention in message.mentions
-        ]
-
-    def get_reaction_data(self, message):
-        reactions = []
-        for reaction in message.reactions:
-            # Get the emoji name properly
-            if isinstance(reaction.emoji, discord.Emoji):
-                name = reaction.emoji.name
-                image_url = str(reaction.emoji.url)
-            else:
-                # For Unicode emojis
-                name = reaction.emoji
-                image_url = None
-
-            reaction_data = {
-                "message_id": message.id,
-                "name": name,
-                "count": reaction.count,
-                "image": image_url,
-                "active": True,
-            }
-            reactions.append(reaction_data)
-        return reactions
-
-    def get_users_data(self, messages):
-        users = {}
-        for message in messages:
-            if message.author.id not in users:
-                users[message.author.id] = self.get_user_data(message.author, message)
-        return list(users.values())
-
-    def get_user_data(self, user, message):
-        return {
-            "accent_color": user.accent_color.value if user.accent_color else None,
-            "author_id": str(user.id),
-            "avatar": str(user.avatar.url) if user.avatar else None,
-            "banner": str(user.banner.url) if user.banner else None,
-            "bot": user.bot,
-            "channel_id": message.channel.id,
-            "content": "",
-            "created_at": user.created_at.isoformat(),
-            "discriminator": user.discriminator,
-            "edited_timestamp": None,
-            "global_name": user.global_name,
-            "id": user.id,
-            # "mfa_enabled": False,
-            "pinned": False,
-            "system": user.system,
-            "timestamp": message.created_at.isoformat(),
-            "username": user.name,
-        }
-
-    def get_attachment_data(self, message):
-        return [
-            {
-                "file_size": attachment.size,
-                "filename": attachment.filename,
-                "message_id": message.id,
-                "url": attachment.url,
-            }
-            for attachment in message.attachments
-        ]
-
     @overload
     async def get_ticket_message(
         self,
@@ -380,131 +175,6 @@ class Ticket(MixinMeta, metaclass=CompositeMetaClass):
         except HTTPException:
             return None
 
-    async def create_ticket_transcript(
-        self, channel: TextChannel, reason: str = "No reason provided"
-    ) -> dict:
-        transcript = {
-            "channel": {
-                "created_at": channel.created_at.isoformat(),
-                "id": str(channel.id),
-                "name": channel.name,
-                "type": str(channel.type),
-            },
-            "embeds": [],
-            "mentions": [],
-            "messages": [],
-            "reactions": [],
-            "buttons": [],
-            "ticket": {
-                "channel_id": channel.id,
-                "closed_at": None,
-                "closed_by_id": None,
-                "guild_id": channel.guild.id,
-                "opened_by_id": None,
-                "reason": reason,
-            },
-            "users": [],
-            "attachments": [],
-        }
-
-        messages = [msg async for msg in channel.history(limit=None, oldest_first=True)]
-        users_dict = {}
-
-        for message in messages:
-            message_data = {
-                "id": str(message.id),
-                "author_id": str(message.author.id),
-                "channel_id": str(message.channel.id),
-                "content": message.content,
-                "created_at": message.created_at.isoformat(),
-                "edited_timestamp": message.edited_at.isoformat() if message.edited_at else None,
-                "pinned": message.pinned,
-                "timestamp": message.created_at.isoformat(),
-            }
-            transcript["messages"].append(message_data)
-
-            if message.author.id not in users_dict:
-                users_dict[message.author.id] = {
-                    "accent_color": str(message.author.accent_color) if message.author.accent_color else None,
-                    "author_id": str(message.author.id),
-                    "avatar": str(message.author.avatar.url) if message.author.avatar else None,
-                    "banner": str(message.author.banner.url) if message.author.banner else None,
-                    "bot": message.author.bot,
-                    "channel_id": str(message.channel.id),
-                    "content": "",
-                    "created_at": message.author.created_at.isoformat(),
-                    "discriminator": message.author.discriminator,
-                    "edited_timestamp": None,
-                    "global_name": message.author.global_name,
-                    "id": str(message.author.id),
-                    "pinned": False,
-                    "system": message.author.system,
-                    "timestamp": message.created_at.isoformat(),
-                    "username": message.author.name,
-                }
-
-            for embed in message.embeds:
-                embed_data = {
-                    "title": embed.title,
-                    "description": embed.description,
-                    "url": embed.url,
-                    "color": str(embed.color.value) if embed.color else None,
-                    "message_id": str(message.id),
-                    "author": {
-                        "name": embed.author.name if embed.author else None,
-                        "icon_url": str(embed.author.icon_url) if embed.author and embed.author.icon_url else None,
-                        "url": str(embed.author.url) if embed.author and embed.author.url else None,
-                    },
-                    "footer": {
-                        "text": embed.footer.text if embed.footer else None,
-                        "icon_url": str(embed.footer.icon_url) if embed.footer and embed.footer.icon_url else None,
-                    },
-                    "timestamp": embed.timestamp.isoformat() if embed.timestamp else None,
-                    "thumbnail": {"url": str(embed.thumbnail.url) if embed.thumbnail else None},
-                    "image": {"url": str(embed.image.url) if embed.image else None},
-                    "fields": [
-                        {"name": field.name, "value": field.value, "inline": field.inline}
-                        for field in embed.fields
-                    ],
-                }
-                transcript["embeds"].append(embed_data)
-
-            for attachment in message.attachments:
-                attachment_data = {
-                    "file_size": attachment.size,
-                    "filename": attachment.filename,
-                    "message_id": str(message.id),
-                    "url": attachment.url,
-                }
-                transcript["attachments"].append(attachment_data)
-
-            for reaction in message.reactions:
-                reaction_data = {
-                    "message_id": str(message.id),
-                    "name": str(reaction.emoji),
-                    "count": reaction.count,
-                    "image": str(reaction.emoji.url) if hasattr(reaction.emoji, 'url') else None,
-                    "active": True,
-                }
-                transcript["reactions"].append(reaction_data)
-
-        transcript["users"] = list(users_dict.values())
-
-        if message.components:
-            for row in message.components:
-                for component in row.children:
-                    if component.type == ComponentType.button:
-                        button_data = {
-                            "label": component.label or "",
-                            "type": "button",
-                            "style": str(component.style),
-                            "custom_id": component.custom_id,
-                            "url": component.url if component.style == ButtonStyle.link else None,
-                        }
-                        transcript["buttons"].append(button_data)
-
-        return transcript
-
     async def get_channel_member_ids(self, channel: TextChannel) -> dict:
         member_ids = set()
 
@@ -1557,7 +1227,6 @@ class Ticket(MixinMeta, metaclass=CompositeMetaClass):
         Close an open ticket and forward the transcript.
         """
 
-        transcript = await self.create_ticket_transcript(ctx.channel, reason)
         member_ids = await self.get_channel_member_ids(ctx.channel)
         channel_config = await self.bot.db.fetchrow(
             """
@@ -1572,19 +1241,14 @@ class Ticket(MixinMeta, metaclass=CompositeMetaClass):
             return await ctx.warn(f"Ticket logs haven't been set, run ``{ctx.clean_prefix}ticket logs`` to set it.")
 
         log_id = secrets.token_hex(8)
-        logs_directory = "/root/tickets"
-        file_path = f"{logs_directory}/{log_id}.json"
-        member_ids_file_path = f"{logs_directory}/{log_id}_ids.json"
-
         logging_channel_id = channel_config["channel_id"]
         logging_channel = self.bot.get_channel(logging_channel_id)
 
-        os.makedirs(logs_directory, exist_ok=True)
-
-        await asyncio.gather(
-            self.write_json(file_path, transcript),
-            self.write_json(member_ids_file_path, member_ids)
-        )
+        async with ctx.typing():
+            await asyncio.gather(
+                Transcript(ctx.channel, reason).write(TRANSCRIPTS / f"{log_id}.json"),
+                self.write_json(TRANSCRIPTS / f"{log_id}_ids.json", member_ids),
+            )
 
         await ctx.approve(
             f"Your logs can be found here: https://evict.bot/tickets/{log_id}"
@@ -1612,9 +1276,12 @@ class Ticket(MixinMeta, metaclass=CompositeMetaClass):
         )
         await logging_channel.send(embed=embed)
 
-    async def write_json(self, path, data):
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+    async def write_json(self, path: Path, data):
+        def write():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+        await asyncio.to_thread(write)
 
     @ticket.command(name="setup")
     @has_permissions(manage_channels=True)
@@ -0,0 +1,245 @@
+import asyncio
+import shutil
+from logging import getLogger
+from pathlib import Path
+from tempfile import TemporaryFile
+from typing import IO, Dict, Iterator, Set
+
+from discord import ButtonStyle, ComponentType, Message, TextChannel
+from discord.abc import User
+from orjson import dumps
+
+log = getLogger("evict/ticket")
+
+SECTIONS = (
+    "embeds",
+    "mentions",
+    "messages",
+    "reactions",
+    "buttons",
+    "users",
+    "attachments",
+)
+
+
+class Transcript:
+    """
+    A single pass transcript writer for ticket channels.
+
+    The channel history is walked once, oldest first, and every record
+    is written to a per-section spool as soon as its message arrives.
+    The spools are joined into the final document once the walk is done,
+    so memory stays flat regardless of how long the ticket ran.
+    """
+
+    def __init__(self, channel: TextChannel, reason: str = "No reason provided"):
+        self.channel = channel
+        self.reason = reason
+        self.authors: Set[int] = set()
+        self.spools: Dict[str, IO[bytes]] = {}
+        self.counts: Dict[str, int] = dict.fromkeys(SECTIONS, 0)
+
+    def __repr__(self) -> str:
+        return f"<Transcript channel={self.channel.id} messages={self.counts['messages']}>"
+
+    def emit(self, section: str, record: dict) -> None:
+        spool = self.spools[section]
+        if self.counts[section]:
+            spool.write(b",")
+
+        spool.write(dumps(record))
+        self.counts[section] += 1
+
+    def header(self) -> bytes:
+        channel = self.channel
+        return dumps(
+            {
+                "channel": {
+                    "created_at": channel.created_at.isoformat(),
+                    "id": str(channel.id),
+                    "name": channel.name,
+                    "type": str(channel.type),
+                },
+                "ticket": {
+                    "channel_id": channel.id,
+                    "closed_at": None,
+                    "closed_by_id": None,
+                    "guild_id": channel.guild.id,
+                    "opened_by_id": None,
+                    "reason": self.reason,
+                },
+            }
+        )
+
+    def author(self, user: User, message: Message) -> None:
+        if user.id in self.authors:
+            return
+
+        self.authors.add(user.id)
+        self.emit(
+            "users",
+            {
+                "accent_color": str(user.accent_color) if user.accent_color else None,
+                "author_id": str(user.id),
+                "avatar": str(user.avatar.url) if user.avatar else None,
+                "banner": str(user.banner.url) if user.banner else None,
+                "bot": user.bot,
+                "channel_id": str(message.channel.id),
+                "content": "",
+                "created_at": user.created_at.isoformat(),
+                "discriminator": user.discriminator,
+                "edited_timestamp": None,
+                "global_name": user.global_name,
+                "id": str(user.id),
+                "pinned": False,
+                "system": user.system,
+                "timestamp": message.created_at.isoformat(),
+                "username": user.name,
+            },
+        )
+
+    def buttons(self, message: Message) -> Iterator[dict]:
+        for row in message.components:
+            for component in getattr(row, "children", ()):
+                if component.type != ComponentType.button:
+                    continue
+
+                yield {
+                    "label": component.label
+                    or (str(component.emoji.url) if component.emoji else ""),
+                    "type": "button",
+                    "style": str(component.style),
+                    "custom_id": component.custom_id,
+                    "url": component.url if component.style == ButtonStyle.link else None,
+                    "message_id": str(message.id),
+                }
+
+    def add(self, message: Message) -> None:
+        message_id = str(message.id)
+        self.author(message.author, message)
+        self.emit(
+            "messages",
+            {
+                "id": message_id,
+                "author_id": str(message.author.id),
+                "channel_id": str(message.channel.id),
+                "content": message.content,
+                "created_at": message.created_at.isoformat(),
+                "edited_timestamp": (
+                    message.edited_at.isoformat() if message.edited_at else None
+                ),
+                "pinned": message.pinned,
+                "timestamp": message.created_at.isoformat(),
+            },
+        )
+
+        for mention in message.mentions:
+            self.emit(
+                "mentions",
+                {"message_id": message_id, "user_id": str(mention.id)},
+            )
+
+        for embed in message.embeds:
+            self.emit(
+                "embeds",
+                {
+                    "title": embed.title,
+                    "description": embed.description,
+                    "url": embed.url,
+                    "color": str(embed.color.value) if embed.color else None,
+                    "message_id": message_id,
+                    "author": {
+                        "name": embed.author.name,
+                        "icon_url": embed.author.icon_url,
+                        "url": embed.author.url,
+                    },
+                    "footer": {
+                        "text": embed.footer.text,
+                        "icon_url": embed.footer.icon_url,
+                    },
+                    "timestamp": (
+                        embed.timestamp.isoformat() if embed.timestamp else None
+                    ),
+                    "thumbnail": {"url": embed.thumbnail.url},
+                    "image": {"url": embed.image.url},
+                    "fields": [
+                        {"name": field.name, "value": field.value, "inline": field.inline}
+                        for field in embed.fields
+                    ],
+                },
+            )
+
+        for attachment in message.attachments:
+            self.emit(
+                "attachments",
+                {
+                    "file_size": attachment.size,
+                    "filename": attachment.filename,
+                    "message_id": message_id,
+                    "url": attachment.url,
+                },
+            )
+
+        for reaction in message.reactions:
+            url = getattr(reaction.emoji, "url", None)
+            self.emit(
+                "reactions",
+                {
+                    "message_id": message_id,
+                    "name": getattr(reaction.emoji, "name", None) or str(reaction.emoji),
+                    "count": reaction.count,
+                    "image": str(url) if url else None,
+                    "active": True,
+                },
+            )
+
+        for button in self.buttons(message):
+            self.emit("buttons", button)
+
+    def assemble(self, destination: IO[bytes]) -> None:
+        header = self.header()
+        destination.write(header[:-1])
+        for section in SECTIONS:
+            spool = self.spools[section]
+            spool.seek(0)
+            destination.write(b',"%s":[' % section.encode())
+            shutil.copyfileobj(spool, destination)
+            destination.write(b"]")
+
+        destination.write(b"}")
+
+    async def write(self, destination: Path | IO[bytes]) -> int:
+        """
+        Walk the channel history and write the transcript to a path or buffer.
+        Returns the number of messages written.
+        """
+
+        self.spools = {section: TemporaryFile("w+b") for section in SECTIONS}
+        try:
+            async for message in self.channel.history(limit=None, oldest_first=True):
+                self.add(message)
+
+            if isinstance(destination, Path):
+                await asyncio.to_thread(self.save, destination)
+            else:
+                await asyncio.to_thread(self.assemble, destination)
+        finally:
+            for spool in self.spools.values():
+                spool.close()
+
+            self.spools = {}
+
+        log.debug("Wrote %r", self)
+        return self.counts["messages"]
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        part = path.with_suffix(".part")
+        try:
+            with open(part, "wb") as file:
+                self.assemble(file)
+
+            part.replace(path)
+        except BaseException:
+            part.unlink(missing_ok=True)
+            raise
@@ -48,7 +48,10 @@ class Timer(MixinMeta, metaclass=CompositeMetaClass):
             SELECT *
             FROM timer.message
             WHERE next_trigger < NOW()
-            """
+            AND (guild_id >> 22) % $1 = ANY($2::INTEGER[])
+            """,
+            self.bot.shard_count or 1,
+            self.bot.owned_shards,
         )
 
         scheduled_deletion: List[int] = []
@@ -106,7 +109,10 @@ class Timer(MixinMeta, metaclass=CompositeMetaClass):
             SELECT *
             FROM timer.purge
             WHERE next_trigger < NOW()
-            """
+            AND (guild_id >> 22) % $1 = ANY($2::INTEGER[])
+            """,
+            self.bot.shard_count or 1,
+            self.bot.owned_shards,
         )
 
         scheduled_deletion: List[int] = []
@@ -22,6 +22,9 @@ class Reaction(MixinMeta, metaclass=CompositeMetaClass):
         Automatically react to a trigger.
         """
 
+        if not ctx.guild or not self.bot.features.active("reaction_trigger", ctx.guild.id):
+            return
+
         reactions = cast(
             List[str],
             await self.bot.db.fetchval(
@@ -40,7 +43,7 @@ class Reaction(MixinMeta, metaclass=CompositeMetaClass):
             return
 
         KEY = xxh64_hexdigest(f"reactions:{ctx.author.id}")
-        if await self.bot.redis.ratelimited(KEY, 1, 3):
+        if await self.bot.ratelimits.limited(KEY, 1, 3, shared=True):
             return
 
         scheduled_deletion: List[str] = []
@@ -62,6 +65,7 @@ class Reaction(MixinMeta, metaclass=CompositeMetaClass):
                 ctx.guild.id,
                 scheduled_deletion,
             )
+            await self.bot.features.refresh("reaction_trigger", ctx.guild.id)
 
     @group(
         aliases=["react", "rt"],
@@ -135,6 +139,8 @@ class Reaction(MixinMeta, metaclass=CompositeMetaClass):
                 f"A reaction trigger with {emoji} for **{trigger}** already exists!"
             )
 
+        await self.bot.features.refresh("reaction_trigger", ctx.guild.id)
+
         return await ctx.approve(f"Now reacting with {emoji} for **{trigger}**")
 
     @reaction.command(
@@ -163,6 +169,8 @@ class Reaction(MixinMeta, metaclass=CompositeMetaClass):
             ctx.guild.id,
             trigger,
         )
+        await self.bot.features.refresh("reaction_trigger", ctx.guild.id)
+
         if result == "DELETE 0":
             return await ctx.warn(
                 f"No reaction trigger with {emoji} for **{trigger}** exists!"
@@ -191,6 +199,8 @@ class Reaction(MixinMeta, metaclass=CompositeMetaClass):
             """,
             ctx.guild.id,
         )
+        await self.bot.features.refresh("reaction_trigger", ctx.guild.id)
+
         if result == "DELETE 0":
             return await ctx.warn("No reaction triggers exist for this server!")
 
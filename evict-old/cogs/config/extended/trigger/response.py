@@ -56,6 +56,9 @@ class Response(MixinMeta, metaclass=CompositeMetaClass):
         if not isinstance(ctx.channel, (discord.TextChannel, discord.Thread)):
             return
 
+        if not self.bot.features.active("response_trigger", ctx.guild.id):
+            return
+
         reskin = await self.bot.db.fetchrow(
             """
             SELECT username, avatar 
@@ -85,7 +88,7 @@ class Response(MixinMeta, metaclass=CompositeMetaClass):
             return
 
         KEY = xxh64_hexdigest(f"responses:{ctx.author.id}")
-        if await self.bot.redis.ratelimited(KEY, 1, 4):
+        if await self.bot.ratelimits.limited(KEY, 1, 4, shared=True):
             return
 
         script = Script(
@@ -199,6 +202,8 @@ class Response(MixinMeta, metaclass=CompositeMetaClass):
                 f"A response trigger for **{trigger}** already exists!"
             )
 
+        await self.bot.features.refresh("response_trigger", ctx.guild.id)
+
         return await ctx.approve(
             f"Now responding with {vowel(script_obj.format)} message for **{trigger}**"
             + (
@@ -278,6 +283,8 @@ class Response(MixinMeta, metaclass=CompositeMetaClass):
             ctx.guild.id,
             trigger,
         )
+        await self.bot.features.refresh("response_trigger", ctx.guild.id)
+
         if result == "DELETE 0":
             return await ctx.warn(
                 f"A response trigger for **{trigger}** doesn't exist!"
@@ -349,6 +356,8 @@ class Response(MixinMeta, metaclass=CompositeMetaClass):
             """,
             ctx.guild.id,
         )
+        await self.bot.features.refresh("response_trigger", ctx.guild.id)
+
         if result == "DELETE 0":
             return await ctx.warn("No response triggers exist for this server!")
 
@@ -90,10 +90,11 @@ class Vanity(MixinMeta, metaclass=CompositeMetaClass):
                             TextChannel, guild.get_channel(record["channel_id"])
                         )
                     )
-                    and not await self.bot.redis.ratelimited(
+                    and not await self.bot.ratelimits.limited(
                          f"vanity:{guild.id}:{member.id}",
-                         limit=1,
-                         timespan=1800,
+                         1,
+                         1800,
+                         shared=True,
                      )
                 ):
                   
@@ -24,7 +24,9 @@ from discord.ext.commands import (
 )
 
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, cast
+
+from .ledger import Ledger
 
 class Yugioh(Cog):
     def __init__(self, bot: Evict):
@@ -44,6 +46,15 @@ class Yugioh(Cog):
         await self.session.close()
         self.card_drops.cancel()
 
+    @property
+    def ledger(self) -> Ledger:
+        """
+        The ledger owned by the economy cog.
+        """
+        from .economy import Economy
+
+        return cast(Economy, self.bot.get_cog("Economy")).ledger
+
     async def fetch_random_card(self, target_rarity: str) -> Optional[dict]:
         """
         Fetch a random card of specific rarity.
@@ -467,39 +478,35 @@ class Yugioh(Cog):
         
         value = values.get(card_data['rarity'], 100) * amount
 
-        if card_data['quantity'] == amount:
-            await self.bot.db.execute(
-                """
-                DELETE FROM user_cards 
-                WHERE user_id = $1 
-                AND card_name = $2
-                """,
-                ctx.author.id, 
-                card_name
-            )
-        
-        else:
-            await self.bot.db.execute(
+        async with self.ledger.transaction() as conn:
+            remaining = await conn.fetchval(
                 """
                 UPDATE user_cards 
                 SET quantity = quantity - $1 
                 WHERE user_id = $2 
                 AND card_name = $3
+                AND quantity >= $1
+                RETURNING quantity
                 """,
                 amount, 
                 ctx.author.id, 
                 card_name
             )
-                
-            await self.bot.db.execute(
-                """
-                UPDATE economy 
-                SET wallet = wallet + $1 
-                WHERE user_id = $2
-                """,
-                value, 
-                ctx.author.id
-            )
+            if remaining is None:
+                return await ctx.warn("You don't have enough copies of this card!")
+
+            if remaining == 0:
+                await conn.execute(
+                    """
+                    DELETE FROM user_cards 
+                    WHERE user_id = $1 
+                    AND card_name = $2
+                    """,
+                    ctx.author.id, 
+                    card_name
+                )
+
+            await self.ledger.credit(ctx.author.id, value, "card_sell", conn=conn)
 
         await ctx.approve(f"Successfully sold {amount}x {card_name} for {value:,} coins!")
 
@@ -639,27 +646,16 @@ class Yugioh(Cog):
         if not cards:
             return await ctx.warn("Failed to generate cards! Please try again.")
             
-        await self.bot.db.execute(
-                    """
-                    UPDATE economy 
-                    SET wallet = wallet - $1 
-                    WHERE user_id = $2
-                    """,
-                    pack['price'], 
-                    ctx.author.id
-                )
-                
-        await self.bot.db.execute(
-                    """
-                    INSERT INTO user_transactions (user_id, type, amount, created_at)
-                    VALUES ($1, $2, $3, CURRENT_TIMESTAMP)
-                    """,
-                    ctx.author.id, 
-                    f"card_pack_{pack_name.lower().replace(' ', '_')}", -pack['price']
-                )
-                
-        for card, rarity in cards:
-            await self.bot.db.execute(
+        async with self.ledger.transaction() as conn:
+            await self.ledger.debit(
+                ctx.author.id,
+                pack['price'],
+                f"card_pack_{pack_name.lower().replace(' ', '_')}",
+                conn=conn,
+            )
+
+            for card, rarity in cards:
+                await conn.execute(
                     """
                     INSERT INTO user_cards (user_id, card_id, quantity)
                     VALUES ($1, $2, 1)
@@ -906,41 +902,39 @@ class Yugioh(Cog):
         if balance < listing['price']:
             return await ctx.warn(f"You need {listing['price']:,} coins to buy this card!")
             
-        async with self.bot.db.acquire() as conn:
-            async with conn.transaction():
-                await conn.execute(
-                    """DELETE FROM card_market WHERE listing_id = $1""",
-                    listing_id
-                )
-                
-                card_data = await conn.fetchrow(
-                    """SELECT * FROM user_cards 
-                    WHERE user_id = $1 AND card_id = $2""",
-                    listing['seller_id'], listing['card_id']
-                )
-                
-                await conn.execute(
-                    """INSERT INTO user_cards (user_id, card_id, card_name, rarity, quantity)
-                    VALUES ($1, $2, $3, $4, 1)
-                    ON CONFLICT (user_id, card_id) 
-                    DO UPDATE SET quantity = user_cards.quantity + 1""",
-                    ctx.author.id, card_data['card_id'], 
-                    card_data['card_name'], card_data['rarity']
-                )
-                
-                await conn.execute(
-                    """UPDATE economy 
-                    SET wallet = wallet - $1 
-                    WHERE user_id = $2""",
-                    listing['price'], ctx.author.id
-                )
-                
-                await conn.execute(
-                    """UPDATE economy 
-                    SET wallet = wallet + $1 
-                    WHERE user_id = $2""",
-                    listing['price'], listing['seller_id']
-                )
+        async with self.ledger.transaction() as conn:
+            claimed = await conn.fetchval(
+                """DELETE FROM card_market WHERE listing_id = $1
+                RETURNING listing_id""",
+                listing_id
+            )
+            if not claimed:
+                return await ctx.warn("This listing has already been sold!")
+
+            await self.ledger.transfer(
+                ctx.author.id,
+                listing['seller_id'],
+                listing['price'],
+                conn=conn,
+                log=False,
+            )
+            self.ledger.log(ctx.author.id, "card_market_buy", -listing['price'], conn=conn)
+            self.ledger.log(listing['seller_id'], "card_market_sell", listing['price'], conn=conn)
+
+            card_data = await conn.fetchrow(
+                """SELECT * FROM user_cards 
+                WHERE user_id = $1 AND card_id = $2""",
+                listing['seller_id'], listing['card_id']
+            )
+            
+            await conn.execute(
+                """INSERT INTO user_cards (user_id, card_id, card_name, rarity, quantity)
+                VALUES ($1, $2, $3, $4, 1)
+                ON CONFLICT (user_id, card_id) 
+                DO UPDATE SET quantity = user_cards.quantity + 1""",
+                ctx.author.id, card_data['card_id'], 
+                card_data['card_name'], card_data['rarity']
+            )
                 
         await ctx.approve(f"Successfully bought {card_data['card_name']} for {listing['price']:,} coins!")
 
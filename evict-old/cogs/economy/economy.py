@@ -14,8 +14,11 @@ from discord.ext.commands import max_concurrency, BucketType
 from discord import Message, Embed, Member, Interaction
 
 from core.client.context import Context
+from managers.paginator import Paginator
 from main import Evict
 
+from .ledger import InsufficientFunds, Ledger
+
 # def is_econ_allowed():
 #     async def predicate(ctx):
 #         is_allowed = await ctx.bot.db.fetchval(
@@ -39,6 +42,8 @@ def is_econ_allowed():
 class Economy(commands.Cog):
     def __init__(self, bot: Evict):
         self.bot = bot
+        self.ledger = Ledger(bot)
+        self.stakes: dict[int, list[tuple[int, int, Optional[dict]]]] = {}
         self.description = "Interact and play games with other users to earn coins and gems."
 
     async def eco_approve(self, ctx: Context, message: str) -> Message:
@@ -73,17 +78,111 @@ class Economy(commands.Cog):
         """
         Setup initial data like default shop items.
         """
+        await self.ledger.start()
         await self.setup_default_shop_items()
+        self.check_lottery.start()
 
     async def cog_unload(self):
         """
         Cleanup any active games or temporary data.
         """
+        self.check_lottery.cancel()
+        await self.ledger.close()
+
         pattern = "active_blackjack_games:*"
         keys = await self.bot.redis.keys(pattern)
         if keys:
             await self.bot.redis.delete(*keys)
 
+    @tasks.loop(minutes=1)
+    async def check_lottery(self):
+        """
+        Check if lottery should be drawn.
+        Every cluster runs this loop, so the draw is held under a Redis lock.
+        """
+        if not await self.lottery_due():
+            return
+
+        lock = self.bot.redis.get_lock("lottery:draw", timeout=300, blocking=False)
+        if not await lock.acquire():
+            return
+
+        try:
+            if await self.lottery_due():
+                await self.draw_lottery()
+        finally:
+            await lock.release()
+
+    @check_lottery.before_loop
+    async def before_check_lottery(self):
+        await self.bot.wait_until_ready()
+
+    async def lottery_due(self) -> bool:
+        next_draw = await self.bot.redis.get("lottery:next_draw")
+        if not next_draw:
+            return False
+
+        next_draw = datetime.fromtimestamp(float(next_draw), timezone.utc)
+        return datetime.now(timezone.utc) >= next_draw
+
+    async def draw_lottery(self):
+        """Draw the lottery and reward winner"""
+        total_tickets = await self.bot.redis.get("lottery:total_tickets")
+        if not total_tickets or int(total_tickets) == 0:
+            pipe = self.bot.redis.pipeline()
+            pipe.delete("lottery:total_tickets", "lottery:pot")
+            next_draw = datetime.now(timezone.utc) + timedelta(days=1)
+            pipe.set("lottery:next_draw", next_draw.timestamp())
+            await pipe.execute()
+            return
+            
+        total_tickets = int(total_tickets)
+        winning_ticket = random.randint(1, total_tickets)
+        pot = int(await self.bot.redis.get("lottery:pot") or 0)
+        
+        current_count = 0
+        async for key in self.bot.redis.scan_iter("lottery:tickets:*"):
+            user_tickets = int(await self.bot.redis.get(key))
+            current_count += user_tickets
+            
+            if current_count >= winning_ticket:
+                winner_id = int(key.split(":")[-1])
+                
+                async with self.ledger.transaction() as conn:
+                    await self.ledger.credit(winner_id, pot, conn=conn)
+                        
+                    await conn.execute(
+                        """INSERT INTO lottery_history 
+                        (user_id, pot_amount, total_tickets, winner_tickets, won_at)
+                        VALUES ($1, $2, $3, $4, CURRENT_TIMESTAMP)""",
+                        winner_id, pot, total_tickets, user_tickets
+                    )
+                
+                channel = self.bot.get_channel(1319467099969556542)
+                if channel:
+                    winner = self.bot.get_user(winner_id)
+                    if winner:
+                        embed = Embed(
+                            title="🎰 Lottery Winner!",
+                            description=(
+                                f"Congratulations to {winner.mention}!\n"
+                                f"They won {pot:,} coins with {user_tickets:,} tickets!\n"
+                                f"Winning chance was {(user_tickets/total_tickets)*100:.2f}%"
+                            ),
+                            color=discord.Color.gold()
+                        )
+                        await channel.send(embed=embed)
+                break
+                
+        pipe = self.bot.redis.pipeline()
+        pipe.delete("lottery:total_tickets", "lottery:pot")
+        next_draw = datetime.now(timezone.utc) + timedelta(days=1)
+        pipe.set("lottery:next_draw", next_draw.timestamp())
+        await pipe.execute()
+        
+        async for key in self.bot.redis.scan_iter("lottery:tickets:*"):
+            await self.bot.redis.delete(key)
+
     @staticmethod
     def calculate_multiplier(bombs: int, safe_revealed: int) -> float:
         """
@@ -99,32 +198,101 @@ class Economy(commands.Cog):
         """
         Returns (wallet, bank, gems).
         """
-        data = await self.bot.db.fetchrow(
-            """
-            SELECT wallet, bank, gems 
-            FROM economy 
-            WHERE user_id = $1
-            """, 
-            user_id
-        )
-        if not data:
-            return 0, 0, 0
-        return data['wallet'], data['bank'], data['gems']
+        return await self.ledger.balance(user_id)
 
     async def log_transaction(self, user_id: int, type: str, amount: int):
         """
-        Log a transaction for a user.
+        Queue a transaction log row for a user.
         """
-        await self.bot.db.execute(
-            """
-            INSERT INTO user_transactions 
-            (user_id, type, amount, created_at)
-            VALUES ($1, $2, $3, CURRENT_TIMESTAMP)
-            """,
-            user_id, 
-            type, 
-            amount
-        )
+        self.ledger.log(user_id, type, amount)
+
+    async def stake(self, ctx: Context, amount: int, user_id: Optional[int] = None) -> bool:
+        """
+        Take a bet out of the wallet before the game is played.
+        Unreleased stakes are refunded once the command finishes.
+        """
+        user_id = user_id or ctx.author.id
+        try:
+            await self.ledger.debit(user_id, amount)
+        except InsufficientFunds:
+            return False
+
+        self.stakes.setdefault(ctx.message.id, []).append((user_id, amount, None))
+        return True
+
+    async def stake_asset(self, ctx: Context, amount: int, asset: dict) -> bool:
+        """
+        Take a business balance or an item out as a bet.
+        The asset itself is returned if the stake is never released.
+        """
+        if asset["type"] == "business":
+            taken = await self.bot.db.fetchval(
+                """
+                UPDATE businesses
+                SET balance = balance - $3
+                WHERE business_id = $1
+                AND owner_id = $2
+                AND balance >= $3
+                RETURNING business_id
+                """,
+                asset["data"]["business_id"], ctx.author.id, amount
+            )
+        else:
+            taken = await self.bot.db.fetchval(
+                """
+                UPDATE user_items
+                SET quantity = quantity - 1
+                WHERE user_id = $1
+                AND item_id = $2
+                AND quantity > 0
+                RETURNING item_id
+                """,
+                ctx.author.id, asset["data"]["item_id"]
+            )
+
+        if taken is None:
+            return False
+
+        self.stakes.setdefault(ctx.message.id, []).append((ctx.author.id, amount, asset))
+        return True
+
+    async def refund(self, user_id: int, amount: int, asset: Optional[dict] = None) -> None:
+        """
+        Give an unreleased stake back in the form it was taken.
+        """
+        if asset is None:
+            await self.ledger.credit(user_id, amount)
+
+        elif asset["type"] == "business":
+            await self.bot.db.execute(
+                """
+                UPDATE businesses
+                SET balance = balance + $2
+                WHERE business_id = $1
+                """,
+                asset["data"]["business_id"], amount
+            )
+
+        else:
+            await self.bot.db.execute(
+                """
+                UPDATE user_items
+                SET quantity = quantity + 1
+                WHERE user_id = $1
+                AND item_id = $2
+                """,
+                user_id, asset["data"]["item_id"]
+            )
+
+    def release(self, ctx: Context) -> None:
+        """
+        Mark the stakes of a game as settled.
+        """
+        self.stakes.pop(ctx.message.id, None)
+
+    async def cog_after_invoke(self, ctx: Context) -> None:
+        for user_id, amount, asset in self.stakes.pop(ctx.message.id, []):
+            await self.refund(user_id, amount, asset)
 
     @commands.command(name="start", aliases=["register"])
     @is_econ_allowed()
@@ -149,15 +317,17 @@ class Economy(commands.Cog):
         starter_coins = 1000
         starter_bank_capacity = 10000
 
-        await self.bot.db.execute(
+        record = await self.bot.db.fetchrow(
             """
             INSERT INTO economy (user_id, wallet, bank_capacity) 
             VALUES ($1, $2, $3)
+            RETURNING user_id, wallet, bank
             """,
             ctx.author.id, 
             starter_coins, 
             starter_bank_capacity
         )
+        await self.ledger.track(record)
         
         await self.log_transaction(ctx.author.id, "account_created", starter_coins)
 
@@ -278,16 +448,7 @@ class Economy(commands.Cog):
         if amount > space_left:
             return await ctx.warn(f"Your bank only has space for {space_left:,} more coins")
 
-        await self.bot.db.execute(
-            """
-            UPDATE economy 
-            SET wallet = wallet - $1, bank = bank + $1 
-            WHERE user_id = $2
-            """,
-            amount, ctx.author.id
-        )
-        
-        await self.log_transaction(ctx.author.id, "deposit", amount)
+        await self.ledger.deposit(ctx.author.id, amount)
         
         await self.eco_bank(ctx, f"Deposited **{amount:,}** coins to your bank account.")
 
@@ -313,16 +474,7 @@ class Economy(commands.Cog):
         if amount > bank:
             return await ctx.warn( "You don't have enough coins in your bank")
 
-        await self.bot.db.execute(
-            """
-            UPDATE economy 
-            SET wallet = wallet + $1, bank = bank - $1 
-            WHERE user_id = $2
-            """,
-            amount, ctx.author.id
-        )
-        
-        await self.log_transaction(ctx.author.id, "withdraw", amount)
+        await self.ledger.withdraw(ctx.author.id, amount)
         
         await self.eco_bank(ctx, f"Withdrew **{amount:,}** coinss from your bank account.")
 
@@ -365,14 +517,16 @@ class Economy(commands.Cog):
         if not confirm:
             return await ctx.warn("Upgrade cancelled!")
 
-        await self.bot.db.execute(
-            """
-            UPDATE economy 
-            SET wallet = wallet - $1, gems = gems - $2, bank_capacity = $3 
-            WHERE user_id = $4
-            """,
-            upgrade_cost, gem_cost, new_capacity, ctx.author.id
-        )
+        async with self.ledger.transaction() as conn:
+            await self.ledger.purchase(ctx.author.id, upgrade_cost, gem_cost, conn=conn)
+            await conn.execute(
+                """
+                UPDATE economy 
+                SET bank_capacity = $1 
+                WHERE user_id = $2
+                """,
+                new_capacity, ctx.author.id
+            )
         
         await self.eco_bank(
             ctx, f"Upgraded your bank capacity to {new_capacity:,} coins!"
@@ -408,21 +562,28 @@ class Economy(commands.Cog):
         if bank <= 0:
             return await ctx.warn("You need to have coins in your bank to earn interest!")
 
-        interest_rate = 0.01
-        interest = int(bank * interest_rate)
-        if interest < 1:
-            interest = 1
-
-        await self.bot.db.execute(
+        record = await self.bot.db.fetchrow(
             """
             UPDATE economy 
-            SET bank = bank + $1, last_interest = $2 
-            WHERE user_id = $3
+            SET bank = economy.bank + claim.interest, last_interest = $2 
+            FROM (
+                SELECT user_id, GREATEST(FLOOR(bank * 0.01), 1)::BIGINT AS interest
+                FROM economy
+                WHERE user_id = $1
+            ) AS claim
+            WHERE economy.user_id = claim.user_id
+            AND economy.bank > 0
+            AND (economy.last_interest IS NULL OR economy.last_interest <= $2 - INTERVAL '1 day')
+            RETURNING economy.user_id, economy.wallet, economy.bank, claim.interest
             """,
-            interest, now, ctx.author.id
+            ctx.author.id, now
         )
+        if not record:
+            return await ctx.warn("You've already claimed your interest!")
+
+        await self.ledger.track(record)
         
-        await self.eco_bank(ctx, f"You earned {interest:,} coins in interest!")
+        await self.eco_bank(ctx, f"You earned {record['interest']:,} coins in interest!")
 
     @commands.command(name="transfer", aliases=["pay", "give"])
     @is_econ_allowed()
@@ -456,30 +617,7 @@ class Economy(commands.Cog):
         if not confirm:
             return await ctx.warn("Transfer cancelled!")
 
-        async with self.bot.db.acquire() as conn:
-            async with conn.transaction():
-                await conn.execute(
-                    """
-                    UPDATE economy 
-                    SET wallet = wallet - $1 
-                    WHERE user_id = $2
-                    """,
-                    amount, 
-                    ctx.author.id
-                )
-                await conn.execute(
-                    """
-                    INSERT INTO economy (user_id, wallet) 
-                    VALUES ($1, $2) 
-                    ON CONFLICT (user_id) 
-                    DO UPDATE SET wallet = economy.wallet + $2
-                    """,
-                    user.id, 
-                    amount
-                )
-        
-        await self.log_transaction(ctx.author.id, "transfer_sent", -amount)
-        await self.log_transaction(user.id, "transfer_received", amount)
+        await self.ledger.transfer(ctx.author.id, user.id, amount)
         
         await ctx.approve(f"Transferred {amount:,} coins to {user.name}")
 
@@ -528,7 +666,7 @@ class Economy(commands.Cog):
         if (current_streak + 1) % 7 == 0:
             gems = (current_streak + 1) // 7  
         
-        await self.bot.db.execute(
+        record = await self.bot.db.fetchrow(
             """
             INSERT INTO economy (user_id, wallet, gems, last_daily, daily_streak) 
             VALUES ($1, $2, $3, $4, $5) 
@@ -537,13 +675,20 @@ class Economy(commands.Cog):
                 gems = economy.gems + $3,
                 last_daily = $4,
                 daily_streak = $5
-                """,
+            WHERE economy.last_daily IS NULL
+            OR economy.last_daily <= $4 - INTERVAL '1 day'
+            RETURNING user_id, wallet, bank
+            """,
             ctx.author.id, 
             total_coins, 
             gems, 
             now, 
             current_streak + 1
         )
+        if not record:
+            return await ctx.warn("You've already claimed your daily reward!")
+
+        await self.ledger.track(record)
         
         await self.log_transaction(ctx.author.id, "daily", total_coins)
         
@@ -625,59 +770,51 @@ class Economy(commands.Cog):
                     "Your employer's business doesn't have enough funds to pay you!"
                 )
 
-        async with self.bot.db.acquire() as conn:
-            async with conn.transaction():
+        async with self.ledger.transaction() as conn:
+            await conn.execute(
+                """
+                UPDATE jobs 
+                SET job_experience = job_experience + 1,
+                last_work = $2
+                WHERE user_id = $1
+                """,
+                ctx.author.id, now
+            )
+
+            if job_data['employer_id']:
                 await conn.execute(
                     """
-                    UPDATE jobs 
-                    SET job_experience = job_experience + 1,
-                    last_work = $2
-                    WHERE user_id = $1
+                    UPDATE businesses 
+                    SET balance = balance - $1 
+                    WHERE owner_id = $2
                     """,
-                    ctx.author.id, now
+                    total_pay, job_data['employer_id']
                 )
-
-                if job_data['employer_id']:
-                    await conn.execute(
-                        """
-                        UPDATE businesses 
-                        SET balance = balance - $1 
-                        WHERE owner_id = $2
-                        """,
-                        total_pay, job_data['employer_id']
-                    )
-                    
-                    await conn.execute(
-                        """
-                        INSERT INTO business_stats (business_id, total_expenses)
-                        VALUES ($1, $2)
-                        ON CONFLICT (business_id) 
-                        DO UPDATE SET total_expenses = business_stats.total_expenses + $2
-                        """,
-                        contract['business_id'], total_pay
-                    )
                     
-                    await conn.execute(
-                        """
-                        INSERT INTO employee_stats (business_id, employee_id, work_count, total_earned)
-                        VALUES ($1, $2, 1, $3)
-                        ON CONFLICT (business_id, employee_id) 
-                        DO UPDATE SET 
-                            work_count = employee_stats.work_count + 1,
-                            total_earned = employee_stats.total_earned + $3
-                            """,
-                        contract['business_id'], ctx.author.id, total_pay
-                    )
-
                 await conn.execute(
                     """
-                    UPDATE economy 
-                    SET wallet = wallet + $1 
-                    WHERE user_id = $2
+                    INSERT INTO business_stats (business_id, total_expenses)
+                    VALUES ($1, $2)
+                    ON CONFLICT (business_id) 
+                    DO UPDATE SET total_expenses = business_stats.total_expenses + $2
                     """,
-                    total_pay, ctx.author.id
+                    contract['business_id'], total_pay
+                )
+                    
+                await conn.execute(
+                    """
+                    INSERT INTO employee_stats (business_id, employee_id, work_count, total_earned)
+                    VALUES ($1, $2, 1, $3)
+                    ON CONFLICT (business_id, employee_id) 
+                    DO UPDATE SET 
+                        work_count = employee_stats.work_count + 1,
+                        total_earned = employee_stats.total_earned + $3
+                        """,
+                    contract['business_id'], ctx.author.id, total_pay
                 )
 
+            await self.ledger.credit(ctx.author.id, total_pay, conn=conn)
+
         exp = await self.bot.db.fetchval(
             """
             SELECT job_experience 
@@ -863,14 +1000,7 @@ class Economy(commands.Cog):
                 """,
                 name, ctx.author.id
             )
-            await self.bot.db.execute(
-                """
-                UPDATE economy 
-                SET wallet = wallet - $1 
-                WHERE user_id = $2
-                """,
-                cost, ctx.author.id
-            )
+            await self.ledger.debit(ctx.author.id, cost)
         except Exception as e:
             if 'unique constraint' in str(e).lower():
                 return await ctx.warn("A business with that name already exists!")
@@ -1132,12 +1262,7 @@ class Economy(commands.Cog):
             business["business_id"]
         )
         
-        await self.bot.db.execute(
-            """UPDATE economy 
-            SET wallet = wallet - $1 
-            WHERE user_id = $2""",
-            amount, ctx.author.id
-        )
+        await self.ledger.debit(ctx.author.id, amount)
         
         await ctx.approve(f"Deposited {amount:,} coins into your business!")
 
@@ -1181,12 +1306,7 @@ class Economy(commands.Cog):
             amount, business["business_id"]
         )
         
-        await self.bot.db.execute(
-            """UPDATE economy 
-            SET wallet = wallet + $1 
-            WHERE user_id = $2""",
-            amount, ctx.author.id
-        )
+        await self.ledger.credit(ctx.author.id, amount)
         
         await ctx.approve(f"Withdrew {amount:,} coins from your business!")
 
@@ -1377,13 +1497,13 @@ class Economy(commands.Cog):
         )
 
         for i, business in enumerate(businesses, 1):
-            owner = ctx.guild.get_member(business["owner_id"])
-            if owner:
-                embed.add_field(
-                    name=f"#{i} {business['name']}",
-                    value=f"{config.EMOJIS.ECONOMY.CROWN} Owner: {owner.name}\n:euro: Balance: {business['balance']:,} coins",
-                    inline=False
-                )
+            owner = self.bot.get_user(business["owner_id"])
+            owner_name = owner.name if owner else business["owner_id"]
+            embed.add_field(
+                name=f"#{i} {business['name']}",
+                value=f"{config.EMOJIS.ECONOMY.CROWN} Owner: {owner_name}\n:euro: Balance: {business['balance']:,} coins",
+                inline=False
+            )
 
         await ctx.send(embed=embed)
 
@@ -2149,12 +2269,7 @@ class Economy(commands.Cog):
             ctx.author.id, item["item_id"], expires_at
         )
 
-        await self.bot.db.execute(
-            """UPDATE economy 
-            SET wallet = wallet - $1 
-            WHERE user_id = $2""",
-            item["price"], ctx.author.id
-        )
+        await self.ledger.debit(ctx.author.id, item["price"])
 
         await ctx.approve(f"Purchased {item['name']}!")
 
@@ -2789,9 +2904,8 @@ class Economy(commands.Cog):
         if win_streak > 3:  
             base_chance *= 0.8  
 
-        wallet, _, _ = await self.get_balance(ctx.author.id)
-        if amount > wallet:
-            return await ctx.warn( "You don't have enough coins!")
+        if not await self.stake(ctx, amount):
+            return await ctx.warn("You don't have enough coins!")
 
         effects = await self.get_active_effects(ctx.author.id)
         luck_boost = effects.get('gambling_luck', {'value': 1.0})['value']
@@ -2823,37 +2937,27 @@ class Economy(commands.Cog):
         choice = 'heads' if choice in ['h', 'heads'] else 'tails'
         won = choice == result
 
-        async with self.bot.db.acquire() as conn:
-            async with conn.transaction():
-                if won:
-                    win_amount = int(amount * win_multiplier)
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet + $1 
-                        WHERE user_id = $2""",
-                        win_amount - amount, ctx.author.id
+        async with self.ledger.transaction() as conn:
+            if won:
+                win_amount = int(amount * win_multiplier)
+                await self.ledger.credit(ctx.author.id, win_amount, conn=conn)
+                if win_multiplier > 2.0:
+                    await self.use_one_time_effect(
+                        ctx.author.id, 'next_gamble_multiplier'
                     )
-                    if win_multiplier > 2.0:
-                        await self.use_one_time_effect(
-                            ctx.author.id, 'next_gamble_multiplier'
-                        )
-                    await self.log_transaction(ctx.author.id, "gamble_win", win_amount)
+                await self.log_transaction(ctx.author.id, "gamble_win", win_amount)
                     
-                    await self.bot.redis.incr(f"win_streak:{ctx.author.id}")
-                    await self.bot.redis.expire(f"win_streak:{ctx.author.id}", 3600)  
-                else:
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet - $1 
-                        WHERE user_id = $2""",
-                        amount, ctx.author.id
-                    )
-                    await self.log_transaction(ctx.author.id, "gamble_loss", -amount)
-                    await self.bot.redis.delete(f"win_streak:{ctx.author.id}")
+                await self.bot.redis.incr(f"win_streak:{ctx.author.id}")
+                await self.bot.redis.expire(f"win_streak:{ctx.author.id}", 3600)  
+            else:
+                await self.log_transaction(ctx.author.id, "gamble_loss", -amount)
+                await self.bot.redis.delete(f"win_streak:{ctx.author.id}")
 
-                await self.bot.redis.incrby(f"daily_gambled:{ctx.author.id}", amount)
-                if daily_gambled == 0: 
-                    await self.bot.redis.expire(f"daily_gambled:{ctx.author.id}", 86400)  
+            await self.bot.redis.incrby(f"daily_gambled:{ctx.author.id}", amount)
+            if daily_gambled == 0: 
+                await self.bot.redis.expire(f"daily_gambled:{ctx.author.id}", 86400)  
+
+        self.release(ctx)
 
         embed.description = (
             f"The coin landed on **{result}**!\n\n"
@@ -2917,17 +3021,13 @@ class Economy(commands.Cog):
         if not wallet or wallet < amount:
             return await ctx.warn( "You don't have enough coins!")
 
-        async with self.bot.db.acquire() as conn:
-            async with conn.transaction():
-                await conn.execute(
-                    """UPDATE economy SET wallet = wallet - $1 WHERE user_id = $2""",
-                    amount, ctx.author.id
-                )
-                pipe = self.bot.redis.pipeline()
-                pipe.incrby(f"lottery:tickets:{ctx.author.id}", amount)
-                pipe.incrby("lottery:total_tickets", amount)
-                pipe.incrby("lottery:pot", amount)
-                await pipe.execute()
+        async with self.ledger.transaction() as conn:
+            await self.ledger.debit(ctx.author.id, amount, conn=conn)
+            pipe = self.bot.redis.pipeline()
+            pipe.incrby(f"lottery:tickets:{ctx.author.id}", amount)
+            pipe.incrby("lottery:total_tickets", amount)
+            pipe.incrby("lottery:pot", amount)
+            await pipe.execute()
 
         total_pot += amount
         total_tickets += amount
@@ -3089,9 +3189,8 @@ class Economy(commands.Cog):
         if win_streak > 3:
             base_chance *= 0.8
 
-        wallet, _, _ = await self.get_balance(ctx.author.id)
-        if amount > wallet:
-            return await ctx.warn( "You don't have enough coins!")
+        if not await self.stake(ctx, amount):
+            return await ctx.warn("You don't have enough coins!")
 
         effects = await self.get_active_effects(ctx.author.id)
         luck_boost = effects.get('gambling_luck', {'value': 1.0})['value']
@@ -3123,37 +3222,27 @@ class Economy(commands.Cog):
         won = random.random() < win_chance
         final_roll = random.randint(4, 6) if won else random.randint(1, 3)
 
-        async with self.bot.db.acquire() as conn:
-            async with conn.transaction():
-                if won:
-                    win_amount = int(amount * win_multiplier)
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet + $1 
-                        WHERE user_id = $2""",
-                        win_amount - amount, ctx.author.id
+        async with self.ledger.transaction() as conn:
+            if won:
+                win_amount = int(amount * win_multiplier)
+                await self.ledger.credit(ctx.author.id, win_amount, conn=conn)
+                if win_multiplier > 2.0:
+                    await self.use_one_time_effect(
+                        ctx.author.id, 'next_gamble_multiplier'
                     )
-                    if win_multiplier > 2.0:
-                        await self.use_one_time_effect(
-                            ctx.author.id, 'next_gamble_multiplier'
-                        )
-                    await self.log_transaction(ctx.author.id, "gamble_win", win_amount)
+                await self.log_transaction(ctx.author.id, "gamble_win", win_amount)
                     
-                    await self.bot.redis.incr(f"win_streak:{ctx.author.id}")
-                    await self.bot.redis.expire(f"win_streak:{ctx.author.id}", 3600)  
-                else:
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet - $1 
-                        WHERE user_id = $2""",
-                        amount, ctx.author.id
-                    )
-                    await self.log_transaction(ctx.author.id, "gamble_loss", -amount)
-                    await self.bot.redis.delete(f"win_streak:{ctx.author.id}")
+                await self.bot.redis.incr(f"win_streak:{ctx.author.id}")
+                await self.bot.redis.expire(f"win_streak:{ctx.author.id}", 3600)  
+            else:
+                await self.log_transaction(ctx.author.id, "gamble_loss", -amount)
+                await self.bot.redis.delete(f"win_streak:{ctx.author.id}")
 
-                await self.bot.redis.incrby(f"daily_gambled:{ctx.author.id}", amount)
-                if daily_gambled == 0: 
-                    await self.bot.redis.expire(f"daily_gambled:{ctx.author.id}", 86400)  
+            await self.bot.redis.incrby(f"daily_gambled:{ctx.author.id}", amount)
+            if daily_gambled == 0: 
+                await self.bot.redis.expire(f"daily_gambled:{ctx.author.id}", 86400)  
+
+        self.release(ctx)
 
         embed.description = (
             f"🎲 You rolled a **{final_roll}**!\n\n"
@@ -3200,9 +3289,8 @@ class Economy(commands.Cog):
         if win_streak > 3:
             base_chance *= 0.8
 
-        wallet, _, _ = await self.get_balance(ctx.author.id)
-        if amount > wallet:
-            return await ctx.warn( "You don't have enough coins!")
+        if not await self.stake(ctx, amount):
+            return await ctx.warn("You don't have enough coins!")
 
         effects = await self.get_active_effects(ctx.author.id)
         luck_boost = effects.get('gambling_luck', {'value': 1.0})['value']
@@ -3234,37 +3322,27 @@ class Economy(commands.Cog):
         won = random.random() < win_chance
         final_roll = number if won else random.choice([x for x in range(1, 7) if x != number])
 
-        async with self.bot.db.acquire() as conn:
-            async with conn.transaction():
-                if won:
-                    win_amount = int(amount * win_multiplier)
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet + $1 
-                        WHERE user_id = $2""",
-                        win_amount - amount, ctx.author.id
+        async with self.ledger.transaction() as conn:
+            if won:
+                win_amount = int(amount * win_multiplier)
+                await self.ledger.credit(ctx.author.id, win_amount, conn=conn)
+                if win_multiplier > 5.0:
+                    await self.use_one_time_effect(
+                        ctx.author.id, 'next_gamble_multiplier'
                     )
-                    if win_multiplier > 5.0:
-                        await self.use_one_time_effect(
-                            ctx.author.id, 'next_gamble_multiplier'
-                        )
-                    await self.log_transaction(ctx.author.id, "gamble_win", win_amount)
+                await self.log_transaction(ctx.author.id, "gamble_win", win_amount)
                     
-                    await self.bot.redis.incr(f"win_streak:{ctx.author.id}")
-                    await self.bot.redis.expire(f"win_streak:{ctx.author.id}", 3600)
-                else:
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet - $1 
-                        WHERE user_id = $2""",
-                        amount, ctx.author.id
-                    )
-                    await self.log_transaction(ctx.author.id, "gamble_loss", -amount)
-                    await self.bot.redis.delete(f"win_streak:{ctx.author.id}")
+                await self.bot.redis.incr(f"win_streak:{ctx.author.id}")
+                await self.bot.redis.expire(f"win_streak:{ctx.author.id}", 3600)
+            else:
+                await self.log_transaction(ctx.author.id, "gamble_loss", -amount)
+                await self.bot.redis.delete(f"win_streak:{ctx.author.id}")
 
-                await self.bot.redis.incrby(f"daily_gambled:{ctx.author.id}", amount)
-                if daily_gambled == 0:
-                    await self.bot.redis.expire(f"daily_gambled:{ctx.author.id}", 86400)
+            await self.bot.redis.incrby(f"daily_gambled:{ctx.author.id}", amount)
+            if daily_gambled == 0:
+                await self.bot.redis.expire(f"daily_gambled:{ctx.author.id}", 86400)
+
+        self.release(ctx)
 
         embed.description = (
             f"🎲 You rolled a **{final_roll}**!\n\n"
@@ -3308,9 +3386,8 @@ class Economy(commands.Cog):
         if win_streak > 3:
             base_chance *= 0.8
 
-        wallet, _, _ = await self.get_balance(ctx.author.id)
-        if amount > wallet:
-            return await ctx.warn( "You don't have enough coins!")
+        if not await self.stake(ctx, amount):
+            return await ctx.warn("You don't have enough coins!")
 
         effects = await self.get_active_effects(ctx.author.id)
         luck_boost = effects.get('gambling_luck', {'value': 1.0})['value']
@@ -3365,37 +3442,27 @@ class Economy(commands.Cog):
             final_roll = random.randint(2, 6) if first_roll == 1 else random.randint(1, 5)
             won = (bet_higher and first_roll == 1) or (not bet_higher and first_roll == 6)
 
-        async with self.bot.db.acquire() as conn:
-            async with conn.transaction():
-                if won:
-                    win_amount = int(amount * win_multiplier)
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet + $1 
-                        WHERE user_id = $2""",
-                        win_amount - amount, ctx.author.id
+        async with self.ledger.transaction() as conn:
+            if won:
+                win_amount = int(amount * win_multiplier)
+                await self.ledger.credit(ctx.author.id, win_amount, conn=conn)
+                if win_multiplier > 2.0:
+                    await self.use_one_time_effect(
+                        ctx.author.id, 'next_gamble_multiplier'
                     )
-                    if win_multiplier > 2.0:
-                        await self.use_one_time_effect(
-                            ctx.author.id, 'next_gamble_multiplier'
-                        )
-                    await self.log_transaction(ctx.author.id, "gamble_win", win_amount)
+                await self.log_transaction(ctx.author.id, "gamble_win", win_amount)
                     
-                    await self.bot.redis.incr(f"win_streak:{ctx.author.id}")
-                    await self.bot.redis.expire(f"win_streak:{ctx.author.id}", 3600)
-                else:
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet - $1 
-                        WHERE user_id = $2""",
-                        amount, ctx.author.id
-                    )
-                    await self.log_transaction(ctx.author.id, "gamble_loss", -amount)
-                    await self.bot.redis.delete(f"win_streak:{ctx.author.id}")
+                await self.bot.redis.incr(f"win_streak:{ctx.author.id}")
+                await self.bot.redis.expire(f"win_streak:{ctx.author.id}", 3600)
+            else:
+                await self.log_transaction(ctx.author.id, "gamble_loss", -amount)
+                await self.bot.redis.delete(f"win_streak:{ctx.author.id}")
 
-                await self.bot.redis.incrby(f"daily_gambled:{ctx.author.id}", amount)
-                if daily_gambled == 0:
-                    await self.bot.redis.expire(f"daily_gambled:{ctx.author.id}", 86400)
+            await self.bot.redis.incrby(f"daily_gambled:{ctx.author.id}", amount)
+            if daily_gambled == 0:
+                await self.bot.redis.expire(f"daily_gambled:{ctx.author.id}", 86400)
+
+        self.release(ctx)
 
         embed.description = (
             f"First roll: **{first_roll}**\n"
@@ -3441,9 +3508,8 @@ class Economy(commands.Cog):
         if win_streak > 3:
             win_chance *= 0.8
 
-        wallet, _, _ = await self.get_balance(ctx.author.id)
-        if amount > wallet:
-            return await ctx.warn( "You don't have enough coins!")
+        if not await self.stake(ctx, amount):
+            return await ctx.warn("You don't have enough coins!")
 
         effects = await self.get_active_effects(ctx.author.id)
         luck_boost = effects.get('gambling_luck', {'value': 1.0})['value']
@@ -3506,41 +3572,31 @@ class Economy(commands.Cog):
         if won:
             symbol = final_slots[0]
             win_amount = int(amount * symbols[symbol]["payout"] * win_multiplier)
-            async with self.bot.db.acquire() as conn:
-                async with conn.transaction():
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet + $1 
-                        WHERE user_id = $2""",
-                        win_amount - amount, ctx.author.id
+            async with self.ledger.transaction() as conn:
+                await self.ledger.credit(ctx.author.id, win_amount, conn=conn)
+                if win_multiplier > 2.0:
+                    await self.use_one_time_effect(
+                        ctx.author.id, 'next_gamble_multiplier'
                     )
-                    if win_multiplier > 2.0:
-                        await self.use_one_time_effect(
-                            ctx.author.id, 'next_gamble_multiplier'
-                        )
-                    await self.log_transaction(ctx.author.id, "gamble_win", win_amount)
+                await self.log_transaction(ctx.author.id, "gamble_win", win_amount)
                     
-                    await self.bot.redis.incr(f"win_streak:{ctx.author.id}")
-                    await self.bot.redis.expire(f"win_streak:{ctx.author.id}", 3600)
+                await self.bot.redis.incr(f"win_streak:{ctx.author.id}")
+                await self.bot.redis.expire(f"win_streak:{ctx.author.id}", 3600)
                     
-                    await self.bot.redis.incrby(f"daily_gambled:{ctx.author.id}", amount)
-                    if daily_gambled == 0:
-                        await self.bot.redis.expire(f"daily_gambled:{ctx.author.id}", 86400)
+                await self.bot.redis.incrby(f"daily_gambled:{ctx.author.id}", amount)
+                if daily_gambled == 0:
+                    await self.bot.redis.expire(f"daily_gambled:{ctx.author.id}", 86400)
+
+            self.release(ctx)
         else:
-            async with self.bot.db.acquire() as conn:
-                async with conn.transaction():
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet - $1 
-                        WHERE user_id = $2""",
-                        amount, ctx.author.id
-                    )
-                    await self.log_transaction(ctx.author.id, "gamble_loss", -amount)
-                    await self.bot.redis.delete(f"win_streak:{ctx.author.id}")
-                    
-                    await self.bot.redis.incrby(f"daily_gambled:{ctx.author.id}", amount)
-                    if daily_gambled == 0:
-                        await self.bot.redis.expire(f"daily_gambled:{ctx.author.id}", 86400)
+            await self.log_transaction(ctx.author.id, "gamble_loss", -amount)
+            await self.bot.redis.delete(f"win_streak:{ctx.author.id}")
+
+            await self.bot.redis.incrby(f"daily_gambled:{ctx.author.id}", amount)
+            if daily_gambled == 0:
+                await self.bot.redis.expire(f"daily_gambled:{ctx.author.id}", 86400)
+
+            self.release(ctx)
 
         embed.description += (
             f"\n\n🎉 You won **{win_amount:,}** coins! "
@@ -3577,10 +3633,6 @@ class Economy(commands.Cog):
                     f"Daily gambling limit reached! You can only gamble {remaining:,} more coins today."
                 )
 
-            wallet, _, _ = await self.get_balance(ctx.author.id)
-            if amount > wallet:
-                return await ctx.warn( "You don't have enough coins!")
-
             await self.bot.redis.incrby(f"daily_gambled:{ctx.author.id}", amount)
             if daily_gambled == 0:
                 await self.bot.redis.expire(f"daily_gambled:{ctx.author.id}", 86400)
@@ -3601,6 +3653,8 @@ class Economy(commands.Cog):
             )
             if not business:
                 return await ctx.warn( "You don't own this business!")
+            if not business["balance"]:
+                return await ctx.warn( "This business has no balance to bet!")
             bet_value = business["balance"]
             bet_type = {"type": "business", "data": business}
         
@@ -3618,25 +3672,29 @@ class Economy(commands.Cog):
             bet_type = {"type": "item", "data": item}
         
         else:
-            if amount.lower() == 'all':
-                wallet, _, _ = await self.get_balance(ctx.author.id)
-                amount = wallet
-            else:
-                try:
-                    amount = int(amount.replace(',', ''))
-                except ValueError:
-                    return await ctx.warn( "Please provide a valid amount or `all`")
+            if isinstance(amount, str):
+                if amount.lower() == 'all':
+                    wallet, _, _ = await self.get_balance(ctx.author.id)
+                    amount = wallet
+                else:
+                    try:
+                        amount = int(amount.replace(',', ''))
+                    except ValueError:
+                        return await ctx.warn( "Please provide a valid amount or `all`")
 
-            if amount < 100:
-                return await ctx.warn( "Minimum bet is 100 coins!")
+                if amount < 100:
+                    return await ctx.warn( "Minimum bet is 100 coins!")
 
-            wallet, _, _ = await self.get_balance(ctx.author.id)
-            if amount > wallet:
-                return await ctx.warn( "You don't have enough coins!")
-            
             bet_value = amount
             bet_type = {"type": "coins", "data": amount}
 
+        if bet_type["type"] != "coins":
+            if not await self.stake_asset(ctx, bet_value, bet_type):
+                return await ctx.warn("You no longer have that to bet!")
+
+        elif not await self.stake(ctx, bet_value):
+            return await ctx.warn("You don't have enough coins!")
+
         game = BlackjackGame(ctx, bet_value, bet_type, self) 
         game.players.append({
             "user": ctx.author,
@@ -3676,8 +3734,7 @@ class Economy(commands.Cog):
                         )
                     )
                     
-                    wallet, _, _ = await self.get_balance(user.id)
-                    if wallet >= bet_value:
+                    if await self.stake(ctx, bet_value, user.id):
                         game.players.append({
                             "user": user,
                             "bet": bet_value,
@@ -3745,64 +3802,6 @@ class Economy(commands.Cog):
         finally:
             await self.bot.redis.delete(active_games_key)
 
-    async def offer_insurance(self):
-        """Offer insurance to all players"""
-        embed = Embed(
-            title="🎰 Insurance Betting",
-            description=(
-                "Dealer shows an Ace! You can bet insurance.\n"
-                "Type `insurance` to place an insurance bet (half your original bet).\n"
-                "Insurance pays 2:1 if dealer has blackjack.\n"
-                "You have 15 seconds to decide."
-            ),
-            color=discord.Color.gold()
-        )
-        await self.ctx.send(embed=embed)
-
-        def check(m):
-            return (
-                m.channel == self.ctx.channel and
-                m.content.lower() == "insurance" and
-                any(p["user"].id == m.author.id for p in self.players)
-            )
-
-        try:
-            while True:
-                msg = await self.ctx.bot.wait_for('message', timeout=15.0, check=check)
-                player = next(p for p in self.players if p["user"].id == msg.author.id)
-                
-                if player["insurance"] == 0:
-                    insurance_amount = player["bet"] // 2
-                    wallet, _, _ = await self.get_balance(player["user"].id)
-                    
-                    if wallet >= insurance_amount:
-                        player["insurance"] = insurance_amount
-                        await self.ctx.approve(f"{player['user'].name} placed insurance bet of {insurance_amount:,} coins")
-                    else:
-                        await self.ctx.warn( f"{player['user'].name} doesn't have enough coins for insurance!")
-        except asyncio.TimeoutError:
-            pass
-
-        if self.calculate_hand(self.dealer_hand) == 21:
-            self.game_status = "ended"
-            await self.handle_insurance_payouts()
-            await self.end_game()
-
-    async def handle_insurance_payouts(self):
-        """Handle insurance bet payouts"""
-        async with self.ctx.bot.db.acquire() as conn:
-            async with conn.transaction():
-                for player in self.players:
-                    if player["insurance"] > 0:
-                        payout = player["insurance"] * 2
-                        await conn.execute(
-                            """UPDATE economy 
-                            SET wallet = wallet + $1 
-                            WHERE user_id = $2""",
-                            payout, player["user"].id
-                        )
-                        player["status"] = f"Insurance Won (+{payout:,})"
-
     async def get_active_effects(self, user_id: int) -> dict:
         """Get all active effects for a user"""
         effects = {}
@@ -3926,9 +3925,8 @@ class Economy(commands.Cog):
         if win_streak > 3:
             win_chance *= 0.8
 
-        wallet, _, _ = await self.get_balance(ctx.author.id)
-        if amount > wallet:
-            return await ctx.warn( "You don't have enough coins!")
+        if not await self.stake(ctx, amount):
+            return await ctx.warn("You don't have enough coins!")
 
         embed = Embed(title="🎰 Roulette", color=discord.Color.gold())
         embed.add_field(
@@ -3960,33 +3958,23 @@ class Economy(commands.Cog):
 
         final_color = numbers[final_number]["color"]
 
-        async with self.bot.db.acquire() as conn:
-            async with conn.transaction():
-                if won:
-                    win_amount = int(amount * win_multiplier)
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet + $1 
-                        WHERE user_id = $2""",
-                        win_amount - amount, ctx.author.id
+        async with self.ledger.transaction() as conn:
+            if won:
+                win_amount = int(amount * win_multiplier)
+                await self.ledger.credit(ctx.author.id, win_amount, conn=conn)
+                if win_multiplier > 2.0:
+                    await self.use_one_time_effect(
+                        ctx.author.id, 'next_gamble_multiplier'
                     )
-                    if win_multiplier > 2.0:
-                        await self.use_one_time_effect(
-                            ctx.author.id, 'next_gamble_multiplier'
-                        )
-                    await self.log_transaction(ctx.author.id, "gamble_win", win_amount)
+                await self.log_transaction(ctx.author.id, "gamble_win", win_amount)
                     
-                    await self.bot.redis.incr(f"win_streak:{ctx.author.id}")
-                    await self.bot.redis.expire(f"win_streak:{ctx.author.id}", 3600)
-                else:
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet - $1 
-                        WHERE user_id = $2""",
-                        amount, ctx.author.id
-                    )
-                    await self.log_transaction(ctx.author.id, "gamble_loss", -amount)
-                    await self.bot.redis.delete(f"win_streak:{ctx.author.id}")
+                await self.bot.redis.incr(f"win_streak:{ctx.author.id}")
+                await self.bot.redis.expire(f"win_streak:{ctx.author.id}", 3600)
+            else:
+                await self.log_transaction(ctx.author.id, "gamble_loss", -amount)
+                await self.bot.redis.delete(f"win_streak:{ctx.author.id}")
+
+        self.release(ctx)
 
         embed.description = (
             f"Ball landed on **{final_number}** {final_color}!\n\n"
@@ -4040,8 +4028,7 @@ class Economy(commands.Cog):
         
         base_crash_chance = 0.05 + (amount / 1_000_000) * 0.15
 
-        wallet, _, _ = await self.get_balance(ctx.author.id)
-        if amount > wallet:
+        if not await self.stake(ctx, amount):
             return await ctx.warn("You don't have enough coins!")
 
         class CrashView(discord.ui.View):
@@ -4092,43 +4079,33 @@ class Economy(commands.Cog):
         view.children[0].disabled = True
         await msg.edit(view=view)
 
-        async with self.bot.db.acquire() as conn:
-            async with conn.transaction():
-                if view.cashed_out:
-                    if multiplier >= 1.0:
-                        win_amount = min(int(amount * final_multiplier), 20000)
-                        if win_amount < amount:  
-                            win_amount = amount
-                    else:
-                        win_amount = int(amount * final_multiplier)
+        async with self.ledger.transaction() as conn:
+            if view.cashed_out:
+                if multiplier >= 1.0:
+                    win_amount = min(int(amount * final_multiplier), 20000)
+                    if win_amount < amount:  
+                        win_amount = amount
+                else:
+                    win_amount = int(amount * final_multiplier)
                         
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet + $1 
-                        WHERE user_id = $2""",
-                        win_amount - amount, ctx.author.id
+                await self.ledger.credit(ctx.author.id, win_amount, conn=conn)
+                if win_multiplier > 1.0:
+                    await self.use_one_time_effect(
+                        ctx.author.id, "next_gamble_multiplier"
                     )
-                    if win_multiplier > 1.0:
-                        await self.use_one_time_effect(
-                            ctx.author.id, "next_gamble_multiplier"
-                        )
-                    await self.log_transaction(ctx.author.id, "gamble_win", win_amount)
+                await self.log_transaction(ctx.author.id, "gamble_win", win_amount)
                     
-                    await self.bot.redis.incr(f"win_streak:{ctx.author.id}")
-                    await self.bot.redis.expire(f"win_streak:{ctx.author.id}", 3600)
-                else:
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet - $1 
-                        WHERE user_id = $2""",
-                        amount, ctx.author.id
-                    )
-                    await self.log_transaction(ctx.author.id, "gamble_loss", -amount)
-                    await self.bot.redis.delete(f"win_streak:{ctx.author.id}")
+                await self.bot.redis.incr(f"win_streak:{ctx.author.id}")
+                await self.bot.redis.expire(f"win_streak:{ctx.author.id}", 3600)
+            else:
+                await self.log_transaction(ctx.author.id, "gamble_loss", -amount)
+                await self.bot.redis.delete(f"win_streak:{ctx.author.id}")
 
-                await self.bot.redis.incrby(f"daily_gambled:{ctx.author.id}", amount)
-                if daily_gambled == 0:
-                    await self.bot.redis.expire(f"daily_gambled:{ctx.author.id}", 86400)
+            await self.bot.redis.incrby(f"daily_gambled:{ctx.author.id}", amount)
+            if daily_gambled == 0:
+                await self.bot.redis.expire(f"daily_gambled:{ctx.author.id}", 86400)
+
+        self.release(ctx)
 
         if view.cashed_out:
             embed.description = (
@@ -4174,9 +4151,8 @@ class Economy(commands.Cog):
         if amount < 100:
             return await ctx.warn( "Minimum bet is 100 coins!")
 
-        wallet, _, _ = await self.get_balance(ctx.author.id)
-        if amount > wallet:
-            return await ctx.warn( "You don't have enough coins!")
+        if not await self.stake(ctx, amount):
+            return await ctx.warn("You don't have enough coins!")
 
         effects = await self.get_active_effects(ctx.author.id)
         luck_boost = effects.get('gambling_luck', {'value': 1.0})['value']
@@ -4227,27 +4203,15 @@ class Economy(commands.Cog):
 
         final_multiplier = final_segment["multiplier"] * win_multiplier
 
-        async with self.bot.db.acquire() as conn:
-            async with conn.transaction():
-                win_amount = int(amount * final_multiplier)
-                if win_amount > amount:  
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet + $1 
-                        WHERE user_id = $2""",
-                        win_amount - amount, ctx.author.id
-                    )
-                    if win_multiplier > 1.0:
-                        await self.use_one_time_effect(
-                            ctx.author.id, 'next_gamble_multiplier'
-                        )
-                elif win_amount < amount:  
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet - $1 
-                        WHERE user_id = $2""",
-                        amount - win_amount, ctx.author.id
-                    )
+        async with self.ledger.transaction() as conn:
+            win_amount = int(amount * final_multiplier)
+            await self.ledger.credit(ctx.author.id, win_amount, conn=conn)
+            if win_amount > amount and win_multiplier > 1.0:
+                await self.use_one_time_effect(
+                    ctx.author.id, 'next_gamble_multiplier'
+                )
+
+        self.release(ctx)
 
         embed.description = (
             f"Landed on: {final_segment['emoji']}\n"
@@ -4299,8 +4263,7 @@ class Economy(commands.Cog):
                 f"Daily gambling limit reached! You can only gamble {remaining:,} more coins today."
             )
 
-        wallet, _, _ = await self.get_balance(ctx.author.id)
-        if amount > wallet:
+        if not await self.stake(ctx, amount):
             return await ctx.warn("You don't have enough coins!")
 
         effects = await self.get_active_effects(ctx.author.id)
@@ -4404,32 +4367,22 @@ class Economy(commands.Cog):
 
         win_amount = int(amount * current_multiplier * win_multiplier)
         
-        async with self.bot.db.acquire() as conn:
-            async with conn.transaction():
-                if win_amount > 0:
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet + $1 
-                        WHERE user_id = $2""",
-                        win_amount - amount, ctx.author.id
-                    )
-                    if win_multiplier > 1.0:
-                        await self.use_one_time_effect(
-                            ctx.author.id, 'next_gamble_multiplier'
-                        )
-                    await self.log_transaction(ctx.author.id, "gamble_win", win_amount)
-                else:
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet - $1 
-                        WHERE user_id = $2""",
-                        amount, ctx.author.id
+        async with self.ledger.transaction() as conn:
+            if win_amount > 0:
+                await self.ledger.credit(ctx.author.id, win_amount, conn=conn)
+                if win_multiplier > 1.0:
+                    await self.use_one_time_effect(
+                        ctx.author.id, 'next_gamble_multiplier'
                     )
-                    await self.log_transaction(ctx.author.id, "gamble_loss", -amount)
+                await self.log_transaction(ctx.author.id, "gamble_win", win_amount)
+            else:
+                await self.log_transaction(ctx.author.id, "gamble_loss", -amount)
 
-                await self.bot.redis.incrby(f"daily_gambled:{ctx.author.id}", amount)
-                if daily_gambled == 0:
-                    await self.bot.redis.expire(f"daily_gambled:{ctx.author.id}", 86400)
+            await self.bot.redis.incrby(f"daily_gambled:{ctx.author.id}", amount)
+            if daily_gambled == 0:
+                await self.bot.redis.expire(f"daily_gambled:{ctx.author.id}", 86400)
+
+        self.release(ctx)
 
         if view.value == "timeout":
             embed.description = "Game ended due to inactivity!"
@@ -4482,8 +4435,7 @@ class Economy(commands.Cog):
                 f"Daily gambling limit reached! You can only gamble {remaining:,} more coins today."
             )
 
-        wallet, _, _ = await self.get_balance(ctx.author.id)
-        if amount > wallet:
+        if not await self.stake(ctx, amount):
             return await ctx.warn("You don't have enough coins!")
 
         effects = await self.get_active_effects(ctx.author.id)
@@ -4553,36 +4505,26 @@ class Economy(commands.Cog):
             winning_horse = horses[winner]
             embed.description += f"\n\n🏆 **{winning_horse['name']}** wins!"
 
-        async with self.bot.db.acquire() as conn:
-            async with conn.transaction():
-                if won:
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet + $1 
-                        WHERE user_id = $2""",
-                        win_amount - amount, ctx.author.id
+        async with self.ledger.transaction() as conn:
+            if won:
+                await self.ledger.credit(ctx.author.id, win_amount, conn=conn)
+                if win_multiplier > 1.0:
+                    await self.use_one_time_effect(
+                        ctx.author.id, 'next_gamble_multiplier'
                     )
-                    if win_multiplier > 1.0:
-                        await self.use_one_time_effect(
-                            ctx.author.id, 'next_gamble_multiplier'
-                        )
-                    await self.log_transaction(ctx.author.id, "gamble_win", win_amount)
+                await self.log_transaction(ctx.author.id, "gamble_win", win_amount)
                     
-                    await self.bot.redis.incr(f"win_streak:{ctx.author.id}")
-                    await self.bot.redis.expire(f"win_streak:{ctx.author.id}", 3600)
-                else:
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet - $1 
-                        WHERE user_id = $2""",
-                        amount, ctx.author.id
-                    )
-                    await self.log_transaction(ctx.author.id, "gamble_loss", -amount)
-                    await self.bot.redis.delete(f"win_streak:{ctx.author.id}")
+                await self.bot.redis.incr(f"win_streak:{ctx.author.id}")
+                await self.bot.redis.expire(f"win_streak:{ctx.author.id}", 3600)
+            else:
+                await self.log_transaction(ctx.author.id, "gamble_loss", -amount)
+                await self.bot.redis.delete(f"win_streak:{ctx.author.id}")
 
-                await self.bot.redis.incrby(f"daily_gambled:{ctx.author.id}", amount)
-                if daily_gambled == 0:
-                    await self.bot.redis.expire(f"daily_gambled:{ctx.author.id}", 86400)
+            await self.bot.redis.incrby(f"daily_gambled:{ctx.author.id}", amount)
+            if daily_gambled == 0:
+                await self.bot.redis.expire(f"daily_gambled:{ctx.author.id}", 86400)
+
+        self.release(ctx)
 
         if won:
             embed.description += (
@@ -4630,8 +4572,7 @@ class Economy(commands.Cog):
                 f"Daily gambling limit reached! You can only gamble {remaining:,} more coins today."
             )
 
-        wallet, _, _ = await self.get_balance(ctx.author.id)
-        if amount > wallet:
+        if not await self.stake(ctx, amount):
             return await ctx.warn("You don't have enough coins!")
 
         effects = await self.get_active_effects(ctx.author.id)
@@ -4676,33 +4617,23 @@ class Economy(commands.Cog):
         win_chance = min(base_chance * luck_boost, 0.75)
         won = won and random.random() < win_chance
 
-        async with self.bot.db.acquire() as conn:
-            async with conn.transaction():
-                if won:
-                    win_amount = int(amount * multiplier * win_multiplier)
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet + $1 
-                        WHERE user_id = $2""",
-                        win_amount - amount, ctx.author.id
-                    )
-                    if win_multiplier > 1.0:
-                        await self.use_one_time_effect(
-                            ctx.author.id, 'next_gamble_multiplier'
-                        )
-                    await self.log_transaction(ctx.author.id, "gamble_win", win_amount)
-                else:
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet - $1 
-                        WHERE user_id = $2""",
-                        amount, ctx.author.id
+        async with self.ledger.transaction() as conn:
+            if won:
+                win_amount = int(amount * multiplier * win_multiplier)
+                await self.ledger.credit(ctx.author.id, win_amount, conn=conn)
+                if win_multiplier > 1.0:
+                    await self.use_one_time_effect(
+                        ctx.author.id, 'next_gamble_multiplier'
                     )
-                    await self.log_transaction(ctx.author.id, "gamble_loss", -amount)
+                await self.log_transaction(ctx.author.id, "gamble_win", win_amount)
+            else:
+                await self.log_transaction(ctx.author.id, "gamble_loss", -amount)
 
-                await self.bot.redis.incrby(f"daily_gambled:{ctx.author.id}", amount)
-                if daily_gambled == 0:
-                    await self.bot.redis.expire(f"daily_gambled:{ctx.author.id}", 86400)
+            await self.bot.redis.incrby(f"daily_gambled:{ctx.author.id}", amount)
+            if daily_gambled == 0:
+                await self.bot.redis.expire(f"daily_gambled:{ctx.author.id}", 86400)
+
+        self.release(ctx)
 
         dice_str = f"{dice_faces[dice1-1]} {dice_faces[dice2-1]}"
         embed.description = (
@@ -4751,8 +4682,7 @@ class Economy(commands.Cog):
                 f"Daily gambling limit reached! You can only gamble {remaining:,} more coins today."
             )
 
-        wallet, _, _ = await self.get_balance(ctx.author.id)
-        if amount > wallet:
+        if not await self.stake(ctx, amount):
             return await ctx.warn("You don't have enough coins!")
 
         effects = await self.get_active_effects(ctx.author.id)
@@ -4888,32 +4818,22 @@ class Economy(commands.Cog):
         else:
             win_amount = 0
 
-        async with self.bot.db.acquire() as conn:
-            async with conn.transaction():
-                if win_amount > 0:
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet + $1 
-                        WHERE user_id = $2""",
-                        win_amount - amount, ctx.author.id
+        async with self.ledger.transaction() as conn:
+            if win_amount > 0:
+                await self.ledger.credit(ctx.author.id, win_amount, conn=conn)
+                if win_multiplier > 1.0:
+                    await self.use_one_time_effect(
+                        ctx.author.id, 'next_gamble_multiplier'
                     )
-                    if win_multiplier > 1.0:
-                        await self.use_one_time_effect(
-                            ctx.author.id, 'next_gamble_multiplier'
-                        )
-                    await self.log_transaction(ctx.author.id, "gamble_win", win_amount)
-                else:
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet - $1 
-                        WHERE user_id = $2""",
-                        amount, ctx.author.id
-                    )
-                    await self.log_transaction(ctx.author.id, "gamble_loss", -amount)
+                await self.log_transaction(ctx.author.id, "gamble_win", win_amount)
+            else:
+                await self.log_transaction(ctx.author.id, "gamble_loss", -amount)
 
-                await self.bot.redis.incrby(f"daily_gambled:{ctx.author.id}", amount)
-                if daily_gambled == 0:
-                    await self.bot.redis.expire(f"daily_gambled:{ctx.author.id}", 86400)
+            await self.bot.redis.incrby(f"daily_gambled:{ctx.author.id}", amount)
+            if daily_gambled == 0:
+                await self.bot.redis.expire(f"daily_gambled:{ctx.author.id}", 86400)
+
+        self.release(ctx)
 
         if view.value == "timeout":
             embed.description = "Game ended due to inactivity!"
@@ -4963,8 +4883,7 @@ class Economy(commands.Cog):
                 f"Daily gambling limit reached! You can only gamble {remaining:,} more coins today."
             )
 
-        wallet, _, _ = await self.get_balance(ctx.author.id)
-        if amount > wallet:
+        if not await self.stake(ctx, amount):
             return await ctx.warn("You don't have enough coins!")
 
         effects = await self.get_active_effects(ctx.author.id)
@@ -5020,33 +4939,23 @@ class Economy(commands.Cog):
         win_chance = min(base_chance * luck_boost, 0.75)
         won = multiplier > 0 and random.random() < win_chance
 
-        async with self.bot.db.acquire() as conn:
-            async with conn.transaction():
-                if won:
-                    win_amount = int(amount * multiplier * win_multiplier)
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet + $1 
-                        WHERE user_id = $2""",
-                        win_amount - amount, ctx.author.id
-                    )
-                    if win_multiplier > 1.0:
-                        await self.use_one_time_effect(
-                            ctx.author.id, 'next_gamble_multiplier'
-                        )
-                    await self.log_transaction(ctx.author.id, "gamble_win", win_amount)
-                else:
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet - $1 
-                        WHERE user_id = $2""",
-                        amount, ctx.author.id
+        async with self.ledger.transaction() as conn:
+            if won:
+                win_amount = int(amount * multiplier * win_multiplier)
+                await self.ledger.credit(ctx.author.id, win_amount, conn=conn)
+                if win_multiplier > 1.0:
+                    await self.use_one_time_effect(
+                        ctx.author.id, 'next_gamble_multiplier'
                     )
-                    await self.log_transaction(ctx.author.id, "gamble_loss", -amount)
+                await self.log_transaction(ctx.author.id, "gamble_win", win_amount)
+            else:
+                await self.log_transaction(ctx.author.id, "gamble_loss", -amount)
 
-                await self.bot.redis.incrby(f"daily_gambled:{ctx.author.id}", amount)
-                if daily_gambled == 0:
-                    await self.bot.redis.expire(f"daily_gambled:{ctx.author.id}", 86400)
+            await self.bot.redis.incrby(f"daily_gambled:{ctx.author.id}", amount)
+            if daily_gambled == 0:
+                await self.bot.redis.expire(f"daily_gambled:{ctx.author.id}", 86400)
+
+        self.release(ctx)
 
         dice_str = ' '.join([dice_faces[r-1] for r in rolls])
         embed.description = (
@@ -5091,14 +5000,13 @@ class Economy(commands.Cog):
                 f"Daily gambling limit reached! You can only gamble {remaining:,} more coins today."
             )
 
-        wallet, _, _ = await self.get_balance(ctx.author.id)
-        if amount > wallet:
-            return await ctx.warn("You don't have enough coins!")
-
         game_key = f"highcard:{ctx.channel.id}"
         if await self.bot.redis.exists(game_key):
             return await ctx.warn("A game is already in progress in this channel!")
 
+        if not await self.stake(ctx, amount):
+            return await ctx.warn("You don't have enough coins!")
+
         await self.bot.redis.setex(game_key, 60, "active")
 
         embed = Embed(
@@ -5135,11 +5043,7 @@ class Economy(commands.Cog):
                         check=check
                     )
                     
-                    wallet = await self.bot.db.fetchval(
-                        """SELECT wallet FROM economy WHERE user_id = $1""",
-                        user.id
-                    )
-                    if not wallet or wallet < amount:
+                    if not await self.stake(ctx, amount, user.id):
                         await ctx.warn(f"{user.mention} doesn't have enough coins!", delete_after=5)
                         continue
 
@@ -5184,25 +5088,22 @@ class Economy(commands.Cog):
         winners = [c for c in cards if c['value'] == max_value]
         win_amount = amount * len(players) // len(winners)
 
-        async with self.bot.db.acquire() as conn:
-            async with conn.transaction():
-                for player_id in players:
-                    modifier = win_amount - amount if any(w['player'].id == player_id for w in winners) else -amount
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet + $1 
-                        WHERE user_id = $2""",
-                        modifier, player_id
-                    )
-                    await self.log_transaction(
-                        player_id,
-                        "gamble_win" if modifier > 0 else "gamble_loss",
-                        modifier
-                    )
+        self.release(ctx)
+        for player_id in players:
+            won = any(w['player'].id == player_id for w in winners)
+            if won:
+                await self.ledger.credit(player_id, win_amount)
+
+            modifier = win_amount - amount if won else -amount
+            await self.log_transaction(
+                player_id,
+                "gamble_win" if modifier > 0 else "gamble_loss",
+                modifier
+            )
 
-                    await self.bot.redis.incrby(f"daily_gambled:{player_id}", amount)
-                    if not daily_gambled:
-                        await self.bot.redis.expire(f"daily_gambled:{player_id}", 86400)
+            await self.bot.redis.incrby(f"daily_gambled:{player_id}", amount)
+            if not daily_gambled:
+                await self.bot.redis.expire(f"daily_gambled:{player_id}", 86400)
 
         results = []
         for card in cards:
@@ -5258,8 +5159,7 @@ class Economy(commands.Cog):
                 f"Daily gambling limit reached! You can only gamble {remaining:,} more coins today."
             )
 
-        wallet, _, _ = await self.get_balance(ctx.author.id)
-        if amount > wallet:
+        if not await self.stake(ctx, amount):
             return await ctx.warn("You don't have enough coins!")
 
         effects = await self.get_active_effects(ctx.author.id)
@@ -5426,32 +5326,22 @@ class Economy(commands.Cog):
             if win_multiplier > 1.0:
                 embed.description += f"\n🌟 Bonus multiplier: {win_multiplier}x"
 
-        async with self.bot.db.acquire() as conn:
-            async with conn.transaction():
-                if win_amount > 0:
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet + $1 
-                        WHERE user_id = $2""",
-                        win_amount - amount, ctx.author.id
-                    )
-                    if win_multiplier > 1.0:
-                        await self.use_one_time_effect(
-                            ctx.author.id, 'next_gamble_multiplier'
-                        )
-                    await self.log_transaction(ctx.author.id, "gamble_win", win_amount)
-                else:
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet - $1 
-                        WHERE user_id = $2""",
-                        amount, ctx.author.id
+        async with self.ledger.transaction() as conn:
+            if win_amount > 0:
+                await self.ledger.credit(ctx.author.id, win_amount, conn=conn)
+                if win_multiplier > 1.0:
+                    await self.use_one_time_effect(
+                        ctx.author.id, 'next_gamble_multiplier'
                     )
-                    await self.log_transaction(ctx.author.id, "gamble_loss", -amount)
+                await self.log_transaction(ctx.author.id, "gamble_win", win_amount)
+            else:
+                await self.log_transaction(ctx.author.id, "gamble_loss", -amount)
 
-                await self.bot.redis.incrby(f"daily_gambled:{ctx.author.id}", amount)
-                if daily_gambled == 0:
-                    await self.bot.redis.expire(f"daily_gambled:{ctx.author.id}", 86400)
+            await self.bot.redis.incrby(f"daily_gambled:{ctx.author.id}", amount)
+            if daily_gambled == 0:
+                await self.bot.redis.expire(f"daily_gambled:{ctx.author.id}", 86400)
+
+        self.release(ctx)
 
         embed.color = discord.Color.green() if win_amount > 0 else discord.Color.red()
         await msg.edit(embed=embed)
@@ -5545,6 +5435,11 @@ class Economy(commands.Cog):
         if not view.value:
             return await ctx.send(f"{opponent.name} declined the duel!")
 
+        if not await self.stake(ctx, amount):
+            return await ctx.warn("You don't have enough coins!")
+        if not await self.stake(ctx, amount, opponent.id):
+            return await ctx.warn(f"{opponent.name} doesn't have enough coins!")
+
         await self.bot.redis.setex(challenger_key, 300, "active")
         await self.bot.redis.setex(opponent_key, 300, "active")
 
@@ -5592,21 +5487,9 @@ class Economy(commands.Cog):
             if view.value:
                 winner = view.value
                 loser = opponent if winner == ctx.author else ctx.author
-                
-                async with self.bot.db.acquire() as conn:
-                    async with conn.transaction():
-                        await conn.execute(
-                            """UPDATE economy 
-                            SET wallet = wallet + $1 
-                            WHERE user_id = $2""",
-                            amount, winner.id
-                        )
-                        await conn.execute(
-                            """UPDATE economy 
-                            SET wallet = wallet - $1 
-                            WHERE user_id = $2""",
-                            amount, loser.id
-                        )
+
+                self.release(ctx)
+                await self.ledger.credit(winner.id, amount * 2)
 
                 embed.description = (
                     f"**{winner.name}** wins the duel!\n"
@@ -5639,9 +5522,8 @@ class Economy(commands.Cog):
         if entry_fee < 1000:
             return await ctx.warn( "Minimum entry fee is 1,000 coins!")
 
-        wallet, _, _ = await self.get_balance(ctx.author.id)
-        if entry_fee > wallet:
-            return await self.eco_warn("You don't have enough coins for the entry fee!")
+        if not await self.stake(ctx, entry_fee):
+            return await self.eco_warn(ctx, "You don't have enough coins for the entry fee!")
 
         class TournamentView(discord.ui.View):
             def __init__(self):
@@ -5660,16 +5542,15 @@ class Economy(commands.Cog):
                 user_key = f"active_duel:{interaction.user.id}"
                 tournament_key = f"active_tournament:{interaction.user.id}"
                 
-                if await self.bot.redis.exists(user_key):
+                if await ctx.bot.redis.exists(user_key):
                     return await interaction.response.send_message("You're in an active duel!", ephemeral=True)
-                if await self.bot.redis.exists(tournament_key):
+                if await ctx.bot.redis.exists(tournament_key):
                     return await interaction.response.send_message("You're already in a tournament!", ephemeral=True)
 
-                wallet, _, _ = await self.bot.get_cog('Economy').get_balance(interaction.user.id)
-                if wallet < entry_fee:
+                if not await ctx.cog.stake(ctx, entry_fee, interaction.user.id):
                     return await interaction.response.send_message("You don't have enough coins!", ephemeral=True)
 
-                await self.bot.redis.setex(f"active_tournament:{interaction.user.id}", 3600, "active")
+                await ctx.bot.redis.setex(f"active_tournament:{interaction.user.id}", 3600, "active")
                 
                 self.participants.append(interaction.user)
                 await interaction.response.send_message(f"You joined the tournament! ({len(self.participants)}/8)", ephemeral=True)
@@ -5779,14 +5660,8 @@ class Economy(commands.Cog):
             winner = winners[0]
             prize_pool = entry_fee * len(participants)
             
-            async with self.bot.db.acquire() as conn:
-                async with conn.transaction():
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet + $1 
-                        WHERE user_id = $2""",
-                        prize_pool, winner.id
-                    )
+            self.release(ctx)
+            await self.ledger.credit(winner.id, prize_pool)
 
             embed.description = (
                 f"🏆 Tournament Complete!\n\n"
@@ -5829,55 +5704,112 @@ class Economy(commands.Cog):
 
         return view.value
 
+    async def leaderboard_entries(
+        self,
+        ranked: list[tuple[int, int]],
+        offset: int = 0,
+    ) -> list[str]:
+        """
+        Format ranked (user_id, net worth) pairs, skipping unknown users.
+        """
+        records = await self.bot.db.fetch(
+            """
+            SELECT user_id, wallet, bank 
+            FROM economy 
+            WHERE user_id = ANY($1::BIGINT[])
+            """,
+            [user_id for user_id, _ in ranked]
+        )
+        balances = {record['user_id']: record for record in records}
+
+        entries = []
+        for rank, (user_id, total) in enumerate(ranked, offset + 1):
+            user = self.bot.get_user(user_id)
+            balance = balances.get(user_id)
+            if not user or not balance:
+                continue
+
+            entries.append(
+                f"{rank}. **{user.name}** - {total:,} coins\n"
+                f"└ Wallet: {balance['wallet']:,} | Bank: {balance['bank']:,}"
+            )
+
+        return entries
+
     @commands.group(name="leaderboard", aliases=["lb"], invoke_without_command=True)
     @is_econ_allowed()
     async def leaderboard(self, ctx: Context):
         """View the richest users"""
-        async with self.bot.db.acquire() as conn:
-            rows = await conn.fetch(
-                """SELECT user_id, wallet + bank as total, wallet, bank 
-                FROM economy 
-                ORDER BY (wallet + bank) DESC 
-                LIMIT 10"""
-            )
+        entries: list[str] = []
 
-        if not rows:
+        for offset in range(0, 500, 50):
+            ranked = await self.ledger.top(offset, 50)
+            if not ranked:
+                break
+
+            entries.extend(await self.leaderboard_entries(ranked, offset))
+            if len(entries) >= 100:
+                break
+
+        if not entries:
             return await ctx.warn("No users found!")
 
-        embed = Embed(
-            title="💰 Richest Users",
-            color=discord.Color.gold()
+        paginator = Paginator(
+            ctx,
+            entries=entries[:100],
+            embed=Embed(title="💰 Richest Users", color=discord.Color.gold()),
+            per_page=10
         )
+        return await paginator.start()
 
-        description = []
-        for i, row in enumerate(rows, 1):
-            user = self.bot.get_user(row['user_id'])
-            if not user:
-                continue
-            
-            total = row['total']
-            wallet = row['wallet']
-            bank = row['bank']
-            
-            description.append(
-                f"{i}. **{user.name}** - {total:,} coins\n"
-                f"└ Wallet: {wallet:,} | Bank: {bank:,}"
-            )
+    @leaderboard.command(name="server", aliases=["guild"])
+    @is_econ_allowed()
+    async def leaderboard_server(self, ctx: Context):
+        """View the richest users in this server"""
+        ranked = await self.ledger.scoped(
+            member.id for member in ctx.guild.members if not member.bot
+        )
+        if not ranked:
+            return await ctx.warn("No users found!")
 
-        embed.description = "\n".join(description)
-        await ctx.send(embed=embed)
+        entries = await self.leaderboard_entries(ranked[:100])
+        paginator = Paginator(
+            ctx,
+            entries=entries,
+            embed=Embed(title=f"💰 Richest Users in {ctx.guild.name}", color=discord.Color.gold()),
+            per_page=10
+        )
+        return await paginator.start()
+
+    @leaderboard.command(name="rank")
+    @is_econ_allowed()
+    async def leaderboard_rank(self, ctx: Context, user: Optional[Member] = None):
+        """View your or another user's global rank"""
+        target = user or ctx.author
+        result = await self.ledger.rank(target.id)
+        if not result:
+            return await ctx.warn(f"**{target.name}** doesn't have an economy account!")
+
+        rank, total = result
+        return await ctx.neutral(f"**{target.name}** is ranked **#{rank:,}** with **{total:,}** coins")
+
+    @leaderboard.command(name="rebuild")
+    @commands.is_owner()
+    async def leaderboard_rebuild(self, ctx: Context):
+        """Rebuild the leaderboard from the database"""
+        total = await self.ledger.rebuild()
+        return await ctx.approve(f"Rebuilt the leaderboard with **{total:,}** users")
 
     @leaderboard.command(name="business", aliases=["biz"])
     @is_econ_allowed()
     async def leaderboard_business(self, ctx: Context):
         """View the most profitable businesses"""
-        async with self.bot.db.acquire() as conn:
-            rows = await conn.fetch(
-                """SELECT * 
-                FROM businesses 
-                ORDER BY balance DESC 
-                LIMIT 10"""
-            )
+        rows = await self.bot.db.fetch(
+            """SELECT name, owner_id, balance, employee_limit 
+            FROM businesses 
+            ORDER BY balance DESC 
+            LIMIT 10"""
+        )
 
         if not rows:
             return await ctx.warn("No businesses found!")
@@ -5889,9 +5821,9 @@ class Economy(commands.Cog):
 
         description = []
         for i, row in enumerate(rows, 1):
-            owner = ctx.guild.get_member(row['owner_id'])
-            owner_name = owner.name if owner else "Unknown"
-            
+            owner = self.bot.get_user(row['owner_id'])
+            owner_name = owner.name if owner else row['owner_id']
+
             description.append(
                 f"{i}. **{row['name']}** (by {owner_name})\n"
                 f"└ Balance: {row['balance']:,} coins | "
@@ -5930,22 +5862,16 @@ class Economy(commands.Cog):
             weights=list(pet_data["rarity_weights"].values())
         )[0]
 
-        async with self.bot.db.acquire() as conn:
-            async with conn.transaction():
-                pet_id = await conn.fetchval(
-                    """INSERT INTO pets (
-                        owner_id, name, type, rarity
-                    ) VALUES ($1, $2, $3, $4)
-                    RETURNING pet_id""",
-                    ctx.author.id, name, pet_type, rarity
-                )
+        async with self.ledger.transaction() as conn:
+            pet_id = await conn.fetchval(
+                """INSERT INTO pets (
+                    owner_id, name, type, rarity
+                ) VALUES ($1, $2, $3, $4)
+                RETURNING pet_id""",
+                ctx.author.id, name, pet_type, rarity
+            )
                 
-                await conn.execute(
-                    """UPDATE economy 
-                    SET wallet = wallet - $1 
-                    WHERE user_id = $2""",
-                    base_cost, ctx.author.id
-                )
+            await self.ledger.debit(ctx.author.id, base_cost, conn=conn)
 
         embed = Embed(
             title="🎉 New Pet Adopted!",
@@ -6098,7 +6024,7 @@ class Economy(commands.Cog):
             new_hunger = min(100, pet["hunger"] + hunger_increase)
             xp_gain = random.randint(1, 3)
 
-            async with conn.transaction():
+            async with self.ledger.transaction(conn):
                 await conn.execute(
                     """UPDATE pets 
                     SET hunger = $1, xp = xp + $2 
@@ -6106,12 +6032,7 @@ class Economy(commands.Cog):
                     new_hunger, xp_gain, pet["pet_id"]
                 )
                 
-                await conn.execute(
-                    """UPDATE economy 
-                    SET wallet = wallet - $1 
-                    WHERE user_id = $2""",
-                    feed_cost, ctx.author.id
-                )
+                await self.ledger.debit(ctx.author.id, feed_cost, conn=conn)
 
         await ctx.approve(
             f"Fed **{pet['name']}**!\n"
@@ -6204,7 +6125,7 @@ class Economy(commands.Cog):
             new_happiness = max(0, pet["happiness"] - happiness_decrease)
             new_hunger = max(0, pet["hunger"] - hunger_decrease)
 
-            async with conn.transaction():
+            async with self.ledger.transaction(conn):
                 await conn.execute(
                     """UPDATE pets 
                     SET xp = $1, level = $2, happiness = $3, hunger = $4 
@@ -6212,12 +6133,7 @@ class Economy(commands.Cog):
                     new_xp, new_level, new_happiness, new_hunger, pet["pet_id"]
                 )
                 
-                await conn.execute(
-                    """UPDATE economy 
-                    SET wallet = wallet - $1 
-                    WHERE user_id = $2""",
-                    training_cost, ctx.author.id
-                )
+                await self.ledger.debit(ctx.author.id, training_cost, conn=conn)
 
         response = [f"Trained **{pet['name']}**!"]
         if level_up:
@@ -6323,7 +6239,7 @@ class Economy(commands.Cog):
             new_hunger = min(100, pet["hunger"] + item_data.get("hunger", 0))
             new_happiness = min(100, pet["happiness"] + item_data.get("happiness", 0))
 
-            async with conn.transaction():
+            async with self.ledger.transaction(conn):
                 await conn.execute(
                     """UPDATE pets 
                     SET hunger = $1, happiness = $2 
@@ -6331,12 +6247,7 @@ class Economy(commands.Cog):
                     new_hunger, new_happiness, pet["pet_id"]
                 )
                 
-                await conn.execute(
-                    """UPDATE economy 
-                    SET wallet = wallet - $1 
-                    WHERE user_id = $2""",
-                    item_data["cost"], ctx.author.id
-                )
+                await self.ledger.debit(ctx.author.id, item_data["cost"], conn=conn)
 
         response = [f"Gave {item_data['emoji']} **{item_data['name']}** to **{pet['name']}**!"]
         if "hunger" in item_data:
@@ -6563,7 +6474,7 @@ class Economy(commands.Cog):
             new_happiness = max(0, pet["happiness"] - happiness_decrease)
             new_hunger = max(0, pet["hunger"] - hunger_decrease)
 
-            async with conn.transaction():
+            async with self.ledger.transaction(conn):
                 await conn.execute(
                     """UPDATE pets 
                     SET xp = $1, level = $2, happiness = $3, hunger = $4 
@@ -6571,12 +6482,7 @@ class Economy(commands.Cog):
                     new_xp, new_level, new_happiness, new_hunger, pet["pet_id"]
                 )
                 
-                await conn.execute(
-                    """UPDATE economy 
-                    SET wallet = wallet + $1 
-                    WHERE user_id = $2""",
-                    coins, ctx.author.id
-                )
+                await self.ledger.credit(ctx.author.id, coins, conn=conn)
                 
                 await conn.execute(
                     """UPDATE pet_adventures 
@@ -6633,18 +6539,13 @@ class Economy(commands.Cog):
             if existing:
                 return await ctx.warn("You already have a pet with that name!")
 
-            async with conn.transaction():
+            async with self.ledger.transaction(conn):
                 await conn.execute(
                     """UPDATE pets SET name = $1 WHERE pet_id = $2""",
                     new_name, pet["pet_id"]
                 )
                 
-                await conn.execute(
-                    """UPDATE economy 
-                    SET wallet = wallet - $1 
-                    WHERE user_id = $2""",
-                    rename_cost, ctx.author.id
-                )
+                await self.ledger.debit(ctx.author.id, rename_cost, conn=conn)
 
         await ctx.approve(
             f"Renamed your pet from **{pet['name']}** to **{new_name}**!\n"
@@ -6745,10 +6646,6 @@ class Economy(commands.Cog):
             wallet, _, _ = await self.get_balance(ctx.author.id)
             if wallet < bet:
                 return await ctx.warn("You don't have enough coins!")
-                
-            opp_wallet, _, _ = await self.get_balance(opponent.id)
-            if opp_wallet < bet:
-                return await ctx.warn(f"{opponent.name} doesn't have enough coins!")
 
         async with self.bot.db.acquire() as conn:
             challenger_pet = await conn.fetchrow(
@@ -6817,6 +6714,12 @@ class Economy(commands.Cog):
             await msg.edit(content="Challenge declined!", embed=None, view=None)
             return
 
+        if bet > 0:
+            if not await self.stake(ctx, bet):
+                return await ctx.warn("You don't have enough coins!")
+            if not await self.stake(ctx, bet, opponent.id):
+                return await ctx.warn(f"{opponent.name} doesn't have enough coins!")
+
         battle = PetBattle(ctx, opponent, challenger_pet, opponent_pet, bet)
         await battle.start_battle(msg)
 
@@ -6887,7 +6790,7 @@ class Economy(commands.Cog):
                 suffix += 1
                 offspring_name = f"{base_name} {suffix}"
 
-            async with conn.transaction():
+            async with self.ledger.transaction(conn):
                 await conn.execute(
                     """INSERT INTO pets (
                         owner_id, name, type, rarity, 
@@ -6896,12 +6799,7 @@ class Economy(commands.Cog):
                     ctx.author.id, offspring_name, offspring_type, offspring_rarity
                 )
                 
-                await conn.execute(
-                    """UPDATE economy 
-                    SET wallet = wallet - $1 
-                    WHERE user_id = $2""",
-                    breed_cost, ctx.author.id
-                )
+                await self.ledger.debit(ctx.author.id, breed_cost, conn=conn)
 
         embed = Embed(
             title="🎉 New Pet Born!",
@@ -7086,7 +6984,7 @@ class Economy(commands.Cog):
                 await trade_msg.edit(content="Trade declined!", embed=None, view=None)
                 return
 
-            async with conn.transaction():
+            async with self.ledger.transaction(conn):
                 await conn.execute(
                     """UPDATE pets 
                     SET owner_id = $1, name = $2 
@@ -7101,19 +6999,9 @@ class Economy(commands.Cog):
                     ctx.author.id, your_pet_data["name"], their_pet_data["pet_id"]
                 )
 
-                await conn.execute(
-                    """UPDATE economy 
-                    SET wallet = wallet - $1 
-                    WHERE user_id = $2""",
-                    trade_fee, ctx.author.id
-                )
+                await self.ledger.debit(ctx.author.id, trade_fee, conn=conn)
                 
-                await conn.execute(
-                    """UPDATE economy 
-                    SET wallet = wallet - $1 
-                    WHERE user_id = $2""",
-                    trade_fee, user.id
-                )
+                await self.ledger.debit(user.id, trade_fee, conn=conn)
 
                 await conn.execute(
                     """INSERT INTO pet_trades (
@@ -7263,23 +7151,10 @@ class PetBattle:
             self.round += 1
 
         winner = self.ctx.author if opponent_hp <= 0 else self.opponent
-        loser = self.opponent if winner == self.ctx.author else self.ctx.author
-        
+
         if self.bet > 0:
-            async with self.ctx.bot.db.acquire() as conn:
-                async with conn.transaction():
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet + $1 
-                        WHERE user_id = $2""",
-                        self.bet, winner.id
-                    )
-                    await conn.execute(
-                        """UPDATE economy 
-                        SET wallet = wallet - $1 
-                        WHERE user_id = $2""",
-                        self.bet, loser.id
-                    )
+            self.ctx.cog.release(self.ctx)
+            await self.ctx.cog.ledger.credit(winner.id, self.bet * 2)
 
         embed = Embed(
             title="🏆 Battle Ended!",
@@ -7354,9 +7229,7 @@ class BlackjackGame:
                 
                 if player["insurance"] == 0:
                     insurance_amount = player["bet"] // 2
-                    wallet, _, _ = await self.economy_cog.get_balance(player["user"].id)
-                    
-                    if wallet >= insurance_amount:
+                    if await self.economy_cog.stake(self.ctx, insurance_amount, player["user"].id):
                         player["insurance"] = insurance_amount
                         await self.ctx.approve(f"{player['user'].name} placed insurance bet of {insurance_amount:,} coins")
                     else:
@@ -7369,6 +7242,16 @@ class BlackjackGame:
             await self.handle_insurance_payouts()
             await self.end_game()
 
+    async def handle_insurance_payouts(self):
+        """Return insurance bets with their 2:1 payout"""
+        for player in self.players:
+            if player["insurance"] > 0:
+                payout = player["insurance"] * 2
+                await self.economy_cog.ledger.credit(
+                    player["user"].id, player["insurance"] + payout
+                )
+                player["insurance"] = 0
+
     def create_deck(self):
         """Create and shuffle a new deck of cards"""
         cards = []
@@ -7410,6 +7293,11 @@ class BlackjackGame:
             await self.next_turn()
 
         elif action == "double" and await self.can_double_down(current_player):
+            if not await self.economy_cog.stake(
+                self.ctx, current_player["bet"], current_player["user"].id
+            ):
+                return await self.ctx.warn("You don't have enough coins to double down!")
+
             current_player["bet"] *= 2
             current_player["hand"].append(self.draw_card())
             hand_value = self.calculate_hand(current_player["hand"])
@@ -7421,6 +7309,11 @@ class BlackjackGame:
             await self.next_turn()
 
         elif action == "split" and await self.can_split(current_player):
+            if not await self.economy_cog.stake(
+                self.ctx, current_player["bet"], current_player["user"].id
+            ):
+                return await self.ctx.warn("You don't have enough coins to split!")
+
             new_hand = [current_player["hand"].pop()]
             self.players.insert(self.current_player_index + 1, {
                 "user": current_player["user"],
@@ -7515,37 +7408,20 @@ class BlackjackGame:
         dealer_value = self.calculate_hand(self.dealer_hand)
         dealer_bust = dealer_value > 21
 
-        async with self.ctx.bot.db.acquire() as conn:
-            async with conn.transaction():
-                for player in self.players:
-                    hand_value = self.calculate_hand(player["hand"])
-                    
-                    if hand_value > 21:
-                        player["status"] = "Lost"
-                        await conn.execute(
-                            """UPDATE economy 
-                            SET wallet = wallet - $1 
-                            WHERE user_id = $2""",
-                            player["bet"], player["user"].id
-                        )
-                    elif dealer_bust or hand_value > dealer_value:
-                        player["status"] = "Won"
-                        await conn.execute(
-                            """UPDATE economy 
-                            SET wallet = wallet + $1 
-                            WHERE user_id = $2""",
-                            player["bet"], player["user"].id
-                        )
-                    elif hand_value < dealer_value:
-                        player["status"] = "Lost"
-                        await conn.execute(
-                            """UPDATE economy 
-                            SET wallet = wallet - $1 
-                            WHERE user_id = $2""",
-                            player["bet"], player["user"].id
-                        )
-                    else:
-                        player["status"] = "Push"
+        self.economy_cog.release(self.ctx)
+        for player in self.players:
+            hand_value = self.calculate_hand(player["hand"])
+
+            if hand_value > 21:
+                player["status"] = "Lost"
+            elif dealer_bust or hand_value > dealer_value:
+                player["status"] = "Won"
+                await self.economy_cog.ledger.credit(player["user"].id, player["bet"] * 2)
+            elif hand_value < dealer_value:
+                player["status"] = "Lost"
+            else:
+                player["status"] = "Push"
+                await self.economy_cog.ledger.credit(player["user"].id, player["bet"])
 
         await self.update_game_message()
 
@@ -7585,81 +7461,6 @@ class BlackjackGame:
         else:
             self.game_message = await self.ctx.send(embed=embed)
 
-    @tasks.loop(minutes=1)
-    async def check_lottery(self):
-        """Check if lottery should be drawn"""
-        next_draw = await self.bot.redis.get("lottery:next_draw")
-        if not next_draw:
-            return
-            
-        next_draw = datetime.fromtimestamp(float(next_draw), timezone.utc)
-        if datetime.now(timezone.utc) >= next_draw:
-            await self.draw_lottery()
-
-    async def draw_lottery(self):
-        """Draw the lottery and reward winner"""
-        total_tickets = await self.bot.redis.get("lottery:total_tickets")
-        if not total_tickets or int(total_tickets) == 0:
-            pipe = self.bot.redis.pipeline()
-            pipe.delete("lottery:total_tickets", "lottery:pot")
-            next_draw = datetime.now(timezone.utc) + timedelta(days=1)
-            pipe.set("lottery:next_draw", next_draw.timestamp())
-            await pipe.execute()
-            return
-            
-        total_tickets = int(total_tickets)
-        winning_ticket = random.randint(1, total_tickets)
-        pot = int(await self.bot.redis.get("lottery:pot") or 0)
-        
-        current_count = 0
-        async for key in self.bot.redis.scan_iter("lottery:tickets:*"):
-            user_tickets = int(await self.bot.redis.get(key))
-            current_count += user_tickets
-            
-            if current_count >= winning_ticket:
-                winner_id = int(key.split(":")[-1])
-                
-                async with self.bot.db.acquire() as conn:
-                    async with conn.transaction():
-                        await conn.execute(
-                            """UPDATE economy 
-                            SET wallet = wallet + $1 
-                            WHERE user_id = $2""",
-                            pot, winner_id
-                        )
-                        
-                        await conn.execute(
-                            """INSERT INTO lottery_history 
-                            (user_id, pot_amount, total_tickets, winner_tickets, won_at)
-                            VALUES ($1, $2, $3, $4, CURRENT_TIMESTAMP)""",
-                            winner_id, pot, total_tickets, user_tickets
-                        )
-                
-                channel = self.bot.get_channel(1319467099969556542)
-                if channel:
-                    winner = self.bot.get_user(winner_id)
-                    if winner:
-                        embed = Embed(
-                            title="🎰 Lottery Winner!",
-                            description=(
-                                f"Congratulations to {winner.mention}!\n"
-                                f"They won {pot:,} coins with {user_tickets:,} tickets!\n"
-                                f"Winning chance was {(user_tickets/total_tickets)*100:.2f}%"
-                            ),
-                            color=discord.Color.gold()
-                        )
-                        await channel.send(embed=embed)
-                break
-                
-        pipe = self.bot.redis.pipeline()
-        pipe.delete("lottery:total_tickets", "lottery:pot")
-        next_draw = datetime.now(timezone.utc) + timedelta(days=1)
-        pipe.set("lottery:next_draw", next_draw.timestamp())
-        await pipe.execute()
-        
-        async for key in self.bot.redis.scan_iter("lottery:tickets:*"):
-            await self.bot.redis.delete(key)
-
 class DuelGame:
     def __init__(self, challenger, opponent, amount):
         self.challenger = challenger
@@ -0,0 +1,487 @@
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from logging import getLogger
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from asyncpg import Connection
+from discord.ext.commands import CommandError
+from discord.ext.tasks import loop
+from discord.utils import utcnow
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from core.client.database import Database, Record
+    from main import Evict
+
+log = getLogger("evict/ledger")
+
+LEADERBOARD_KEY = "economy:leaderboard"
+
+Row = Tuple[int, str, int, "datetime"]
+
+
+class InsufficientFunds(CommandError):
+    def __init__(self, message: str = "You don't have enough coins!"):
+        super().__init__(message)
+
+
+class Ledger:
+    """
+    Every balance mutation is a single guarded statement,
+    so concurrent commands can never overdraw a wallet or bank.
+
+    Transaction log rows are buffered and copied in batches,
+    and the net worth leaderboard is kept in a sorted set
+    which is updated from the returned balances. Mutations made
+    inside `transaction` only reach either once it commits.
+    """
+
+    def __init__(self, bot: Evict, *, batch_size: int = 500):
+        self.bot = bot
+        self.batch_size = batch_size
+        self.pending: List[Row] = []
+        self.deferred: Dict[Connection, Tuple[List[Record], List[Row]]] = {}
+
+    def executor(self, conn: Optional[Connection]) -> Connection | Database:
+        return conn or self.bot.db
+
+    async def start(self) -> None:
+        self.flush.start()
+        if not await self.bot.redis.exists(LEADERBOARD_KEY):
+            await self.rebuild()
+
+    async def close(self) -> None:
+        self.flush.cancel()
+        await self.write_pending()
+
+    @asynccontextmanager
+    async def transaction(
+        self,
+        conn: Optional[Connection] = None,
+    ) -> AsyncIterator[Connection]:
+        """
+        Open a transaction, acquiring a connection if none is given.
+        Leaderboard updates and log rows are held back until it commits.
+        """
+
+        if conn is None:
+            async with self.bot.db.acquire() as conn:
+                async with self.transaction(conn) as conn:
+                    yield conn
+            return
+
+        if conn in self.deferred:
+            async with conn.transaction():
+                yield conn
+            return
+
+        records, rows = self.deferred[conn] = ([], [])
+        try:
+            async with conn.transaction():
+                yield conn
+        finally:
+            del self.deferred[conn]
+
+        self.queue(*rows)
+        if records:
+            await self.track(*records)
+
+    def queue(self, *rows: Row) -> None:
+        self.pending.extend(rows)
+        if len(self.pending) >= self.batch_size:
+            self.bot.loop.create_task(self.write_pending())
+
+    def log(
+        self,
+        user_id: int,
+        type: str,
+        amount: int,
+        *,
+        conn: Optional[Connection] = None,
+    ) -> None:
+        """
+        Queue a transaction log row.
+        """
+
+        row = (user_id, type, amount, utcnow().replace(tzinfo=None))
+        if conn in self.deferred:
+            self.deferred[conn][1].append(row)
+        else:
+            self.queue(row)
+
+    async def write_pending(self) -> None:
+        if not self.pending:
+            return
+
+        records, self.pending = self.pending, []
+        try:
+            await self.bot.db.copy_records_to_table(
+                "user_transactions",
+                records=records,
+                columns=("user_id", "type", "amount", "created_at"),
+            )
+        except Exception:
+            log.exception("Failed to write %s transaction rows.", len(records))
+            self.pending[:0] = records
+
+    @loop(seconds=5)
+    async def flush(self) -> None:
+        await self.write_pending()
+
+    async def balance(self, user_id: int) -> Tuple[int, int, int]:
+        """
+        Returns (wallet, bank, gems).
+        """
+
+        record = await self.bot.db.fetchrow(
+            """
+            SELECT wallet, bank, gems
+            FROM economy
+            WHERE user_id = $1
+            """,
+            user_id,
+        )
+        if not record:
+            return 0, 0, 0
+
+        return record["wallet"], record["bank"], record["gems"]
+
+    async def credit(
+        self,
+        user_id: int,
+        amount: int,
+        type: Optional[str] = None,
+        *,
+        conn: Optional[Connection] = None,
+    ) -> Optional[Record]:
+        """
+        Add coins to a wallet.
+        Returns None when the user has no account.
+        """
+
+        record = await self.executor(conn).fetchrow(
+            """
+            UPDATE economy
+            SET wallet = wallet + $2
+            WHERE user_id = $1
+            RETURNING user_id, wallet, bank
+            """,
+            user_id,
+            amount,
+        )
+        if not record:
+            return None
+
+        await self.track(record, conn=conn)
+        if type:
+            self.log(user_id, type, amount, conn=conn)
+
+        return record
+
+    async def debit(
+        self,
+        user_id: int,
+        amount: int,
+        type: Optional[str] = None,
+        *,
+        conn: Optional[Connection] = None,
+    ) -> Record:
+        """
+        Remove coins from a wallet only if it can cover them.
+        """
+
+        record = await self.executor(conn).fetchrow(
+            """
+            UPDATE economy
+            SET wallet = wallet - $2
+            WHERE user_id = $1
+            AND wallet >= $2
+            RETURNING user_id, wallet, bank
+            """,
+            user_id,
+            amount,
+        )
+        if not record:
+            raise InsufficientFunds()
+
+        await self.track(record, conn=conn)
+        if type:
+            self.log(user_id, type, -amount, conn=conn)
+
+        return record
+
+    async def adjust(
+        self,
+        user_id: int,
+        delta: int,
+        type: Optional[str] = None,
+        *,
+        conn: Optional[Connection] = None,
+    ) -> Optional[Record]:
+        """
+        Apply a signed change, debits stay guarded.
+        """
+
+        if delta < 0:
+            return await self.debit(user_id, -delta, type, conn=conn)
+
+        return await self.credit(user_id, delta, type, conn=conn)
+
+    async def purchase(
+        self,
+        user_id: int,
+        coins: int,
+        gems: int = 0,
+        *,
+        conn: Optional[Connection] = None,
+    ) -> Record:
+        """
+        Spend coins and gems together in one guarded statement.
+        """
+
+        record = await self.executor(conn).fetchrow(
+            """
+            UPDATE economy
+            SET wallet = wallet - $2,
+                gems = gems - $3
+            WHERE user_id = $1
+            AND wallet >= $2
+            AND gems >= $3
+            RETURNING user_id, wallet, bank, gems
+            """,
+            user_id,
+            coins,
+            gems,
+        )
+        if not record:
+            raise InsufficientFunds("You don't have enough coins or gems!")
+
+        await self.track(record, conn=conn)
+        return record
+
+    async def deposit(
+        self,
+        user_id: int,
+        amount: int,
+        *,
+        conn: Optional[Connection] = None,
+    ) -> Record:
+        """
+        Move coins from the wallet into the bank within its capacity.
+        """
+
+        record = await self.executor(conn).fetchrow(
+            """
+            UPDATE economy
+            SET wallet = wallet - $2,
+                bank = bank + $2
+            WHERE user_id = $1
+            AND wallet >= $2
+            AND bank + $2 <= COALESCE(bank_capacity, 10000)
+            RETURNING user_id, wallet, bank
+            """,
+            user_id,
+            amount,
+        )
+        if not record:
+            raise InsufficientFunds(
+                "You don't have enough coins or your bank doesn't have enough space!"
+            )
+
+        await self.track(record, conn=conn)
+        self.log(user_id, "deposit", amount, conn=conn)
+        return record
+
+    async def withdraw(
+        self,
+        user_id: int,
+        amount: int,
+        *,
+        conn: Optional[Connection] = None,
+    ) -> Record:
+        """
+        Move coins from the bank into the wallet.
+        """
+
+        record = await self.executor(conn).fetchrow(
+            """
+            UPDATE economy
+            SET wallet = wallet + $2,
+                bank = bank - $2
+            WHERE user_id = $1
+            AND bank >= $2
+            RETURNING user_id, wallet, bank
+            """,
+            user_id,
+            amount,
+        )
+        if not record:
+            raise InsufficientFunds("You don't have enough coins in your bank!")
+
+        await self.track(record, conn=conn)
+        self.log(user_id, "withdraw", amount, conn=conn)
+        return record
+
+    async def transfer(
+        self,
+        sender_id: int,
+        recipient_id: int,
+        amount: int,
+        *,
+        conn: Optional[Connection] = None,
+        log: bool = True,
+    ) -> int:
+        """
+        Move coins between two wallets in a single statement.
+        The recipient account is created if it doesn't exist.
+        Returns the sender's remaining wallet.
+        """
+
+        records = await self.executor(conn).fetch(
+            """
+            WITH debit AS (
+                UPDATE economy
+                SET wallet = wallet - $3
+                WHERE user_id = $1
+                AND wallet >= $3
+                RETURNING user_id, wallet, bank
+            ), credit AS (
+                INSERT INTO economy (user_id, wallet)
+                SELECT $2, $3 FROM debit
+                ON CONFLICT (user_id)
+                DO UPDATE SET wallet = economy.wallet + EXCLUDED.wallet
+                RETURNING user_id, wallet, bank
+            )
+            SELECT * FROM debit
+            UNION ALL
+            SELECT * FROM credit
+            """,
+            sender_id,
+            recipient_id,
+            amount,
+        )
+        if not records:
+            raise InsufficientFunds()
+
+        await self.track(*records, conn=conn)
+        wallet = next(
+            record["wallet"] for record in records if record["user_id"] == sender_id
+        )
+
+        if log:
+            self.log(sender_id, "transfer_sent", -amount, conn=conn)
+            self.log(recipient_id, "transfer_received", amount, conn=conn)
+
+        return wallet
+
+    async def track(
+        self,
+        *records: Record,
+        conn: Optional[Connection] = None,
+    ) -> None:
+        """
+        Update the leaderboard from balances returned by a mutation.
+        """
+
+        if conn in self.deferred:
+            self.deferred[conn][0].extend(records)
+            return
+
+        await self.bot.redis.zadd(
+            LEADERBOARD_KEY,
+            {
+                str(record["user_id"]): (record["wallet"] or 0) + (record["bank"] or 0)
+                for record in records
+            },
+        )
+
+    async def top(self, offset: int = 0, limit: int = 10) -> List[Tuple[int, int]]:
+        """
+        Returns (user_id, net worth) pairs ranked from `offset`.
+        """
+
+        entries = await self.bot.redis.zrevrange(
+            LEADERBOARD_KEY,
+            offset,
+            offset + limit - 1,
+            withscores=True,
+        )
+        return [(int(member), int(score)) for member, score in entries]
+
+    async def rank(self, user_id: int) -> Optional[Tuple[int, int]]:
+        """
+        Returns the 1-based (rank, net worth) of a user.
+        """
+
+        async with self.bot.redis.pipeline() as pipe:
+            pipe.zrevrank(LEADERBOARD_KEY, str(user_id))
+            pipe.zscore(LEADERBOARD_KEY, str(user_id))
+            rank, score = await pipe.execute()
+
+        if rank is None:
+            return None
+
+        return rank + 1, int(score)
+
+    async def scoped(
+        self,
+        user_ids: Iterable[int],
+        chunk_size: int = 5000,
+    ) -> List[Tuple[int, int]]:
+        """
+        Rank a set of users, such as the members of a guild.
+        """
+
+        user_ids = [str(user_id) for user_id in user_ids]
+        entries: List[Tuple[int, int]] = []
+
+        for index in range(0, len(user_ids), chunk_size):
+            chunk = user_ids[index : index + chunk_size]
+            scores = await self.bot.redis.zmscore(LEADERBOARD_KEY, chunk)
+            entries.extend(
+                (int(user_id), int(score))
+                for user_id, score in zip(chunk, scores)
+                if score is not None
+            )
+
+        return sorted(entries, key=lambda entry: entry[1], reverse=True)
+
+    async def rebuild(self, chunk_size: int = 5000) -> int:
+        """
+        Rebuild the leaderboard from the economy table.
+        The new set is swapped in atomically once complete.
+        """
+
+        staging = f"{LEADERBOARD_KEY}:rebuild"
+        await self.bot.redis.delete(staging)
+
+        total = 0
+        async with self.bot.db.acquire() as conn:
+            async with conn.transaction():
+                cursor = conn.cursor(
+                    """
+                    SELECT user_id, COALESCE(wallet, 0) + COALESCE(bank, 0) AS total
+                    FROM economy
+                    """
+                )
+                batch = {}
+                async for record in cursor:
+                    batch[str(record["user_id"])] = record["total"]
+                    if len(batch) >= chunk_size:
+                        await self.bot.redis.zadd(staging, batch)
+                        total += len(batch)
+                        batch = {}
+
+                if batch:
+                    await self.bot.redis.zadd(staging, batch)
+                    total += len(batch)
+
+        if total:
+            await self.bot.redis.rename(staging, LEADERBOARD_KEY)
+        else:
+            await self.bot.redis.delete(LEADERBOARD_KEY)
+
+        log.info("Rebuilt the economy leaderboard with %s users.", total)
+        return total
@@ -815,6 +815,7 @@ class Fun(Cog):
                 ctx.guild.id, 
                 member.id
             )
+            await self.bot.features.refresh("uwulock", ctx.guild.id)
 
             return await ctx.approve(f"Added **{member}** to uwulock!")
         
@@ -829,6 +830,7 @@ class Fun(Cog):
                 member.id, 
                 ctx.guild.id
             )
+            await self.bot.features.refresh("uwulock", ctx.guild.id)
             
             return await ctx.approve(f"Removed **{member}** from uwulock!")
     
@@ -857,6 +859,7 @@ class Fun(Cog):
             """,
             ctx.guild.id
         )
+        await self.bot.features.refresh("uwulock", ctx.guild.id)
 
         return await ctx.approve("Removed everyone from uwulock!")
 
@@ -890,6 +893,7 @@ class Fun(Cog):
                 ctx.guild.id, 
                 member.id
             )
+            await self.bot.features.refresh("uwulock", ctx.guild.id)
 
             return await ctx.approve(f"Added **{member}** to shutup!")
         
@@ -904,6 +908,7 @@ class Fun(Cog):
                 member.id, 
                 ctx.guild.id
             )
+            await self.bot.features.refresh("uwulock", ctx.guild.id)
             
             return await ctx.approve(f"Removed **{member}** from shutup!")
 
@@ -932,6 +937,7 @@ class Fun(Cog):
             """,
             ctx.guild.id
         )
+        await self.bot.features.refresh("uwulock", ctx.guild.id)
 
         return await ctx.approve("Removed everyone from shutup!")
 
@@ -3766,6 +3772,7 @@ class Fun(Cog):
             ctx.guild.id,
             channel.id
         )
+        await self.bot.features.refresh("streaks", ctx.guild.id)
         
         return await ctx.approve(f"Streak channel set to {channel.mention}")
 
@@ -4023,6 +4030,7 @@ class Fun(Cog):
             ctx.guild.id,
             channel.id
         )
+        await self.bot.features.refresh("counting", ctx.guild.id)
         
         return await ctx.approve(f"Set {channel.mention} as the counting channel")
 
@@ -4038,6 +4046,7 @@ class Fun(Cog):
             """,
             ctx.guild.id
         )
+        await self.bot.features.refresh("counting", ctx.guild.id)
         
         if deleted == "DELETE 0":
             return await ctx.warn("Counting is not set up in this server!")
@@ -4630,14 +4639,16 @@ class Fun(Cog):
         if message.author.bot or not message.guild:
             return
 
-        streaks_config = await self.bot.db.fetchrow(
-            """
-            SELECT channel_id, notification_channel_id, streak_emoji, image_only
-            FROM streaks.config
-            WHERE guild_id = $1
-            """,
-            message.guild.id
-        )
+        streaks_config = None
+        if self.bot.features.active("streaks", message.channel.id):
+            streaks_config = await self.bot.db.fetchrow(
+                """
+                SELECT channel_id, notification_channel_id, streak_emoji, image_only
+                FROM streaks.config
+                WHERE guild_id = $1
+                """,
+                message.guild.id
+            )
 
         if streaks_config and message.channel.id == streaks_config['channel_id']:
             has_image = any(
@@ -4714,15 +4725,17 @@ class Fun(Cog):
 
                 await message.add_reaction(streaks_config['streak_emoji'])
 
-        counting_config = await self.bot.db.fetchrow(
-            """
-            SELECT channel_id, current_count, high_score, safe_mode, allow_fails,
-                   last_user_id, success_emoji, fail_emoji
-            FROM counting.config
-            WHERE guild_id = $1
-            """,
-            message.guild.id
-        )
+        counting_config = None
+        if self.bot.features.active("counting", message.channel.id):
+            counting_config = await self.bot.db.fetchrow(
+                """
+                SELECT channel_id, current_count, high_score, safe_mode, allow_fails,
+                       last_user_id, success_emoji, fail_emoji
+                FROM counting.config
+                WHERE guild_id = $1
+                """,
+                message.guild.id
+            )
 
         if counting_config and message.channel.id == counting_config['channel_id']:
             try:
@@ -4797,7 +4810,7 @@ class Fun(Cog):
 
     @Cog.listener("on_message")
     async def uwulock_shutup(self, message: Message):
-        if not message.guild:
+        if not message.guild or not self.bot.features.active("uwulock", message.guild.id):
             return
 
         checks = await self.bot.db.fetch(
@@ -4820,7 +4833,7 @@ class Fun(Cog):
                 hook = await self.webhook(message.channel)
 
                 uwulock_key = xxh64_hexdigest(f"uwulock:{message.author.id}{message.channel.id}")
-                if await self.bot.redis.ratelimited(uwulock_key, 3, 2):
+                if await self.bot.ratelimits.limited(uwulock_key, 3, 2):
                     await asyncio.sleep(2)
 
                 if hook and uwu_message.strip():
@@ -4841,7 +4854,7 @@ class Fun(Cog):
 
             elif check['type'] == 'shutup':
                 shutup_key = xxh64_hexdigest(f"stfu:{message.author.id}{message.channel.id}")
-                if await self.bot.redis.ratelimited(shutup_key, 3, 2):
+                if await self.bot.ratelimits.limited(shutup_key, 3, 2):
                     await asyncio.sleep(2)
                 
                 try:
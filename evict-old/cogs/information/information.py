@@ -222,14 +222,18 @@ class Information(Cog):
         """
 
         embed = Embed(title=f"Total shards [{self.bot.shard_count}]")
+        clusters = await self.bot.ipc.request("stats")
+        shards = {
+            shard_id: stats
+            for cluster in clusters.values()
+            for shard_id, stats in cluster["shards"].items()
+        }
 
-        for shard in self.bot.shards:
-            guilds = [g for g in self.bot.guilds if g.shard_id == shard]
-            users = sum([g.member_count for g in guilds])
+        for shard, stats in sorted(shards.items()):
             shard_indicator = f"{config.EMOJIS.MISC.CONNECTION}" if ctx.guild.shard_id == shard else ""
             embed.add_field(
                 name=f"Shard {shard} {shard_indicator}",
-                value=f"**ping**: ``{round(self.bot.shards.get(shard).latency * 1000)}ms``\n**guilds**: ``{len(guilds)}``\n**users**: ``{users:,}``",
+                value=f"**ping**: ``{round(stats['latency'] * 1000)}ms``\n**guilds**: ``{stats['guilds']}``\n**users**: ``{stats['users']:,}``",
                 inline=True,
             )
             embed.set_footer(text=f"You are on Shard {ctx.guild.shard_id}", icon_url=f"{self.bot.user.display_avatar.url}")
@@ -499,6 +499,9 @@ class Lastfm(Cog):
 
     @Cog.listener()
     async def on_message_without_command(self, ctx: Context) -> Optional[Message]:
+        if not self.bot.features.active("lastfm.command", ctx.author.id):
+            return
+
         command = cast(
             Optional[str],
             await self.bot.db.fetchval(
@@ -1547,6 +1550,8 @@ class Lastfm(Cog):
             ctx.author.id,
             command,
         )
+        await self.bot.features.refresh("lastfm.command", ctx.author.id)
+
         return await ctx.approve(
             f"Successfully set your **now playing** command to **{command}**"
         )
@@ -1573,6 +1578,8 @@ class Lastfm(Cog):
             """,
             ctx.author.id,
         )
+        await self.bot.features.refresh("lastfm.command", ctx.author.id)
+
         return await ctx.approve("Successfully removed your **now playing** command")
 
     @lastfm.command(
@@ -1,9 +1,12 @@
 from main import Evict
-from typing import Union
+from collections import defaultdict
+from contextlib import suppress
+from logging import getLogger
+from typing import Coroutine, Dict, List, Sequence, Union
 from core.client.context import Context
 from discord.ext import commands
 from discord.ext.commands.core import has_permissions
-from discord import Member, User, Embed
+from discord import Member, User, Embed, HTTPException
 from discord.ui import Modal, TextInput, Button, View
 import config
 
@@ -13,10 +16,11 @@ import config
 import humanize
 from datetime import timedelta
 from tools.conversion.embed1 import EmbedScript
-from processors.moderation import process_mod_action, process_dm_script
-import psutil
+from processors.moderation import process_mod_action
 import asyncio
 
+log = getLogger("evict/modlog")
+
 class Mod:
     def is_mod_configured():
         async def predicate(ctx: Context):
@@ -56,52 +60,51 @@ class Mod:
 
 
 class ModConfig:
+    async def allocate_cases(bot: Evict, guild_id: int, amount: int = 1) -> range:
+        """
+        Reserve a contiguous range of case numbers in one statement.
+        The row lock taken by the upsert keeps concurrent actions from sharing a case.
+        """
+        last = await bot.db.fetchval(
+            """
+            INSERT INTO cases (guild_id, count)
+            VALUES ($1, $2)
+            ON CONFLICT (guild_id)
+            DO UPDATE SET count = COALESCE(cases.count, 0) + EXCLUDED.count
+            RETURNING count
+            """,
+            guild_id,
+            amount,
+        )
+        return range(last - amount + 1, last + 1)
+
     async def sendlogs(
         bot: Evict,
         action: str,
         author: Member,
-        victim: Union[Member, User],
+        victim: Union[Member, User, Sequence[Union[Member, User]]],
         reason: str,
         duration: Union[timedelta, int, None] = None,
         role: discord.Role = None
     ):
+        victims = list(victim) if isinstance(victim, (list, tuple, set)) else [victim]
+        if not victims:
+            return
+
         try:  
             settings = await bot.db.fetchrow(
                 "SELECT * FROM mod WHERE guild_id = $1",
                 author.guild.id
             )
-            
-            action_data = {
-                'action': action,
-                'duration': duration
-            }
-            
-            processed_action = await bot.loop.run_in_executor(
-                None,
-                bot.process_pool.apply,
-                process_mod_action,
-                (action_data,)
-            )
-
             if not settings:
                 return
 
-            res = await bot.db.fetchrow(
-                "SELECT count FROM cases WHERE guild_id = $1", author.guild.id
-            )
-            
-            if not res:
-                await bot.db.execute(
-                    "INSERT INTO cases (guild_id, count) VALUES ($1, $2)",
-                    author.guild.id, 0
-                )
-                case = 1
-            else:
-                case = int(res["count"]) + 1
+            processed_action = process_mod_action({
+                'action': action,
+                'duration': duration
+            })
 
-            await bot.db.execute(
-                "UPDATE cases SET count = $1 WHERE guild_id = $2", case, author.guild.id
-            )
+            cases = await ModConfig.allocate_cases(bot, author.guild.id, len(victims))
 
             duration_value = (
                 int(duration.total_seconds())
@@ -109,213 +112,147 @@ class ModConfig:
                 else duration
             )
 
-            await bot.db.execute(
+            await bot.db.executemany(
                 """
                 INSERT INTO history.moderation 
                 (guild_id, case_id, user_id, moderator_id, action, reason, duration, role_id)
                 VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
                 """,
-                author.guild.id,
-                case,
-                victim.id,
-                author.id,
-                action,
-                reason,
-                duration_value,
-                role.id if role else None
+                [
+                    (
+                        author.guild.id,
+                        case,
+                        target.id,
+                        author.id,
+                        action,
+                        reason,
+                        duration_value,
+                        role.id if role else None
+                    )
+                    for case, target in zip(cases, victims)
+                ]
             )
 
-            if settings.get("channel_id"):
-                embed = Embed(
-                    timestamp=datetime.datetime.now(),
-                    color=(
-                        discord.Color.green() if action in ['role_add', 'unban', 'untimeout', 'unjail']
-                        else discord.Color.red() if action in ['ban', 'kick', 'timeout', 'jail']
-                        else discord.Color.green() if action == 'role_add'
-                        else discord.Color.red() if action == 'role_remove'
-                        else discord.Color.blurple()
-                    )
-                )
-                embed.set_author(name="Modlog Entry", icon_url=author.display_avatar)
-                
-                if action in ['role_add', 'role_remove']:
-                    embed.add_field(
-                        name="Information",
-                        value=f"**Case #{case}** | {action}\n**User**: {victim} (`{victim.id}`)\n**Moderator**: {author} (`{author.id}`)\n**Role**: {role.mention}\n**Reason**: {reason}",
-                    )
-                else:
-                    duration_text = f"\n**Duration**: {humanize.naturaldelta(duration)}" if duration else ""
-                    embed.add_field(
-                        name="Information",
-                        value=f"**Case #{case}** | {action}\n**User**: {victim} (`{victim.id}`)\n**Moderator**: {author} (`{author.id}`)\n**Reason**: {reason}{duration_text}",
+            channel = (
+                author.guild.get_channel(int(settings["channel_id"]))
+                if settings.get("channel_id")
+                else None
+            )
+            if channel:
+                for case, target in zip(cases, victims):
+                    queue_modlog(
+                        channel,
+                        modlog_embed(action, case, author, target, reason, duration, role)
                     )
 
-                try:
-                    await author.guild.get_channel(int(settings["channel_id"])).send(embed=embed)
-                except:
-                    pass
+            if not processed_action['should_dm'] or not settings.get('dm_enabled'):
+                return
 
-            if processed_action['should_dm'] and settings.get('dm_enabled'):
-                mutual_guilds = [g for g in bot.guilds if victim in g.members]
+            appeal_config = await bot.db.fetchrow(
+                "SELECT * FROM appeal_config WHERE guild_id = $1",
+                author.guild.id
+            )
+
+            targets = []
+            for target in victims:
+                mutual_guilds = [g for g in bot.guilds if target in g.members]
                 if not mutual_guilds and action not in ['ban', 'kick', 'hardban']:
-                    return
+                    continue
 
-                if action in ['ban', 'kick']:
-                    try:
-                        script = settings.get(f"dm_{action.lower()}")
-                        
-                        if script and script.lower() != 'true':
-                            script_obj = EmbedScript(script)
-                            await script_obj.send(
-                                victim,
-                                guild=author.guild,
-                                moderator=author,
-                                reason=reason,
-                                duration=duration,
-                                role=role
-                            )
-                        else:
-                            if action in ['role_add', 'role_remove']:
-                                embed = Embed(
-                                    title=f"Role {'Added' if action == 'role_add' else 'Removed'}",
-                                    color=discord.Color.green() if action == 'role_add' else discord.Color.red(),
-                                    timestamp=datetime.datetime.now()
-                                )
-                                embed.add_field(
-                                    name="Server",
-                                    value=author.guild.name,
-                                    inline=True
-                                )
-                                embed.add_field(
-                                    name="Role",
-                                    value=role.name,
-                                    inline=True
-                                )
-                                embed.add_field(
-                                    name="Moderator",
-                                    value=str(author),
-                                    inline=True
-                                )
-                                if reason:
-                                    embed.add_field(
-                                        name="Reason",
-                                        value=reason,
-                                        inline=False
-                                    )
-                            else:
-                                duration_text = f"{humanize.naturaldelta(duration)}" if duration else ""
-                                embed = Embed(
-                                    title=processed_action['title'].title(),
-                                    description=duration_text if duration else "",
-                                    color=discord.Color.green() if processed_action['is_unaction'] else discord.Color.red(),
-                                    timestamp=datetime.datetime.now()
-                                )
-                                embed.add_field(
-                                    name=f"You have been {processed_action['title']} in",
-                                    value=author.guild.name,
-                                    inline=True
-                                )
-                                embed.add_field(
-                                    name="Moderator",
-                                    value=str(author),
-                                    inline=True
-                                )
-                                embed.add_field(
-                                    name="Reason",
-                                    value=reason,
-                                    inline=True
-                                )
+                targets.append(target)
 
-                            appeal_config = await bot.db.fetchrow(
-                                "SELECT * FROM appeal_config WHERE guild_id = $1",
-                                author.guild.id
-                            )
-
-                            view = View()
-                            if appeal_config:
-                                if appeal_config.get('direct_appeal', False) or action in ['timeout', 'jail']:
-                                    view = View()
-                                    view.add_item(AppealButton(modal=True, action_type=action, guild_id=author.guild.id))
-                                elif action in ['ban', 'kick']:
-                                    appeal_server = bot.get_guild(appeal_config['appeal_server_id'])
-                                    if appeal_server and not appeal_config.get('direct_appeal', False):
-                                        appeal_channel = appeal_server.get_channel(appeal_config['appeal_channel_id'])
-                                        if appeal_channel:
-                                            try:
-                                                invite = await appeal_channel.create_invite(max_uses=1)
-                                                view = View()
-                                                view.add_item(Button(
-                                                    label="Join Appeal Server",
-                                                    url=invite.url,
-                                                    style=discord.ButtonStyle.link
-                                                ))
-                                                embed.add_field(
-                                                    name="Appeal",
-                                                    value=f"You can appeal this action in our appeal server",
-                                                    inline=False
-                                                )
-                                            except:
-                                                embed.add_field(
-                                                    name="Appeal",
-                                                    value="To appeal, please join discord.gg/evict to get mutual server access with the bot",
-                                                    inline=False
-                                                )
-
-                            await victim.send(embed=embed, view=view)
-
-                    except Exception as e:
-                        import traceback
-                else:
-                    asyncio.create_task(
-                        send_non_critical_dm(
-                            bot, settings, action, author, victim, 
-                            reason, duration, role, processed_action
-                        )
-                    )
+            dms = [
+                send_non_critical_dm(
+                    bot, settings, action, author, target,
+                    reason, duration, role, processed_action, appeal_config
+                )
+                for target in targets
+            ]
+            if action in ['ban', 'kick']:
+                await gather_limited(dms)
+            else:
+                asyncio.create_task(gather_limited(dms))
+
+        except Exception:
+            log.exception("Failed to dispatch the modlog for %s in %s.", action, author.guild)
+
+
+def modlog_embed(
+    action: str,
+    case: int,
+    author: Member,
+    victim: Union[Member, User],
+    reason: str,
+    duration: Union[timedelta, int, None] = None,
+    role: discord.Role = None
+) -> Embed:
+    embed = Embed(
+        timestamp=datetime.datetime.now(),
+        color=(
+            discord.Color.green() if action in ['role_add', 'unban', 'untimeout', 'unjail']
+            else discord.Color.red() if action in ['ban', 'kick', 'timeout', 'jail']
+            else discord.Color.green() if action == 'role_add'
+            else discord.Color.red() if action == 'role_remove'
+            else discord.Color.blurple()
+        )
+    )
+    embed.set_author(name="Modlog Entry", icon_url=author.display_avatar)
+    
+    if action in ['role_add', 'role_remove']:
+        embed.add_field(
+            name="Information",
+            value=f"**Case #{case}** | {action}\n**User**: {victim} (`{victim.id}`)\n**Moderator**: {author} (`{author.id}`)\n**Role**: {role.mention}\n**Reason**: {reason}",
+        )
+    else:
+        duration_text = f"\n**Duration**: {humanize.naturaldelta(duration)}" if duration else ""
+        embed.add_field(
+            name="Information",
+            value=f"**Case #{case}** | {action}\n**User**: {victim} (`{victim.id}`)\n**Moderator**: {author} (`{author.id}`)\n**Reason**: {reason}{duration_text}",
+        )
 
-            try:
-                properties = {
-                    "action": action,
-                    "guild_id": str(author.guild.id),
-                    "guild_name": author.guild.name,
-                    "moderator_id": str(author.id),
-                    "moderator_name": str(author),
-                    "moderator_roles": [str(role.id) for role in author.roles[1:]],
-                    "target_id": str(victim.id),
-                    "target_name": str(victim),
-                    "reason": reason,
-                    "case_id": case,
-                    "duration_seconds": (
-                        int(duration.total_seconds()) if isinstance(duration, timedelta)
-                        else duration if isinstance(duration, int)
-                        else None
-                    ),
-                    "role_id": str(role.id) if role else None,
-                    "role_name": role.name if role else None,
-                    "dm_success": False,
-                    "system_metrics": {
-                        "cpu_percent": psutil.cpu_percent(),
-                        "memory_usage": psutil.Process().memory_info().rss / 1024 / 1024,
-                        "thread_count": psutil.Process().num_threads()
-                    },
-                    "guild_metrics": {
-                        "member_count": author.guild.member_count,
-                        "case_count": case,
-                        "verification_level": str(author.guild.verification_level),
-                        "boost_level": author.guild.premium_tier
-                    }
-                }
+    return embed
+
+
+MODLOG_DELAY = 1.5
+modlog_queue: Dict[int, List[Embed]] = defaultdict(list)
+modlog_tasks: Dict[int, asyncio.Task] = {}
 
-            except Exception as e:
-                print(f"Error in modlog: {e}")
-                traceback.print_exc()
 
-        except Exception as e:
-            print(f"Error in modlog: {e}")
-            traceback.print_exc()
+def queue_modlog(channel: discord.abc.Messageable, embed: Embed) -> None:
+    """
+    Queue a modlog entry so entries from the same burst share messages.
+    """
+    modlog_queue[channel.id].append(embed)
+    if channel.id not in modlog_tasks:
+        modlog_tasks[channel.id] = asyncio.create_task(flush_modlog(channel))
 
-async def send_non_critical_dm(bot, settings, action, author, victim, reason, duration, role, processed_action):
-    """Handles sending DMs for non-critical moderation actions"""
+
+async def flush_modlog(channel: discord.abc.Messageable) -> None:
+    try:
+        await asyncio.sleep(MODLOG_DELAY)
+        while modlog_queue.get(channel.id):
+            embeds = modlog_queue[channel.id][:10]
+            del modlog_queue[channel.id][:10]
+
+            with suppress(HTTPException):
+                await channel.send(embeds=embeds)
+    finally:
+        modlog_queue.pop(channel.id, None)
+        modlog_tasks.pop(channel.id, None)
+
+
+async def gather_limited(coros: List[Coroutine], limit: int = 5) -> None:
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(coro: Coroutine) -> None:
+        async with semaphore:
+            await coro
+
+    await asyncio.gather(*(run(coro) for coro in coros))
+
+
+async def send_non_critical_dm(bot, settings, action, author, victim, reason, duration, role, processed_action, appeal_config=None):
+    """Handles sending DMs for moderation actions"""
     try:
         script = settings.get(f"dm_{action.lower()}")
         
@@ -353,11 +290,6 @@ async def send_non_critical_dm(bot, settings, action, author, victim, reason, du
                 embed.add_field(name="Moderator", value=str(author), inline=True)
                 embed.add_field(name="Reason", value=reason, inline=True)
 
-            appeal_config = await bot.db.fetchrow(
-                "SELECT * FROM appeal_config WHERE guild_id = $1",
-                author.guild.id
-            )
-
             view = View()
             if appeal_config:
                 if appeal_config.get('direct_appeal', False) or action in ['timeout', 'jail']:
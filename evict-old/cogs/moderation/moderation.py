@@ -169,6 +169,24 @@ class Moderation(Cog):
         self.bot = bot
         self.description = "Moderation commands to make things easier."
 
+    async def cog_load(self) -> None:
+        """
+        Case numbers are allocated with an upsert,
+        which needs the unique index from the schema.
+        """
+        indexed = await self.bot.db.fetchval(
+            """
+            SELECT EXISTS(
+                SELECT 1
+                FROM pg_indexes
+                WHERE tablename = 'cases'
+                AND indexname = 'cases_guild_id_idx'
+            )
+            """
+        )
+        if not indexed:
+            log.warning("The cases_guild_id_idx index is missing, case numbers will fail.")
+
     @property
     def actions(self) -> dict[str, str]:
         return {
@@ -302,6 +320,15 @@ class Moderation(Cog):
                 new_channel.id,
             )
             if result != "UPDATE 0":
+                if table_name == "feeds.reddit":
+                    self.bot.dispatch("reddit_feed_update")
+
+                elif table_name == "feeds.tiktok":
+                    self.bot.dispatch("social_feed_update", "TikTok", guild.id)
+
+                elif table_name == "feeds.pinterest":
+                    self.bot.dispatch("social_feed_update", "Pinterest", guild.id)
+
                 pretty_name = (
                     table_name.replace("_", " ")
                     .replace(".", " ")
@@ -466,7 +493,7 @@ class Moderation(Cog):
             log.debug("There is no nickname to set or nickname is already correct")
             return
 
-        if await self.bot.redis.ratelimited(f"nick:{key}", limit=8, timespan=15):
+        if await self.bot.ratelimits.limited(f"nick:{key}", 8, 15):
             log.warning("Rate limit exceeded for key: %s, deleting key.", key)
             await self.bot.db.execute(
                 """
@@ -4778,7 +4805,15 @@ class Moderation(Cog):
                 jai.id,
                 role.id,
             )
-            await self.bot.db.execute("INSERT INTO cases VALUES ($1,$2)", ctx.guild.id, 0)
+            await self.bot.db.execute(
+                """
+                INSERT INTO cases (guild_id, count)
+                VALUES ($1, $2)
+                ON CONFLICT (guild_id) DO NOTHING
+                """,
+                ctx.guild.id,
+                0,
+            )
             
             return await ctx.approve("I have **enabled** the jail system!")
             
@@ -5384,7 +5419,7 @@ class Moderation(Cog):
         """
         Ban a certain number of newest members from the server.
         """
-        if await self.bot.redis.ratelimited(f"chunkban:{ctx.guild.id}", 1, 180):
+        if await self.bot.ratelimits.limited(f"chunkban:{ctx.guild.id}", 1, 180, shared=True):
             return await ctx.warn("This command can only be used **once per three minutes**!")
 
         if not ctx.guild.chunked:
@@ -5435,7 +5470,7 @@ class Moderation(Cog):
         """
         Ban members with default avatars.
         """
-        if await self.bot.redis.ratelimited(f"chunkban:{ctx.guild.id}", 1, 180):
+        if await self.bot.ratelimits.limited(f"chunkban:{ctx.guild.id}", 1, 180, shared=True):
             return await ctx.warn("This command can only be used **once per three minutes**!")
 
         if not ctx.guild.chunked:
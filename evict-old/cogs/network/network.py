@@ -642,18 +642,22 @@ class Network(Cog):
         return int(xp * multiplier)
 
     async def root_handler(self, request):
+        clusters = await self.bot.ipc.request("stats")
         return web.json_response(
             {
-            "commands": {len([cmd for cmd in self.bot.walk_commands() if cmd.cog_name != 'Jishaku' and cmd.cog_name != 'Owner'])},
+            "commands": len([cmd for cmd in self.bot.walk_commands() if cmd.cog_name != 'Jishaku' and cmd.cog_name != 'Owner']),
             "latency": self.bot.latency * 1000,
             "cache": {
-                "guilds": len(self.bot.guilds),
-                "users": len([user for user in self.bot.users if not user.bot]),
+                "guilds": sum(stats["guilds"] for stats in clusters.values()),
+                "users": sum(stats["users"] for stats in clusters.values()),
             },
             }
         )
 
     async def cog_load(self) -> None:
+        if self.bot.cluster_id != 0:
+            return
+
         host = config.NETWORK.HOST
         port = config.NETWORK.PORT
         
@@ -714,6 +718,9 @@ class Network(Cog):
         log.info(f"Started the internal API on {host}:{port}.")
 
     async def cog_unload(self) -> None:
+        if not self.runner:
+            return
+
         if self.site:
             await self.site.stop()
             log.info("Stopped the TCP site")
@@ -886,17 +893,23 @@ class Network(Cog):
     @route("/status")
     # @ratelimit(5, 60)
     async def status(self, request: Request) -> Response:
+        clusters = await self.bot.ipc.request("stats")
+        shards = {
+            shard_id: shard
+            for stats in clusters.values()
+            for shard_id, shard in stats["shards"].items()
+        }
         return web.json_response(
             {
                 "shards": [
                     {
-                        "guilds": f"{len([guild for guild in self.bot.guilds if guild.shard_id == shard.id])}",
-                        "id": f"{shard.id}",
-                        "ping": f"{(shard.latency * 1000):.2f}ms",
+                        "guilds": f"{shard['guilds']}",
+                        "id": f"{shard_id}",
+                        "ping": f"{(shard['latency'] * 1000):.2f}ms",
                         "uptime": f"{int(self.bot.uptime2)}",
-                        "users": f"{sum(guild.member_count for guild in self.bot.guilds if guild.shard_id == shard.id)}",
+                        "users": f"{shard['users']}",
                     }
-                    for shard in self.bot.shards.values()
+                    for shard_id, shard in sorted(shards.items())
                 ]
             }
         )
@@ -104,6 +104,9 @@ class Owner(
     def __init__(self, bot: Evict):
         self.bot = bot
 
+    async def cog_load(self) -> None:
+        self.bot.ipc.route("reload")(self.reload_extensions)
+
     async def cog_check(self, ctx: Context) -> bool:
         return ctx.author.id in self.bot.owner_ids
 
@@ -498,11 +501,24 @@ class Owner(
         *extensions: Annotated[str, ExtensionConverter],
     ) -> Message:
         """
-        Reload an extension.
+        Reload an extension on every cluster.
+        """
+        clusters = await self.bot.ipc.request("reload", list(chain(*extensions)))
+
+        return await ctx.send(
+            "\n".join(
+                f"**Cluster {cluster_id}**\n" + "\n".join(result)
+                for cluster_id, result in sorted(clusters.items())
+            )
+        )
+
+    async def reload_extensions(self, extensions: List[str]) -> List[str]:
+        """
+        Reload extensions on this cluster.
         """
         result: List[str] = []
 
-        for extension in chain(*extensions):
+        for extension in extensions:
             extension = "cogs." + extension.replace("extensions", "")
             method, icon = (
                 (
@@ -526,7 +542,50 @@ class Owner(
             else:
                 result.append(f"{icon} `{extension}`")
 
-        return await ctx.send("\n".join(result))
+        return result
+
+    @group(aliases=["limits"], invoke_without_command=True)
+    async def ratelimits(self, ctx: Context, key: Optional[str] = None) -> Message:
+        """
+        View the most limited keys, or the counters of one key.
+        """
+        limiter = self.bot.ratelimits
+        if key:
+            if not (stats := limiter.stats(key)):
+                return await ctx.warn(f"No rate limit checks for `{key}` yet!")
+
+            return await ctx.neutral(
+                f"`{key}` was allowed **{stats.allowed}** times and limited **{stats.limited}** times"
+            )
+
+        if not (hottest := limiter.hottest()):
+            return await ctx.warn("No keys have been rate limited yet!")
+
+        return await ctx.send(
+            codeblock(
+                "\n".join(
+                    f"{key:<48} {stats.limited:>8} / {stats.allowed + stats.limited}"
+                    for key, stats in hottest
+                )
+            )
+        )
+
+    @ratelimits.command(name="benchmark", aliases=["bench"])
+    async def ratelimits_benchmark(self, ctx: Context, messages: int = 20_000) -> Message:
+        """
+        Measure the cost of a rate limit check per tier.
+        """
+        async with ctx.typing():
+            results = await self.bot.ratelimits.benchmark(messages)
+
+        return await ctx.send(
+            codeblock(
+                "\n".join(
+                    f"{tier:<14} {value:10.2f}{'' if tier.endswith('calls') else 'μs'}"
+                    for tier, value in results.items()
+                )
+            )
+        )
 
     @command(aliases=["debug"])
     async def logger(self, ctx: Context, module: str, level: str = "DEBUG") -> None:
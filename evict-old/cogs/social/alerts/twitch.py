@@ -53,7 +53,10 @@ class TwitchAlerts(MixinMeta, metaclass=CompositeMetaClass):
                 role_id,
                 template
             FROM alerts.twitch
+            WHERE (guild_id >> 22) % $1 = ANY($2::INTEGER[])
             """,
+            self.bot.shard_count or 1,
+            self.bot.owned_shards,
         )
         if not records:
             return
@@ -66,11 +69,13 @@ class TwitchAlerts(MixinMeta, metaclass=CompositeMetaClass):
             return
 
         for stream in streams:
-            records = [
-                record for record in records if record["twitch_id"] == stream.user_id
+            matches = [
+                record
+                for record in records
+                if record["twitch_id"] == stream.user_id
+                and record["last_stream_id"] != stream.id
             ]
-
-            if not records or stream.id == records[0]["last_stream_id"]:
+            if not matches:
                 continue
 
             await self.bot.db.execute(
@@ -78,14 +83,17 @@ class TwitchAlerts(MixinMeta, metaclass=CompositeMetaClass):
                 UPDATE alerts.twitch
                 SET last_stream_id = $2
                 WHERE twitch_id = $1
+                AND (guild_id >> 22) % $3 = ANY($4::INTEGER[])
                 """,
                 stream.user_id,
                 stream.id,
+                self.bot.shard_count or 1,
+                self.bot.owned_shards,
             )
             self.bot.dispatch(
                 "twitch_alert",
                 stream,
-                records,
+                matches,
             )
 
     @twitch_alerts.before_loop
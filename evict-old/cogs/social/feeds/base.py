@@ -1,11 +1,22 @@
 import asyncio
-from typing import List, Optional, TypedDict
+from collections import defaultdict
+from contextlib import suppress
+from heapq import heappop, heappush
+from logging import getLogger
+from random import uniform
+from time import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple, TypedDict, cast
 
 from discord import TextChannel, Thread
 from xxhash import xxh32_hexdigest
 
+from core.client.codec import MSGPACK, Namespace
 from main import Evict
 
+log = getLogger("evict/feeds")
+
+CURSORS = Namespace("feed:cursor", MSGPACK)
+
 
 class BaseRecord(TypedDict):
     guild_id: int
@@ -13,17 +24,54 @@ class BaseRecord(TypedDict):
     template: Optional[str]
 
 
+class Cursor(TypedDict, total=False):
+    last_seen: float
+    etag: str
+    interval: float
+
+
+class Source:
+    """
+    An upstream account and the channels subscribed to it.
+    """
+
+    key: str | int
+    records: List[BaseRecord]
+    interval: float
+    next_poll: float
+    cursor: Optional[Cursor]
+
+    def __init__(self, key: str | int, records: List[BaseRecord], interval: float):
+        self.key = key
+        self.records = records
+        self.interval = interval
+        self.next_poll = 0
+        self.cursor = None
+
+    def __repr__(self) -> str:
+        return f"<Source key={self.key!r} records={len(self.records)} interval={self.interval:.0f}s>"
+
+
 class Feed:
     """
     Base class for all Social Feeds.
+
+    Every account is a source in a priority queue ordered by its next poll.
+    The interval of a source adapts to how often the account posts,
+    and the number of concurrent polls is bounded per feed.
     """
 
     bot: Evict
     name: str
     posted: int = 0
-    scheduled_deletion: List[int] = []
     task: Optional[asyncio.Task] = None
 
+    table: str = ""
+    column: str = ""
+    concurrency: int = 2
+    min_interval: float = 60 * 2
+    max_interval: float = 60 * 60
+
     def __init__(
         self,
         bot: Evict,
@@ -32,6 +80,13 @@ class Feed:
     ):
         self.bot = bot
         self.name = name
+        self.scheduled_deletion: List[int] = []
+        self.sources: Dict[str | int, Source] = {}
+        self.queue: List[Tuple[float, str | int]] = []
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.updated: Set[int] = set()
+        self.wakeup = asyncio.Event()
+        bot.add_listener(self.on_social_feed_update)
         self.task = asyncio.create_task(self.feed())
 
     def __repr__(self) -> str:
@@ -52,6 +107,46 @@ class Feed:
     async def feed(self) -> None:
         """
         The feed task.
+        Waits for the guild cache so missing guilds aren't purged early.
+        """
+
+        await self.bot.wait_until_ready()
+        await self.load()
+        while True:
+            if self.updated:
+                guild_ids, self.updated = self.updated, set()
+                await self.refresh(guild_ids)
+
+            if self.scheduled_deletion:
+                await self.purge()
+
+            if not self.queue:
+                await self.wait(self.max_interval)
+                continue
+
+            due, key = self.queue[0]
+            source = self.sources.get(key)
+            if not source or source.next_poll != due:
+                heappop(self.queue)
+                continue
+
+            delay = due - time()
+            if delay > 0:
+                await self.wait(delay)
+                continue
+
+            heappop(self.queue)
+            await self.semaphore.acquire()
+            task = self.bot.loop.create_task(
+                self.run(source),
+                name=f"{self.name}-{source.key}",
+            )
+            task.add_done_callback(lambda _: self.semaphore.release())
+
+    async def poll(self, source: Source) -> int:
+        """
+        Fetch and dispatch new posts for a source.
+        Returns the amount of new posts.
         """
 
         raise NotImplementedError
@@ -61,10 +156,28 @@ class Feed:
         Stop the feed task.
         """
 
+        self.bot.remove_listener(self.on_social_feed_update)
         if self.task:
             self.task.cancel("Feed stopped.")
             self.task = None
 
+    async def on_social_feed_update(self, name: str, guild_id: int) -> None:
+        """
+        Dispatched whenever a guild modifies its feeds.
+        """
+
+        if name != self.name:
+            return
+
+        self.updated.add(guild_id)
+        self.wakeup.set()
+
+    async def wait(self, delay: float) -> None:
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self.wakeup.wait(), timeout=delay)
+
+        self.wakeup.clear()
+
     async def get_records(self) -> dict[str | int, List[BaseRecord]]:
         """
         Get records receiving the feed.
@@ -72,9 +185,142 @@ class Feed:
         This will group the feeds based on the name_id,
         Which means that if you have multiple feeds for the same
         name_id, it will only fetch that user once.
+        Only guilds on this cluster's shards are loaded.
         """
 
-        raise NotImplementedError
+        records = cast(
+            List[BaseRecord],
+            await self.bot.db.fetch(
+                f"""
+                SELECT *
+                FROM {self.table}
+                WHERE (guild_id >> 22) % $1 = ANY($2::INTEGER[])
+                """,
+                self.bot.shard_count or 1,
+                self.bot.owned_shards,
+            ),
+        )
+
+        result: Dict[str | int, List[BaseRecord]] = defaultdict(list)
+        for record in records:
+            result[record[self.column]].append(record)
+
+        return result
+
+    async def load(self) -> None:
+        """
+        Populate the queue, spreading the first polls over the minimum interval.
+        """
+
+        now = time()
+        for key, records in (await self.get_records()).items():
+            source = self.sources[key] = Source(key, records, self.min_interval)
+            self.schedule(source, now + uniform(0, self.min_interval))
+
+        log.debug("Loaded %s sources for the %s feed.", len(self.sources), self.name)
+
+    async def refresh(self, guild_ids: Iterable[int]) -> None:
+        """
+        Reload the subscriptions of specific guilds.
+        """
+
+        guild_ids = [guild_id for guild_id in guild_ids if self.bot.owns(guild_id)]
+        if not guild_ids:
+            return
+
+        records = cast(
+            List[BaseRecord],
+            await self.bot.db.fetch(
+                f"""
+                SELECT *
+                FROM {self.table}
+                WHERE guild_id = ANY($1::BIGINT[])
+                """,
+                guild_ids,
+            ),
+        )
+
+        for source in self.sources.values():
+            source.records = [
+                record
+                for record in source.records
+                if record["guild_id"] not in guild_ids
+            ]
+
+        now = time()
+        for record in records:
+            key = record[self.column]
+            source = self.sources.get(key)
+            if not source:
+                source = self.sources[key] = Source(key, [], self.min_interval)
+                self.schedule(source, now)
+
+            source.records.append(record)
+
+        await self.prune()
+
+    async def purge(self) -> None:
+        """
+        Remove subscriptions for channels which can no longer receive posts.
+        Rows of guilds on other clusters are never touched.
+        """
+
+        channel_ids, self.scheduled_deletion = set(self.scheduled_deletion), []
+        await self.bot.db.execute(
+            f"""
+            DELETE FROM {self.table}
+            WHERE channel_id = ANY($1::BIGINT[])
+            AND (guild_id >> 22) % $2 = ANY($3::INTEGER[])
+            """,
+            list(channel_ids),
+            self.bot.shard_count or 1,
+            self.bot.owned_shards,
+        )
+
+        for source in self.sources.values():
+            source.records = [
+                record
+                for record in source.records
+                if record["channel_id"] not in channel_ids
+            ]
+
+        await self.prune()
+
+    async def prune(self) -> None:
+        for key in [key for key, source in self.sources.items() if not source.records]:
+            del self.sources[key]
+            await self.redis.delete(CURSORS.key(f"{self.name}:{key}"))
+
+    def schedule(self, source: Source, at: float) -> None:
+        source.next_poll = at
+        heappush(self.queue, (at, source.key))
+
+    async def run(self, source: Source) -> None:
+        ident = f"{self.name}:{source.key}"
+        found: Optional[int] = None
+
+        try:
+            if source.cursor is None:
+                source.cursor = cast(Cursor, await self.redis.fetch(CURSORS, ident) or {})
+                source.interval = source.cursor.get("interval", source.interval)
+
+            found = await self.poll(source)
+        except Exception:
+            log.exception("Failed to poll %s source %r.", self.name, source.key)
+
+        if found is None:
+            source.interval = min(source.interval * 2, self.max_interval)
+        elif found:
+            source.interval = max(source.interval / 2, self.min_interval)
+        else:
+            source.interval = min(source.interval * 1.25, self.max_interval)
+
+        if self.sources.get(source.key) is not source:
+            return
+
+        self.schedule(source, time() + source.interval * uniform(0.9, 1.1))
+        source.cursor = cast(Cursor, {**(source.cursor or {}), "interval": source.interval})
+        await self.redis.store(CURSORS, ident, source.cursor)
 
     def can_post(self, channel: TextChannel | Thread) -> bool:
         """
@@ -14,7 +14,7 @@ from cogs.social.models.pinterest.saved import Pin, SavedPins
 from main import Evict
 from tools.formatter import plural
 
-from .base import BaseRecord, Feed
+from .base import BaseRecord, Feed, Source
 
 log = getLogger("evict/pinterest")
 
@@ -33,40 +33,31 @@ class Pinterest(Feed):
     Listener for new saved pins.
     """
 
+    table = "feeds.pinterest"
+    column = "pinterest_id"
+    concurrency = 3
+    min_interval = 60 * 2
+    max_interval = 60 * 30
+
     def __init__(self, bot: Evict):
         super().__init__(
             bot,
             name="Pinterest",
         )
 
-    async def feed(self) -> None:
-        while True:
-            records = cast(
-                List[Record],
-                await self.bot.db.fetch(
-                    """
-                    SELECT *
-                    FROM feeds.pinterest
-                    """
-                ),
-            )
-            for record in records:
-                self.bot.loop.create_task(self.get_pins(record))
-                await asyncio.sleep(uniform(1, 3.5))
-
-            if self.scheduled_deletion:
-                await self.bot.db.execute(
-                    """
-                    DELETE FROM feeds.pinterest
-                    WHERE channel_id = ANY($1::BIGINT[])
-                    """,
-                    self.scheduled_deletion,
-                )
-                self.scheduled_deletion.clear()
+    async def poll(self, source: Source) -> int:
+        """
+        Fetch new pins for every channel subscribed to a user.
+        The bookmark and sent pins kept per channel act as the cursor.
+        """
 
-            await asyncio.sleep(60 * 2)
+        found = 0
+        for record in cast(List[Record], source.records):
+            found += await self.get_pins(record)
 
-    async def get_pins(self, record: Record) -> None:
+        return found
+
+    async def get_pins(self, record: Record) -> int:
         """
         Fetches new pins for a user.
         """
@@ -96,7 +87,7 @@ class Pinterest(Feed):
                 username,
                 user_id,
             )
-            return
+            return 0
 
         sent_pins = await self.bot.redis.smembers(sent_key)
         pins = [pin for pin in data.pins if pin.id not in sent_pins]
@@ -127,13 +118,15 @@ class Pinterest(Feed):
                     username,
                     user_id,
                 )
-            return
+            return 0
 
         shuffle(pins)
         for chunk in as_chunks(pins[:15], 3):
             await self.dispatch(sent_key, record, chunk)
             await asyncio.sleep(uniform(1, 2.5))
 
+        return len(pins[:15])
+
     async def dispatch(self, sent_key: str, record: Record, pins: List[Pin]) -> None:
         """
         Dispatch chunks of pins to the subscription channel.
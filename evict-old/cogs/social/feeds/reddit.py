@@ -1,15 +1,17 @@
 import asyncio
+from collections import defaultdict, deque
 from contextlib import suppress
 from datetime import datetime, timezone
 from html import unescape
 from io import BytesIO
 from logging import getLogger
-from typing import Dict, List, Optional, cast
+from time import time
+from typing import Deque, Dict, List, Optional, Set, cast
 
 import validators
 from asyncpraw import Reddit as Client
 from asyncpraw.models.reddit.submission import Submission
-from asyncpraw.models.reddit.subreddit import Subreddit, SubredditStream
+from asyncpraw.models.reddit.subreddit import Subreddit
 from discord import Embed, File, HTTPException, TextChannel, Thread
 
 from cogs.social.reposters.reddit import Reddit as RedditReposter
@@ -22,110 +24,291 @@ from .base import BaseRecord, Feed
 log = getLogger("evict/reddit")
 
 
+GROUP_SIZE = 100
+GROUP_LENGTH = 1800
+LISTING_LIMIT = 100
+TARGET_POSTS = 25
+MIN_INTERVAL = 30
+MAX_INTERVAL = 60 * 10
+REFRESH_INTERVAL = 60 * 10
+SEEN_SIZE = 20_000
+
+
 class Record(BaseRecord):
     subreddit_name: str
 
 
+class Group:
+    """
+    A set of subreddits polled through one multi-subreddit listing.
+    """
+
+    subreddits: List[str]
+    interval: float
+    rate: float
+    next_poll: float
+    last_poll: Optional[float]
+
+    def __init__(self, subreddits: List[str]):
+        self.subreddits = subreddits
+        self.interval = MIN_INTERVAL
+        self.rate = 0
+        self.next_poll = 0
+        self.last_poll = None
+
+    def __repr__(self) -> str:
+        return f"<Group subreddits={len(self.subreddits)} interval={self.interval:.0f}s>"
+
+    @property
+    def path(self) -> str:
+        return "+".join(self.subreddits)
+
+    def schedule(self, found: int, now: float) -> None:
+        """
+        Adjust the polling interval from the observed post velocity.
+        The interval targets a fraction of the listing window,
+        so a burst of posts can't push unseen posts out of it.
+        Quiet groups slow down gradually rather than all at once.
+        """
+
+        if self.last_poll is not None:
+            elapsed = max(now - self.last_poll, 1)
+            self.rate = 0.3 * (found / elapsed) + 0.7 * self.rate
+
+        target = TARGET_POSTS / self.rate if self.rate else MAX_INTERVAL
+        self.last_poll = now
+        self.interval = min(
+            max(min(target, self.interval * 1.5), MIN_INTERVAL),
+            MAX_INTERVAL,
+        )
+        self.next_poll = now + self.interval
+
+    def backoff(self, now: float) -> None:
+        self.interval = min(self.interval * 2, MAX_INTERVAL)
+        self.next_poll = now + self.interval
+
+
+class Seen:
+    """
+    A bounded set of submission IDs, the oldest are evicted first.
+    """
+
+    def __init__(self, size: int):
+        self.order: Deque[str] = deque()
+        self.members: Set[str] = set()
+        self.size = size
+
+    def __contains__(self, item: str) -> bool:
+        return item in self.members
+
+    def add(self, item: str) -> None:
+        if item in self.members:
+            return
+
+        if len(self.order) >= self.size:
+            self.members.discard(self.order.popleft())
+
+        self.order.append(item)
+        self.members.add(item)
+
+
 class Reddit(Feed):
     """
     Listener for new submissions.
+
+    Subreddits are grouped into multi-subreddit listings,
+    so the number of requests scales with the groups rather than the subreddits.
     """
 
-    streams: Dict[str, asyncio.Task]
+    groups: List[Group]
+    subscriptions: Dict[str, List[Record]]
+    added: Dict[str, float]
+    seen: Seen
+    changed: asyncio.Event
     reposter: RedditReposter
 
     def __init__(self, bot: Evict):
+        self.groups = []
+        self.subscriptions = {}
+        self.added = {}
+        self.seen = Seen(SEEN_SIZE)
+        self.changed = asyncio.Event()
+        self.changed.set()
         super().__init__(bot, name="Reddit")
         bot.reddit = Client(
             client_id=AUTHORIZATION.REDDIT.CLIENT_ID,
             client_secret=AUTHORIZATION.REDDIT.CLIENT_SECRET,
             user_agent=bot.user_agent,
         )
-        self.streams = {}
         self.reposter = RedditReposter(bot, add_listener=False)
+        bot.add_listener(self.on_reddit_feed_update)
 
     async def stop(self) -> None:
-        for stream in self.streams:
-            self.streams[stream].cancel()
-
+        self.bot.remove_listener(self.on_reddit_feed_update)
         await self.bot.reddit.close()
         return await super().stop()
 
-    async def start_stream(self, display_name: str) -> None:
-        subreddit: Subreddit = await self.bot.reddit.subreddit(display_name)
-        stream: SubredditStream = subreddit.stream
-
-        log.debug("Started submission stream for r/%s.", display_name)
-        retry_attempts = 3
-
-        for attempt in range(retry_attempts):
-            try:
-                async for submission in stream.submissions(skip_existing=True):
-                    await self.dispatch(submission)
-                break
-
-            except Exception as e:
-                log.error(
-                    "Error in stream for r/%s (attempt %d): %s",
-                    display_name,
-                    attempt + 1,
-                    e,
+    async def on_reddit_feed_update(self) -> None:
+        """
+        Dispatched whenever `feeds.reddit` is modified.
+        """
+
+        self.changed.set()
+
+    async def get_records(self) -> dict[str, List[Record]]:
+        records = cast(
+            List[Record],
+            await self.bot.db.fetch(
+                """
+                SELECT *
+                FROM feeds.reddit
+                WHERE (guild_id >> 22) % $1 = ANY($2::INTEGER[])
+                """,
+                self.bot.shard_count or 1,
+                self.bot.owned_shards,
+            ),
+        )
+
+        result: Dict[str, List[Record]] = defaultdict(list)
+        for record in records:
+            result[record["subreddit_name"].lower()].append(record)
+
+        return result
+
+    async def refresh(self) -> None:
+        """
+        Reload the subscription map and regroup the subreddits.
+        """
+
+        if self.scheduled_deletion:
+            await self.bot.db.execute(
+                """
+                DELETE FROM feeds.reddit
+                WHERE channel_id = ANY($1::BIGINT[])
+                AND (guild_id >> 22) % $2 = ANY($3::INTEGER[])
+                """,
+                self.scheduled_deletion,
+                self.bot.shard_count or 1,
+                self.bot.owned_shards,
+            )
+            self.scheduled_deletion.clear()
+
+        self.subscriptions = await self.get_records()
+
+        now = time()
+        self.added = {
+            subreddit: self.added.get(subreddit, now)
+            for subreddit in self.subscriptions
+        }
+
+        previous = {
+            subreddit: group
+            for group in self.groups
+            for subreddit in group.subreddits
+        }
+        groups: List[Group] = []
+        chunk: List[str] = []
+        for subreddit in sorted(self.subscriptions):
+            if chunk and (
+                len(chunk) >= GROUP_SIZE
+                or len("+".join(chunk)) + len(subreddit) + 1 > GROUP_LENGTH
+            ):
+                groups.append(Group(chunk))
+                chunk = []
+
+            chunk.append(subreddit)
+
+        if chunk:
+            groups.append(Group(chunk))
+
+        for group in groups:
+            prior = [previous[name] for name in group.subreddits if name in previous]
+            if prior:
+                group.rate = max(old.rate for old in prior)
+                group.interval = min(old.interval for old in prior)
+                group.last_poll = min(
+                    (old.last_poll for old in prior if old.last_poll),
+                    default=None,
                 )
-                if attempt < retry_attempts - 1:
-                    await asyncio.sleep(2**attempt)
-                else:
-                    log.error(
-                        "Max retry attempts reached for r/%s. Stopping stream.",
-                        display_name,
-                    )
-                    self.streams.pop(display_name, None)
+                group.next_poll = min(old.next_poll for old in prior)
+
+        self.groups = groups
+        log.debug(
+            "Grouped %s subreddits into %s listings.",
+            len(self.subscriptions),
+            len(self.groups),
+        )
 
     async def feed(self) -> None:
+        await self.bot.wait_until_ready()
+        refreshed = 0.0
         while True:
-            subreddits = cast(
-                List[str],
-                await self.bot.db.fetchval(
-                    """
-                    SELECT ARRAY_AGG(subreddit_name)
-                    FROM feeds.reddit
-                    """,
-                ),
+            if self.changed.is_set() or time() - refreshed > REFRESH_INTERVAL:
+                self.changed.clear()
+                await self.refresh()
+                refreshed = time()
+
+            if not self.groups:
+                await self.wait(REFRESH_INTERVAL)
+                continue
+
+            group = min(self.groups, key=lambda group: group.next_poll)
+            delay = group.next_poll - time()
+            if delay > 0:
+                await self.wait(delay)
+                continue
+
+            await self.poll(group)
+
+    async def wait(self, delay: float) -> None:
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self.changed.wait(), timeout=delay)
+
+    async def poll(self, group: Group) -> None:
+        """
+        Fetch the newest submissions of a group
+        and dispatch the ones which haven't been seen.
+        """
+
+        try:
+            subreddit: Subreddit = await self.bot.reddit.subreddit(group.path)
+            submissions: List[Submission] = [
+                submission
+                async for submission in subreddit.new(limit=LISTING_LIMIT)
+            ]
+        except Exception as exc:
+            group.backoff(time())
+            log.error(
+                "Failed to poll %s subreddits, retrying in %ss: %s",
+                len(group.subreddits),
+                int(group.interval),
+                exc,
             )
-            for subreddit in subreddits:
-                if subreddit in self.streams:
-                    continue
+            return
 
-                self.streams[subreddit] = self.bot.loop.create_task(
-                    self.start_stream(subreddit),
-                    name=f"Reddit-{subreddit}",
-                )
-                self.streams[subreddit].add_done_callback(
-                    lambda _: (
-                        log.debug(
-                            "Stopped submission stream for r/%s.",
-                            _.get_name().split("-")[-1],
-                        ),
-                        self.streams.pop(_.get_name().split("-")[-1]),
-                    ),
-                )
+        found = 0
+        for submission in reversed(submissions):
+            if submission.id in self.seen:
+                continue
 
-            for stream in list(self.streams):
-                if stream not in subreddits:
-                    self.streams[stream].cancel()
-
-            if self.scheduled_deletion:
-                await self.bot.db.execute(
-                    """
-                    DELETE FROM feeds.reddit
-                    WHERE channel_id = ANY($1::BIGINT[])
-                    """,
-                    self.scheduled_deletion,
-                )
-                self.scheduled_deletion.clear()
+            self.seen.add(submission.id)
+            name = submission.subreddit.display_name.lower()
+            if submission.created_utc < self.added.get(name, float("inf")):
+                continue
+
+            records = self.subscriptions.get(name)
+            if not records:
+                continue
+
+            found += 1
+            self.bot.loop.create_task(
+                self.dispatch(submission, records),
+                name=f"Reddit-{submission.id}",
+            )
 
-            await asyncio.sleep(60 * 10)
+        group.schedule(found, time())
 
-    async def dispatch(self, submission: Submission) -> None:
+    async def dispatch(self, submission: Submission, records: List[Record]) -> None:
         """
         Dispatch a submission to the subscription channels
         """
@@ -179,18 +362,6 @@ class Reddit(Feed):
                     buffer = await data.requested_downloads[-1].read()
                     extension = data.ext
 
-        records = cast(
-            List[Record],
-            await self.bot.db.fetch(
-                """
-                SELECT *
-                FROM feeds.reddit
-                WHERE subreddit_name = $1
-                """,
-                submission.subreddit.display_name,
-            ),
-        )
-
         for record in records:
             guild = self.bot.get_guild(record["guild_id"])
             if not guild:
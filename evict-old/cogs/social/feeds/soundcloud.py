@@ -1,10 +1,7 @@
-import asyncio
-from collections import defaultdict
 from contextlib import suppress
 from datetime import timedelta
 from logging import getLogger
-from random import uniform
-from typing import Dict, List, cast
+from typing import List, cast
 
 from discord import AllowedMentions, HTTPException, TextChannel, Thread
 from discord.utils import utcnow
@@ -13,7 +10,7 @@ from cogs.social.models.soundcloud import Track, User
 from main import Evict
 from tools.conversion.script import Script
 
-from .base import BaseRecord, Feed
+from .base import BaseRecord, Feed, Source
 
 log = getLogger("evict/soundcloud")
 
@@ -28,69 +25,54 @@ class SoundCloud(Feed):
     Listener for new tracks.
     """
 
+    table = "feeds.soundcloud"
+    column = "soundcloud_id"
+    concurrency = 4
+    min_interval = 60 * 3
+    max_interval = 60 * 60
+
     def __init__(self, bot: Evict):
         super().__init__(
             bot,
             name="SoundCloud",
         )
 
-    async def feed(self) -> None:
-        while True:
-            records = await self.get_records()
-            for soundcloud_id, records in records.items():
-                self.bot.loop.create_task(self.get_tracks(soundcloud_id, records))
-                await asyncio.sleep(uniform(0.5, 1.5))
-
-            if self.scheduled_deletion:
-                await self.bot.db.execute(
-                    """
-                    DELETE FROM feeds.soundcloud
-                    WHERE channel_id = ANY($1::BIGINT[])
-                    """,
-                    self.scheduled_deletion,
-                )
-                self.scheduled_deletion.clear()
-
-            await asyncio.sleep(60 * 9)
-
-    async def get_records(self) -> dict[int, List[Record]]:
-        records = cast(
-            List[Record],
-            await self.bot.db.fetch(
-                """
-                SELECT *
-                FROM feeds.soundcloud
-                """,
-            ),
-        )
-
-        result: Dict[int, List[Record]] = defaultdict(list)
-        for record in records:
-            result[record["soundcloud_id"]].append(record)
-
-        return result
-
-    async def get_tracks(self, user_id: int, records: List[Record]) -> None:
+    async def poll(self, source: Source) -> int:
         """
-        Fetch and dispatch new tracks.
+        Fetch and dispatch tracks newer than the cursor.
+        The listing is requested conditionally on its last ETag.
         """
 
-        tracks = await User.tracks(self.bot.session, user_id)
-        if not tracks:
-            log.debug("No tracks found for %s.", user_id)
-            return
-
-        for track in reversed(tracks[:8]):
-            if utcnow() - track.created_at > timedelta(hours=12):
-                continue
-
-            if await self.redis.sismember(self.key, str(track.id)):
-                continue
+        tracks, etag = await User.tracks(
+            self.bot.session,
+            source.key,
+            etag=source.cursor.get("etag"),
+        )
+        if etag:
+            source.cursor["etag"] = etag
 
-            await self.redis.sadd(self.key, str(track.id))
-            await self.dispatch(track.user, track, records)
+        if not tracks:
+            return 0
+
+        last_seen = source.cursor.get("last_seen")
+        tracks = sorted(tracks[:8], key=lambda track: track.created_at)
+        if last_seen is None:
+            source.cursor["last_seen"] = tracks[-1].created_at.timestamp()
+            return 0
+
+        tracks = [
+            track
+            for track in tracks
+            if track.created_at.timestamp() > last_seen
+            and utcnow() - track.created_at <= timedelta(hours=12)
+        ]
+        for track in tracks:
+            await self.dispatch(track.user, track, cast(List[Record], source.records))
+            source.cursor["last_seen"] = track.created_at.timestamp()
             self.posted += 1
 
+        return len(tracks)
+
     async def dispatch(
         self,
         user: User,
@@ -1,23 +1,21 @@
 import asyncio
-from collections import defaultdict
 from contextlib import suppress
-from datetime import timedelta
-from io import BytesIO
+from io import SEEK_END
 from logging import getLogger
 from random import uniform
 from secrets import token_urlsafe
 from textwrap import shorten
-from typing import Dict, List, cast
+from typing import IO, List, Tuple, cast
 
 from discord import AllowedMentions, Embed, File, HTTPException, TextChannel, Thread
-from discord.utils import utcnow
 
-from cogs.social.models.tiktok.posts import BasicUser, Post, Posts
+from cogs.social.models.tiktok.posts import Post, Posts
 from cogs.social.reposters.tiktok import TikTok as TikTokReposter
 from main import Evict
 from tools.conversion.script import Script
+from tools.handlers.relay import MediaTooLarge, Relay
 
-from .base import BaseRecord, Feed
+from .base import BaseRecord, Feed, Source
 
 log = getLogger("evict/tiktok")
 
@@ -33,6 +31,11 @@ class TikTok(Feed):
     """
 
     reposter: TikTokReposter
+    table = "feeds.tiktok"
+    column = "tiktok_id"
+    concurrency = 2
+    min_interval = 60 * 5
+    max_interval = 60 * 60 * 2
 
     def __init__(self, bot: Evict):
         super().__init__(
@@ -41,49 +44,35 @@ class TikTok(Feed):
         )
         self.reposter = TikTokReposter(bot, add_listener=False)
 
-    async def feed(self) -> None:
-        while True:
-            records = await self.get_records()
-            for username, records in records.items():
-                self.bot.loop.create_task(self.get_posts(username, records))
-                await asyncio.sleep(uniform(4, 9))
-
-            if self.scheduled_deletion:
-                await self.bot.db.execute(
-                    """
-                    DELETE FROM feeds.tiktok
-                    WHERE channel_id = ANY($1::BIGINT[])
-                    """,
-                    self.scheduled_deletion,
-                )
-                self.scheduled_deletion.clear()
-
-            await asyncio.sleep(60 * 10)
-
-    async def get_records(self) -> dict[str, List[Record]]:
-        records = cast(
-            List[Record],
-            await self.bot.db.fetch(
-                """
-                SELECT *
-                FROM feeds.tiktok
-                """,
-            ),
-        )
+    async def poll(self, source: Source) -> int:
+        """
+        Fetch and dispatch posts newer than the cursor.
+        """
 
-        result: Dict[str, List[Record]] = defaultdict(list)
-        for record in records:
-            result[record["tiktok_name"]].append(record)
+        records = cast(List[Record], source.records)
+        data = await Posts.fetch(self.bot.browser, records[0]["tiktok_name"])
+        if not data or not data.posts:
+            return 0
 
-        return result
+        last_seen = source.cursor.get("last_seen")
+        posts = sorted(data.posts, key=lambda post: post.created_at)
+        if last_seen is None:
+            source.cursor["last_seen"] = posts[-1].created_at.timestamp()
+            return 0
 
+        posts = [post for post in posts if post.created_at.timestamp() > last_seen]
+        for post in posts:
+            await self.dispatch(post, source.records)
+            source.cursor["last_seen"] = post.created_at.timestamp()
+            self.posted += 1
 
-async def get_posts(self, username: str, records: List[Dict[str, int]]) -> None:
-    data = await Posts.fetch(self.bot.browser, username)
-    if not data:
-        return
+        return len(posts)
+
+    async def dispatch(self, post: Post, records: List[Record]) -> None:
+        """
+        Dispatch a post to the subscription channels.
+        """
 
-    for post in data.posts:
         user = post.author
         embed = Embed(
             title=shorten(post.caption, width=256),
@@ -111,11 +100,7 @@ async def get_posts(self, username: str, records: List[Dict[str, int]]) -> None:
             )
             return
 
-        response = await self.bot.session.get(data.url)
-        if not response.ok:
-            return
-
-        buffer = await response.read()
+        channels: List[Tuple[TextChannel | Thread, Record]] = []
         for record in records:
             guild = self.bot.get_guild(record["guild_id"])
             if not guild:
@@ -131,18 +116,44 @@ async def get_posts(self, username: str, records: List[Dict[str, int]]) -> None:
                 self.scheduled_deletion.append(record["channel_id"])
                 continue
 
+            channels.append((channel, record))
+
+        if not channels:
+            return
+
+        limit = max(channel.guild.filesize_limit for channel, _ in channels)
+        try:
+            async with Relay(self.bot.session).fetch(data.url, limit) as buffer:
+                await self.send(post, embed, buffer, channels)
+        except MediaTooLarge:
+            log.warning("Post %r from @%s is too large to relay.", post.id, user.username)
+
+    async def send(
+        self,
+        post: Post,
+        embed: Embed,
+        buffer: IO[bytes],
+        channels: List[Tuple[TextChannel | Thread, Record]],
+    ) -> None:
+        """
+        Send a relayed post to every channel which can receive its size.
+        """
+
+        size = buffer.seek(0, SEEK_END)
+        for channel, record in channels:
             with suppress(HTTPException):
-                if len(buffer) >= channel.guild.filesize_limit:
+                if size > channel.guild.filesize_limit:
                     continue
 
+                buffer.seek(0)
                 file = File(
-                    BytesIO(buffer),
+                    buffer,
                     filename=f"{self.name}{token_urlsafe(6)}.mp4",
                 )
 
                 script = Script(
                     record["template"] or "",
-                    [channel.guild, channel, user, post],
+                    [channel.guild, channel, post.author, post],
                 )
                 await channel.send(
                     content=script.content,
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 from logging import getLogger
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from aiohttp import ClientSession
 from discord.ext.commands import CommandError
@@ -55,7 +55,17 @@ class User(BaseModel):
         cls,
         session: ClientSession,
         user_id: int,
-    ) -> List[Track]:
+        etag: Optional[str] = None,
+    ) -> Tuple[Optional[List[Track]], Optional[str]]:
+        """
+        Returns the user's tracks and the listing ETag.
+        The tracks are None when the listing hasn't changed since `etag`.
+        """
+
+        headers = {"Authorization": AUTHORIZATION.SOUNDCLOUD}
+        if etag:
+            headers["If-None-Match"] = etag
+
         async with session.get(
             URL.build(
                 scheme="https",
@@ -66,21 +76,25 @@ class User(BaseModel):
                     "offset": 0,
                 },
             ),
-            headers={
-                "Authorization": AUTHORIZATION.SOUNDCLOUD,
-            },
+            headers=headers,
         ) as response:
+            if response.status == 304:
+                return None, etag
+
             if not response.ok:
                 log.debug(
                     "Soundcloud raised an exception for %r: %s",
                     user_id,
                     await response.text(),
                 )
-                return []
+                return [], None
 
             data = await response.json()
             collection = data["collection"]
-            return [Track(**track) for track in collection]
+            return (
+                [Track(**track) for track in collection],
+                response.headers.get("ETag"),
+            )
 
     @classmethod
     async def fetch(
@@ -8,7 +8,6 @@ from io import BytesIO
 from logging import getLogger
 from typing import TYPE_CHECKING, List, Optional, TypedDict, cast
 
-from aiohttp import ClientPayloadError
 from colorama import Fore, Style
 from discord import HTTPException, Message
 from discord.ext.commands import BadArgument
@@ -16,6 +15,7 @@ from discord.http import Route
 from discord.utils import find
 import discord
 from cogs.social.reposters.extraction import Information, download
+from tools.handlers.relay import MediaTooLarge, Relay
 from main import Evict
 from core.client.context import Context
 
@@ -38,6 +38,7 @@ class Reposter:
     bot: Evict
     name: str
     regex: List[str]
+    relayed: bool = False
 
     def __init__(
         self,
@@ -59,6 +60,10 @@ class Reposter:
     def __repr__(self) -> str:
         return f"<Reposter name={self.name!r} regex={self.regex!r}>"
 
+    @property
+    def relay(self) -> Relay:
+        return Relay(self.bot.session)
+
     async def dispatch(
         self,
         ctx: Context,
@@ -102,7 +107,7 @@ class Reposter:
         Fetch the information from the given url.
         """
 
-        return await download(url)
+        return await download(self.bot, url)
 
     async def listener(self, ctx: Context) -> None:
         """
@@ -141,7 +146,7 @@ class Reposter:
                 return
 
         key = f"reposter:{ctx.channel.id}"
-        if await self.bot.redis.ratelimited(key, 2, 8):
+        if await self.bot.ratelimits.limited(key, 2, 8):
             return
 
         async with ctx.typing():
@@ -150,7 +155,10 @@ class Reposter:
                 if not data:
                     return await ctx.send("Failed to fetch that post!")
                     
-                await self.dispatch(ctx, data)
+                await self.process(ctx, data)
+
+            except MediaTooLarge as exc:
+                return await ctx.warn(*exc.args)
                 
             except Exception as e:
                 log.error(f"Error processing URL {url}: {e}")
@@ -196,19 +204,18 @@ class Reposter:
             
         return True
 
-    async def process(self, ctx: Context, url: str) -> None:
-        try:
-            data = await self.fetch(url)
-            if not data:
-                return
+    async def process(self, ctx: Context, data: Information) -> Optional[Message]:
+        """
+        Dispatch the information, relaying the media when the reposter needs it.
+        """
 
-            response = await self.bot.session.get(data["filename"])
-            if not response.ok:
-                return
+        if not self.relayed or not data.url:
+            return await self.dispatch(ctx, data)
 
-            buffer = BytesIO(await response.read())
-            await self.dispatch(ctx, data, buffer)
-            
-        except Exception as e:
-            log.error(f"Error processing URL {url}: {e}")
-            raise
+        async with self.relay.fetch(
+            data.url,
+            ctx.guild.filesize_limit,
+            duration=data.duration,
+            reencode=data.ext == "mp4",
+        ) as buffer:
+            return await self.dispatch(ctx, data, buffer)
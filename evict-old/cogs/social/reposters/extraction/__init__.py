@@ -1,49 +1,29 @@
-from logging import getLogger
-from typing import Optional
+from __future__ import annotations
 
-from jishaku.functools import executor_function
-from yt_dlp import DownloadError, YoutubeDL
+from typing import TYPE_CHECKING, Optional
 
-import config
-from tools import CACHE_ROOT
+from core.client.extraction import ExtractionError
 
 from .models import Information
 
-log = getLogger("evict/ydl")
-log.setLevel("CRITICAL")
-
-
-@executor_function
-def download(url: str, options: dict = {}, **kwargs) -> Optional[Information]:
-    if "download" not in kwargs:
-        kwargs["download"] = False
-
-    YDL_OPTS = {
-        "logger": log,
-        "quiet": True,
-        "verbose": False,
-        "no_warnings": True,
-        "final_ext": "mp4",
-        "age_limit": 18,
-        "concurrent_fragment_downloads": 12,
-        "outtmpl": str(CACHE_ROOT / "%(id)s.%(ext)s"),
-        "cachedir": str(CACHE_ROOT / "ydl"),
-        "noplaylist": True,
-        "restrictfilenames": True,
-        "cookiefile": "cookies.txt",
-        **options,
-    }
-    if "youtu" in url:
-        YDL_OPTS["format"] = "best"
-
-    if config.CLIENT.WARP:
-        YDL_OPTS["proxy"] = config.CLIENT.WARP
-
-    with YoutubeDL(YDL_OPTS) as ydl:
-        try:
-            info = ydl.extract_info(url, **kwargs)
-        except DownloadError:
-            return
-
-        if info:
-            return Information(**info)
+if TYPE_CHECKING:
+    from main import Evict
+
+
+async def download(
+    bot: Evict,
+    url: str,
+    options: Optional[dict] = None,
+    *,
+    download: bool = False,
+) -> Optional[Information]:
+    """
+    Extract a URL through the shared extraction pool.
+    """
+
+    try:
+        info = await bot.extractor.extract(url, options, download=download)
+    except ExtractionError:
+        return None
+
+    return Information(**info)
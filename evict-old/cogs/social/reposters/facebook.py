@@ -39,7 +39,7 @@ class Facebook(Reposter):
                 r"(?:https?://)?(?:www\.)?fb\.watch/(\w+)",
             ],
         )
-        self.downloader = create_downloader()
+        self.downloader = create_downloader(bot)
 
     async def fetch(self, url: str) -> Optional[dict]:
         try:
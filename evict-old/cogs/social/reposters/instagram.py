@@ -1,5 +1,4 @@
 from datetime import datetime
-from io import BytesIO
 from secrets import token_urlsafe
 from typing import Optional
 from pydantic import BaseModel
@@ -66,14 +65,14 @@ class Instagram(Reposter):
             return await ctx.warn("Failed to process Instagram content")
 
         if data.url:
-            async with self.bot.session.get(data.url) as resp:
-                if resp.status != 200:
-                    return await ctx.warn("Failed to download video")
-                
-                video_data = await resp.read()
+            async with self.relay.fetch(
+                data.url,
+                ctx.guild.filesize_limit,
+                duration=data.metadata.duration if data.metadata else None,
+            ) as buffer:
                 return await ctx.send(
                     file=File(
-                        BytesIO(video_data),
+                        buffer,
                         filename=f"Evict{self.name}{token_urlsafe(4)}.mp4",
                     ),
                     no_reference=ctx.settings.reposter_delete,
@@ -10,6 +10,8 @@ from core.client.context import Context
 
 
 class Medal(Reposter):
+    relayed = True
+
     def __init__(self, bot: Evict):
         super().__init__(
             bot,
@@ -29,6 +29,8 @@ class Information(BaseModel):
 
 
 class Pinterest(Reposter):
+    relayed = True
+
     def __init__(self, bot: Evict):
         super().__init__(
             bot,
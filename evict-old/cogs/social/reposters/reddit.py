@@ -8,8 +8,8 @@ from discord import Embed, File, Message
 
 from cogs.social.reposters.base import Information, Reposter
 from cogs.social.reposters.extraction import download
+from tools.handlers.relay import MediaTooLarge
 from main import Evict
-from tools import CACHE_ROOT
 from core.client.context import Context
 
 
@@ -27,19 +27,22 @@ class Reddit(Reposter):
 
     @cache(ttl="1h", prefix="reddit")
     async def fetch(self, url: str) -> Optional[Information]:
-        await CACHE_ROOT.mkdir(parents=True, exist_ok=True)
-        return await download(url, download=True)
+        return await download(self.bot, url, download=True)
 
     async def dispatch(
         self,
         ctx: Context,
         data: Information,
-        buffer: BytesIO,
+        buffer: Optional[BytesIO] = None,
     ) -> Optional[Message]:
         if not data.requested_downloads:
             return
 
-        buffer = await data.requested_downloads[-1].read()
+        download = data.requested_downloads[-1]
+        if download.file_size and download.file_size > ctx.guild.filesize_limit:
+            raise MediaTooLarge()
+
+        path = download.filepath
         embed = Embed(
             url=data.webpage_url,
             title=shorten(data.title or "", width=256),
@@ -56,7 +59,7 @@ class Reddit(Reposter):
         return await ctx.send(
             embed=embed if ctx.settings.reposter_embed else None,
             file=File(
-                buffer,
+                path,
                 filename=f"{self.name}{token_urlsafe(6)}.{data.ext}",
             ),
             no_reference=ctx.settings.reposter_delete,
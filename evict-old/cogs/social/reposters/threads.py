@@ -18,7 +18,7 @@ class Threads(Reposter):
                 r"(?:https?://)?(?:www\.)?threads\.net/@[\w\.]+/post/(\w+)",
             ],
         )
-        self.downloader = create_downloader()
+        self.downloader = create_downloader(bot)
 
     async def fetch(self, url: str):
         try:
@@ -106,15 +106,15 @@ class TikTok(Reposter):
             )
 
         if data.type == "video" and data.url:
-            async with self.bot.session.get(data.url) as resp:
-                if resp.status != 200:
-                    return await ctx.warn("Failed to download video")
-                
-                video_data = await resp.read()
+            async with self.relay.fetch(
+                data.url,
+                ctx.guild.filesize_limit,
+                duration=data.duration,
+            ) as buffer:
                 return await ctx.send(
                     embed=embed if ctx.settings.reposter_embed else None,
                     file=File(
-                        BytesIO(video_data),
+                        buffer,
                         filename=f"Evict{self.name}{token_urlsafe(4)}.mp4",
                     ),
                     no_reference=ctx.settings.reposter_delete,
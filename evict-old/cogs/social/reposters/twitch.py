@@ -11,6 +11,8 @@ from tools.formatter import duration
 
 
 class Twitch(Reposter):
+    relayed = True
+
     def __init__(self, bot: Evict):
         super().__init__(
             bot,
@@ -18,7 +18,7 @@ class Twitter(Reposter):
                 r"(?:https?://)?(?:www\.)?x\.com/(?:\w+)/status/(\d+)",
             ],
         )
-        self.downloader = create_downloader()
+        self.downloader = create_downloader(bot)
 
     async def fetch(self, url: str):
         try:
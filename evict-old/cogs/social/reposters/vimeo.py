@@ -18,7 +18,7 @@ class Vimeo(Reposter):
                 r"(?:https?://)?player\.vimeo\.com/video/(\d+)",
             ],
         )
-        self.downloader = create_downloader()
+        self.downloader = create_downloader(bot)
 
     async def fetch(self, url: str) -> Optional[dict]:
         filename, embed = None, None
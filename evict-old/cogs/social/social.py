@@ -689,6 +689,8 @@ class Social(Alerts, Cog):
             flags.embeds,
             flags.new,
         )
+        self.bot.dispatch("social_feed_update", "Pinterest", ctx.guild.id)
+
         return await ctx.approve(
             f"Now streaming **{'newly' if flags.new else 'old'} saved pins** from [**{user}**]({user.url}){f' (`{board.name}`)' if board else ''} to {channel.mention} {'with an embed' if flags.embeds else 'in batches of `3`'}",
         )
@@ -723,6 +725,8 @@ class Social(Alerts, Cog):
                 f"Saved pins from [**{user}**]({user.url}) are not being streamed!"
             )
 
+        self.bot.dispatch("social_feed_update", "Pinterest", ctx.guild.id)
+
         return await ctx.approve(
             f"No longer streaming saved pins from [**{user}**]({user.url})"
         )
@@ -758,6 +762,8 @@ class Social(Alerts, Cog):
                 f"Saved pins from [**{user}**]({user.url}) are not being streamed!"
             )
 
+        self.bot.dispatch("social_feed_update", "Pinterest", ctx.guild.id)
+
         return await ctx.approve(
             f"{'Now' if status else 'No longer'} displaying **embeds** for [**{user}**]({user.url})"
         )
@@ -786,6 +792,8 @@ class Social(Alerts, Cog):
         if result == "DELETE 0":
             return await ctx.warn("No **Pinterest feeds** exist for this server!")
 
+        self.bot.dispatch("social_feed_update", "Pinterest", ctx.guild.id)
+
         return await ctx.approve(
             f"Successfully  removed {plural(result, md='`'):Pinterest feed}"
         )
@@ -1123,6 +1131,8 @@ class Social(Alerts, Cog):
             user.id,
             user.username,
         )
+        self.bot.dispatch("social_feed_update", "TikTok", ctx.guild.id)
+
         return await ctx.approve(
             f"Now streaming new posts from [**{user}**]({user.url}) to {channel.mention}"
         )
@@ -1157,6 +1167,8 @@ class Social(Alerts, Cog):
                 f"Posts from [**{user}**]({user.url}) are not being streamed!"
             )
 
+        self.bot.dispatch("social_feed_update", "TikTok", ctx.guild.id)
+
         return await ctx.approve(
             f"No longer streaming posts from [**{user}**]({user.url})"
         )
@@ -1198,6 +1210,8 @@ class Social(Alerts, Cog):
             if result == "UPDATE 0":
                 return await ctx.warn("No **TikTok feeds** were modified!")
 
+            self.bot.dispatch("social_feed_update", "TikTok", ctx.guild.id)
+
             return await ctx.approve(
                 "Updated the post message for all **TikTok feeds**"
             )
@@ -1218,6 +1232,8 @@ class Social(Alerts, Cog):
                 f"Posts from [**{user}**]({user.url}) are not being streamed!"
             )
 
+        self.bot.dispatch("social_feed_update", "TikTok", ctx.guild.id)
+
         return await ctx.approve(
             f"Updated the post message for [**{user}**]({user.url})"
         )
@@ -1255,6 +1271,8 @@ class Social(Alerts, Cog):
             if result == "UPDATE 0":
                 return await ctx.warn("No **TikTok feeds** were modified!")
 
+            self.bot.dispatch("social_feed_update", "TikTok", ctx.guild.id)
+
             return await ctx.approve("Reset the post message for all **TikTok feeds**")
 
         result = await self.bot.db.execute(
@@ -1272,6 +1290,8 @@ class Social(Alerts, Cog):
                 f"Posts from [**{user}**]({user.url}) are not being streamed!"
             )
 
+        self.bot.dispatch("social_feed_update", "TikTok", ctx.guild.id)
+
         return await ctx.approve(f"Reset the post message for [**{user}**]({user.url})")
 
     @tiktok.command(
@@ -1298,6 +1318,8 @@ class Social(Alerts, Cog):
         if result == "DELETE 0":
             return await ctx.warn("No **TikTok feeds** exist for this server!")
 
+        self.bot.dispatch("social_feed_update", "TikTok", ctx.guild.id)
+
         return await ctx.approve(
             f"Successfully  removed {plural(result, md='`'):TikTok feed}"
         )
@@ -1425,6 +1447,8 @@ class Social(Alerts, Cog):
             user.id,
             user.permalink,
         )
+        self.bot.dispatch("social_feed_update", "SoundCloud", ctx.guild.id)
+
         return await ctx.approve(
             f"Now streaming new tracks from [**{user}**]({user.url}) to {channel.mention}"
         )
@@ -1460,6 +1484,8 @@ class Social(Alerts, Cog):
                 f"Tracks from [**{user}**]({user.url}) are not being streamed!"
             )
 
+        self.bot.dispatch("social_feed_update", "SoundCloud", ctx.guild.id)
+
         return await ctx.approve(
             f"No longer streaming tracks from [**{user}**]({user.url})"
         )
@@ -1501,6 +1527,8 @@ class Social(Alerts, Cog):
             if result == "UPDATE 0":
                 return await ctx.warn("No **SoundCloud feeds** were modified!")
 
+            self.bot.dispatch("social_feed_update", "SoundCloud", ctx.guild.id)
+
             return await ctx.approve(
                 "Updated the track message for all **SoundCloud feeds**"
             )
@@ -1521,6 +1549,8 @@ class Social(Alerts, Cog):
                 f"Tracks from [**{user}**]({user.url}) are not being streamed!"
             )
 
+        self.bot.dispatch("social_feed_update", "SoundCloud", ctx.guild.id)
+
         return await ctx.approve(
             f"Updated the track message for [**{user}**]({user.url})"
         )
@@ -1558,6 +1588,8 @@ class Social(Alerts, Cog):
             if result == "UPDATE 0":
                 return await ctx.warn("No **SoundCloud feeds** were modified!")
 
+            self.bot.dispatch("social_feed_update", "SoundCloud", ctx.guild.id)
+
             return await ctx.approve(
                 "Reset the track message for all **SoundCloud feeds**"
             )
@@ -1577,6 +1609,8 @@ class Social(Alerts, Cog):
                 f"Tracks from [**{user}**]({user.url}) are not being streamed!"
             )
 
+        self.bot.dispatch("social_feed_update", "SoundCloud", ctx.guild.id)
+
         return await ctx.approve(
             f"Reset the track message for [**{user}**]({user.url})"
         )
@@ -1605,6 +1639,8 @@ class Social(Alerts, Cog):
         if result == "DELETE 0":
             return await ctx.warn("No **SoundCloud feeds** exist for this server!")
 
+        self.bot.dispatch("social_feed_update", "SoundCloud", ctx.guild.id)
+
         return await ctx.approve(
             f"Successfully  removed {plural(result, md='`'):SoundCloud feed}"
         )
@@ -1724,6 +1760,8 @@ class Social(Alerts, Cog):
             channel.id,
             subreddit.display_name,
         )
+        self.bot.dispatch("reddit_feed_update")
+
         return await ctx.approve(
             f"Now streaming new submissions from [**{subreddit.display_name_prefixed}**](https://reddit.com{subreddit.url}) to {channel.mention}"
         )
@@ -1758,6 +1796,8 @@ class Social(Alerts, Cog):
                 f"Submissions from [**{subreddit.display_name_prefixed}**](https://reddit.com{subreddit.url}) are not being streamed!"
             )
 
+        self.bot.dispatch("reddit_feed_update")
+
         return await ctx.approve(
             f"No longer streaming submissions from [**{subreddit.display_name_prefixed}**](https://reddit.com{subreddit.url})"
         )
@@ -1786,6 +1826,8 @@ class Social(Alerts, Cog):
         if result == "DELETE 0":
             return await ctx.warn("No **Subreddit feeds** exist for this server!")
 
+        self.bot.dispatch("reddit_feed_update")
+
         return await ctx.approve(
             f"Successfully  removed {plural(result, md='`'):Subreddit feed}"
         )
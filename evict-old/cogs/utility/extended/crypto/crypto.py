@@ -3,7 +3,7 @@ from logging import getLogger
 from typing import List, Optional, cast
 
 from asyncpg import UniqueViolationError
-from discord import Embed, HTTPException, Message, TextChannel
+from discord import Embed, Forbidden, HTTPException, Message, NotFound, TextChannel
 from discord.ext.commands import group
 from discord.ext.tasks import loop
 from discord.utils import format_dt
@@ -54,7 +54,19 @@ class Crypto(MixinMeta, metaclass=CompositeMetaClass):
                 Optional[TextChannel],
                 self.bot.get_channel(record["channel_id"]),
             )
-            if not user or not channel:
+            if not channel:
+                # The channel may be served by another cluster,
+                # so it's only dropped once Discord no longer has it.
+                try:
+                    await self.bot.fetch_channel(record["channel_id"])
+                except (NotFound, Forbidden):
+                    scheduled_deletion.append(record["transaction_id"])
+                except HTTPException:
+                    pass
+
+                continue
+
+            if not user:
                 scheduled_deletion.append(record["transaction_id"])
                 continue
 
@@ -85,7 +85,10 @@ class Giveaway(MixinMeta, metaclass=CompositeMetaClass):
                 FROM giveaway
                 WHERE ends_at <= NOW()
                 AND ended = FALSE
+                AND (guild_id >> 22) % $1 = ANY($2::INTEGER[])
                 """,
+                self.bot.shard_count or 1,
+                self.bot.owned_shards,
             )
         ]
 
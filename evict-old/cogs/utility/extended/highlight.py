@@ -38,7 +38,11 @@ class Highlight(MixinMeta, metaclass=CompositeMetaClass):
 
     @Cog.listener("on_message")
     async def highlight_listener(self, message: Message) -> None:
-        if not message.guild or message.author.bot:
+        if (
+            not message.guild
+            or message.author.bot
+            or not self.bot.features.active("highlight", message.guild.id)
+        ):
             return
 
         records: List[HighlightRecord] = [
@@ -85,10 +89,10 @@ class Highlight(MixinMeta, metaclass=CompositeMetaClass):
         elif isinstance(message.channel, (DMChannel, GroupChannel, PartialMessageable)):
             return
 
-        if await self.bot.redis.ratelimited(
+        if await self.bot.ratelimits.limited(
             f"highlight:{message.channel.id}:{member.id}",
-            limit=1,
-            timespan=30,
+            1,
+            30,
         ):
             return
 
@@ -154,10 +158,11 @@ class Highlight(MixinMeta, metaclass=CompositeMetaClass):
             await self.bot.db.execute(
                 """
                 DELETE FROM highlights
-                AND user_id = $1
+                WHERE user_id = $1
                 """,
                 member.id,
             )
+            await self.bot.features.refresh("highlight", message.guild.id)
 
     @group(
         aliases=["hl", "snitch"],
@@ -198,6 +203,8 @@ class Highlight(MixinMeta, metaclass=CompositeMetaClass):
                 f"You're already receiving notifications for `{word}`!"
             )
 
+        await self.bot.features.refresh("highlight", ctx.guild.id)
+
         return await ctx.approve(f"You will now receive notifications for `{word}`")
 
     @highlight.command(
@@ -221,6 +228,8 @@ class Highlight(MixinMeta, metaclass=CompositeMetaClass):
             ctx.author.id,
             word,
         )
+        await self.bot.features.refresh("highlight", ctx.guild.id)
+
         if result == "DELETE 0":
             return await ctx.warn(f"You're not receiving notifications for `{word}`!")
 
@@ -250,6 +259,8 @@ class Highlight(MixinMeta, metaclass=CompositeMetaClass):
             ctx.guild.id,
             ctx.author.id,
         )
+        await self.bot.features.refresh("highlight", ctx.guild.id)
+
         if result == "DELETE 0":
             return await ctx.warn("You don't have any highlights!")
 
@@ -1,15 +1,196 @@
+import asyncio
+import time
+from collections import OrderedDict, defaultdict, deque
 from datetime import datetime
 from io import BytesIO
-from typing import List, Optional
+from logging import getLogger
+from typing import ClassVar, Deque, Dict, Iterable, List, Optional, Set, Tuple
 
-from discord import File, Message, Reaction, User
+from discord import File, HTTPException, Message, Reaction, User
 from discord.http import HTTPClient
 from discord.utils import utcnow
 from pydantic import BaseModel
 from typing_extensions import Self
 from xxhash import xxh64_hexdigest
 
+from core.client.codec import MSGPACK, Namespace
 from core.client.redis import Redis
+from tools import CACHE_ROOT
+
+log = getLogger("evict/snipe")
+
+MESSAGE_SNIPES = Namespace("snipe", MSGPACK, ttl=64800, hasher=xxh64_hexdigest)
+REACTION_SNIPES = Namespace("rsnipe", MSGPACK, ttl=14400, hasher=xxh64_hexdigest)
+EDIT_SNIPES = Namespace("esnipe", MSGPACK, ttl=14400, hasher=xxh64_hexdigest)
+
+SNIPE_LIMIT = 100
+
+
+class SnipeRing:
+    """
+    A bounded per-channel ring in front of a Redis snipe list.
+
+    Pushes are written through to Redis in a single pipelined call,
+    and a channel's ring is hydrated from Redis on its first read,
+    after which reads never leave the process. Each entry keeps the
+    time it was pushed and is dropped once the namespace TTL passes.
+    """
+
+    def __init__(self, namespace: Namespace, channels: int = 2048):
+        self.namespace = namespace
+        self.channels = channels
+        self.rings: OrderedDict[int, Deque[Tuple[float, dict]]] = OrderedDict()
+        self.hydrated: Set[int] = set()
+
+    def ring(self, channel_id: int) -> Deque[Tuple[float, dict]]:
+        if channel_id not in self.rings:
+            self.rings[channel_id] = deque(maxlen=SNIPE_LIMIT)
+            while len(self.rings) > self.channels:
+                evicted, _ = self.rings.popitem(last=False)
+                self.hydrated.discard(evicted)
+
+        self.rings.move_to_end(channel_id)
+        return self.rings[channel_id]
+
+    def expire(self, ring: Deque[Tuple[float, dict]]) -> None:
+        if not self.namespace.ttl:
+            return
+
+        cutoff = time.time() - self.namespace.ttl
+        while ring and ring[0][0] <= cutoff:
+            ring.popleft()
+
+    async def push(self, redis: Redis, channel_id: int, *items: dict) -> None:
+        pushed_at = time.time()
+        self.ring(channel_id).extend((pushed_at, item) for item in items)
+        await redis.append(self.namespace, channel_id, *items, limit=SNIPE_LIMIT)
+
+    async def hydrate(self, redis: Redis, channel_id: int) -> Deque[Tuple[float, dict]]:
+        """
+        Load a channel's ring from Redis on its first read.
+        Redis only tracks when the list was last pushed to, so the
+        hydrated entries are stamped with that time.
+        """
+
+        ring = self.ring(channel_id)
+        if channel_id in self.hydrated:
+            self.expire(ring)
+            return ring
+
+        remaining = await redis.ttl(self.namespace.key(channel_id))
+        items = await redis.fetch_range(self.namespace, channel_id, -SNIPE_LIMIT, -1)
+        pushed_at = time.time()
+        if self.namespace.ttl and remaining > 0:
+            pushed_at -= self.namespace.ttl - remaining
+
+        ring.clear()
+        ring.extend((pushed_at, item) for item in items)
+        self.hydrated.add(channel_id)
+        self.expire(ring)
+        return ring
+
+    async def get(self, redis: Redis, channel_id: int, index: int) -> Optional[dict]:
+        ring = await self.hydrate(redis, channel_id)
+        if index < 1 or index > len(ring):
+            return None
+
+        return ring[-index][1]
+
+    async def count(self, redis: Redis, channel_id: int) -> int:
+        return len(await self.hydrate(redis, channel_id))
+
+    async def clear(self, redis: Redis, channel_id: int) -> None:
+        self.rings.pop(channel_id, None)
+        self.hydrated.discard(channel_id)
+        await redis.delete(self.namespace.key(channel_id))
+
+
+class AttachmentStore:
+    """
+    A size capped store of attachments fetched as their message is deleted.
+    The CDN stops serving deleted attachments shortly after, so small ones
+    are kept locally for the snipe commands.
+    """
+
+    def __init__(self, capacity: int = 256 * 1024 * 1024, limit: int = 8 * 1024 * 1024):
+        self.root = CACHE_ROOT / "snipes"
+        self.capacity = capacity
+        self.limit = limit
+        self.entries: OrderedDict[str, int] = OrderedDict()
+        self.size = 0
+        self.tasks: Set[asyncio.Task] = set()
+
+    def prefetch(self, http: HTTPClient, attachments: Iterable["MessageAttachment"]) -> None:
+        for attachment in attachments:
+            if attachment.key and attachment.size <= self.limit:
+                task = asyncio.create_task(self.fetch(http, attachment))
+                self.tasks.add(task)
+                task.add_done_callback(self.tasks.discard)
+
+    async def fetch(self, http: HTTPClient, attachment: "MessageAttachment") -> None:
+        try:
+            buffer = await http.get_from_cdn(attachment.url)
+        except HTTPException as exc:
+            log.debug("Failed to prefetch attachment %s: %s", attachment.url, exc)
+            return
+
+        await self.root.mkdir(parents=True, exist_ok=True)
+        await (self.root / attachment.key).write_bytes(buffer)
+        self.entries[attachment.key] = len(buffer)
+        self.size += len(buffer)
+        while self.size > self.capacity and self.entries:
+            key, size = self.entries.popitem(last=False)
+            self.size -= size
+            await (self.root / key).unlink(missing_ok=True)
+
+    async def sweep(self) -> None:
+        """
+        Rebuild the index from disk after a restart.
+        Files older than a message snipe are deleted and the rest are
+        indexed oldest first, so the capacity still holds across restarts.
+        """
+
+        if not await self.root.exists():
+            return
+
+        cutoff = time.time() - (MESSAGE_SNIPES.ttl or 0)
+        files: List[Tuple[float, str, int]] = []
+        async for path in self.root.iterdir():
+            try:
+                stat = await path.stat()
+                if stat.st_mtime <= cutoff:
+                    await path.unlink(missing_ok=True)
+                else:
+                    files.append((stat.st_mtime, path.name, stat.st_size))
+            except OSError:
+                continue
+
+        self.entries.clear()
+        self.size = 0
+        for _, key, size in sorted(files):
+            self.entries[key] = size
+            self.size += size
+
+        while self.size > self.capacity and self.entries:
+            key, size = self.entries.popitem(last=False)
+            self.size -= size
+            await (self.root / key).unlink(missing_ok=True)
+
+        log.info("Swept the snipe attachment cache, %s files kept.", len(self.entries))
+
+    async def read(self, key: str) -> Optional[bytes]:
+        if key not in self.entries:
+            return None
+
+        self.entries.move_to_end(key)
+        try:
+            return await (self.root / key).read_bytes()
+        except OSError:
+            self.size -= self.entries.pop(key, 0)
+            return None
+
+
+attachments = AttachmentStore()
 
 
 class MessageAttachment(BaseModel):
@@ -17,6 +198,7 @@ class MessageAttachment(BaseModel):
     size: int
     filename: str
     content_type: Optional[str]
+    key: Optional[str] = None
 
     def __str__(self) -> str:
         return self.url
@@ -25,7 +207,10 @@ class MessageAttachment(BaseModel):
         return self.content_type.startswith("image/") if self.content_type else False
 
     async def to_file(self, http: HTTPClient) -> File:
-        buffer = await http.get_from_cdn(self.url)
+        buffer = await attachments.read(self.key) if self.key else None
+        if buffer is None:
+            buffer = await http.get_from_cdn(self.url)
+
         return File(BytesIO(buffer), filename=self.filename)
 
 
@@ -42,6 +227,8 @@ class MessageSnipe(BaseModel):
     attachments: List[MessageAttachment] = []
     stickers: List[str] = []
 
+    store: ClassVar[SnipeRing] = SnipeRing(MESSAGE_SNIPES)
+
     @property
     def filtered(self) -> bool:
         """
@@ -52,10 +239,10 @@ class MessageSnipe(BaseModel):
 
     @staticmethod
     def key(channel_id: int) -> str:
-        return xxh64_hexdigest(f"snipe:{channel_id}")
+        return MESSAGE_SNIPES.key(channel_id)
 
     @classmethod
-    async def push(cls, redis: Redis, message: Message) -> Optional[Self]:
+    def build(cls, message: Message) -> Optional[Self]:
         if (
             not message.guild
             or message.author.bot
@@ -67,7 +254,7 @@ class MessageSnipe(BaseModel):
         elif not message.content and not message.attachments and not message.stickers:
             return
 
-        data = cls(
+        return cls(
             guild_id=message.guild.id,
             channel_id=message.channel.id,
             message_id=message.id,
@@ -83,32 +270,81 @@ class MessageSnipe(BaseModel):
                     size=attachment.size,
                     filename=attachment.filename,
                     content_type=attachment.content_type,
+                    key=f"{attachment.id}_{attachment.filename}",
                 )
                 for attachment in message.attachments
             ],
             stickers=[str(sticker.url) for sticker in message.stickers],
         )
 
-        key = cls.key(message.channel.id)
-        cache_size = await redis.rpush(key, data.json())
-        if cache_size > 100:
-            await redis.ltrim(key, -49, -1)
+    @classmethod
+    async def push(
+        cls,
+        redis: Redis,
+        message: Message,
+        http: Optional[HTTPClient] = None,
+    ) -> Optional[Self]:
+        data = cls.build(message)
+        if not data:
+            return
+
+        if http:
+            attachments.prefetch(http, data.attachments)
 
-        await redis.expire(key, 64800)
+        await cls.store.push(redis, message.channel.id, data.dict())
         return data
 
+    @classmethod
+    async def push_many(
+        cls,
+        redis: Redis,
+        messages: List[Message],
+        http: Optional[HTTPClient] = None,
+    ) -> List[Self]:
+        """
+        Push a bulk deletion with a single call per channel.
+        """
+
+        channels: Dict[int, List[Self]] = defaultdict(list)
+        for message in sorted(messages, key=lambda message: message.id):
+            if data := cls.build(message):
+                channels[message.channel.id].append(data)
+
+        for channel_id, snipes in channels.items():
+            await cls.store.push(
+                redis,
+                channel_id,
+                *(data.dict() for data in snipes[-SNIPE_LIMIT:]),
+            )
+
+        if http:
+            attachments.prefetch(
+                http,
+                [
+                    attachment
+                    for snipes in channels.values()
+                    for data in snipes
+                    for attachment in data.attachments
+                ],
+            )
+
+        return [data for snipes in channels.values() for data in snipes]
+
     @classmethod
     async def get(cls, redis: Redis, channel_id: int, index: int = 1) -> Optional[Self]:
-        key = cls.key(channel_id)
-        if not await redis.llen(key):
+        snipe = await cls.store.get(redis, channel_id, index)
+        if not snipe:
             return
 
-        index = -index
-        snipes = await redis.lrange(key, index, index)
-        if not snipes:
-            return
+        return cls.parse_obj(snipe)
+
+    @classmethod
+    async def count(cls, redis: Redis, channel_id: int) -> int:
+        return await cls.store.count(redis, channel_id)
 
-        return cls.parse_raw(snipes[0])
+    @classmethod
+    async def clear(cls, redis: Redis, channel_id: int) -> None:
+        await cls.store.clear(redis, channel_id)
 
 
 class ReactionSnipe(BaseModel):
@@ -120,13 +356,15 @@ class ReactionSnipe(BaseModel):
     removed_at: datetime
     emoji: str
 
+    store: ClassVar[SnipeRing] = SnipeRing(REACTION_SNIPES)
+
     @property
     def message_url(self) -> str:
         return f"https://discord.com/channels/{self.guild_id}/{self.channel_id}/{self.message_id}"
 
     @staticmethod
     def key(channel_id: int) -> str:
-        return xxh64_hexdigest(f"rsnipe:{channel_id}")
+        return REACTION_SNIPES.key(channel_id)
 
     @classmethod
     async def push(cls, redis: Redis, reaction: Reaction, user: User) -> Optional[Self]:
@@ -143,26 +381,16 @@ class ReactionSnipe(BaseModel):
             emoji=str(reaction.emoji),
         )
 
-        key = cls.key(reaction.message.channel.id)
-        cache_size = await redis.rpush(key, data.json())
-        if cache_size > 100:
-            await redis.ltrim(key, -49, -1)
-
-        await redis.expire(key, 14400)
+        await cls.store.push(redis, reaction.message.channel.id, data.dict())
         return data
 
     @classmethod
     async def get(cls, redis: Redis, channel_id: int, index: int = 1) -> Optional[Self]:
-        key = cls.key(channel_id)
-        if not await redis.llen(key):
-            return
-
-        index = -index
-        snipes = await redis.lrange(key, index, index)
-        if not snipes:
+        snipe = await cls.store.get(redis, channel_id, index)
+        if not snipe:
             return
 
-        return cls.parse_raw(snipes[0])
+        return cls.parse_obj(snipe)
 
 
 class EditSnipe(BaseModel):
@@ -177,13 +405,15 @@ class EditSnipe(BaseModel):
     attachments: List[MessageAttachment] = []
     stickers: List[str] = []
 
+    store: ClassVar[SnipeRing] = SnipeRing(EDIT_SNIPES)
+
     @property
     def message_url(self) -> str:
         return f"https://discord.com/channels/{self.guild_id}/{self.channel_id}/{self.message_id}"
 
     @staticmethod
     def key(channel_id: int) -> str:
-        return xxh64_hexdigest(f"esnipe:{channel_id}")
+        return EDIT_SNIPES.key(channel_id)
 
     @classmethod
     async def push(
@@ -214,23 +444,21 @@ class EditSnipe(BaseModel):
             stickers=[str(sticker.url) for sticker in before.stickers],
         )
 
-        key = cls.key(before.channel.id)
-        cache_size = await redis.rpush(key, data.json())
-        if cache_size > 100:
-            await redis.ltrim(key, -49, -1)
-
-        await redis.expire(key, 14400)
+        await cls.store.push(redis, before.channel.id, data.dict())
         return data
 
     @classmethod
     async def get(cls, redis: Redis, channel_id: int, index: int = 1) -> Optional[Self]:
-        key = cls.key(channel_id)
-        if not await redis.llen(key):
+        snipe = await cls.store.get(redis, channel_id, index)
+        if not snipe:
             return
 
-        index = -index
-        snipes = await redis.lrange(key, index, index)
-        if not snipes:
-            return
+        return cls.parse_obj(snipe)
 
-        return cls.parse_raw(snipes[0])
+    @classmethod
+    async def count(cls, redis: Redis, channel_id: int) -> int:
+        return await cls.store.count(redis, channel_id)
+
+    @classmethod
+    async def clear(cls, redis: Redis, channel_id: int) -> None:
+        await cls.store.clear(redis, channel_id)
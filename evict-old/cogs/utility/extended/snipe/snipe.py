@@ -1,6 +1,6 @@
 import re
 from contextlib import suppress
-from typing import Optional, cast
+from typing import List, Optional, cast
 
 from discord import Embed, File, HTTPException, Member, Message, Reaction, User
 from discord.ext.commands import (
@@ -38,7 +38,15 @@ class Snipe(MixinMeta, metaclass=CompositeMetaClass):
         Push a message to the snipe cache.
         """
 
-        await MessageSnipe.push(self.bot.redis, message)
+        await MessageSnipe.push(self.bot.redis, message, self.bot.http)
+
+    @Cog.listener("on_bulk_message_delete")
+    async def push_bulk_snipe(self, messages: List[Message]) -> None:
+        """
+        Push a bulk deletion to the snipe cache.
+        """
+
+        await MessageSnipe.push_many(self.bot.redis, messages, self.bot.http)
 
     @Cog.listener("on_reaction_remove")
     async def push_reaction_snipe(
@@ -78,7 +86,7 @@ class Snipe(MixinMeta, metaclass=CompositeMetaClass):
             return await ctx.warn("Please provide a valid positive number!")
 
         message = await MessageSnipe.get(self.bot.redis, ctx.channel.id, index_num)
-        snipes = await self.bot.redis.llen(MessageSnipe.key(ctx.channel.id))
+        snipes = await MessageSnipe.count(self.bot.redis, ctx.channel.id)
 
         if not message:
             return await ctx.warn(
@@ -497,8 +505,7 @@ class Snipe(MixinMeta, metaclass=CompositeMetaClass):
         Remove all sniped messages from the cache.
         """
 
-        key = MessageSnipe.key(ctx.channel.id)
-        await self.bot.redis.delete(key)
+        await MessageSnipe.clear(self.bot.redis, ctx.channel.id)
 
         return await ctx.check()
 
@@ -529,7 +536,7 @@ class Snipe(MixinMeta, metaclass=CompositeMetaClass):
         """
 
         message = await EditSnipe.get(self.bot.redis, ctx.channel.id, index)
-        snipes = await self.bot.redis.llen(EditSnipe.key(ctx.channel.id))
+        snipes = await EditSnipe.count(self.bot.redis, ctx.channel.id)
 
         if not message:
             return await ctx.warn(
@@ -625,7 +632,6 @@ class Snipe(MixinMeta, metaclass=CompositeMetaClass):
     async def editsnipe_clear(self, ctx: Context) -> None:
         """Remove all sniped messages from the cache."""
 
-        key = EditSnipe.key(ctx.channel.id)
-        await self.bot.redis.delete(key)
+        await EditSnipe.clear(self.bot.redis, ctx.channel.id)
 
         return await ctx.check()
\ No newline at end of file
@@ -34,6 +34,7 @@ from tools.formatter import codeblock, shorten
 from managers.paginator import Paginator
 
 from .extended import Extended
+from .extended.snipe.models import attachments as snipe_attachments
 from .models.google import GoogleTranslate
 from .handlers import EmbedBuilding
 
@@ -251,36 +252,34 @@ class Utility(Extended, Cog):
             try:
                 current_time = utcnow()
                 reminders = await self.bot.db.fetch(
-                    "SELECT * FROM reminders WHERE remind_at <= $1",
+                    "DELETE FROM reminders WHERE remind_at <= $1 RETURNING *",
                     current_time
                 )
 
                 for reminder in reminders:
                     user = self.bot.get_user(reminder['user_id'])
-                    if user:
-                        view = View()
-                        if reminder['message_url']:
-                            view.add_item(
-                                Button(
-                                    label="Jump to Message",
-                                    url=reminder['message_url'],
-                                    style=discord.ButtonStyle.url
-                                )
-                            )                       
+                    if not user:
                         try:
-                            embed = Embed()
-                            embed.description = f"⏰ **Reminder:** {reminder['reminder']}\n Set: {format_dt(reminder['invoked_at'], 'R')}"
-                            
-                            await user.send(embed=embed, view=view if reminder['message_url'] else None)
-                        except:
-                            pass 
+                            user = await self.bot.fetch_user(reminder['user_id'])
+                        except discord.HTTPException:
+                            continue
 
-                    await self.bot.db.execute(
-                        "DELETE FROM reminders WHERE user_id = $1 AND remind_at = $2 AND reminder = $3",
-                        reminder['user_id'],
-                        reminder['remind_at'],
-                        reminder['reminder']
-                    )
+                    view = View()
+                    if reminder['message_url']:
+                        view.add_item(
+                            Button(
+                                label="Jump to Message",
+                                url=reminder['message_url'],
+                                style=discord.ButtonStyle.url
+                            )
+                        )                       
+                    try:
+                        embed = Embed()
+                        embed.description = f"⏰ **Reminder:** {reminder['reminder']}\n Set: {format_dt(reminder['invoked_at'], 'R')}"
+                            
+                        await user.send(embed=embed, view=view if reminder['message_url'] else None)
+                    except:
+                        pass 
 
             except Exception as e:
                 print(f"Error in reminder check: {e}")
@@ -308,6 +307,7 @@ class Utility(Extended, Cog):
     
     async def cog_load(self):
         self.reminder_check_task = self.bot.loop.create_task(self.reminder_check())
+        await snipe_attachments.sweep()
 
     @tasks.loop(seconds=60)
     async def auto_media(self):
@@ -577,28 +577,33 @@ class Utility(Extended, Cog):
 
     @Cog.listener("on_message_without_command")
     async def afk_listener(self, ctx: Context) -> Optional[Message]:
-        if left_at := cast(
-            Optional[datetime],
-            await self.bot.db.fetchval(
-                """
-                DELETE FROM afk
-                WHERE user_id = $1
-                RETURNING left_at
-                """,
-                ctx.author.id,
-            ),
+        if self.bot.features.active("afk", ctx.author.id) and (
+            left_at := cast(
+                Optional[datetime],
+                await self.bot.db.fetchval(
+                    """
+                    DELETE FROM afk
+                    WHERE user_id = $1
+                    RETURNING left_at
+                    """,
+                    ctx.author.id,
+                ),
+            )
         ):
+            await self.bot.features.refresh("afk", ctx.author.id)
             return await ctx.neutral(
                 f"Welcome back, you left {format_dt(left_at, 'R')}",
                 reference=ctx.message,
             )
 
-        if len(ctx.message.mentions) == 1:
+        if len(ctx.message.mentions) == 1 and self.bot.features.active(
+            "afk", ctx.message.mentions[0].id
+        ):
             user = ctx.message.mentions[0]
             
             rate_key = xxh64_hexdigest(f"{ctx.channel.id}:{user.id}")
             
-            if await self.bot.redis.ratelimited(rate_key, 6, 60):
+            if await self.bot.ratelimits.limited(rate_key, 6, 60):
                 return
 
             if record := await self.bot.db.fetchrow(
@@ -634,6 +639,7 @@ class Utility(Extended, Cog):
                 ctx.author.id,
                 status,
             )
+        await self.bot.features.refresh("afk", ctx.author.id)
             
         return await ctx.approve(f"You're now **AFK** with the status **{status}**")
 
@@ -2259,6 +2265,7 @@ class Utility(Extended, Cog):
                 ctx.guild.id,
                 channel.id,
             )
+            await self.bot.features.refresh("transcribe", ctx.guild.id)
             return await ctx.approve(
                 f"Added {channel.mention} to auto-transcribe channels!"
             )
@@ -2281,6 +2288,7 @@ class Utility(Extended, Cog):
             ctx.guild.id,
             channel.id,
         )
+        await self.bot.features.refresh("transcribe", ctx.guild.id)
 
         if not deleted:
             return await ctx.warn(
@@ -2334,6 +2342,7 @@ class Utility(Extended, Cog):
             """,
             ctx.guild.id,
         )
+        await self.bot.features.refresh("transcribe", ctx.guild.id)
         return await ctx.approve("Cleared all auto-transcribe channels!")
 
     async def get_audio_duration(self, url: str) -> float:
@@ -2413,6 +2422,13 @@ class Utility(Extended, Cog):
 
     @Cog.listener("on_message")
     async def auto_transcribe(self, message: Message):
+        if (
+            not message.guild
+            or not message.attachments
+            or not self.bot.features.active("transcribe", message.channel.id)
+        ):
+            return
+
         try:
             from pydub.utils import which
 
@@ -2421,9 +2437,6 @@ class Utility(Extended, Cog):
         except Exception:
             return
 
-        if not message.guild or not message.attachments:
-            return
-
         channel_ids = await self.bot.db.fetch(
             """
             SELECT channel_id
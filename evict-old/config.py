@@ -67,6 +67,14 @@ class NETWORK:
     HOST: str = "0.0.0.0"
     PORT: int = 6000
     
+class CLUSTER:
+    """
+    Shard cluster layout for the launcher.
+    """
+    SHARDS: int = 9
+    CLUSTERS: int = 3
+    SOCKET: str = "/tmp/evict-ipc.sock"
+
 class DATABASE:
     """
     Postgres authentication class.
@@ -1,21 +1,20 @@
+from __future__ import annotations
+
+import asyncio
 from contextlib import asynccontextmanager
 from http.cookiejar import MozillaCookieJar
 from logging import getLogger
-from secrets import token_urlsafe
-from typing import AsyncGenerator, Literal, Optional
-
-from anyio import CapacityLimiter
-from playwright.async_api import (
-    Browser,
-    BrowserContext,
-    Page,
-    Playwright,
-    async_playwright,
-)
+from typing import TYPE_CHECKING, AsyncGenerator, List, Literal, Optional
+
 from pydantic import BaseConfig, BaseModel
 
 import config
 
+from .pool import PagePool
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Page, Playwright
+
 log = getLogger("evict/browser")
 jar = MozillaCookieJar()
 jar.load("cookies.txt")
@@ -38,51 +37,102 @@ class CookieModel(BaseModel):
 
 
 class BrowserHandler:
-    limiter: CapacityLimiter
+    """
+    Launches Playwright and serves pages from a warm `PagePool`.
+
+    Playwright is only imported and launched once the first page is borrowed.
+    """
+
     playwright: Optional[Playwright] = None
     browser: Optional[Browser] = None
-    context: Optional[BrowserContext] = None
+    contexts: List[BrowserContext]
+    pool: PagePool
+
+    def __init__(
+        self,
+        *,
+        pages: int = 4,
+        contexts: int = 2,
+        max_uses: int = 50,
+        timeout: float = 30.0,
+    ) -> None:
+        self.total_contexts = contexts
+        self.contexts = []
+        self.pool = PagePool(pages, max_uses=max_uses, timeout=timeout)
+        self.starting: Optional[asyncio.Task] = None
 
-    def __init__(self) -> None:
-        self.limiter = CapacityLimiter(4)
+    def __repr__(self) -> str:
+        return f"<BrowserHandler {self.pool!r}>"
+
+    @property
+    def context(self) -> Optional[BrowserContext]:
+        return self.contexts[0] if self.contexts else None
 
     async def cleanup(self) -> None:
-        if self.playwright:
-            await self.playwright.stop()
+        if not self.playwright:
+            return
 
+        await self.pool.clear()
+        self.contexts.clear()
         if self.browser:
             await self.browser.close()
 
+        await self.playwright.stop()
+        self.playwright = None
+        self.browser = None
+
     async def init(self) -> None:
+        from playwright.async_api import async_playwright
+
         await self.cleanup()
         self.playwright = await async_playwright().start()
         self.browser = await self.playwright.chromium.launch()
-        self.context = await self.browser.new_context(
-            user_agent=(
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-                "(KHTML, like Gecko) Chrome/93.0.4577.63 Safari/537.36"
-            ),
-            proxy={"server": "http://127.1:40000"},
-        )
-        await self.context.add_cookies(
-            [
-                cookie.dict(exclude_unset=True)
-                for _cookie in jar
-                if (cookie := CookieModel.from_orm(_cookie))
-            ]  # type: ignore
+        cookies = [
+            cookie.dict(exclude_unset=True)
+            for _cookie in jar
+            if (cookie := CookieModel.from_orm(_cookie))
+        ]
+        contexts = []
+        for _ in range(self.total_contexts):
+            context = await self.browser.new_context(
+                user_agent=(
+                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                    "(KHTML, like Gecko) Chrome/93.0.4577.63 Safari/537.36"
+                ),
+                proxy={"server": "http://127.1:40000"},
+            )
+            await context.add_cookies(cookies)  # type: ignore
+            contexts.append(context)
+
+        await self.pool.fill(contexts)
+        self.contexts = contexts
+        log.info(
+            "Warmed %s pages across %s browser contexts.",
+            self.pool.queue.qsize(),
+            len(self.contexts),
         )
 
+    async def ensure(self) -> None:
+        """
+        Launch the browser if it isn't running yet.
+        Concurrent borrowers share a single launch.
+        """
+
+        if self.contexts:
+            return
+
+        if not self.starting or self.starting.done():
+            self.starting = asyncio.create_task(self.init())
+
+        await asyncio.shield(self.starting)
+
     @asynccontextmanager
-    async def borrow_page(self) -> AsyncGenerator[Page, None]:
-        if not self.context:
-            raise RuntimeError("Browser context is not initialized.")
-
-        await self.limiter.acquire()
-        identifier, page = token_urlsafe(12), await self.context.new_page()
-        log.debug("Borrowing page ID %s.", identifier)
-        try:
+    async def borrow_page(self, *, block: bool = True) -> AsyncGenerator[Page, None]:
+        """
+        Borrow a warm page from the pool.
+        Images, fonts and media are aborted unless `block` is disabled.
+        """
+
+        await self.ensure()
+        async with self.pool.borrow(block=block) as page:
             yield page
-        finally:
-            self.limiter.release()
-            await page.close()
-            log.debug("Released page ID %s.", identifier)
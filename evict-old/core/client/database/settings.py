@@ -158,7 +158,7 @@ class Settings:
         for key, value in kwargs.items():
             setattr(self, key, value)
 
-        self.fetch.invalidate_containing(self.guild.id)
+        await self.bot.ipc.invalidate("settings", self.guild.id)
 
     @classmethod
     @cache()
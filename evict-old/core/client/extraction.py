@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, suppress
+from logging import getLogger
+from os import path, remove
+from typing import TYPE_CHECKING, Dict, Iterator, Optional
+
+import orjson
+from xxhash import xxh64_hexdigest
+from yarl import URL
+
+import config
+from processors.extraction import process_extraction
+from tools import CACHE_ROOT
+
+from .codec import JSON, Namespace
+
+if TYPE_CHECKING:
+    from main import Evict
+
+log = getLogger("evict/extraction")
+
+CACHE = Namespace("ydl", JSON, ttl=60 * 30, hasher=xxh64_hexdigest)
+FAILURE_TTL = 60
+
+DEFAULT_OPTIONS = {
+    "quiet": True,
+    "verbose": False,
+    "no_warnings": True,
+    "final_ext": "mp4",
+    "age_limit": 18,
+    "concurrent_fragment_downloads": 12,
+    "outtmpl": str(CACHE_ROOT / "%(id)s.%(ext)s"),
+    "cachedir": str(CACHE_ROOT / "ydl"),
+    "noplaylist": True,
+    "restrictfilenames": True,
+    "cookiefile": "cookies.txt",
+}
+
+EXTRACTORS = {
+    "youtu": "youtube",
+    "x": "twitter",
+    "redd": "reddit",
+    "fb": "facebook",
+    "pin": "pinterest",
+}
+EXTRACTOR_LIMITS = {
+    "tiktok": 3,
+    "instagram": 2,
+    "twitter": 3,
+    "youtube": 4,
+}
+TRACKING_PARAMETERS = frozenset(
+    (
+        "si",
+        "igsh",
+        "igshid",
+        "fbclid",
+        "gclid",
+        "dclid",
+        "msclkid",
+        "mc_cid",
+        "mc_eid",
+        "feature",
+        "ref",
+        "ref_src",
+        "ref_url",
+        "share_id",
+        "share_app_id",
+        "sender_device",
+        "is_from_webapp",
+        "mibextid",
+        "rdt",
+        "_r",
+        "_t",
+    )
+)
+TRACKING_PREFIXES = ("utm_",)
+
+
+class ExtractionError(Exception):
+    pass
+
+
+class Extractor:
+    """
+    Runs yt-dlp in a dedicated process pool.
+
+    Results are cached by canonical URL, concurrent requests
+    for the same URL share one extraction and every extractor
+    has its own concurrency cap.
+    """
+
+    def __init__(self, bot: Evict, *, workers: int = 4):
+        self.bot = bot
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.inflight: Dict[str, asyncio.Task] = {}
+        self.holders: Dict[str, int] = defaultdict(int)
+        self.discarded: Dict[str, str] = {}
+        self.semaphores: Dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(4)
+        )
+        for name, limit in EXTRACTOR_LIMITS.items():
+            self.semaphores[name] = asyncio.Semaphore(limit)
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def canonicalize(url: str) -> str:
+        """
+        Strip tracking parameters and host aliases from a URL.
+        """
+
+        parsed = URL(url.strip("<>"))
+        host = (parsed.host or "").lower()
+        for prefix in ("www.", "m.", "mobile."):
+            host = host.removeprefix(prefix)
+
+        query = sorted(
+            (key, value)
+            for key, value in parsed.query.items()
+            if key.lower() not in TRACKING_PARAMETERS
+            and not key.lower().startswith(TRACKING_PREFIXES)
+        )
+        return str(
+            URL.build(
+                scheme="https",
+                host=host,
+                path=parsed.path.rstrip("/") or "/",
+                query=query,
+            )
+        )
+
+    @staticmethod
+    def extractor(url: str) -> str:
+        host = (URL(url).host or "").split(".")
+        name = host[-2] if len(host) >= 2 else host[0]
+        return EXTRACTORS.get(name, name)
+
+    @staticmethod
+    def build_options(url: str, options: Optional[dict] = None) -> dict:
+        built = {**DEFAULT_OPTIONS, **(options or {})}
+        if "youtu" in url and "format" not in (options or {}):
+            built["format"] = "best"
+
+        if config.CLIENT.WARP:
+            built["proxy"] = config.CLIENT.WARP
+
+        return built
+
+    async def extract(
+        self,
+        url: str,
+        options: Optional[dict] = None,
+        *,
+        download: bool = False,
+    ) -> dict:
+        """
+        Extract the information for a URL.
+        Raises ExtractionError when yt-dlp fails.
+        """
+
+        canonical = self.canonicalize(url)
+        options = self.build_options(canonical, options)
+        ident = ":".join(
+            (
+                xxh64_hexdigest(orjson.dumps(options, option=orjson.OPT_SORT_KEYS)),
+                "download" if download else "info",
+                canonical,
+            )
+        )
+
+        task = self.inflight.get(ident)
+        if not task:
+            task = self.inflight[ident] = asyncio.create_task(
+                self.resolve(url, ident, options, download)
+            )
+            task.add_done_callback(
+                lambda task: (
+                    self.inflight.pop(ident, None),
+                    task.cancelled() or task.exception(),
+                )
+            )
+
+        return await asyncio.shield(task)
+
+    async def resolve(
+        self,
+        url: str,
+        ident: str,
+        options: dict,
+        download: bool,
+    ) -> dict:
+        cached = await self.bot.redis.fetch(CACHE, ident)
+        if cached is not None:
+            if "error" in cached:
+                raise ExtractionError(cached["error"])
+
+            if not download or self.available(cached):
+                return cached
+
+        extractor = self.extractor(url)
+        async with self.semaphores[extractor]:
+            if download:
+                await CACHE_ROOT.mkdir(parents=True, exist_ok=True)
+
+            info, error = await asyncio.get_running_loop().run_in_executor(
+                self.executor,
+                process_extraction,
+                url,
+                options,
+                download,
+            )
+
+        if error or not info:
+            log.debug("Failed to extract %s with %s: %s", url, extractor, error)
+            await self.bot.redis.store(
+                CACHE,
+                ident,
+                {"error": error or "No information was extracted"},
+                ex=FAILURE_TTL,
+            )
+            raise ExtractionError(error or "No information was extracted")
+
+        await self.bot.redis.store(CACHE, ident, info)
+        return info
+
+    @contextmanager
+    def hold(self, url: str) -> Iterator[None]:
+        """
+        Hold the downloaded file of a URL while the caller inspects it.
+        Concurrent callers share one file, so a discarded file is
+        only removed once the last holder is done with it.
+        """
+
+        canonical = self.canonicalize(url)
+        self.holders[canonical] += 1
+        try:
+            yield
+        finally:
+            self.holders[canonical] -= 1
+            if not self.holders[canonical]:
+                del self.holders[canonical]
+                if filename := self.discarded.pop(canonical, None):
+                    with suppress(FileNotFoundError):
+                        remove(filename)
+
+    def discard(self, url: str, filename: str) -> None:
+        self.discarded[self.canonicalize(url)] = filename
+
+    @staticmethod
+    def available(info: dict) -> bool:
+        """
+        Check that the files of a cached download still exist.
+        """
+
+        files = [
+            download["filepath"]
+            for download in info.get("requested_downloads") or []
+            if download.get("filepath")
+        ]
+        if not files and info.get("local_file"):
+            files.append(info["local_file"])
+
+        return bool(files) and all(path.exists(file) for file in files)
+
+
+__all__ = ("Extractor", "ExtractionError")
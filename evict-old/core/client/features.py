@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import asyncio
+from logging import getLogger
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set
+
+if TYPE_CHECKING:
+    from main import Evict
+
+log = getLogger("evict/features")
+
+FEATURES: Dict[str, str] = {
+    "afk": "SELECT user_id AS scope_id, NULL::BIGINT AS channel_id FROM afk",
+    "alias": "SELECT guild_id AS scope_id, NULL::BIGINT AS channel_id FROM aliases",
+    "antiraid.mentions": """
+        SELECT guild_id AS scope_id, NULL::BIGINT AS channel_id
+        FROM antiraid
+        WHERE mentions IS NOT NULL
+    """,
+    "counting": """
+        SELECT guild_id AS scope_id, channel_id
+        FROM counting.config
+        WHERE channel_id IS NOT NULL
+    """,
+    "gallery": "SELECT guild_id AS scope_id, channel_id FROM gallery",
+    "highlight": "SELECT guild_id AS scope_id, NULL::BIGINT AS channel_id FROM highlights",
+    "lastfm.command": """
+        SELECT user_id AS scope_id, NULL::BIGINT AS channel_id
+        FROM lastfm.config
+        WHERE command IS NOT NULL
+    """,
+    "level": """
+        SELECT guild_id AS scope_id, NULL::BIGINT AS channel_id
+        FROM level.config
+        WHERE status = TRUE
+    """,
+    "publisher": "SELECT guild_id AS scope_id, channel_id FROM publisher",
+    "reaction_trigger": "SELECT guild_id AS scope_id, NULL::BIGINT AS channel_id FROM reaction_trigger",
+    "response_trigger": "SELECT guild_id AS scope_id, NULL::BIGINT AS channel_id FROM response_trigger",
+    "sticky": "SELECT guild_id AS scope_id, channel_id FROM sticky_message",
+    "streaks": """
+        SELECT guild_id AS scope_id, channel_id
+        FROM streaks.config
+        WHERE channel_id IS NOT NULL
+    """,
+    "transcribe": "SELECT guild_id AS scope_id, channel_id FROM transcribe.channels",
+    "uwulock": """
+        SELECT guild_id AS scope_id, NULL::BIGINT AS channel_id FROM uwulock
+        UNION
+        SELECT guild_id AS scope_id, NULL::BIGINT AS channel_id FROM shutup
+    """,
+}
+
+
+class FeatureRegistry:
+    """
+    Which features are configured, per guild, user or channel.
+
+    Message listeners consult the registry before any I/O, so messages
+    in places without a feature configured never reach Postgres or Redis.
+    Each feature is a query yielding a scope (a guild or user) and an
+    optional channel. Config writes refresh their scope through the IPC,
+    so every cluster stays current, and a periodic reload picks up
+    writes made outside the bot. Features which failed to load are
+    reported as active, so a listener is never skipped by mistake.
+    """
+
+    def __init__(self, bot: Evict, interval: int = 600):
+        self.bot = bot
+        self.interval = interval
+        self.scopes: Dict[str, Dict[int, Set[int]]] = {name: {} for name in FEATURES}
+        self.channels: Dict[str, Set[int]] = {name: set() for name in FEATURES}
+        self.unknown: Set[str] = set(FEATURES)
+        self.task: Optional[asyncio.Task] = None
+
+    def __repr__(self) -> str:
+        return f"<FeatureRegistry features={len(FEATURES)} unknown={sorted(self.unknown)}>"
+
+    def active(self, feature: str, *snowflakes: int) -> bool:
+        """
+        Whether the feature is configured for any of the given
+        guild, user or channel IDs.
+        """
+
+        if feature in self.unknown:
+            return True
+
+        scopes = self.scopes[feature]
+        channels = self.channels[feature]
+        return any(
+            snowflake in scopes or snowflake in channels for snowflake in snowflakes
+        )
+
+    def features(self, *snowflakes: int) -> Set[str]:
+        return {feature for feature in FEATURES if self.active(feature, *snowflakes)}
+
+    def apply(self, feature: str, scope_id: int, channels: Iterable[int]) -> None:
+        scopes = self.scopes[feature]
+        self.channels[feature].difference_update(scopes.pop(scope_id, ()))
+
+        channels = set(channels)
+        if channels:
+            self.channels[feature].update(channels)
+
+        scopes[scope_id] = channels
+
+    def drop(self, feature: str, scope_id: int) -> None:
+        self.channels[feature].difference_update(self.scopes[feature].pop(scope_id, ()))
+
+    async def load_feature(self, feature: str) -> None:
+        try:
+            records = await self.bot.db.fetch(FEATURES[feature])
+        except Exception:
+            log.exception("Failed to load the %r feature", feature)
+            self.unknown.add(feature)
+            return
+
+        scopes: Dict[int, Set[int]] = {}
+        for record in records:
+            channels = scopes.setdefault(record["scope_id"], set())
+            if record["channel_id"]:
+                channels.add(record["channel_id"])
+
+        self.scopes[feature] = scopes
+        self.channels[feature] = set().union(*scopes.values())
+        self.unknown.discard(feature)
+
+    async def load(self) -> None:
+        await asyncio.gather(*map(self.load_feature, FEATURES))
+
+    async def refresh(self, feature: str, scope_id: int) -> None:
+        """
+        Re-read a single guild or user after its configuration changed.
+        """
+
+        records = await self.bot.db.fetch(
+            f"SELECT * FROM ({FEATURES[feature]}) AS feature WHERE scope_id = $1",
+            scope_id,
+        )
+        channels: List[int] = [
+            record["channel_id"] for record in records if record["channel_id"]
+        ]
+        await self.bot.ipc.publish(
+            "features",
+            {
+                "feature": feature,
+                "scope_id": scope_id,
+                "active": bool(records),
+                "channels": channels,
+            },
+        )
+
+    async def on_update(self, data: dict) -> None:
+        if data["active"]:
+            self.apply(data["feature"], data["scope_id"], data["channels"])
+        else:
+            self.drop(data["feature"], data["scope_id"])
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.load()
+
+    def start(self) -> None:
+        if not self.task:
+            self.task = asyncio.create_task(self.run())
+
+    def stop(self) -> None:
+        if self.task:
+            self.task.cancel()
+            self.task = None
@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import struct
+from contextlib import suppress
+from itertools import count
+from logging import getLogger
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional
+
+import msgpack
+
+if TYPE_CHECKING:
+    from main import Evict
+    from tools.cache import CacheProtocol
+
+log = getLogger("evict/ipc")
+
+HEADER = struct.Struct("!I")
+Handler = Callable[[Any], Awaitable[Any]]
+
+
+async def read_frame(reader: asyncio.StreamReader) -> dict:
+    (size,) = HEADER.unpack(await reader.readexactly(HEADER.size))
+    return msgpack.unpackb(await reader.readexactly(size), strict_map_key=False)
+
+
+def write_frame(writer: asyncio.StreamWriter, frame: dict) -> None:
+    data = msgpack.packb(frame)
+    writer.write(HEADER.pack(len(data)) + data)
+
+
+class IPCHub:
+    """
+    The launcher side of the cluster channel.
+
+    Clusters connect over a Unix socket and the hub relays frames
+    between them without looking at their payload. Requests sent to
+    every cluster are answered with the number of peers which received
+    them, so the requester knows how many responses to wait for.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.clusters: Dict[int, asyncio.StreamWriter] = {}
+        self.ready: Dict[int, asyncio.Event] = {}
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    def __repr__(self) -> str:
+        return f"<IPCHub path={self.path!r} clusters={sorted(self.clusters)}>"
+
+    async def start(self) -> None:
+        with suppress(FileNotFoundError):
+            os.unlink(self.path)
+
+        self.server = await asyncio.start_unix_server(self.accept, self.path)
+        os.chmod(self.path, 0o600)
+        log.info("Listening for clusters on %s", self.path)
+
+    async def close(self) -> None:
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+
+        for writer in self.clusters.values():
+            writer.close()
+
+        with suppress(FileNotFoundError):
+            os.unlink(self.path)
+
+    def wait_ready(self, cluster_id: int) -> Awaitable[bool]:
+        return self.ready.setdefault(cluster_id, asyncio.Event()).wait()
+
+    async def accept(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        cluster_id: Optional[int] = None
+        try:
+            hello = await read_frame(reader)
+            cluster_id = int(hello["cluster"])
+            self.clusters[cluster_id] = writer
+            self.ready.setdefault(cluster_id, asyncio.Event()).clear()
+            log.info("Cluster %s connected", cluster_id)
+
+            while True:
+                frame = await read_frame(reader)
+                if frame["op"] == "ready":
+                    self.ready[cluster_id].set()
+                else:
+                    self.relay(cluster_id, frame)
+
+        except (asyncio.IncompleteReadError, ConnectionError, KeyError):
+            pass
+
+        finally:
+            if cluster_id is not None and self.clusters.get(cluster_id) is writer:
+                del self.clusters[cluster_id]
+                log.warning("Cluster %s disconnected", cluster_id)
+
+            writer.close()
+
+    def relay(self, source: int, frame: dict) -> None:
+        target = frame.get("target")
+        if target is not None:
+            peers = [self.clusters[target]] if target in self.clusters else []
+        else:
+            peers = [
+                writer
+                for cluster_id, writer in self.clusters.items()
+                if cluster_id != source
+            ]
+
+        for writer in peers:
+            write_frame(writer, frame)
+
+        if frame["op"] == "request":
+            write_frame(
+                self.clusters[source],
+                {"op": "expect", "id": frame["id"], "count": len(peers)},
+            )
+
+
+class Pending:
+    def __init__(self):
+        self.results: Dict[int, Any] = {}
+        self.expected: Optional[int] = None
+        self.done = asyncio.Event()
+
+    def check(self) -> None:
+        if self.expected is not None and len(self.results) >= self.expected:
+            self.done.set()
+
+
+class ClusterMixin:
+    """
+    Ownership and stats of the shards served by this cluster.
+    """
+
+    shard_ids: Optional[List[int]]
+    shard_count: Optional[int]
+
+    @property
+    def owned_shards(self) -> List[int]:
+        """
+        The shards served by this cluster.
+        """
+        return list(self.shard_ids or range(self.shard_count or 1))
+
+    def owns(self, guild_id: int) -> bool:
+        """
+        Check if a guild is on one of this cluster's shards.
+        """
+        return (guild_id >> 22) % (self.shard_count or 1) in self.owned_shards
+
+    async def cluster_stats(self, _: Any = None) -> Dict[str, Any]:
+        """
+        Report the guilds and shards served by this cluster.
+        """
+        return {
+            "guilds": len(self.guilds),
+            "users": sum(1 for user in self.users if not user.bot),
+            "shards": {
+                shard_id: {
+                    "guilds": sum(1 for guild in self.guilds if guild.shard_id == shard_id),
+                    "users": sum(
+                        guild.member_count or 0
+                        for guild in self.guilds
+                        if guild.shard_id == shard_id
+                    ),
+                    "latency": shard.latency,
+                }
+                for shard_id, shard in self.shards.items()
+            },
+        }
+
+
+class IPC:
+    """
+    The cluster side of the channel.
+
+    Handlers are registered by event name and run for requests from
+    any cluster, including this one. Without a socket the client
+    only serves local calls, so a single process behaves the same.
+    """
+
+    def __init__(self, bot: Evict, cluster_id: int, path: Optional[str] = None):
+        self.bot = bot
+        self.cluster_id = cluster_id
+        self.path = path
+        self.handlers: Dict[str, Handler] = {}
+        self.caches: Dict[str, CacheProtocol] = {}
+        self.pending: Dict[int, Pending] = {}
+        self.nonce = count()
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.task: Optional[asyncio.Task] = None
+        self.tasks: set[asyncio.Task] = set()
+        self.is_ready = False
+        self.route("invalidate")(self.on_invalidate)
+
+    def __repr__(self) -> str:
+        return f"<IPC cluster={self.cluster_id} connected={self.writer is not None}>"
+
+    def route(self, event: str) -> Callable[[Handler], Handler]:
+        def decorator(handler: Handler) -> Handler:
+            self.handlers[event] = handler
+            return handler
+
+        return decorator
+
+    def start(self) -> None:
+        if self.path and not self.task:
+            self.task = asyncio.create_task(self.run())
+
+    async def close(self) -> None:
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+        if self.writer:
+            self.writer.close()
+            self.writer = None
+
+    async def run(self) -> None:
+        backoff = 1
+        while True:
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.path)
+            except OSError as exc:
+                log.warning("Failed to reach the launcher: %s", exc)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+                continue
+
+            backoff = 1
+            write_frame(writer, {"op": "hello", "cluster": self.cluster_id})
+            if self.is_ready:
+                write_frame(writer, {"op": "ready"})
+
+            self.writer = writer
+            try:
+                while True:
+                    self.receive(await read_frame(reader))
+            except (asyncio.IncompleteReadError, ConnectionError):
+                log.warning("Lost the connection to the launcher")
+            finally:
+                self.writer = None
+                writer.close()
+                for pending in self.pending.values():
+                    pending.expected = len(pending.results)
+                    pending.done.set()
+
+    def send(self, frame: dict) -> bool:
+        if not self.writer:
+            return False
+
+        write_frame(self.writer, frame)
+        return True
+
+    def ready(self) -> None:
+        self.is_ready = True
+        self.send({"op": "ready"})
+
+    def receive(self, frame: dict) -> None:
+        op = frame["op"]
+        if op in ("request", "publish"):
+            task = asyncio.create_task(self.handle(frame))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+        elif op == "response" and (pending := self.pending.get(frame["id"])):
+            if frame.get("error"):
+                log.warning(
+                    "Cluster %s failed to handle a request: %s",
+                    frame["source"],
+                    frame["error"],
+                )
+                pending.expected = (pending.expected or 0) - 1
+            else:
+                pending.results[frame["source"]] = frame["data"]
+
+            pending.check()
+
+        elif op == "expect" and (pending := self.pending.get(frame["id"])):
+            pending.expected = frame["count"]
+            pending.check()
+
+    async def call(self, event: str, data: Any) -> Any:
+        handler = self.handlers.get(event)
+        if not handler:
+            raise LookupError(f"No handler for {event!r}")
+
+        return await handler(data)
+
+    async def handle(self, frame: dict) -> None:
+        try:
+            result = await self.call(frame["event"], frame.get("data"))
+        except Exception as exc:
+            if frame["op"] == "publish":
+                log.exception("Failed to handle the %r broadcast", frame["event"])
+                return
+
+            self.send(
+                {
+                    "op": "response",
+                    "id": frame["id"],
+                    "source": self.cluster_id,
+                    "target": frame["source"],
+                    "data": None,
+                    "error": repr(exc),
+                }
+            )
+        else:
+            if frame["op"] == "request":
+                self.send(
+                    {
+                        "op": "response",
+                        "id": frame["id"],
+                        "source": self.cluster_id,
+                        "target": frame["source"],
+                        "data": result,
+                        "error": None,
+                    }
+                )
+
+    async def request(
+        self,
+        event: str,
+        data: Any = None,
+        *,
+        target: Optional[int] = None,
+        timeout: float = 5.0,
+    ) -> Dict[int, Any]:
+        """
+        Run a handler on every cluster, or only on `target`,
+        and return the results keyed by cluster.
+        Clusters which fail or don't answer in time are left out.
+        """
+
+        results: Dict[int, Any] = {}
+        if target is None or target == self.cluster_id:
+            results[self.cluster_id] = await self.call(event, data)
+            if target is not None:
+                return results
+
+        nonce = next(self.nonce)
+        pending = self.pending[nonce] = Pending()
+        try:
+            if not self.send(
+                {
+                    "op": "request",
+                    "id": nonce,
+                    "source": self.cluster_id,
+                    "target": target,
+                    "event": event,
+                    "data": data,
+                }
+            ):
+                return results
+
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(pending.done.wait(), timeout)
+
+            results.update(pending.results)
+            return results
+        finally:
+            del self.pending[nonce]
+
+    async def publish(self, event: str, data: Any = None) -> None:
+        """
+        Run a handler on every cluster without waiting for results.
+        """
+
+        self.send(
+            {
+                "op": "publish",
+                "source": self.cluster_id,
+                "target": None,
+                "event": event,
+                "data": data,
+            }
+        )
+        await self.call(event, data)
+
+    async def invalidate(self, cache: str, key: int | str) -> None:
+        """
+        Drop entries of a registered cache on every cluster.
+        """
+
+        await self.publish("invalidate", {"cache": cache, "key": key})
+
+    async def on_invalidate(self, data: dict) -> None:
+        if cache := self.caches.get(data["cache"]):
+            cache.invalidate_containing(data["key"])
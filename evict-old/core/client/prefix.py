@@ -3,9 +3,13 @@ from discord import Message
 
 import logging
 
+from .codec import STRING, Namespace
+
 if TYPE_CHECKING:
     from main import Evict
 
+PREFIX = Namespace("prefix", STRING, ttl=21600)
+
 async def getprefix(bot: Any, message: Message) -> Tuple[str, str]:
     """
     Utility function to get the bot prefix.
@@ -16,29 +20,30 @@ async def getprefix(bot: Any, message: Message) -> Tuple[str, str]:
     guildprefix = ";"
     selfprefix = ";"
 
-    async with bot.redis.pipeline() as pipe:
-        await pipe.get(f"prefix:guild:{message.guild.id}")
-        await pipe.get(f"prefix:user:{message.author.id}")
-        guild_prefix, user_prefix = await pipe.execute()
+    guild_prefix, user_prefix = await bot.redis.fetch_many(
+        PREFIX,
+        f"guild:{message.guild.id}",
+        f"user:{message.author.id}",
+    )
 
     if guild_prefix is not None:
-        guildprefix = guild_prefix.decode("utf-8") if isinstance(guild_prefix, bytes) else str(guild_prefix)
+        guildprefix = str(guild_prefix)
     
     if user_prefix is not None:
-        selfprefix = user_prefix.decode("utf-8") if isinstance(user_prefix, bytes) else str(user_prefix)
+        selfprefix = str(user_prefix)
 
     if guild_prefix is None or user_prefix is None:
         if guild_prefix is None:
             res = await bot.db.fetchrow("SELECT prefix FROM prefix WHERE guild_id = $1", message.guild.id)
             if res:
                     guildprefix = res["prefix"]
-                    await bot.redis.set(f"prefix:guild:{message.guild.id}", guildprefix, ex=21600)
+                    await bot.redis.store(PREFIX, f"guild:{message.guild.id}", guildprefix)
                 
             if user_prefix is None:
                 res = await bot.db.fetchrow("SELECT prefix FROM selfprefix WHERE user_id = $1", message.author.id)
                 if res:
                     selfprefix = res["prefix"]
-                    await bot.redis.set(f"prefix:user:{message.author.id}", selfprefix, ex=21600)
+                    await bot.redis.store(PREFIX, f"user:{message.author.id}", selfprefix)
 
     if selfprefix == ";" and guildprefix != ";":
         selfprefix = guildprefix
@@ -83,9 +88,9 @@ async def update_guild_prefix(bot, guild_id: int, prefix: str) -> None:
         )
 
     if prefix:
-        await bot.redis.set(f"prefix:guild:{guild_id}", str(prefix), ex=21600)
+        await bot.redis.store(PREFIX, f"guild:{guild_id}", prefix)
     else:
-        await bot.redis.delete(f"prefix:guild:{guild_id}")
+        await bot.redis.delete(PREFIX.key(f"guild:{guild_id}"))
 
 
 async def update_user_prefix(bot, user_id: int, prefix: Optional[str] = None) -> None:
@@ -97,7 +102,7 @@ async def update_user_prefix(bot, user_id: int, prefix: Optional[str] = None) ->
             "DELETE FROM selfprefix WHERE user_id = $1",
             user_id,
         )
-        await bot.redis.delete(f"prefix:user:{user_id}")
+        await bot.redis.delete(PREFIX.key(f"user:{user_id}"))
     else:
         exists = await bot.db.fetchval(
             """
@@ -129,4 +134,4 @@ async def update_user_prefix(bot, user_id: int, prefix: Optional[str] = None) ->
                 prefix,
             )
 
-        await bot.redis.set(f"prefix:user:{user_id}", str(prefix), ex=21600)
+        await bot.redis.store(PREFIX, f"user:{user_id}", prefix)
@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from hashlib import sha1
+from logging import getLogger
+from time import perf_counter
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+from redis.exceptions import NoScriptError
+from xxhash import xxh32_hexdigest
+
+import config
+
+if TYPE_CHECKING:
+    from main import Evict
+
+log = getLogger("evict/ratelimit")
+
+GUILD_LIMITS: Tuple[Tuple[int, int], ...] = (
+    (config.RATELIMITS.PER_10S, 10),
+    (config.RATELIMITS.PER_30S, 30),
+    (config.RATELIMITS.PER_1M, 60),
+)
+
+WINDOW_SCRIPT = b"""
+    local results = {}
+    for index = 1, #KEYS / 2 do
+        local offset = (index - 1) * 4
+        local limit = tonumber(ARGV[offset + 1])
+        local window = tonumber(ARGV[offset + 2])
+        local elapsed = tonumber(ARGV[offset + 3])
+        local cost = tonumber(ARGV[offset + 4])
+        local current = tonumber(redis.call("get", KEYS[index * 2 - 1]) or "0")
+        local previous = tonumber(redis.call("get", KEYS[index * 2]) or "0")
+        local usage = previous * (window - elapsed) / window + current
+        if usage + cost > limit then
+            results[index] = 0
+        else
+            redis.call("incrby", KEYS[index * 2 - 1], cost)
+            redis.call("pexpire", KEYS[index * 2 - 1], window * 2)
+            results[index] = 1
+        end
+    end
+    return results
+"""
+
+Check = Tuple[str, int, float, int, "asyncio.Future[bool]"]
+
+
+class TokenBucket:
+    """
+    `rate` tokens refilled evenly over `per` seconds.
+    """
+
+    __slots__ = ("rate", "per", "tokens", "updated")
+
+    def __init__(self, rate: int, per: float, now: float):
+        self.rate = rate
+        self.per = per
+        self.tokens = float(rate)
+        self.updated = now
+
+    def __repr__(self) -> str:
+        return f"<TokenBucket tokens={self.tokens:.2f}/{self.rate} per={self.per}>"
+
+    def acquire(self, now: float, cost: int = 1) -> float:
+        """
+        Take `cost` tokens, or return how long until they're available.
+        """
+
+        self.tokens = min(
+            self.rate,
+            self.tokens + (now - self.updated) * self.rate / self.per,
+        )
+        self.updated = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+
+        return (cost - self.tokens) * self.per / self.rate
+
+
+class KeyStats:
+    __slots__ = ("allowed", "limited", "last")
+
+    def __init__(self):
+        self.allowed = 0
+        self.limited = 0
+        self.last = 0.0
+
+    def __repr__(self) -> str:
+        return f"<KeyStats allowed={self.allowed} limited={self.limited}>"
+
+
+class RateLimiter:
+    """
+    Rate limits for commands and listeners, in two tiers.
+
+    The local tier is a token bucket per key, checked without I/O. As
+    every guild is served by a single cluster, guild and channel keys
+    only need the local tier. The per-user command cooldown is local
+    too, so a user gets one bucket on every cluster they use commands
+    on. Keys which must hold across clusters or restarts use the shared
+    tier, a sliding window in Redis. Shared checks made in the same loop
+    iteration are sent as one script call. Counters are kept for the
+    most recently used keys.
+    """
+
+    def __init__(self, bot: Evict, capacity: int = 50_000, batch: int = 256):
+        self.bot = bot
+        self.capacity = capacity
+        self.batch = batch
+        self.buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+        self.keys: OrderedDict[str, KeyStats] = OrderedDict()
+        self.pending: List[Check] = []
+        self.scheduled = False
+        self.flushes: Set[asyncio.Task] = set()
+        self.script = sha1(WINDOW_SCRIPT).hexdigest()
+        self.calls = 0
+
+    def __repr__(self) -> str:
+        return f"<RateLimiter buckets={len(self.buckets)} calls={self.calls}>"
+
+    def record(self, key: str, allowed: bool) -> None:
+        stats = self.keys.get(key)
+        if stats is None:
+            stats = self.keys[key] = KeyStats()
+            if len(self.keys) > self.capacity:
+                self.keys.popitem(last=False)
+        else:
+            self.keys.move_to_end(key)
+
+        if allowed:
+            stats.allowed += 1
+        else:
+            stats.limited += 1
+
+        stats.last = time.time()
+
+    def stats(self, key: str) -> Optional[KeyStats]:
+        return self.keys.get(key)
+
+    def hottest(self, limit: int = 10) -> List[Tuple[str, KeyStats]]:
+        return sorted(
+            self.keys.items(),
+            key=lambda item: item[1].limited,
+            reverse=True,
+        )[:limit]
+
+    def hit(self, key: str, rate: int, per: float, cost: int = 1) -> float:
+        """
+        Check a key against the local tier.
+        Returns the seconds to wait, or 0 when the call is allowed.
+        """
+
+        now = time.monotonic()
+        bucket = self.buckets.get(key)
+        if bucket is None or bucket.rate != rate or bucket.per != per:
+            bucket = self.buckets[key] = TokenBucket(rate, per, now)
+            while len(self.buckets) > self.capacity:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(key)
+
+        retry_after = bucket.acquire(now, cost)
+        self.record(key, not retry_after)
+        return retry_after
+
+    async def limited(
+        self,
+        key: str,
+        rate: int,
+        per: float,
+        *,
+        shared: bool = False,
+        cost: int = 1,
+    ) -> bool:
+        """
+        Whether the key is over `rate` uses per `per` seconds.
+        """
+
+        if not shared or not getattr(self.bot, "redis", None):
+            return bool(self.hit(key, rate, per, cost))
+
+        future: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        self.pending.append((key, rate, per, cost, future))
+        if not self.scheduled:
+            self.scheduled = True
+            asyncio.get_running_loop().call_soon(self.schedule_flush)
+
+        allowed = await future
+        self.record(key, allowed)
+        return not allowed
+
+    def schedule_flush(self) -> None:
+        self.scheduled = False
+        checks, self.pending = self.pending, []
+        for start in range(0, len(checks), self.batch):
+            task = asyncio.create_task(self.flush(checks[start : start + self.batch]))
+            self.flushes.add(task)
+            task.add_done_callback(self.flushes.discard)
+
+    async def evaluate(self, keys: List[str], args: List[float | int]) -> List[int]:
+        try:
+            return await self.bot.redis.evalsha(self.script, len(keys), *keys, *args)
+        except NoScriptError:
+            self.script = await self.bot.redis.script_load(WINDOW_SCRIPT)
+            return await self.bot.redis.evalsha(self.script, len(keys), *keys, *args)
+
+    async def flush(self, checks: List[Check]) -> None:
+        now = int(time.time() * 1000)
+        keys: List[str] = []
+        args: List[float | int] = []
+        for key, rate, per, cost, _ in checks:
+            window = int(per * 1000)
+            start = now - now % window
+            name = f"rl:{xxh32_hexdigest(key)}"
+            keys.extend((f"{name}:{start}", f"{name}:{start - window}"))
+            args.extend((rate, window, now - start, cost))
+
+        try:
+            results = await self.evaluate(keys, args)
+        except Exception as exc:
+            log.warning("Failed to check %s shared rate limits: %s", len(checks), exc)
+            for *_, future in checks:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        self.calls += 1
+        for (*_, future), allowed in zip(checks, results):
+            if not future.done():
+                future.set_result(bool(allowed))
+
+    async def benchmark(
+        self,
+        messages: int = 20_000,
+        guilds: int = 500,
+        users: int = 5_000,
+    ) -> Dict[str, float]:
+        """
+        Average cost of a check in microseconds, replaying a burst of
+        messages through the guild tiers and a per user shared limit.
+        """
+
+        results: Dict[str, float] = {}
+        started = perf_counter()
+        for index in range(messages):
+            guild_id = index % guilds
+            for rate, per in GUILD_LIMITS:
+                self.hit(f"bench:guild:{per}:{guild_id}", rate, per)
+
+        results["local"] = (
+            (perf_counter() - started) / (messages * len(GUILD_LIMITS)) * 1e6
+        )
+
+        if getattr(self.bot, "redis", None):
+            sample = min(messages, 5_000)
+            calls = self.calls
+            started = perf_counter()
+            await asyncio.gather(
+                *(
+                    self.limited(f"bench:user:{index % users}", 1, 3, shared=True)
+                    for index in range(sample)
+                )
+            )
+            results["shared"] = (perf_counter() - started) / sample * 1e6
+            results["shared_calls"] = self.calls - calls
+
+            started = perf_counter()
+            for index in range(min(sample, 500)):
+                await self.limited(f"bench:user:{index % users}", 1, 3, shared=True)
+
+            results["shared_serial"] = (perf_counter() - started) / min(sample, 500) * 1e6
+
+        for key in [key for key in self.buckets if key.startswith("bench:")]:
+            del self.buckets[key]
+
+        for key in [key for key in self.keys if key.startswith("bench:")]:
+            del self.keys[key]
+
+        return results
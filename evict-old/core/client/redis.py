@@ -1,43 +1,32 @@
 from __future__ import annotations
 
 import time
-from contextlib import suppress
 from datetime import timedelta
-from hashlib import sha1
-from json import JSONDecodeError, dumps, loads
 from logging import getLogger
 from types import TracebackType
-from typing import Any, List, Literal, Optional, Union
+from typing import Any, Dict, List, Literal, Optional, Union
 
+import orjson
 from redis.asyncio import Redis as DefaultRedis
 from redis.asyncio.connection import BlockingConnectionPool
 from redis.asyncio.lock import Lock
 from redis.backoff import EqualJitterBackoff
-from redis.exceptions import NoScriptError
+from redis.client import NEVER_DECODE
 from redis.retry import Retry
 from redis.typing import AbsExpiryT, EncodableT, ExpiryT, FieldT, KeyT
 from xxhash import xxh32_hexdigest
 
 import config
 
+from .codec import Namespace, is_legacy, legacy
+
 log = getLogger("evict/redis")
 
 
 REDIS_URL = f"redis://{config.REDIS.HOST}"
 
-INCREMENT_SCRIPT = b"""
-    local current
-    current = tonumber(redis.call("incrby", KEYS[1], ARGV[2]))
-    if current == tonumber(ARGV[2]) then
-        redis.call("expire", KEYS[1], ARGV[1])
-    end
-    return current
-"""
-
 
 class Redis(DefaultRedis):
-    INCREMENT_SCRIPT_HASH = sha1(INCREMENT_SCRIPT).hexdigest()
-
     async def __aenter__(self) -> "Redis":
         return await self.initialize()
 
@@ -106,7 +95,7 @@ class Redis(DefaultRedis):
         pxat: Union[AbsExpiryT, None] = None,
     ) -> bool | Any:
         if isinstance(value, (dict, list)):
-            value = dumps(value, separators=(',', ':'))
+            value = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
 
         return await super().set(name, value, ex, px, nx, xx, keepttl, get, exat, pxat)
 
@@ -119,13 +108,7 @@ class Redis(DefaultRedis):
         if not validate or output is None:
             return output
 
-        if output.isnumeric():
-            return int(output)
-
-        with suppress(JSONDecodeError):
-            return loads(output)
-
-        return output
+        return legacy(output)
 
     async def getdel(
         self,
@@ -140,13 +123,7 @@ class Redis(DefaultRedis):
         if not validate or output is None:
             return output
 
-        if output.isnumeric():
-            return int(output)
-
-        with suppress(JSONDecodeError):
-            return loads(output)
-
-        return output
+        return legacy(output)
 
     async def sadd(
         self,
@@ -175,17 +152,7 @@ class Redis(DefaultRedis):
         result = []
 
         for value in output:
-            value = value.decode("utf-8")
-
-            if value.isnumeric():
-                result.append(int(value))
-                continue
-
-            with suppress(JSONDecodeError):
-                result.append(loads(value))
-                continue
-
-            result.append(value)
+            result.append(legacy(value))
 
         return result
 
@@ -226,34 +193,153 @@ class Redis(DefaultRedis):
     ) -> List:
         return await super().lrange(name, start, end)  # type: ignore
 
-    async def ratelimited(
+    async def store(
         self,
-        resource: str,
-        limit: int,
-        timespan: int = 60,
-        increment: int = 1,
+        namespace: Namespace,
+        ident: Any,
+        value: Any,
+        ex: Optional[ExpiryT] = None,
     ) -> bool:
-        key = f"rl:{xxh32_hexdigest(resource)}"
-        
-        try:
-            current_usage = await self.evalsha(
-                self.INCREMENT_SCRIPT_HASH,
-                1,
-                key,
-                timespan,
-                increment,
-            )
-        except NoScriptError:
-            self.INCREMENT_SCRIPT_HASH = await self.script_load(INCREMENT_SCRIPT)
-            current_usage = await self.evalsha(
-                self.INCREMENT_SCRIPT_HASH,
-                1,
+        """
+        Encode and store a value under a typed namespace.
+        """
+
+        return await super().set(
+            namespace.key(ident),
+            namespace.encode(value),
+            ex=ex or namespace.ttl,
+        )
+
+    async def fetch(
+        self,
+        namespace: Namespace,
+        ident: Any,
+    ) -> Optional[Any]:
+        """
+        Fetch and decode a value from a typed namespace.
+        Legacy values are rewritten with the namespace codec.
+        """
+
+        key = namespace.key(ident)
+        output = await self.execute_command("GET", key, **{NEVER_DECODE: []})
+        if output is None:
+            return None
+
+        value = namespace.decode(output)
+        if is_legacy(output):
+            await super().set(key, namespace.encode(value), keepttl=True, xx=True)
+
+        return value
+
+    async def fetch_many(
+        self,
+        namespace: Namespace,
+        *idents: Any,
+    ) -> List[Optional[Any]]:
+        """
+        Fetch several values from a typed namespace in one round trip.
+        Legacy values are rewritten with the namespace codec, like `fetch`.
+        """
+
+        if not idents:
+            return []
+
+        keys = [namespace.key(ident) for ident in idents]
+        output = await self.execute_command("MGET", *keys, **{NEVER_DECODE: []})
+        values = [namespace.decode(value) for value in output]
+
+        stale = [
+            (key, value)
+            for key, data, value in zip(keys, output, values)
+            if data is not None and is_legacy(data)
+        ]
+        if stale:
+            async with self.pipeline(transaction=False) as pipe:
+                for key, value in stale:
+                    pipe.set(key, namespace.encode(value), keepttl=True, xx=True)
+
+                await pipe.execute()
+
+        return values
+
+    async def fetch_range(
+        self,
+        namespace: Namespace,
+        ident: Any,
+        start: int,
+        end: int,
+    ) -> List[Any]:
+        """
+        Fetch and decode a slice of a list in a typed namespace.
+        """
+
+        output = await self.execute_command(
+            "LRANGE",
+            namespace.key(ident),
+            start,
+            end,
+            **{NEVER_DECODE: []},
+        )
+        return [namespace.decode(value) for value in output]
+
+    async def append(
+        self,
+        namespace: Namespace,
+        ident: Any,
+        *values: Any,
+        limit: int = 100,
+    ) -> int:
+        """
+        Append to a bounded list in a typed namespace in one round trip.
+        The list is trimmed to `limit` entries and its expiry is refreshed.
+        """
+
+        key = namespace.key(ident)
+        async with self.pipeline(transaction=False) as pipe:
+            pipe.rpush(key, *(namespace.encode(value) for value in values))
+            pipe.ltrim(key, -limit, -1)
+            if namespace.ttl:
+                pipe.expire(key, namespace.ttl)
+
+            size, *_ = await pipe.execute()
+
+        return min(size, limit)
+
+    async def migrate(
+        self,
+        namespace: Namespace,
+        count: int = 500,
+    ) -> Dict[str, int]:
+        """
+        Rewrite every legacy string value in a namespace with its codec.
+        Hashed namespaces can't be scanned and migrate lazily through `fetch`.
+        """
+
+        if namespace.hasher:
+            raise ValueError("Hashed namespaces migrate lazily on fetch")
+
+        stats = {"scanned": 0, "migrated": 0}
+        async for key in self.scan_iter(match=f"{namespace.prefix}:*", count=count, _type="string"):
+            stats["scanned"] += 1
+            output = await self.execute_command("GET", key, **{NEVER_DECODE: []})
+            if output is None or not is_legacy(output):
+                continue
+
+            await super().set(
                 key,
-                timespan,
-                increment,
+                namespace.encode(legacy(output)),
+                keepttl=True,
+                xx=True,
             )
+            stats["migrated"] += 1
 
-        return int(current_usage) > limit
+        log.info(
+            "Migrated %s of %s keys in the %s namespace.",
+            stats["migrated"],
+            stats["scanned"],
+            namespace.prefix,
+        )
+        return stats
 
     def get_lock(
         self,
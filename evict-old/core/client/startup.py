@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from logging import getLogger
+from time import perf_counter
+from typing import TYPE_CHECKING, Awaitable, DefaultDict, Dict, Generator, Optional, TypeVar
+
+import psutil
+
+from .codec import JSON, Namespace
+
+if TYPE_CHECKING:
+    from .redis import Redis
+
+log = getLogger("evict/startup")
+T = TypeVar("T")
+
+STARTUP = Namespace("startup", JSON, ttl=60 * 60 * 24 * 30)
+
+
+class StartupReport:
+    """
+    Timings of a single boot, split into phases.
+
+    The `imports` phase covers everything between the process being
+    created and the report being constructed. Every boot is logged and
+    appended to a bounded Redis list per cluster, so cold start time
+    and RSS at ready can be compared between releases.
+    """
+
+    def __init__(self):
+        self.process = psutil.Process()
+        self.created = self.process.create_time()
+        self.phases: DefaultDict[str, float] = defaultdict(float)
+        self.phases["imports"] = time.time() - self.created
+        self.extensions: Dict[str, float] = {}
+        self.started: Dict[str, float] = {}
+        self.total: Optional[float] = None
+        self.rss: Optional[int] = None
+
+    def __repr__(self) -> str:
+        return f"<StartupReport total={self.total} rss={self.rss}>"
+
+    @contextmanager
+    def phase(self, name: str) -> Generator[None, None, None]:
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] += perf_counter() - started
+
+    async def timed(self, name: str, awaitable: Awaitable[T]) -> T:
+        with self.phase(name):
+            return await awaitable
+
+    def start(self, name: str) -> None:
+        self.started[name] = perf_counter()
+
+    def stop(self, name: str) -> None:
+        if name in self.started:
+            self.phases[name] += perf_counter() - self.started.pop(name)
+
+    def finish(self) -> None:
+        self.total = time.time() - self.created
+        self.rss = self.process.memory_info().rss
+
+    def render(self) -> str:
+        lines = [f"{name:<12} {duration:7.2f}s" for name, duration in self.phases.items()]
+        slowest = sorted(self.extensions.items(), key=lambda item: item[1], reverse=True)
+        lines.extend(f"  {name:<30} {duration:5.2f}s" for name, duration in slowest[:5])
+        lines.append(f"{'total':<12} {self.total or 0:7.2f}s")
+        lines.append(f"{'rss':<12} {(self.rss or 0) / 1024 ** 2:7.1f}MiB")
+        return "\n".join(lines)
+
+    def record(self) -> dict:
+        return {
+            "at": int(self.created),
+            "total": self.total,
+            "rss": self.rss,
+            "phases": dict(self.phases),
+            "extensions": self.extensions,
+        }
+
+    async def publish(self, redis: Redis, cluster_id: int) -> None:
+        self.finish()
+        log.info("Startup report for cluster %s:\n%s", cluster_id, self.render())
+        try:
+            await redis.append(STARTUP, cluster_id, self.record(), limit=100)
+        except Exception:
+            log.exception("Failed to store the startup report")
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from logging import getLogger
+from typing import TYPE_CHECKING, DefaultDict, Dict, Iterable, Optional, Tuple
+
+from discord import Guild, Member, VoiceChannel, VoiceState
+
+if TYPE_CHECKING:
+    from main import Evict
+
+log = getLogger("evict/voice")
+
+
+class VoiceTracker:
+    """
+    Voice minute accounting driven by voice state transitions.
+
+    Open sessions are held in memory per guild and credited up to the
+    present on every flush and once they end, split at midnight so each
+    day receives its own share. Credited seconds
+    are flushed to Postgres in a single batch, keeping any remainder below
+    a minute for the next flush, so guilds without voice activity cost nothing.
+    """
+
+    def __init__(self, bot: Evict, interval: int = 60):
+        self.bot = bot
+        self.interval = interval
+        self.sessions: Dict[int, Dict[int, float]] = {}
+        self.pending: DefaultDict[Tuple[int, date], float] = defaultdict(float)
+        self.task: Optional[asyncio.Task] = None
+
+    def __repr__(self) -> str:
+        return f"<VoiceTracker sessions={sum(map(len, self.sessions.values()))} pending={len(self.pending)}>"
+
+    @staticmethod
+    def counted(state: VoiceState) -> bool:
+        return isinstance(state.channel, VoiceChannel)
+
+    def credit(self, guild_id: int, started: float, ended: float) -> None:
+        cursor = datetime.fromtimestamp(started, timezone.utc)
+        end = datetime.fromtimestamp(ended, timezone.utc)
+        while cursor < end:
+            midnight = datetime.combine(
+                cursor.date() + timedelta(days=1),
+                datetime.min.time(),
+                timezone.utc,
+            )
+            boundary = min(midnight, end)
+            self.pending[guild_id, cursor.date()] += (boundary - cursor).total_seconds()
+            cursor = boundary
+
+    def open(self, guild_id: int, member_id: int, now: float) -> None:
+        self.sessions.setdefault(guild_id, {}).setdefault(member_id, now)
+
+    def close(self, guild_id: int, member_id: int, now: float) -> None:
+        sessions = self.sessions.get(guild_id)
+        if not sessions or member_id not in sessions:
+            return
+
+        self.credit(guild_id, sessions.pop(member_id), now)
+        if not sessions:
+            del self.sessions[guild_id]
+
+    def update(
+        self,
+        member: Member,
+        before: VoiceState,
+        after: VoiceState,
+        now: Optional[float] = None,
+    ) -> None:
+        """
+        Apply a join, leave or move transition.
+        """
+
+        if member.bot:
+            return
+
+        now = time.time() if now is None else now
+        if self.counted(after):
+            self.open(member.guild.id, member.id, now)
+        elif self.counted(before):
+            self.close(member.guild.id, member.id, now)
+
+    def reconcile(self, guilds: Iterable[Guild], now: Optional[float] = None) -> None:
+        """
+        Align open sessions with the gateway state of the given guilds.
+        Used once a shard becomes ready, as events may have been missed.
+        """
+
+        now = time.time() if now is None else now
+        for guild in guilds:
+            present = {
+                member.id
+                for channel in guild.voice_channels
+                for member in channel.members
+                if not member.bot
+            }
+            for member_id in set(self.sessions.get(guild.id, ())) - present:
+                self.close(guild.id, member_id, now)
+
+            for member_id in present:
+                self.open(guild.id, member_id, now)
+
+    def checkpoint(self, now: Optional[float] = None) -> None:
+        """
+        Credit every open session up to now without closing it.
+        """
+
+        now = time.time() if now is None else now
+        for guild_id, sessions in self.sessions.items():
+            for member_id, started in sessions.items():
+                self.credit(guild_id, started, now)
+                sessions[member_id] = now
+
+    async def flush(self) -> None:
+        records = []
+        for (guild_id, day), seconds in list(self.pending.items()):
+            minutes, remainder = divmod(seconds, 60)
+            if not minutes:
+                continue
+
+            records.append((guild_id, day, int(minutes)))
+            if remainder:
+                self.pending[guild_id, day] = remainder
+            else:
+                del self.pending[guild_id, day]
+
+        if not records:
+            return
+
+        try:
+            await self.bot.db.executemany(
+                """
+                INSERT INTO statistics.daily (guild_id, date, voice_minutes)
+                VALUES ($1, $2, $3)
+                ON CONFLICT (guild_id, date)
+                DO UPDATE SET voice_minutes = statistics.daily.voice_minutes + EXCLUDED.voice_minutes
+                """,
+                records,
+            )
+        except Exception:
+            log.exception("Failed to flush voice minutes for %s guilds", len(records))
+            for guild_id, day, minutes in records:
+                self.pending[guild_id, day] += minutes * 60
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self.checkpoint()
+            await self.flush()
+
+    def start(self) -> None:
+        if not self.task:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+        self.checkpoint()
+        await self.flush()
@@ -0,0 +1,205 @@
+import asyncio
+import logging
+import os
+import signal
+import sys
+import time
+from argparse import ArgumentParser
+from logging import getLogger
+from typing import List, Optional, Sequence
+
+import config
+from core.client.ipc import IPCHub
+
+log = getLogger("evict/launcher")
+
+
+def layout(shards: int, clusters: int) -> List[List[int]]:
+    """
+    Split the shard range into contiguous, evenly sized clusters.
+    """
+
+    size, remainder = divmod(shards, clusters)
+    result: List[List[int]] = []
+    start = 0
+    for index in range(clusters):
+        end = start + size + (index < remainder)
+        result.append(list(range(start, end)))
+        start = end
+
+    return [shard_ids for shard_ids in result if shard_ids]
+
+
+class Cluster:
+    """
+    A supervised bot process running a slice of the shards.
+    """
+
+    def __init__(
+        self,
+        cluster_id: int,
+        shard_ids: List[int],
+        shard_count: int,
+        socket: str,
+        command: Sequence[str],
+    ):
+        self.cluster_id = cluster_id
+        self.shard_ids = shard_ids
+        self.shard_count = shard_count
+        self.socket = socket
+        self.command = command
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.stopping = False
+        self.restarts = 0
+
+    def __repr__(self) -> str:
+        pid = self.process.pid if self.process else None
+        return f"<Cluster id={self.cluster_id} shards={self.shard_ids} pid={pid}>"
+
+    def environment(self) -> dict:
+        return {
+            **os.environ,
+            "CLUSTER_ID": str(self.cluster_id),
+            "CLUSTER_SHARDS": ",".join(map(str, self.shard_ids)),
+            "SHARD_COUNT": str(self.shard_count),
+            "IPC_SOCKET": self.socket,
+        }
+
+    async def spawn(self) -> None:
+        self.process = await asyncio.create_subprocess_exec(
+            *self.command,
+            env=self.environment(),
+        )
+        log.info("Started %r", self)
+
+    async def supervise(self) -> None:
+        """
+        Restart the process whenever it exits, backing off on crash loops.
+        """
+
+        backoff = 1
+        while not self.stopping:
+            started = time.monotonic()
+            if not self.process or self.process.returncode is not None:
+                await self.spawn()
+
+            code = await self.process.wait()  # type: ignore
+            if self.stopping:
+                break
+
+            if time.monotonic() - started > 60:
+                backoff = 1
+
+            self.restarts += 1
+            log.warning(
+                "Cluster %s exited with %s, restarting in %ss",
+                self.cluster_id,
+                code,
+                backoff,
+            )
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 60)
+
+    async def stop(self, timeout: float = 30) -> None:
+        self.stopping = True
+        if not self.process or self.process.returncode is not None:
+            return
+
+        self.process.terminate()
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout)
+        except asyncio.TimeoutError:
+            log.warning("Cluster %s did not stop in time, killing it", self.cluster_id)
+            self.process.kill()
+            await self.process.wait()
+
+
+class Launcher:
+    """
+    Run the bot as several processes on a single machine.
+
+    Clusters are started one at a time, each waiting for the previous one
+    to report ready so identifies don't overlap, and are relaunched when
+    they exit. They talk to each other through the hub on a Unix socket.
+    """
+
+    def __init__(
+        self,
+        shards: int = config.CLUSTER.SHARDS,
+        clusters: int = config.CLUSTER.CLUSTERS,
+        socket: str = config.CLUSTER.SOCKET,
+        command: Optional[Sequence[str]] = None,
+        startup_timeout: float = 120,
+    ):
+        self.hub = IPCHub(socket)
+        self.startup_timeout = startup_timeout
+        self.clusters = [
+            Cluster(
+                cluster_id,
+                shard_ids,
+                shards,
+                socket,
+                command or (sys.executable, "main.py"),
+            )
+            for cluster_id, shard_ids in enumerate(layout(shards, clusters))
+        ]
+        self.tasks: List[asyncio.Task] = []
+        self.closed = asyncio.Event()
+
+    async def start(self) -> None:
+        await self.hub.start()
+        for cluster in self.clusters:
+            await cluster.spawn()
+            self.tasks.append(asyncio.create_task(cluster.supervise()))
+            try:
+                await asyncio.wait_for(
+                    self.hub.wait_ready(cluster.cluster_id),
+                    self.startup_timeout,
+                )
+            except asyncio.TimeoutError:
+                log.warning(
+                    "Cluster %s was not ready after %ss, starting the next one",
+                    cluster.cluster_id,
+                    self.startup_timeout,
+                )
+
+        log.info("Launched %s clusters", len(self.clusters))
+
+    async def close(self) -> None:
+        await asyncio.gather(*(cluster.stop() for cluster in self.clusters))
+        for task in self.tasks:
+            task.cancel()
+
+        await self.hub.close()
+        self.closed.set()
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, lambda: asyncio.create_task(self.close()))
+
+        await self.start()
+        await self.closed.wait()
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Run the bot as a set of shard clusters.")
+    parser.add_argument("--shards", type=int, default=config.CLUSTER.SHARDS)
+    parser.add_argument("--clusters", type=int, default=config.CLUSTER.CLUSTERS)
+    parser.add_argument("--socket", default=config.CLUSTER.SOCKET)
+    parser.add_argument(
+        "command",
+        nargs="*",
+        help="The worker command, defaults to running main.py.",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(
+        Launcher(
+            shards=args.shards,
+            clusters=args.clusters,
+            socket=args.socket,
+            command=args.command or None,
+        ).run()
+    )
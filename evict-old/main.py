@@ -1,6 +1,5 @@
 import os
 import psutil
-import onnxruntime
 import discord
 import secrets
 import os
@@ -37,9 +36,15 @@ from managers.parser.TagScript.exceptions import EmbedParseError, TagScriptError
 from core.client import database
 from core.client.browser import BrowserHandler
 from core.client.context import Context, Redis
+from core.client.extraction import Extractor
+from core.client.features import FeatureRegistry
+from core.client.ratelimit import GUILD_LIMITS, RateLimiter
 from core.client import logging
 from core.client.database import Database, Settings
 from core.client.help import EvictHelp
+from core.client.ipc import IPC, ClusterMixin
+from core.client.startup import StartupReport
+from core.client.voice import VoiceTracker
 
 from cogs.config.extended.roles.dynamicrolebutton import DynamicRoleButton
 from cogs.config.extended.ticket.ticket import DeleteTicket
@@ -50,7 +55,6 @@ from tools.formatter import human_join, plural
 from processors.backup import run_pg_dump
 from processors.listeners import process_guild_data, process_jail_permissions, process_add_role
 from processors.backup import process_bunny_upload
-from processors.image_generation import process_image_effect
 
 from discord.ext import commands
 from discord.message import Message
@@ -92,7 +96,7 @@ from discord.ext.commands import (
     CommandInvokeError,
     CommandNotFound,
     CommandOnCooldown,
-    CooldownMapping,
+    Cooldown,
     DisabledCommand,
     FlagError,
     MaxConcurrencyReached,
@@ -143,15 +147,6 @@ os.environ["OMP_SCHEDULE"] = "static"
 os.environ["KMP_BLOCKTIME"] = "0"
 os.environ["KMP_SETTINGS"] = "0"
 
-onnxruntime.set_default_logger_severity(3)
-sess_options = onnxruntime.SessionOptions()
-sess_options.intra_op_num_threads = logical_cpu_count
-sess_options.inter_op_num_threads = logical_cpu_count
-sess_options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
-sess_options.enable_cpu_mem_arena = False
-sess_options.enable_mem_pattern = False
-sess_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL
-
 class MonitoredHTTPClient(discord.http.HTTPClient):
     """
     Custom HTTP client that monitors API calls.
@@ -204,24 +199,28 @@ class MonitoredHTTPClient(discord.http.HTTPClient):
             raise
 
 
-class Evict(commands.AutoShardedBot):
+class Evict(ClusterMixin, commands.AutoShardedBot):
     """
     Custom bot class that extends the AutoShardedBot.
     """
     session: ClientSession
     uptime: datetime
     traceback: Dict[str, Exception]
-    global_cooldown: CooldownMapping
+    global_cooldown: Cooldown
+    ratelimits: RateLimiter
     owner_ids: Collection[int]
     database: Database
     redis: Redis
+    extractor: Extractor
     user: ClientUser
     reddit: RedditClient
     version: str = "3.0"
     user_agent: str = f"Evict (DISCORD BOT/{version})"
     browser: BrowserHandler
-    voice_join_times = {}
-    voice_update_task = None
+    voice: VoiceTracker
+    features: FeatureRegistry
+    ipc: IPC
+    cluster_id: int
     start_time: float
     system_stats: defaultdict
     process: psutil.Process
@@ -229,6 +228,8 @@ class Evict(commands.AutoShardedBot):
     _is_ready: asyncio.Event
 
     def __init__(self, *args, **kwargs):
+        self.startup = StartupReport()
+        shard_ids = os.getenv("CLUSTER_SHARDS")
         super().__init__(
             *args,
             **kwargs,
@@ -249,7 +250,8 @@ class Evict(commands.AutoShardedBot):
                 roles=False,
                 users=True,
             ),
-            shard_count=9,
+            shard_count=int(os.getenv("SHARD_COUNT", config.CLUSTER.SHARDS)),
+            shard_ids=[int(shard_id) for shard_id in shard_ids.split(",")] if shard_ids else None,
             command_prefix=getprefix,
             help_command=EvictHelp(),
             case_insensitive=True,
@@ -261,26 +263,15 @@ class Evict(commands.AutoShardedBot):
             ),
         )
         
+        self.cluster_id = int(os.getenv("CLUSTER_ID", 0))
         self.traceback = {}
-        self.global_cooldown = CooldownMapping.from_cooldown(2, 3, BucketType.user)
+        self.ratelimits = RateLimiter(self)
+        self.global_cooldown = Cooldown(2, 3)
         self.add_check(self.check_global_cooldown)
         self.uptime2 = time.time()
         self.embed_build = EmbedScript()
         self.cache = cache(self)
-        self.process_pool = Pool(
-            processes=min(4, logical_cpu_count),
-            maxtasksperchild=100  
-        )
-
-        self.guild_ratelimit_10s = CooldownMapping.from_cooldown(
-            config.RATELIMITS.PER_10S, 10, BucketType.guild
-        )
-        self.guild_ratelimit_30s = CooldownMapping.from_cooldown(
-            config.RATELIMITS.PER_30S, 30, BucketType.guild
-        )
-        self.guild_ratelimit_1m = CooldownMapping.from_cooldown(
-            config.RATELIMITS.PER_1M, 60, BucketType.guild
-        )
+        self._process_pool: Optional[Pool] = None
 
         self.start_time = time.time()
         self.system_stats = defaultdict(list)
@@ -289,6 +280,19 @@ class Evict(commands.AutoShardedBot):
         self.command_stats = defaultdict(lambda: {'calls': 0, 'total_time': 0})
         self._is_ready = asyncio.Event()
 
+    @property
+    def process_pool(self) -> Pool:
+        """
+        The worker pool, created on first use.
+        """
+        if not self._process_pool:
+            self._process_pool = Pool(
+                processes=min(4, logical_cpu_count),
+                maxtasksperchild=100
+            )
+
+        return self._process_pool
+
     @property
     def db(self) -> Database:
         """
@@ -332,8 +336,14 @@ class Evict(commands.AutoShardedBot):
         Custom close method that cleans up resources.
         """
         try:
-            if self.voice_update_task:
-                self.voice_update_task.cancel()
+            if hasattr(self, 'voice'):
+                await self.voice.stop()
+
+            if hasattr(self, 'features'):
+                self.features.stop()
+
+            if hasattr(self, 'ipc'):
+                await self.ipc.close()
                 
             if hasattr(self, 'browser'):
                 await self.browser.cleanup()
@@ -341,9 +351,12 @@ class Evict(commands.AutoShardedBot):
             if hasattr(self, 'session'):
                 await self.session.close()
             
-            if hasattr(self, 'process_pool'):
-                self.process_pool.close()
-                self.process_pool.join()
+            if self._process_pool:
+                self._process_pool.close()
+                self._process_pool.join()
+
+            if hasattr(self, 'extractor'):
+                self.extractor.close()
                 
             await super().close()
             
@@ -355,21 +368,29 @@ class Evict(commands.AutoShardedBot):
         """
         Custom on_ready method that performs additional setup.
         """
-        if not self._is_ready.is_set():
-            self._is_ready.set()
-            log.info("Bot is ready, performing final setup...")
+        log.info(
+            f"Connected as {Fore.LIGHTCYAN_EX}{Style.BRIGHT}{self.user}{Fore.RESET} ({Fore.LIGHTRED_EX}{self.user.id}{Fore.RESET})."
+        )
+        if self._is_ready.is_set():
+            return
+
+        self._is_ready.set()
+        self.startup.stop("gateway")
+        log.info("Bot is ready, performing final setup...")
 
         try:
-            log.info(
-                f"Connected as {Fore.LIGHTCYAN_EX}{Style.BRIGHT}{self.user}{Fore.RESET} ({Fore.LIGHTRED_EX}{self.user.id}{Fore.RESET})."
-            )
             self.uptime = utcnow()
-            
-            await self.wait_until_ready()
+
             log.info("Loading extensions...")
-            await self.load_extensions()
+            with self.startup.phase("extensions"):
+                await self.load_extensions()
+
             log.info("Connecting to nodes...")
-            await self.connect_nodes()
+            with self.startup.phase("nodes"):
+                await self.connect_nodes()
+
+            self.ipc.ready()
+            await self.startup.publish(self.redis, self.cluster_id)
             log.info("Bot is fully operational!")
 
         except Exception as e:
@@ -456,6 +477,9 @@ class Evict(commands.AutoShardedBot):
             log.info(
                 f"Shard ID {Fore.LIGHTGREEN_EX}{shard_id}{Fore.RESET} has {Fore.LIGHTGREEN_EX}spawned{Fore.RESET}."
             )
+            self.voice.reconcile(
+                guild for guild in self.guilds if guild.shard_id == shard_id
+            )
             
             if shard_id == self.shard_count - 1:
                 log.info("All shards connected, waiting for full ready state...")
@@ -493,13 +517,29 @@ class Evict(commands.AutoShardedBot):
             self.add_view(DeleteTicket())
             log.info("Added dynamic views")
 
-            self.database = await database.connect()
-            log.info("Connected to database")
+            self.database, self.redis = await asyncio.gather(
+                self.startup.timed("database", database.connect()),
+                self.startup.timed("redis", Redis.from_url()),
+            )
+            log.info("Connected to database and Redis")
+
+            self.extractor = Extractor(self)
+            log.info("Started extraction pool")
+
+            self.ipc = IPC(self, self.cluster_id, os.getenv("IPC_SOCKET"))
+            self.ipc.route("stats")(self.cluster_stats)
+            self.ipc.caches["settings"] = Settings.fetch
+            self.ipc.start()
+            log.info(f"Started IPC for cluster {self.cluster_id}")
 
-            self.redis = await Redis.from_url()
-            log.info("Connected to Redis")
+            self.features = FeatureRegistry(self)
+            self.ipc.route("features")(self.features.on_update)
+            await self.startup.timed("features", self.features.load())
+            self.features.start()
+            log.info("Loaded the feature registry")
 
-            await self.load_patches()
+            with self.startup.phase("patches"):
+                await self.load_patches()
             log.info("Loaded patches")
 
             self.start_time = time.time()
@@ -510,23 +550,16 @@ class Evict(commands.AutoShardedBot):
             log.info("Initialized monitoring systems")
 
             self.browser = BrowserHandler()
-            await self.browser.init()
-            log.info("Initialized browser")
 
-            self.voice_update_task = self.loop.create_task(self.update_voice_times())
-            log.info("Started voice update task")
+            self.voice = VoiceTracker(self)
+            self.voice.start()
+            log.info("Started voice tracker")
             
             # self.backup_manager = BackupManager(self)
             # self.backup_task = self.loop.create_task(self._backup_task())
             # log.info("Started backup manager")
 
-            for guild in self.guilds:
-                for vc in guild.voice_channels:
-                    for member in vc.members:
-                        if not member.bot:
-                            self.voice_join_times[member.id] = time.time()
-            
-            log.info("Initialized voice times")
+            self.startup.start("gateway")
             log.info("Setup complete!")
 
         except Exception as e:
@@ -569,19 +602,35 @@ class Evict(commands.AutoShardedBot):
             except Exception as e:
                 log.error(f"Failed to connect to node {identifier}: {e}")
 
+        if NodePool().node_count:
+            self.dispatch("nodes_ready")
+
     async def load_extensions(self) -> None:
         """
         Load all extensions in the cogs directory.
+        Extensions don't depend on each other while loading,
+        so their setup runs concurrently once imported.
         """
         await self.load_extension("jishaku")
-        for feature in Path("cogs").iterdir():
-            if feature.is_dir() and (feature / "__init__.py").is_file():
-                try:
-                    await self.load_extension(".".join(feature.parts))
-                except Exception as exc:
-                    log.exception(
-                        f"Failed to load extension {feature.name}.", exc_info=exc
-                    )
+
+        async def load(extension: str) -> None:
+            started = time.perf_counter()
+            try:
+                await self.load_extension(extension)
+            except Exception as exc:
+                log.exception(
+                    f"Failed to load extension {extension}.", exc_info=exc
+                )
+            else:
+                self.startup.extensions[extension] = time.perf_counter() - started
+
+        await asyncio.gather(
+            *(
+                load(".".join(feature.parts))
+                for feature in sorted(Path("cogs").iterdir())
+                if feature.is_dir() and (feature / "__init__.py").is_file()
+            )
+        )
 
     async def load_patches(self) -> None:
         """
@@ -857,15 +906,19 @@ class Evict(commands.AutoShardedBot):
     async def check_global_cooldown(self, ctx: Context) -> bool:
         """
         Check the global cooldown for the bot.
+        The bucket is local to this cluster, as it only guards against
+        command spam and a Redis round trip per command isn't worth it.
         """
         if ctx.author.id in self.owner_ids:
             return True
 
-        bucket = self.global_cooldown.get_bucket(ctx.message)
-        if bucket:
-            retry_after = bucket.update_rate_limit()
-            if retry_after:
-                raise CommandOnCooldown(bucket, retry_after, BucketType.user)
+        cooldown = self.global_cooldown
+        if retry_after := self.ratelimits.hit(
+            f"cooldown:{ctx.author.id}",
+            cooldown.rate,
+            cooldown.per,
+        ):
+            raise CommandOnCooldown(cooldown, retry_after, BucketType.user)
 
         return True
 
@@ -1034,7 +1087,8 @@ class Evict(commands.AutoShardedBot):
         after: VoiceState,
     ):
         """
-        Make sure the bot is a Stage Channel speaker.
+        Make sure the bot is a Stage Channel speaker
+        and track voice sessions for the statistics.
         """
         if member.bot:
             if (
@@ -1048,11 +1102,7 @@ class Evict(commands.AutoShardedBot):
                     await member.edit(suppress=False)
             return
 
-        if before.channel is None and after.channel is not None:
-            self.voice_join_times[member.id] = time.time()
-
-        elif before.channel is not None and after.channel is None:
-            self.voice_join_times.pop(member.id, None)
+        self.voice.update(member, before, after)
 
     async def on_audit_log_entry_create(self, entry: AuditLogEntry):
         """
@@ -1084,77 +1134,17 @@ class Evict(commands.AutoShardedBot):
                 except HTTPException:
                     break
 
-    async def update_voice_times(self):
-        """
-        Calculate voice minutes for each guild.
-        """
-        await self.wait_until_ready()
-        while not self.is_closed():
-            current_time = time.time()
-            
-            voice_stats = {}  
-            member_updates = {}
-            
-            for guild in self.guilds:
-                total_minutes = 0
-                
-                for vc in guild.voice_channels:
-                    for member in vc.members:
-                        if member.bot:
-                            continue
-                            
-                        if member.id not in self.voice_join_times:
-                            member_updates[member.id] = current_time
-                            continue
-                            
-                        join_time = self.voice_join_times[member.id]
-                        minutes = int((current_time - join_time) / 60)
-                        
-                        if minutes > 0:
-                            total_minutes += minutes
-                            member_updates[member.id] = current_time
-                
-                if total_minutes > 0:
-                    voice_stats[guild.id] = total_minutes
-            
-            self.voice_join_times.update(member_updates)
-            
-            if voice_stats:
-                query = """
-                INSERT INTO statistics.daily (guild_id, date, voice_minutes)
-                VALUES 
-                    {placeholders}
-                ON CONFLICT (guild_id, date) 
-                DO UPDATE SET voice_minutes = statistics.daily.voice_minutes + EXCLUDED.voice_minutes
-                """
-                
-                values = []
-                placeholders = []
-                for i, (guild_id, minutes) in enumerate(voice_stats.items()):
-                    values.extend([guild_id, minutes])
-                    placeholders.append(f"(${i*2 + 1}, CURRENT_DATE, ${i*2 + 2})")
-                
-                await self.db.execute(
-                    query.format(placeholders=','.join(placeholders)),
-                    *values
-                )
-            
-            await asyncio.sleep(30)
-
     async def check_guild_ratelimit(self, message) -> bool:
         """
         Check the guild ratelimits for the bot.
         """
         if not message.guild:
             return True
-            
-        bucket_10s = self.guild_ratelimit_10s.get_bucket(message)
-        bucket_30s = self.guild_ratelimit_30s.get_bucket(message) 
-        bucket_1m = self.guild_ratelimit_1m.get_bucket(message)
 
-        retry_after = bucket_10s.update_rate_limit() or bucket_30s.update_rate_limit() or bucket_1m.update_rate_limit()
-        
-        return not bool(retry_after)
+        return not any(
+            self.ratelimits.hit(f"guild:{per}:{message.guild.id}", rate, per)
+            for rate, per in GUILD_LIMITS
+        )
 
     async def update_system_stats(self):
         """
@@ -1186,7 +1176,7 @@ class Evict(commands.AutoShardedBot):
 
     async def _backup_task(self):
         """
-        Run backups every 8 hours.
+        Run backups every 8 hours, in the mode scheduled for the run.
         """
         await self.wait_until_ready()
         while not self.is_closed():
@@ -1197,11 +1187,12 @@ class Evict(commands.AutoShardedBot):
                     next_run += timedelta(hours=8)
                 
                 await asyncio.sleep((next_run - now).total_seconds())
-                
-                if await self.backup_manager.run_backup():
-                    log.info("8-hour backup completed successfully")
+
+                mode = self.backup_manager.scheduled_mode(next_run)
+                if await self.backup_manager.run_backup(mode):
+                    log.info(f"8-hour {mode} backup completed successfully")
                 else:
-                    log.error("8-hour backup failed")
+                    log.error(f"8-hour {mode} backup failed")
                     
             except Exception as e:
                 log.error(f"Error in backup task: {e}")
@@ -1211,6 +1202,8 @@ class Evict(commands.AutoShardedBot):
         """
         Wrapper for process pool execution.
         """
+        from processors.image_generation import process_image_effect
+
         try:
             return await self.loop.run_in_executor(
                 None,
@@ -1246,7 +1239,7 @@ class Evict(commands.AutoShardedBot):
             log.error(f"Data processing error: {e}")
             raise
 
-    async def process_backup(self, command: str):
+    async def process_backup(self, command: str, output: str):
         """
         Wrapper for process pool execution of backup tasks.
         """
@@ -1255,12 +1248,12 @@ class Evict(commands.AutoShardedBot):
                 None,
                 self.process_pool.apply,
                 run_pg_dump,
-                (command,),
+                (command, output),
                 {}
             )
         finally:
-            if hasattr(self, 'process_pool'):
-                self.process_pool._maintain_pool()
+            if self._process_pool:
+                self._process_pool._maintain_pool()
 
 if __name__ == "__main__":
     bot = Evict(
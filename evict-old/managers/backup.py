@@ -1,222 +1,437 @@
-import gzip
 import config
 import asyncio
 import logging
-import ftplib
-import subprocess
+import shutil
 
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from time import perf_counter
+from typing import AsyncIterator, List, Literal, Optional
+
+from aiohttp import ClientTimeout
+from yarl import URL
 
 log = logging.getLogger(__name__)
 
+BackupMode = Literal["full", "base", "incremental"]
+CHUNK_SIZE = 1024 * 1024
+ARCHIVES = ("*.tar.zst", "*.sql.zst")
+UPLOAD_TIMEOUT = ClientTimeout(total=None, sock_connect=30, sock_read=600)
+
+
+class BackupReport:
+    """
+    The outcome of a single backup stage.
+    """
+
+    def __init__(self, name: str, size: int, duration: float, uploaded: bool):
+        self.name = name
+        self.size = size
+        self.duration = duration
+        self.uploaded = uploaded
+
+    def __repr__(self) -> str:
+        return (
+            f"<BackupReport name={self.name!r} size={self.size} "
+            f"duration={self.duration:.1f}s throughput={self.throughput / 1024 ** 2:.1f}MiB/s>"
+        )
+
+    @property
+    def throughput(self) -> float:
+        return self.size / self.duration if self.duration else 0
+
+
 class BackupManager:
-    def __init__(self, bot):
+    """
+    Database backups which never run on the event loop.
+
+    Dumping, compression and uploading all happen in subprocesses
+    or streamed chunks, so the bot only awaits their completion.
+    Full backups dump every database with `pg_dump -Fd -j N`,
+    while base and incremental backups use `pg_basebackup` with streamed WAL.
+    An incremental backup and the base it builds on are retained together.
+    """
+
+    def __init__(self, bot, jobs: int = 4):
         self.bot = bot
+        self.jobs = jobs
         self.backup_dir = Path("backups")
         self.schemas_dir = self.backup_dir / "schemas"
         self.full_dir = self.backup_dir / "full"
+        self.base_dir = self.backup_dir / "base"
+        self.staging_dir = self.backup_dir / "staging"
+        self.manifest = self.base_dir / "backup_manifest"
         self.retention_days = 7
-        
-        self.backup_dir.mkdir(exist_ok=True)
-        self.schemas_dir.mkdir(exist_ok=True)
-        self.full_dir.mkdir(exist_ok=True)
 
-    def _upload_to_bunny(self, local_path: Path, remote_path: str) -> bool:
+        for directory in (
+            self.backup_dir,
+            self.schemas_dir,
+            self.full_dir,
+            self.base_dir,
+            self.staging_dir,
+        ):
+            directory.mkdir(exist_ok=True)
+
+    def dsn(self, database: Optional[str] = None) -> str:
+        url = URL(config.DATABASE.DSN)
+        if database:
+            url = url.with_path(f"/{database}")
+
+        return str(url)
+
+    async def _execute(self, *command: str, shell: bool = False) -> bool:
         """
-        Upload file to Bunny Storage via FTP.
+        Run a backup command, logging its error output on failure.
         """
+
+        if shell:
+            process = await asyncio.create_subprocess_shell(
+                command[0],
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        else:
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+            )
+
         try:
-            with ftplib.FTP(config.AUTHORIZATION.BACKUPS.HOST, timeout=30) as ftp:
-                ftp.login(config.AUTHORIZATION.BACKUPS.USER, config.AUTHORIZATION.BACKUPS.PASSWORD)
-                
-                current_path = ""
-                for part in remote_path.split("/")[:-1]:
-                    current_path += f"/{part}"
-                    try:
-                        ftp.mkd(current_path)
-                    except:
-                        pass
-
-                with open(local_path, "rb") as file:
-                    ftp.storbinary(f"STOR {remote_path}", file, blocksize=8192)
-                
-                log.info(f"Uploaded {local_path} to Bunny Storage")
-                return True
-        except Exception as e:
-            log.error(f"Bunny Storage upload failed: {e}")
+            _, stderr = await process.communicate()
+        except asyncio.CancelledError:
+            process.kill()
+            raise
+
+        if process.returncode != 0:
+            log.error(f"Backup command {command[0]!r} failed: {stderr.decode()}")
             return False
 
-    async def _run_pg_dump(self, command: str) -> Optional[bytes]:
+        return True
+
+    async def _compress(self, source: Path, destination: Path) -> bool:
         """
-        Execute pg_dump command and return output.
+        Archive a directory with tar and a multithreaded zstd process.
         """
+
+        return await self._execute(
+            "tar",
+            "--use-compress-program=zstd -T0 -3",
+            "-cf",
+            str(destination),
+            "-C",
+            str(source.parent),
+            source.name,
+        )
+
+    async def _read(self, path: Path) -> AsyncIterator[bytes]:
+        with open(path, "rb") as file:
+            while chunk := await asyncio.to_thread(file.read, CHUNK_SIZE):
+                yield chunk
+
+    async def _upload(self, local_path: Path, remote_path: str) -> bool:
+        """
+        Stream a file to Bunny Storage in chunks.
+        Only stalls time out, as large archives outlast the session timeout.
+        """
+
+        url = URL.build(
+            scheme="https",
+            host=config.AUTHORIZATION.BACKUPS.HOST,
+            path=f"/{config.AUTHORIZATION.BACKUPS.USER}/{remote_path.lstrip('/')}",
+        )
         try:
-            process = await asyncio.create_subprocess_shell(
-                command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode != 0:
-                log.error(f"Backup failed: {stderr.decode()}")
-                return None
-            
-            try:
-                process.kill()
-            except ProcessLookupError:
-                pass
-                
-            return stdout
+            async with self.bot.session.put(
+                url,
+                data=self._read(local_path),
+                timeout=UPLOAD_TIMEOUT,
+                headers={
+                    "AccessKey": config.AUTHORIZATION.BACKUPS.PASSWORD,
+                    "Content-Type": "application/octet-stream",
+                },
+            ) as response:
+                if response.status >= 400:
+                    log.error(
+                        f"Bunny Storage upload of {remote_path} failed with {response.status}"
+                    )
+                    return False
+
         except Exception as e:
-            log.error(f"Backup error: {e}")
-            if 'process' in locals():
-                try:
-                    process.kill()
-                except ProcessLookupError:
-                    pass
+            log.error(f"Bunny Storage upload failed: {e}")
+            return False
+
+        log.info(f"Uploaded {local_path} to Bunny Storage")
+        return True
+
+    async def _finish(
+        self,
+        name: str,
+        local_path: Path,
+        remote_path: str,
+        started: float,
+    ) -> Optional[BackupReport]:
+        if not local_path.exists():
             return None
 
-    async def create_schema_backup(self, timestamp: datetime) -> bool:
+        uploaded = await self._upload(local_path, remote_path)
+        report = BackupReport(
+            name,
+            local_path.stat().st_size,
+            perf_counter() - started,
+            uploaded,
+        )
+        log.info(f"Finished backup stage {report!r}")
+        return report if uploaded else None
+
+    async def databases(self) -> List[str]:
+        return [
+            record["datname"]
+            for record in await self.bot.db.fetch(
+                """
+                SELECT datname
+                FROM pg_database
+                WHERE NOT datistemplate
+                AND datallowconn
+                """
+            )
+        ]
+
+    async def create_schema_backup(self, timestamp: datetime) -> Optional[BackupReport]:
         """
         Create schema-only backup of all databases.
         """
         date_folder = timestamp.strftime("%Y-%m-%d")
-        time_str = timestamp.strftime("%H%M%S")
-        filename = f"schemas_{time_str}.sql.gz"
-        
+        filename = f"schemas_{timestamp.strftime('%H%M%S')}.sql.zst"
+
         local_dir = self.schemas_dir / date_folder
         local_dir.mkdir(exist_ok=True)
         local_path = local_dir / filename
 
-        command = (
-            "PGPASSWORD=admin pg_dumpall -h localhost -U postgres "
-            "--schema-only --clean --if-exists"
+        started = perf_counter()
+        command = " ".join(
+            (
+                "pg_dumpall --schema-only --clean --if-exists",
+                f"-d '{self.dsn()}'",
+                f"| zstd -T0 -3 -q -o '{local_path}'",
+            )
         )
+        if not await self._execute(command, shell=True):
+            local_path.unlink(missing_ok=True)
+            return None
 
-        if data := await self._run_pg_dump(command):
-            try:
-                with gzip.open(local_path, 'wb') as f:
-                    f.write(data)
-                del data  
-                
-                remote_path = f"/schemas/{date_folder}/{filename}"
-                success = self._upload_to_bunny(local_path, remote_path)
-                
-                if success:
-                    log.info(f"Created schema backup: {filename}")
-                    return True
-            except Exception as e:
-                log.error(f"Failed to write backup: {e}")
-                if local_path.exists():
-                    local_path.unlink()
-        return False
+        return await self._finish(
+            "schemas",
+            local_path,
+            f"/schemas/{date_folder}/{filename}",
+            started,
+        )
 
-    async def create_full_backup(self, timestamp: datetime) -> bool:
+    async def create_database_backup(
+        self,
+        database: str,
+        timestamp: datetime,
+    ) -> Optional[BackupReport]:
         """
-        Create full backup of all databases.
+        Dump a database in the parallel directory format and archive it.
         """
         date_folder = timestamp.strftime("%Y-%m-%d")
-        time_str = timestamp.strftime("%H%M%S")
-        filename = f"full_{time_str}.sql.gz"
-        
+        filename = f"{database}_{timestamp.strftime('%H%M%S')}.tar.zst"
+
         local_dir = self.full_dir / date_folder
         local_dir.mkdir(exist_ok=True)
         local_path = local_dir / filename
+        staging = self.staging_dir / f"{database}_{timestamp.strftime('%H%M%S')}"
+
+        started = perf_counter()
+        try:
+            if not await self._execute(
+                "pg_dump",
+                "-Fd",
+                "-j",
+                str(self.jobs),
+                "-Z",
+                "0",
+                "-f",
+                str(staging),
+                "-d",
+                self.dsn(database),
+            ):
+                return None
 
-        command = (
-            "PGPASSWORD=admin pg_dumpall -h localhost -U postgres "
-            "--clean --if-exists"
+            if not await self._compress(staging, local_path):
+                local_path.unlink(missing_ok=True)
+                return None
+        finally:
+            await asyncio.to_thread(shutil.rmtree, staging, True)
+
+        return await self._finish(
+            database,
+            local_path,
+            f"/full/{date_folder}/{filename}",
+            started,
         )
 
+    async def create_base_backup(
+        self,
+        timestamp: datetime,
+        incremental: bool = False,
+    ) -> Optional[BackupReport]:
+        """
+        Create a physical backup with streamed WAL.
+        Incremental backups build on the manifest of the previous one.
+        """
+        date_folder = timestamp.strftime("%Y-%m-%d")
+        kind = "incremental" if incremental and self.manifest.exists() else "base"
+        filename = f"{kind}_{timestamp.strftime('%H%M%S')}.tar.zst"
+
+        local_dir = self.base_dir / date_folder
+        local_dir.mkdir(exist_ok=True)
+        local_path = local_dir / filename
+        staging = self.staging_dir / f"{kind}_{timestamp.strftime('%H%M%S')}"
+        manifest = self.staging_dir / f"{staging.name}.manifest"
+
+        command = [
+            "pg_basebackup",
+            "-d",
+            self.dsn(),
+            "-D",
+            str(staging),
+            "-X",
+            "stream",
+            "-c",
+            "fast",
+        ]
+        if kind == "incremental":
+            command.append(f"--incremental={self.manifest}")
+
+        started = perf_counter()
         try:
-            process = await asyncio.create_subprocess_shell(
-                command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+            if not await self._execute(*command):
+                return None
+
+            await asyncio.to_thread(
+                shutil.copyfile,
+                staging / "backup_manifest",
+                manifest,
             )
-            
-            with gzip.open(local_path, 'wb') as gz_file:
-                while True:
-                    chunk = await process.stdout.read(8192)  
-                    if not chunk:
-                        break
-                    gz_file.write(chunk)
-            
-            stderr = await process.stderr.read()
-            if process.returncode != 0:
-                log.error(f"Backup failed: {stderr.decode()}")
-                local_path.unlink()
-                return False
-                
-            try:
-                process.kill()
-            except ProcessLookupError:
-                pass
-            
-            success = await asyncio.get_event_loop().run_in_executor(
-                None, 
-                self._upload_to_bunny, 
-                local_path, 
-                f"/full/{date_folder}/{filename}"
+            if not await self._compress(staging, local_path):
+                local_path.unlink(missing_ok=True)
+                return None
+        finally:
+            await asyncio.to_thread(shutil.rmtree, staging, True)
+
+        try:
+            report = await self._finish(
+                kind,
+                local_path,
+                f"/base/{date_folder}/{filename}",
+                started,
             )
-            
-            if success:
-                log.info(f"Created full backup: {filename}")
-                return True
-                
-        except Exception as e:
-            log.error(f"Backup error: {e}")
-            if 'local_path' in locals() and local_path.exists():
-                local_path.unlink()
-            
-        return False
+            if report:
+                manifest.replace(self.manifest)
+
+            return report
+        finally:
+            manifest.unlink(missing_ok=True)
+
+    async def create_full_backup(self, timestamp: datetime) -> bool:
+        """
+        Create full backup of all databases.
+        """
+        reports = [
+            await self.create_database_backup(database, timestamp)
+            for database in await self.databases()
+        ]
+        return bool(reports) and all(reports)
+
+    def chains(self) -> List[List[Path]]:
+        """
+        Group physical backups into each base and the incrementals built on it.
+        """
+        archives = sorted(
+            self.base_dir.glob("*/*.tar.zst"),
+            key=lambda path: (path.parent.name, path.name.split("_", 1)[-1]),
+        )
+        chains: List[List[Path]] = []
+        for path in archives:
+            if path.name.startswith("base_") or not chains:
+                chains.append([path])
+            else:
+                chains[-1].append(path)
+
+        return chains
 
     def cleanup_old_backups(self):
         """
         Remove backups older than retention period.
+        A base is kept for as long as any incremental built on it.
         """
         try:
             current_time = datetime.now(timezone.utc).timestamp()
             retention_seconds = self.retention_days * 24 * 60 * 60
 
-            for directory in [self.schemas_dir, self.full_dir]:
-                if not directory.exists():
-                    continue
-                    
+            def expired(path: Path) -> bool:
+                return current_time - path.stat().st_mtime > retention_seconds
+
+            old_backups: List[Path] = []
+            for directory in (self.schemas_dir, self.full_dir):
+                for pattern in ARCHIVES:
+                    old_backups.extend(
+                        path for path in directory.glob(f"*/{pattern}") if expired(path)
+                    )
+
+            for chain in self.chains():
+                if all(expired(path) for path in chain):
+                    old_backups.extend(chain)
+
+            for backup_file in old_backups:
+                try:
+                    backup_file.unlink()
+                    log.info(f"Removed old backup: {backup_file.name}")
+                except (OSError, IOError) as e:
+                    log.error(f"Error processing backup file {backup_file}: {e}")
+
+            for directory in (self.schemas_dir, self.full_dir, self.base_dir):
                 for date_dir in directory.iterdir():
-                    if not date_dir.is_dir():
-                        continue
-                        
                     try:
-                        for backup_file in date_dir.glob("*.sql.gz"):
-                            try:
-                                file_time = backup_file.stat().st_mtime
-                                if current_time - file_time > retention_seconds:
-                                    backup_file.unlink()
-                                    log.info(f"Removed old backup: {backup_file.name}")
-                            except (OSError, IOError) as e:
-                                log.error(f"Error processing backup file {backup_file}: {e}")
-                        
-                        if not any(date_dir.iterdir()):
+                        if date_dir.is_dir() and not any(date_dir.iterdir()):
                             date_dir.rmdir()
                     except (OSError, IOError) as e:
                         log.error(f"Error processing date directory {date_dir}: {e}")
-                        
+
         except Exception as e:
             log.error(f"Cleanup error: {e}")
 
-    async def run_backup(self):
+    @staticmethod
+    def scheduled_mode(timestamp: datetime) -> BackupMode:
+        """
+        The mode for a scheduled run, a logical dump on Sundays,
+        a new base each other day and incrementals in between.
+        """
+        if timestamp.hour >= 8:
+            return "incremental"
+
+        return "full" if timestamp.weekday() == 6 else "base"
+
+    async def run_backup(self, mode: BackupMode = "full"):
         """
-        Run both schema and full backups.
+        Run the schema backup along with a backup of the given mode.
         """
         timestamp = datetime.now(timezone.utc)
+        started = perf_counter()
         schema_success = await self.create_schema_backup(timestamp)
-        full_success = await self.create_full_backup(timestamp)
-        
-        if schema_success and full_success:
-            self.cleanup_old_backups()
+        if mode == "full":
+            data_success = await self.create_full_backup(timestamp)
+        else:
+            data_success = bool(
+                await self.create_base_backup(
+                    timestamp,
+                    incremental=mode == "incremental",
+                )
+            )
+
+        log.info(f"Backup run ({mode}) took {perf_counter() - started:.1f}s")
+        if schema_success and data_success:
+            await asyncio.to_thread(self.cleanup_old_backups)
             return True
-        return False 
\ No newline at end of file
+        return False
@@ -1,33 +1,35 @@
 import asyncio
 import logging
 from pathlib import Path
-from typing import Optional
 import ftplib
 import subprocess
 
 log = logging.getLogger(__name__)
 
-def run_pg_dump(command: str) -> Optional[bytes]:
+def run_pg_dump(command: str, output: str) -> bool:
     """
     Execute pg_dump command in a separate process.
+    The dump is streamed straight into `output` rather than held in memory.
     """
     try:
-        process = subprocess.Popen(
-            command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            shell=True
-        )
-        stdout, stderr = process.communicate()
-        
+        with open(output, "wb") as file:
+            process = subprocess.Popen(
+                command,
+                stdout=file,
+                stderr=subprocess.PIPE,
+                shell=True
+            )
+            _, stderr = process.communicate()
+
         if process.returncode != 0:
             log.error(f"Backup failed: {stderr.decode()}")
-            return None
-            
-        return stdout
+            Path(output).unlink(missing_ok=True)
+            return False
+
+        return True
     except Exception as e:
         log.error(f"Backup error: {e}")
-        return None 
+        return False
 
 def process_bunny_upload(local_path: Path, remote_path: str, bunny_host: str, bunny_user: str, bunny_pass: str) -> bool:
     """
@@ -0,0 +1,55 @@
+from collections import OrderedDict
+from contextlib import suppress
+from logging import getLogger
+from typing import Optional, Tuple
+
+import orjson
+from yt_dlp import YoutubeDL
+
+log = getLogger("evict/ydl")
+log.setLevel("CRITICAL")
+
+MAX_INSTANCES = 8
+instances: "OrderedDict[bytes, YoutubeDL]" = OrderedDict()
+
+
+def get_instance(options: dict) -> YoutubeDL:
+    """
+    Reuse a YoutubeDL instance per options set within the worker.
+    """
+    key = orjson.dumps(options, option=orjson.OPT_SORT_KEYS)
+    if key in instances:
+        instances.move_to_end(key)
+        return instances[key]
+
+    if len(instances) >= MAX_INSTANCES:
+        _, ydl = instances.popitem(last=False)
+        with suppress(Exception):
+            ydl.close()
+
+    ydl = instances[key] = YoutubeDL({**options, "logger": log})
+    return ydl
+
+
+def process_extraction(
+    url: str,
+    options: dict,
+    download: bool = False,
+) -> Tuple[Optional[dict], Optional[str]]:
+    """
+    Extract media information in the extraction pool.
+    Returns the sanitized information or the error message.
+    """
+    ydl = get_instance(options)
+    try:
+        info = ydl.extract_info(url, download=download)
+    except Exception as exc:
+        return None, str(exc)
+
+    if not info:
+        return None, "No information was extracted"
+
+    if download:
+        info.setdefault("local_file", ydl.prepare_filename(info))
+
+    return ydl.sanitize_info(info), None
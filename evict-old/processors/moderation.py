@@ -8,7 +8,7 @@ def process_mod_action(
     action_data: Dict[str, Union[str, int, timedelta, None]]
 ) -> Dict[str, str]:
     """
-    Process moderation action data in a separate process.
+    Resolve the title and DM behaviour of a moderation action.
     """
     action = action_data['action']
     duration = action_data.get('duration')
@@ -0,0 +1,90 @@
+"""
+Two clusters against a fake gateway.
+
+Each cluster only caches the guilds on its own shards, the way the
+gateway hands them out, and both talk through a real IPC hub.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Dict, List
+
+import pytest
+
+pytest.importorskip("discord")
+pytest.importorskip("msgpack")
+
+from core.client.ipc import IPC, ClusterMixin, IPCHub  # noqa: E402
+from launcher import layout  # noqa: E402
+
+SHARDS = 4
+GUILDS = [(index << 22) | index for index in range(1, 41)]
+
+
+class Cluster(ClusterMixin):
+    def __init__(self, cluster_id: int, shard_ids: List[int]):
+        self.cluster_id = cluster_id
+        self.shard_ids = shard_ids
+        self.shard_count = SHARDS
+        self.shards = {
+            shard_id: SimpleNamespace(latency=0.05) for shard_id in shard_ids
+        }
+        self.guilds = [
+            SimpleNamespace(id=guild_id, shard_id=shard_id, member_count=10)
+            for guild_id in GUILDS
+            if (shard_id := (guild_id >> 22) % SHARDS) in shard_ids
+        ]
+        self.users = [
+            SimpleNamespace(id=guild.id, bot=False) for guild in self.guilds
+        ] + [SimpleNamespace(id=0, bot=True)]
+
+
+def clusters() -> List[Cluster]:
+    return [
+        Cluster(cluster_id, shard_ids)
+        for cluster_id, shard_ids in enumerate(layout(SHARDS, 2))
+    ]
+
+
+def test_every_guild_has_one_owner():
+    first, second = clusters()
+
+    for guild_id in GUILDS:
+        assert first.owns(guild_id) != second.owns(guild_id)
+
+    assert {guild.id for guild in first.guilds} == set(
+        filter(first.owns, GUILDS)
+    )
+
+
+def test_stats_are_gathered_from_both_clusters(tmp_path):
+    async def run() -> Dict[int, dict]:
+        hub = IPCHub(str(tmp_path / "ipc.sock"))
+        await hub.start()
+
+        peers = []
+        for cluster in clusters():
+            ipc = IPC(cluster, cluster.cluster_id, hub.path)  # type: ignore
+            ipc.route("stats")(cluster.cluster_stats)
+            ipc.start()
+            peers.append(ipc)
+
+        try:
+            while len(hub.clusters) < len(peers):
+                await asyncio.sleep(0.01)
+
+            return await peers[0].request("stats", timeout=2)
+        finally:
+            for ipc in peers:
+                await ipc.close()
+
+            await hub.close()
+
+    results = asyncio.run(run())
+
+    assert sorted(results) == [0, 1]
+    assert sum(stats["guilds"] for stats in results.values()) == len(GUILDS)
+    assert sum(stats["users"] for stats in results.values()) == len(GUILDS)
+    assert sorted(
+        shard_id for stats in results.values() for shard_id in stats["shards"]
+    ) == list(range(SHARDS))
@@ -0,0 +1,95 @@
+"""
+Join attribution when invites are deleted.
+
+Discord deletes a limited invite once its last use is consumed, which
+attributes the next join without a request. An invite deleted by hand
+with uses left says nothing about the join, so it must be refreshed.
+"""
+
+import asyncio
+import importlib.util
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+
+pytest.importorskip("discord")
+
+# The invites package pulls in the whole config cog, and with it main,
+# so the tracker is loaded on its own.
+spec = importlib.util.spec_from_file_location(
+    "invite_tracker",
+    Path(__file__).parent.parent / "cogs/config/extended/invites/tracker.py",
+)
+tracker = importlib.util.module_from_spec(spec)  # type: ignore
+spec.loader.exec_module(tracker)  # type: ignore
+InviteTracker = tracker.InviteTracker
+
+
+class Guild:
+    def __init__(self, invites: List[SimpleNamespace]):
+        self.id = 1
+        self.features: List[str] = []
+        self.current = invites
+        self.requests = 0
+
+    async def invites(self) -> List[SimpleNamespace]:
+        self.requests += 1
+        return self.current
+
+
+def invite(guild: Guild, code: str, uses: int, max_uses: int = 0):
+    return SimpleNamespace(
+        guild=guild,
+        code=code,
+        inviter=None,
+        uses=uses,
+        max_uses=max_uses,
+        expires_at=None,
+        max_age=0,
+        created_at=None,
+    )
+
+
+def join(tracker: InviteTracker, guild: Guild, deleted, current):
+    async def run():
+        await tracker.prime(guild)
+        tracker.delete(deleted)
+        guild.current = current
+        return await tracker.attribute(SimpleNamespace(id=2, guild=guild))
+
+    return asyncio.run(run())
+
+
+def test_exhausted_invite_is_attributed_without_a_refresh():
+    guild = Guild([])
+    last = invite(guild, "last", uses=4, max_uses=5)
+    other = invite(guild, "other", uses=0)
+    guild.current = [last, other]
+
+    tracker = InviteTracker(window=0)
+    used = join(tracker, guild, last, [other])
+
+    assert used is not None and used.code == "last"
+    assert used.uses == 5
+    assert guild.requests == 1
+
+
+def test_manually_deleted_invite_is_not_credited():
+    guild = Guild([])
+    removed = invite(guild, "removed", uses=1, max_uses=5)
+    first, second = invite(guild, "first", uses=0), invite(guild, "second", uses=0)
+    guild.current = [removed, first, second]
+
+    tracker = InviteTracker(window=0)
+    used = join(
+        tracker,
+        guild,
+        removed,
+        [first, invite(guild, "second", uses=1)],
+    )
+
+    assert used is not None and used.code == "second"
+    assert guild.requests == 2
+    assert not tracker.guilds[guild.id].spent
@@ -0,0 +1,107 @@
+"""
+Concurrency checks for the economy ledger.
+
+These run against a real Postgres, as the guarantees come from the
+guarded statements themselves. Point EVICT_TEST_DATABASE at a
+scratch database to run them.
+"""
+
+import asyncio
+import os
+from typing import Dict
+
+import pytest
+
+asyncpg = pytest.importorskip("asyncpg")
+pytest.importorskip("discord")
+
+from cogs.economy.ledger import InsufficientFunds, Ledger  # noqa: E402
+
+DSN = os.getenv("EVICT_TEST_DATABASE")
+pytestmark = pytest.mark.skipif(not DSN, reason="EVICT_TEST_DATABASE is not set")
+
+
+class LeaderboardRecorder:
+    def __init__(self):
+        self.scores: Dict[str, int] = {}
+
+    async def zadd(self, key: str, mapping: Dict[str, int]) -> None:
+        self.scores.update(mapping)
+
+
+class Bot:
+    def __init__(self, db):
+        self.db = db
+        self.redis = LeaderboardRecorder()
+        self.loop = asyncio.get_running_loop()
+
+
+async def setup(pool) -> None:
+    await pool.execute("CREATE SCHEMA IF NOT EXISTS evict_test")
+    await pool.execute(
+        """
+        CREATE TABLE IF NOT EXISTS economy (
+            user_id BIGINT PRIMARY KEY,
+            wallet BIGINT DEFAULT 0,
+            bank BIGINT DEFAULT 0,
+            gems BIGINT DEFAULT 0,
+            bank_capacity BIGINT
+        )
+        """
+    )
+
+
+async def stress(rounds: int = 200, wallet: int = 1_000, bet: int = 70) -> None:
+    pool = await asyncpg.create_pool(
+        DSN,
+        min_size=1,
+        max_size=20,
+        server_settings={"search_path": "evict_test"},
+    )
+    try:
+        await setup(pool)
+        await pool.execute("TRUNCATE economy")
+        await pool.execute(
+            "INSERT INTO economy (user_id, wallet) VALUES (1, $1), (2, 0)",
+            wallet,
+        )
+
+        bot = Bot(pool)
+        ledger = Ledger(bot)  # type: ignore
+
+        async def debit() -> bool:
+            try:
+                await ledger.debit(1, bet)
+            except InsufficientFunds:
+                return False
+
+            return True
+
+        async def transfer() -> bool:
+            try:
+                await ledger.transfer(1, 2, bet, log=False)
+            except InsufficientFunds:
+                return False
+
+            return True
+
+        results = await asyncio.gather(
+            *(debit() if index % 2 else transfer() for index in range(rounds))
+        )
+
+        record = await pool.fetchrow("SELECT wallet FROM economy WHERE user_id = 1")
+        received = await pool.fetchval("SELECT wallet FROM economy WHERE user_id = 2")
+
+        assert record["wallet"] >= 0
+        assert record["wallet"] == wallet - sum(results) * bet
+        assert sum(results) == wallet // bet
+        assert received == bet * sum(
+            succeeded for index, succeeded in enumerate(results) if not index % 2
+        )
+    finally:
+        await pool.execute("DROP SCHEMA evict_test CASCADE")
+        await pool.close()
+
+
+def test_concurrent_debits_never_overdraw():
+    asyncio.run(stress())
@@ -0,0 +1,111 @@
+"""
+Round trips of a player through its snapshot.
+
+A player is built against a fake Lavalink node, snapshotted, and then
+restored into a fresh player, which must end up in the same state.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+
+discord = pytest.importorskip("discord")
+pomice = pytest.importorskip("pomice")
+
+from pomice.enums import TrackType  # noqa: E402
+from pomice.utils import LavalinkVersion  # noqa: E402
+
+from cogs.audio.core.player import Client  # noqa: E402
+from cogs.audio.core.state import PlayerStore, snapshot  # noqa: E402
+
+FILTERS = {"timescale": {"speed": 1.25, "pitch": 1.1}}
+
+
+class Node:
+    def __init__(self):
+        self._log = None
+        self._session_id = "session"
+        self._version = LavalinkVersion(4, 0, 0)
+        self._players = {}
+        self.sent: List[dict] = []
+
+    @property
+    def players(self):
+        return self._players
+
+    async def send(self, **kwargs) -> None:
+        self.sent.append(kwargs["data"])
+
+
+class Channel(discord.VoiceChannel):
+    members = [SimpleNamespace(id=1, bot=False)]
+
+    def __init__(self, guild, node: Node):
+        self.id = 2
+        self.guild = guild
+        self.node = node
+
+    async def connect(self, *, cls, self_deaf: bool = False):
+        client = cls(SimpleNamespace(), self, node=self.node)
+        client._is_connected = True
+        return client
+
+
+def track(track_id: str) -> pomice.Track:
+    return pomice.Track(
+        track_id=track_id,
+        info={"title": track_id, "length": 240_000},
+        track_type=TrackType.YOUTUBE,
+    )
+
+
+def test_snapshot_survives_a_restore():
+    guild = SimpleNamespace(id=1, voice_client=None, get_member=lambda _: None)
+
+    async def run():
+        node = Node()
+        channel = Channel(guild, node)
+        guild.get_channel = lambda _: channel
+
+        client = await channel.connect(cls=Client)
+        await client.set_volume(80)
+        await client.apply_filters(FILTERS)
+        client.queue.put(track("second"))
+        client.queue.put(track("third"))
+        await client.play(track("first"))
+        client._last_position = 42_000
+        client._last_update = time.time() * 1000
+        await client.set_pause(True)
+
+        state = snapshot(client)
+
+        store = PlayerStore()
+
+        async def build(_, state):
+            return track(state["track_id"])
+
+        store.build = build  # type: ignore
+        restored = await store.restore(guild, state)  # type: ignore
+        return state, restored, node
+
+    state, restored, node = asyncio.run(run())
+
+    assert state["filters"] == FILTERS
+    assert state["position"] == 42_000
+    assert restored.filter_payload == FILTERS
+    assert restored.volume == 80
+    assert restored.is_paused
+    assert restored.current.track_id == "first"
+    assert [item.track_id for item in restored.queue] == ["second", "third"]
+    assert {"filters": FILTERS} in node.sent
+    assert node.sent[-2]["position"] == "42000"
+
+    # The position is reported by Lavalink once the track resumes.
+    resumed = snapshot(restored)
+    for key in ("position", "updated_at"):
+        del state[key], resumed[key]
+
+    assert resumed == state
@@ -0,0 +1,105 @@
+"""
+A reaction storm against the starboard engine.
+
+Hundreds of concurrent reactions on one message must cost a single
+fetch and at most one board write per debounce window, and the final
+board entry must show the true count.
+"""
+
+import asyncio
+import importlib.util
+import random
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+
+pytest.importorskip("discord")
+
+# The starboard package pulls in the whole config cog, and with it main,
+# so the engine is loaded on its own.
+spec = importlib.util.spec_from_file_location(
+    "starboard_engine",
+    Path(__file__).parent.parent / "cogs/config/extended/starboard/engine.py",
+)
+engine = importlib.util.module_from_spec(spec)  # type: ignore
+spec.loader.exec_module(engine)  # type: ignore
+StarboardEngine = engine.StarboardEngine
+
+EMOJI = "⭐"
+DELAY = 0.05
+
+
+class Channel:
+    def __init__(self):
+        self.stars = 0
+        self.fetches = 0
+
+    async def fetch_message(self, message_id: int):
+        self.fetches += 1
+        await asyncio.sleep(0.01)
+        return SimpleNamespace(
+            id=message_id,
+            reactions=[SimpleNamespace(emoji=EMOJI, count=self.stars)],
+        )
+
+
+class Starboard:
+    guild_id = 1
+    emoji = EMOJI
+    threshold = 3
+
+    def __init__(self):
+        self.writes: List[int] = []
+
+    async def get_star(self, message):
+        return None
+
+    async def save_star(self, *, stars: int, message, star_message):
+        self.writes.append(stars)
+        await asyncio.sleep(0.005)
+        return star_message or SimpleNamespace(id=2)
+
+
+def storm(reactions: int = 300):
+    bot = SimpleNamespace(get_message=lambda _: None)
+    channel, starboard = Channel(), Starboard()
+
+    async def run():
+        board = StarboardEngine(bot, delay=DELAY)  # type: ignore
+
+        def react(delta: int) -> None:
+            channel.stars += delta
+            tally = board.get(3, EMOJI) or board.track(starboard, channel, 3)  # type: ignore
+            board.react(tally, delta)
+
+        async def user(removes: bool) -> None:
+            await asyncio.sleep(random.uniform(0, 0.4))
+            react(1)
+            if removes:
+                await asyncio.sleep(random.uniform(0, 0.1))
+                react(-1)
+
+        started = time.monotonic()
+        await asyncio.gather(
+            *(user(removes=index % 3 == 0) for index in range(reactions))
+        )
+        elapsed = time.monotonic() - started
+
+        await asyncio.sleep(DELAY * 4)
+        await board.close()
+        return board, elapsed
+
+    board, elapsed = asyncio.run(run())
+    return board, channel, starboard, elapsed
+
+
+def test_reaction_storm_is_bounded():
+    board, channel, starboard, elapsed = storm()
+
+    assert channel.fetches == 1
+    assert board.fetches == 1
+    assert len(starboard.writes) <= elapsed / DELAY + 2
+    assert starboard.writes[-1] == channel.stars == 200
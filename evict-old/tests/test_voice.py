@@ -0,0 +1,100 @@
+"""
+Replay checks for voice minute accounting.
+
+A recorded trace of joins, moves and leaves is fed through the tracker
+with explicit timestamps, flushing along the way, and the minutes
+written to the database are compared with the session totals.
+"""
+
+import asyncio
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+from typing import DefaultDict, List, Tuple
+
+import pytest
+
+discord = pytest.importorskip("discord")
+
+from core.client.voice import VoiceTracker  # noqa: E402
+
+MIDNIGHT = datetime(2026, 1, 2, tzinfo=timezone.utc).timestamp()
+BEFORE, AFTER = date(2026, 1, 1), date(2026, 1, 2)
+GUILD = SimpleNamespace(id=1)
+
+
+class Database:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.minutes: DefaultDict[Tuple[int, date], int] = defaultdict(int)
+
+    async def executemany(self, query: str, records: List[tuple]) -> None:
+        if self.fail:
+            raise ConnectionError("The database is unavailable")
+
+        for guild_id, day, minutes in records:
+            self.minutes[guild_id, day] += minutes
+
+
+def channel(cls=None):
+    return (cls or discord.VoiceChannel).__new__(cls or discord.VoiceChannel)
+
+
+def state(channel=None):
+    return SimpleNamespace(channel=channel)
+
+
+def member(member_id: int, bot: bool = False):
+    return SimpleNamespace(id=member_id, bot=bot, guild=GUILD)
+
+
+def replay(db: Database) -> VoiceTracker:
+    tracker = VoiceTracker(SimpleNamespace(db=db))  # type: ignore
+    general, music = channel(), channel()
+    stage = channel(discord.StageChannel)
+    alice, bob, carol, robot = member(1), member(2), member(3), member(4, bot=True)
+
+    start = MIDNIGHT - 120
+
+    async def run() -> None:
+        tracker.update(alice, state(), state(general), start)
+        tracker.update(robot, state(), state(general), start)
+        tracker.update(bob, state(), state(general), start + 30)
+        tracker.update(carol, state(), state(stage), start + 45)
+        tracker.update(alice, state(general), state(music), start + 60)
+
+        tracker.checkpoint(start + 90)
+        await tracker.flush()
+
+        tracker.update(bob, state(general), state(), start + 150)
+        tracker.update(carol, state(stage), state(), start + 200)
+        tracker.update(alice, state(music), state(), start + 300)
+        tracker.update(robot, state(general), state(), start + 300)
+
+        tracker.checkpoint(start + 400)
+        await tracker.flush()
+
+    asyncio.run(run())
+    return tracker
+
+
+def test_replay_matches_session_totals():
+    db = Database()
+    tracker = replay(db)
+
+    # Alice spends 120s before midnight and 180s after it, Bob 90s and 30s.
+    assert db.minutes == {(1, BEFORE): 3, (1, AFTER): 3}
+    assert dict(tracker.pending) == {(1, BEFORE): 30, (1, AFTER): 30}
+    assert not tracker.sessions
+
+
+def test_failed_flush_keeps_the_minutes():
+    db = Database(fail=True)
+    tracker = replay(db)
+
+    assert not db.minutes
+    assert dict(tracker.pending) == {(1, BEFORE): 210, (1, AFTER): 210}
+
+    db.fail = False
+    asyncio.run(tracker.flush())
+    assert db.minutes == {(1, BEFORE): 3, (1, AFTER): 3}
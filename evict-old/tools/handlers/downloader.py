@@ -1,7 +1,5 @@
-from yt_dlp import YoutubeDL
-import asyncio
 import os
-from typing import Dict, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 import discord
 from datetime import datetime
 import re
@@ -9,10 +7,14 @@ import aiohttp
 from yarl import URL
 from json import loads
 
+if TYPE_CHECKING:
+    from core.client.extraction import Extractor
+    from main import Evict
 
-def create_downloader():
+
+def create_downloader(bot: "Evict"):
     """Factory function to create a downloader instance"""
-    return Downloader()
+    return Downloader(bot.extractor)
 
 
 class Downloader:
@@ -44,7 +46,8 @@ class Downloader:
         "threads.net": "Threads",
     }
 
-    def __init__(self):
+    def __init__(self, extractor: "Extractor"):
+        self.extractor = extractor
         self.base_opts = {
             "format": "best",
             "outtmpl": "downloads/%(title)s.%(ext)s",
@@ -89,12 +92,8 @@ class Downloader:
             platform = self._get_platform(url)
 
             if platform == "TikTok" and "/photo/" not in url:
-                opts = self.base_opts.copy()
-                with YoutubeDL(opts) as ydl:
-                    info = await asyncio.to_thread(ydl.extract_info, url, download=True)
-                    filename = ydl.prepare_filename(info)
-                    info["local_file"] = filename
-                    return info, filename
+                info = await self.extractor.extract(url, self.base_opts, download=True)
+                return info, info["local_file"]
 
             if platform == "TikTok":
                 async with aiohttp.ClientSession() as session:
@@ -154,20 +153,18 @@ class Downloader:
             elif platform == "Reddit":
                 opts["extract_flat"] = True
 
-            with YoutubeDL(opts) as ydl:
-                info = await asyncio.to_thread(ydl.extract_info, url, download=download)
+            info = await self.extractor.extract(url, opts, download=download)
 
-                if info.get("_type") == "playlist":
-                    if platform in ["Instagram", "Reddit", "Twitter"]:
-                        info = info["entries"][0]
+            if info.get("_type") == "playlist":
+                if platform in ["Instagram", "Reddit", "Twitter"]:
+                    info = info["entries"][0]
 
-                if info.get("duration", 0) > 180:
-                    raise Exception("Video exceeds 3 minutes limit")
+            if info.get("duration", 0) > 180:
+                raise Exception("Video exceeds 3 minutes limit")
 
-                if download:
-                    filename = ydl.prepare_filename(info)
-                    return info, filename
-                return info, None
+            if download:
+                return info, info.get("local_file")
+            return info, None
 
         except Exception as e:
             error_msg = str(e).lower()
@@ -232,31 +229,32 @@ class Downloader:
         For photos: returns (info_dict, embed)
         For videos: returns (info_dict with filename, embed)
         """
-        try:
-            info, filename = await self._extract_info(url, download=False)
+        filename = None
+        with self.extractor.hold(url):
+            try:
+                info, filename = await self._extract_info(url, download=False)
+
+                if info.get("_type") == "photo":
+                    return info, self._create_embed(info)
+
+                if filesize := info.get("filesize"):
+                    if filesize > max_size:
+                        raise Exception(
+                            f"File too large ({filesize/1_000_000:.1f}MB). Maximum size is {max_size/1_000_000:.1f}MB"
+                        )
+
+                info, filename = await self._extract_info(url, download=True)
+                if filename:
+                    if os.path.getsize(filename) > max_size:
+                        raise Exception(f"Downloaded file exceeds size limit")
+                    info["local_file"] = filename
 
-            if info.get("_type") == "photo":
                 return info, self._create_embed(info)
 
-            if filesize := info.get("filesize"):
-                if filesize > max_size:
-                    raise Exception(
-                        f"File too large ({filesize/1_000_000:.1f}MB). Maximum size is {max_size/1_000_000:.1f}MB"
-                    )
-
-            info, filename = await self._extract_info(url, download=True)
-            if filename:
-                if os.path.getsize(filename) > max_size:
-                    os.remove(filename)
-                    raise Exception(f"Downloaded file exceeds size limit")
-                info["local_file"] = filename
-
-            return info, self._create_embed(info)
-
-        except Exception as e:
-            if filename and os.path.exists(filename):
-                os.remove(filename)
-            raise Exception(str(e))
+            except Exception as e:
+                if filename:
+                    self.extractor.discard(url, filename)
+                raise Exception(str(e))
 
     async def get_info(self, url: str) -> discord.Embed:
         """Just gets info without downloading"""
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from logging import getLogger
+from shutil import copyfileobj
+from tempfile import SpooledTemporaryFile
+from typing import IO, AsyncIterator, Optional
+
+from aiohttp import ClientSession
+from discord.ext.commands import CommandError
+
+from tools import temp_file
+
+log = getLogger("evict/relay")
+
+CHUNK_SIZE = 64 * 1024
+SPOOL_THRESHOLD = 4 * 1024 * 1024
+REENCODE_RATIO = 3
+AUDIO_BITRATE = 96_000
+MIN_VIDEO_BITRATE = 150_000
+
+
+class MediaTooLarge(CommandError):
+    def __init__(self, message: str = "That media is too large to upload here!"):
+        super().__init__(message)
+
+
+class Relay:
+    """
+    Stream remote media into a file backed payload.
+
+    The length is probed before downloading, so media which can't
+    fit the upload limit is never fetched. Bodies are spooled to disk
+    past a threshold, which caps the memory held per relay, and
+    writes past it run in a thread.
+    Oversized videos are re-encoded with ffmpeg to fit the limit.
+    """
+
+    encoders = asyncio.Semaphore(2)
+    peak: int = 0
+
+    def __init__(
+        self,
+        session: ClientSession,
+        *,
+        threshold: int = SPOOL_THRESHOLD,
+    ):
+        self.session = session
+        self.threshold = threshold
+
+    async def probe(self, url: str) -> Optional[int]:
+        """
+        Resolve the content length with a HEAD or a single byte range request.
+        """
+
+        with suppress(Exception):
+            async with self.session.head(url, allow_redirects=True) as response:
+                if response.ok and response.content_length:
+                    return response.content_length
+
+        with suppress(Exception):
+            async with self.session.get(
+                url,
+                headers={"Range": "bytes=0-0"},
+            ) as response:
+                content_range = response.headers.get("Content-Range", "")
+                if response.status == 206 and "/" in content_range:
+                    total = content_range.rsplit("/", 1)[1]
+                    if total.isdigit():
+                        return int(total)
+
+        return None
+
+    @asynccontextmanager
+    async def fetch(
+        self,
+        url: str,
+        limit: int,
+        *,
+        duration: Optional[float] = None,
+        reencode: bool = True,
+    ) -> AsyncIterator[IO[bytes]]:
+        """
+        Yield a file object for `url` which fits within `limit` bytes.
+        Raises MediaTooLarge when it can't be made to fit.
+        """
+
+        ceiling = limit * REENCODE_RATIO if reencode else limit
+        size = await self.probe(url)
+        if size and size > ceiling:
+            raise MediaTooLarge()
+
+        spool = SpooledTemporaryFile(max_size=self.threshold)
+        try:
+            written = await self.stream(url, spool, ceiling)
+            if written > limit:
+                async with self.shrink(spool, limit, duration) as output:
+                    with open(output, "rb") as fp:
+                        yield fp
+
+                return
+
+            spool.seek(0)
+            yield spool
+        finally:
+            spool.close()
+
+    async def stream(self, url: str, spool: IO[bytes], ceiling: int) -> int:
+        written = 0
+        async with self.session.get(url) as response:
+            if not response.ok:
+                raise CommandError("Failed to download that media!")
+
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                written += len(chunk)
+                if written > ceiling:
+                    raise MediaTooLarge()
+
+                if written > self.threshold:
+                    await asyncio.to_thread(spool.write, chunk)
+                else:
+                    spool.write(chunk)
+
+        in_memory = min(written, self.threshold)
+        if in_memory > Relay.peak:
+            Relay.peak = in_memory
+
+        log.debug(
+            "Relayed %s bytes from %s, %s bytes held in memory (peak %s).",
+            written,
+            url,
+            in_memory,
+            Relay.peak,
+        )
+        return written
+
+    @asynccontextmanager
+    async def shrink(
+        self,
+        spool: IO[bytes],
+        limit: int,
+        duration: Optional[float] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Re-encode a spooled video at a bitrate which fits `limit`.
+        """
+
+        async with temp_file("mp4") as source, temp_file("mp4") as output:
+            spool.seek(0)
+            with open(source, "wb") as fp:
+                await asyncio.to_thread(copyfileobj, spool, fp)
+
+            duration = duration or await self.duration(str(source))
+            if not duration:
+                raise MediaTooLarge()
+
+            bitrate = int(limit * 8 * 0.92 / duration) - AUDIO_BITRATE
+            if bitrate < MIN_VIDEO_BITRATE:
+                raise MediaTooLarge()
+
+            async with self.encoders:
+                process = await asyncio.create_subprocess_exec(
+                    "ffmpeg",
+                    "-i",
+                    str(source),
+                    "-c:v",
+                    "libx264",
+                    "-preset",
+                    "veryfast",
+                    "-b:v",
+                    str(bitrate),
+                    "-maxrate",
+                    str(bitrate),
+                    "-bufsize",
+                    str(bitrate * 2),
+                    "-c:a",
+                    "aac",
+                    "-b:a",
+                    str(AUDIO_BITRATE),
+                    "-movflags",
+                    "+faststart",
+                    "-y",
+                    "-loglevel",
+                    "panic",
+                    str(output),
+                )
+                await process.communicate()
+
+            if process.returncode != 0 or not await output.exists():
+                raise MediaTooLarge()
+
+            if (await output.stat()).st_size > limit:
+                raise MediaTooLarge()
+
+            yield str(output)
+
+    async def duration(self, path: str) -> Optional[float]:
+        process = await asyncio.create_subprocess_exec(
+            "ffprobe",
+            "-v",
+            "error",
+            "-show_entries",
+            "format=duration",
+            "-of",
+            "csv=p=0",
+            path,
+            stdout=asyncio.subprocess.PIPE,
+        )
+        stdout, _ = await process.communicate()
+        with suppress(ValueError):
+            return float(stdout.decode().strip())
+
+        return None
+
+
+__all__ = ("Relay", "MediaTooLarge")
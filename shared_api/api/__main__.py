@@ -62,6 +62,16 @@ async def index(request: Request):
     return "docs"
 
 
+@app.get(
+    "/cache",
+    name="cache",
+    description="Response cache counters for each route.",
+    include_in_schema=False,
+)
+async def cache_statistics(request: Request):
+    return services.cache.counters
+
+
 @app.exception_handler(ValidationException)
 async def validation_exception_handler(request: Request, exc: ValidationException):
     return UJSONResponse({"error": exc.errors()}, status_code=400)
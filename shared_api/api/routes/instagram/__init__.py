@@ -3,7 +3,7 @@ import re
 from fastapi import APIRouter, Request
 from fastapi.responses import UJSONResponse
 from playwright.async_api import Request as PlaywrightRequest, Error as PlaywrightError
-from api.shared import BaseModel, services, extract_json
+from api.shared import BaseModel, BatchRequest, batch_response, services, extract_json
 from typing import List
 from .models import (
     InstagramUser,
@@ -120,6 +120,13 @@ async def instagram_post(request: Request, url: str):
     return post
 
 
+@router.post("/users:batch")
+async def instagram_users(request: Request, batch: BatchRequest):
+    """Fetch several Instagram users' profiles."""
+
+    return await batch_response(instagram_user, request, batch.usernames, concurrency=4)
+
+
 @router.get("/{username}", response_model=InstagramUser)
 @services.cache(ttl="1h", key="{username}", prefix="instagram:user")
 async def instagram_user(request: Request, username: str):
@@ -131,9 +138,8 @@ async def instagram_user(request: Request, username: str):
         logger.error("Received request for invalid username {}", username)
         return UJSONResponse({"error": str(exc)}, status_code=400)
 
-    key = f"instagram:user:{username}"
     future, highlights = asyncio.get_running_loop().create_future(), []
-    async with services.lock[key], services.browser.borrow_page(reserved=True) as page:
+    async with services.browser.borrow_page(reserved=True) as page:
 
         async def user_request(request: PlaywrightRequest):
             with suppress(PlaywrightError, KeyError):
@@ -250,13 +256,13 @@ async def instagram_story(request: Request, username: str):
         logger.error("Received request for invalid username {}", username)
         return UJSONResponse({"error": str(exc)}, status_code=400)
 
-    user = await instagram_user(request, username)
-    if isinstance(user, UJSONResponse):
-        return user
+    response = await instagram_user(request, username)
+    if response.status_code != 200:
+        return response
 
-    key = f"instagram:story:{user.id}"
+    user = InstagramUser.model_validate_json(response.body)
     data = {}
-    async with services.lock[key], services.browser.borrow_page() as page:
+    async with services.browser.borrow_page() as page:
         try:
             await page.goto(
                 f"https://www.instagram.com/stories/{username}",
@@ -330,9 +336,8 @@ async def instagram_highlight(request: Request, highlight_id: str):
     """Fetch an Instagram highlight."""
 
     highlight_id = highlight_id.split(":")[-1]
-    key = f"instagram:highlight:{highlight_id}"
     future = asyncio.get_running_loop().create_future()
-    async with services.lock[key], services.browser.borrow_page() as page:
+    async with services.browser.borrow_page() as page:
 
         async def reels_request(request: PlaywrightRequest):
             if future.done():
@@ -1,7 +1,25 @@
 from fastapi import APIRouter, Request, Response
-from fastapi.responses import UJSONResponse
+from fastapi.responses import UJSONResponse, StreamingResponse
 from api.shared import services
+from email.utils import formatdate, parsedate_to_datetime
 from filetype import guess_mime
+from typing import AsyncIterator, Optional
+from pathlib import Path
+from loguru import logger
+import aiofiles
+import mimetypes
+import re
+
+CHUNK_SIZE = 64 * 1024
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+FORWARDED_HEADERS = (
+    "Content-Type",
+    "Content-Length",
+    "Content-Range",
+    "Accept-Ranges",
+    "ETag",
+    "Last-Modified",
+)
 
 router = APIRouter(
     prefix="/media",
@@ -9,12 +27,164 @@ router = APIRouter(
 )
 
 
+def parse_range(header: str, size: int) -> Optional[tuple[int, int]]:
+    """
+    Resolve a single byte range against the file size.
+    Multiple ranges are not supported and fall back to the full body.
+    """
+
+    match = RANGE_PATTERN.match(header.strip())
+    if not match or not any(match.groups()):
+        return None
+
+    start, end = match.groups()
+    if not start:
+        start, end = max(size - int(end), 0), size - 1
+    else:
+        start, end = int(start), min(int(end) if end else size - 1, size - 1)
+
+    if start > end or start >= size:
+        raise ValueError("Unsatisfiable range")
+
+    return start, end
+
+
+async def read_file(path: Path, start: int, length: int) -> AsyncIterator[bytes]:
+    async with aiofiles.open(path, "rb") as file:
+        await file.seek(start)
+        while length > 0:
+            chunk = await file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+
+            length -= len(chunk)
+            yield chunk
+
+
+def serve_file(request: Request, path: Path) -> Response:
+    stat = path.stat()
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+        "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+        "Cache-Control": "public, max-age=1800",
+    }
+    if request.headers.get("If-None-Match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    if since := request.headers.get("If-Modified-Since"):
+        try:
+            if parsedate_to_datetime(since).timestamp() >= int(stat.st_mtime):
+                return Response(status_code=304, headers=headers)
+        except (TypeError, ValueError):
+            pass
+
+    media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    start, end = 0, stat.st_size - 1
+    status_code = 200
+    if header := request.headers.get("Range"):
+        try:
+            resolved = parse_range(header, stat.st_size)
+        except ValueError:
+            return Response(
+                status_code=416,
+                headers={"Content-Range": f"bytes */{stat.st_size}"},
+            )
+
+        if resolved:
+            start, end = resolved
+            status_code = 206
+            headers["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        read_file(path, start, end - start + 1),
+        status_code=status_code,
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+async def proxy(request: Request, filename: str, url: str, kwargs: dict) -> Response:
+    """
+    Stream the upstream body to the client while writing it through to the disk cache.
+    Partial requests are forwarded upstream and never cached.
+    """
+
+    partial = request.headers.get("Range")
+    if partial:
+        kwargs = {
+            **kwargs,
+            "headers": {**kwargs.get("headers", {}), "Range": partial},
+        }
+
+    response = await services.session.get(url, **kwargs)
+    if response.status >= 400:
+        response.release()
+        return UJSONResponse(
+            {"error": "Upstream returned an error."},
+            status_code=response.status,
+        )
+
+    iterator = response.content.iter_chunked(CHUNK_SIZE)
+    try:
+        head = await anext(iterator, b"")
+    except Exception:
+        response.release()
+        raise
+
+    headers = {
+        header: response.headers[header]
+        for header in FORWARDED_HEADERS
+        if header in response.headers
+    }
+    media_type = headers.pop("Content-Type", None)
+    if not media_type or media_type == "application/octet-stream":
+        media_type = guess_mime(head) or mimetypes.guess_type(filename)[0]
+
+    cacheable = not partial and response.status == 200
+
+    async def body() -> AsyncIterator[bytes]:
+        part = services.media.reserve() if cacheable else None
+        file = await aiofiles.open(part, "wb") if part else None
+        complete = False
+        try:
+            chunk = head
+            while chunk:
+                if file:
+                    await file.write(chunk)
+
+                yield chunk
+                chunk = await anext(iterator, b"")
+
+            complete = True
+        finally:
+            response.release()
+            if file and part:
+                await file.close()
+                if complete:
+                    services.media.commit(filename, part)
+                else:
+                    part.unlink(missing_ok=True)
+                    logger.debug(f"Discarded a partial cache write for {filename}")
+
+    return StreamingResponse(
+        body(),
+        status_code=response.status,
+        media_type=media_type,
+        headers=headers,
+    )
+
+
 @router.get(
     "/{filename}",
     description="Retrieve a file from the cache.",
 )
-@services.cache(ttl="30m", key="{filename}")
 async def media_fetch(request: Request, filename: str):
+    if path := services.media.get(filename):
+        return serve_file(request, path)
+
     media = services.passive_cache.get(filename)
     if not media:
         return UJSONResponse(
@@ -22,6 +192,4 @@ async def media_fetch(request: Request, filename: str):
             status_code=404,
         )
 
-    async with services.session.get(media.original_url, **media.kwargs) as response:
-        buffer = await response.read()
-        return Response(buffer, media_type=guess_mime(buffer))
+    return await proxy(request, filename, media.original_url, media.kwargs)
@@ -2,7 +2,7 @@ import re
 from fastapi import APIRouter, Request
 from fastapi.responses import UJSONResponse
 from loguru import logger
-from api.shared import services, retry
+from api.shared import BatchRequest, batch_response, services, retry
 from pydantic import BaseModel
 from typing import List
 from contextlib import suppress
@@ -119,6 +119,20 @@ async def tiktok_post(request: Request, url: str):
     return final_post
 
 
+@router.post("/users:batch")
+async def tiktok_users(request: Request, batch: BatchRequest):
+    """Fetch several TikTok users' profiles."""
+
+    return await batch_response(tiktok_user, request, batch.usernames, concurrency=8)
+
+
+@router.post("/posts:batch")
+async def tiktok_posts_batch(request: Request, batch: BatchRequest):
+    """Fetch the posts of several TikTok users."""
+
+    return await batch_response(tiktok_posts, request, batch.usernames, concurrency=8)
+
+
 @router.get("/{username}", response_model=TikTokUser)
 @services.cache(ttl="30m", key="{username}", prefix="tiktok:user")
 async def tiktok_user(request: Request, username: str):
@@ -164,9 +178,11 @@ async def tiktok_posts(request: Request, username: str):
     """Fetch a TikTok user's posts."""
 
     username = username.lstrip("@")
-    user = await tiktok_user(request, username)
-    if isinstance(user, UJSONResponse):
-        return user
+    response = await tiktok_user(request, username)
+    if response.status_code != 200:
+        return response
+
+    user = TikTokUser.model_validate_json(response.body)
 
     response = await services.session.get(
         URL.build(
@@ -222,9 +238,11 @@ async def tiktok_reposts(request: Request, username: str):
     """Fetch a TikTok user's repost"""
 
     username = username.lstrip("@")
-    user = await tiktok_user(request, username)
-    if isinstance(user, UJSONResponse):
-        return user
+    response = await tiktok_user(request, username)
+    if response.status_code != 200:
+        return response
+
+    user = TikTokUser.model_validate_json(response.body)
 
     response = await services.session.get(
         URL.build(
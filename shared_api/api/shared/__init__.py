@@ -1,14 +1,17 @@
 from .services import services, Media
 from .logger import build_logger
 from pydantic import BaseModel as _BaseModel, ConfigDict, Field, computed_field
-from contextlib import asynccontextmanager
-from bs4 import BeautifulSoup
-from ujson import loads, dumps
-from typing import no_type_check, Awaitable, Callable, TypeVar
+from contextlib import asynccontextmanager, suppress
+from fastapi import Request, Response
+from typing import Any, Awaitable, Callable, Iterator, List, Optional, TypeVar
 from typing_extensions import ParamSpec
-from collections import deque
+from collections import OrderedDict
 from functools import wraps, partial
+from xxhash import xxh64_hexdigest
+from threading import Lock
 import asyncio
+import orjson
+import re
 
 T = TypeVar("T")
 P = ParamSpec("P")
@@ -47,65 +50,115 @@ def executor_function(sync_function: Callable[P, T]) -> Callable[P, Awaitable[T]
     return sync_wrapper
 
 
-@no_type_check
-@executor_function
-def extract_json(data, key_ident: str, soap=True) -> bytes:
-    def seq_checker(value):
-        if len(value) == 1:
-            value = [value]
-        to_check = deque(value)
-
-        def mapping_checker(value: dict):
-            for v in value.values():
-                if type(v) == list:
-                    to_check.extend(v)
-                    continue
-                if type(v) == dict:
-                    to_check.append(v)
-                    continue
-                if type(v) == str:
-                    try:
-                        data = loads(v)
-                        to_check.append(data)
-                    except Exception:
-                        continue
-
-        rounds = 0
-        while to_check:
-            item = to_check.pop()
-            rounds += 1
-            if type(item) == list:
-                to_check.extend(item)
-                continue
-            if type(item) == dict:
-                if key_ident in item:
-                    return item
-                item = mapping_checker(item)
-                if type(item) == list:
-                    to_check.extend(result)
-                    continue
-            if type(item) == str:
-                try:
-                    item = loads(item)
-                    to_check.append(item)
-                except Exception:
-                    continue
+SCRIPT_PATTERN = re.compile(rb"<script[^>]*>(.*?)</script>", re.DOTALL | re.IGNORECASE)
+EXTRACTED: OrderedDict[tuple[str, str, bool], Optional[bytes]] = OrderedDict()
+EXTRACTED_LOCK = Lock()
+MAX_EXTRACTED = 256
+
+
+def _search(value: Any, key_ident: str) -> Optional[dict]:
+    """
+    Walk a parsed document for the first mapping holding `key_ident`.
+    Strings are only parsed when they mention the key themselves.
+    """
+
+    to_check = [value]
+    while to_check:
+        item = to_check.pop()
+        if isinstance(item, dict):
+            if key_ident in item:
+                return item
+
+            to_check.extend(item.values())
+        elif isinstance(item, list):
+            to_check.extend(item)
+        elif isinstance(item, str) and key_ident in item:
+            with suppress(orjson.JSONDecodeError):
+                to_check.append(orjson.loads(item))
+
+    return None
 
+
+def _candidates(data: bytes, needle: bytes) -> Iterator[bytes]:
+    for match in SCRIPT_PATTERN.finditer(data):
+        body = match.group(1)
+        if needle in body:
+            yield body.strip()
+
+
+@executor_function
+def extract_json(data: str | bytes, key_ident: str, soap=True) -> Optional[bytes]:
+    """
+    Find the first JSON object holding `key_ident` within a page.
+
+    Script bodies are scanned for the key before anything is parsed,
+    so only the blobs which can contain it are decoded.
+    Results are memoized by the hash of the page, the memo is shared
+    between executor threads behind a lock.
+    """
+
+    raw = data.encode() if isinstance(data, str) else data
+    needle = key_ident.encode()
+    if needle not in raw:
         return None
 
-    if soap:
-        soup = BeautifulSoup(data, "lxml")
-        for x in soup.find_all("script"):
-            result = seq_checker(loads(x.decode_contents()))
-            if result:
-                return dumps(result)
+    ident = (xxh64_hexdigest(raw), key_ident, soap)
+    with EXTRACTED_LOCK:
+        if ident in EXTRACTED:
+            EXTRACTED.move_to_end(ident)
+            return EXTRACTED[ident]
 
-    else:
-        result = seq_checker(loads(data))
-        if result:
-            return dumps(result)
+    result = None
+    for blob in _candidates(raw, needle) if soap else (raw,):
+        try:
+            document = orjson.loads(blob)
+        except orjson.JSONDecodeError:
+            continue
 
-    return False
+        if found := _search(document, key_ident):
+            result = orjson.dumps(found)
+            break
+
+    with EXTRACTED_LOCK:
+        EXTRACTED[ident] = result
+        if len(EXTRACTED) > MAX_EXTRACTED:
+            EXTRACTED.popitem(last=False)
+
+    return result
+
+
+class BatchRequest(_BaseModel):
+    usernames: List[str] = Field(min_length=1, max_length=25)
+
+
+async def batch_response(
+    handler: Callable[..., Awaitable[Response]],
+    request: Request,
+    keys: List[str],
+    concurrency: int = 4,
+) -> Response:
+    """
+    Resolve several keys through a cached route handler.
+    The cached bodies are spliced into one mapping without being decoded.
+    """
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def resolve(key: str) -> bytes:
+        async with semaphore:
+            try:
+                response = await handler(request, key)
+            except Exception:
+                return orjson.dumps({"error": "An internal server error occurred."})
+
+            return bytes(response.body)
+
+    keys = list(dict.fromkeys(keys))
+    bodies = await asyncio.gather(*(resolve(key) for key in keys))
+    content = b",".join(
+        orjson.dumps(key) + b":" + body for key, body in zip(keys, bodies)
+    )
+    return Response(b'{"results":{' + content + b"}}", media_type="application/json")
 
 
 __all__ = (
@@ -118,4 +171,6 @@ __all__ = (
     "retry",
     "executor_function",
     "extract_json",
+    "BatchRequest",
+    "batch_response",
 )
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import asyncio
-from contextlib import asynccontextmanager, suppress
+from contextlib import asynccontextmanager
 from loguru import logger
 from typing import AsyncGenerator, Literal, Optional, List
 from http.cookiejar import MozillaCookieJar
@@ -17,6 +17,8 @@ from playwright.async_api import (
     async_playwright,
 )
 
+from .pool import PagePool
+
 jar = MozillaCookieJar()
 jar.load("cookies.txt")
 
@@ -41,32 +43,40 @@ cookies: List[CookieModel] = [CookieModel.from_orm(cookie) for cookie in jar]
 
 
 class BrowserManager:
-    pages: List[Page]
+    """
+    Connects to Chromium over CDP and serves pages from a warm `PagePool`.
+    """
+
     browser: Optional[Browser]
-    context: Optional[BrowserContext]
+    contexts: List[BrowserContext]
     playwright: Optional[Playwright]
-
-    def __init__(self, total_pages: int = 6) -> None:
-        self.pages = []
+    pool: PagePool
+
+    def __init__(
+        self,
+        total_pages: int = 8,
+        total_contexts: int = 2,
+        max_uses: int = 50,
+        timeout: float = 30.0,
+    ) -> None:
         self.browser = None
-        self.context = None
+        self.contexts = []
         self.playwright = None
-        self.total_pages = total_pages
+        self.total_contexts = total_contexts
+        self.pool = PagePool(total_pages, max_uses=max_uses, timeout=timeout)
 
     def __repr__(self) -> str:
-        return f"<BrowserManager chromium pool={len(self.pages)}>"
+        return f"<BrowserManager chromium {self.pool!r}>"
 
     async def cleanup(self) -> None:
+        await self.pool.clear()
+        self.contexts.clear()
         if self.browser:
             await self.browser.close()
 
         if self.playwright:
             await self.playwright.stop()
 
-        for page in list(self.pages):
-            await page.close()
-            self.pages.remove(page)
-
     async def _install(self) -> None:
         logger.warning("Executable not found, installing them now")
         process = await asyncio.create_subprocess_exec(
@@ -115,39 +125,33 @@ class BrowserManager:
         finally:
             logger.info("Connected over CDP to Chromium browser")
 
-        self.context = await self.browser.new_context(
-            color_scheme="dark",
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36",
-            locale="en_US",
-        )
-        await self.context.add_cookies(
-            [cookie.dict(exclude_unset=True) for cookie in cookies]  # type: ignore
-        )
-        for _id in range(self.total_pages):
-            page = await self.context.new_page()
-            self.pages.append(page)
+        for _id in range(self.total_contexts):
+            context = await self.browser.new_context(
+                color_scheme="dark",
+                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36",
+                locale="en_US",
+            )
+            await context.add_cookies(
+                [cookie.dict(exclude_unset=True) for cookie in cookies]  # type: ignore
+            )
+            self.contexts.append(context)
 
+        await self.pool.fill(self.contexts)
         logger.info(
-            f"Headless browser is ready with {len(self.pages)} pages in the pool"
+            f"Headless browser is ready with {self.pool.queue.qsize()} pages across {len(self.contexts)} contexts"
         )
         return self
 
     @asynccontextmanager
-    async def borrow_page(self, reserved: bool = False) -> AsyncGenerator[Page, None]:
-        while not self.pages:
-            await asyncio.sleep(1)
-
-        page = self.pages.pop()
-        try:
-            logger.info(
-                f"Page borrowed from the pool, {len(self.pages)}/{self.total_pages} pages available"
-            )
+    async def borrow_page(
+        self,
+        reserved: bool = False,
+        block: bool = True,
+    ) -> AsyncGenerator[Page, None]:
+        """
+        Borrow a warm page from the pool.
+        Images, fonts and media are aborted unless `block` is disabled.
+        """
+
+        async with self.pool.borrow(block=block) as page:
             yield page
-        finally:
-            # with suppress(Error):
-            #     await page.goto("about:blank")
-
-            self.pages.append(page)
-            logger.debug(
-                f"Page released back to the pool, {len(self.pages)}/{self.total_pages} pages available"
-            )
\ No newline at end of file
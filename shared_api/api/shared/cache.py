@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+from collections import OrderedDict, defaultdict
+from contextvars import ContextVar
+from functools import wraps
+from secrets import token_hex
+from time import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Optional, TypedDict
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from loguru import logger
+from pydantic import BaseModel
+from ujson import dumps, loads
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+    from .services import Media
+
+collected: ContextVar[Optional[list[dict]]] = ContextVar("collected", default=None)
+
+UNITS = {"s": 1, "m": 60, "h": 60 * 60, "d": 60 * 60 * 24}
+RELEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+def seconds(value: int | str) -> int:
+    if isinstance(value, int):
+        return value
+
+    return int(value[:-1]) * UNITS[value[-1]]
+
+
+class Entry(TypedDict):
+    status: int
+    body: str
+    media: list[dict]
+    fresh: float
+    stale: float
+
+
+class ResponseCache:
+    """
+    A two tier response cache shared between workers.
+
+    Entries live in a local LRU in front of Redis. Expired entries are
+    still served for the `stale` window while a single worker refreshes
+    them in the background, and client errors are cached briefly so
+    unresolvable lookups don't trigger a scrape on every request.
+    """
+
+    redis: Optional[Redis]
+
+    def __init__(self, capacity: int = 2048) -> None:
+        self.redis = None
+        self.capacity = capacity
+        self.entries: OrderedDict[str, Entry] = OrderedDict()
+        self.inflight: dict[str, asyncio.Task[Entry]] = {}
+        self.counters: defaultdict[str, defaultdict[str, int]] = defaultdict(
+            lambda: defaultdict(int)
+        )
+
+    def __repr__(self) -> str:
+        return f"<ResponseCache entries={len(self.entries)} inflight={len(self.inflight)}>"
+
+    async def setup(self, url: Optional[str]) -> None:
+        if not url:
+            logger.warning("No Redis URL was provided, responses are cached per worker")
+            return
+
+        from redis.asyncio import from_url
+
+        self.redis = from_url(url, decode_responses=True)
+        await self.redis.ping()
+        logger.info("Connected to Redis for the shared response cache")
+
+    async def close(self) -> None:
+        for task in self.inflight.values():
+            task.cancel()
+
+        if self.redis:
+            await self.redis.aclose()
+
+    def remember(self, key: str, entry: Entry) -> None:
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    async def lookup(self, key: str) -> Optional[Entry]:
+        entry = self.entries.get(key)
+        if entry:
+            self.entries.move_to_end(key)
+            return entry
+
+        if not self.redis:
+            return None
+
+        try:
+            raw = await self.redis.get(key)
+        except Exception:
+            logger.exception("Failed to read {} from Redis", key)
+            return None
+
+        if not raw:
+            return None
+
+        entry = loads(raw)
+        self.restore(entry)
+        self.remember(key, entry)
+        return entry
+
+    async def store(self, key: str, entry: Entry) -> None:
+        self.remember(key, entry)
+        if not self.redis:
+            return
+
+        ttl = max(int(entry["stale"] - time()), 1)
+        try:
+            await self.redis.set(key, dumps(entry), ex=ttl)
+        except Exception:
+            logger.exception("Failed to write {} to Redis", key)
+
+    @staticmethod
+    def restore(entry: Entry) -> None:
+        """
+        Register the media of an entry computed by another worker.
+        """
+
+        from .services import Media, services
+
+        for record in entry["media"]:
+            if record["filename"] not in services.passive_cache:
+                services.passive_cache[record["filename"]] = Media(**record)
+
+    @staticmethod
+    def collect(media: Media) -> None:
+        records = collected.get()
+        if records is not None:
+            records.append(
+                {
+                    "filename": media.filename,
+                    "original_url": media.original_url,
+                    "kwargs": media.kwargs,
+                }
+            )
+
+    @staticmethod
+    def serialize(result: Any) -> tuple[int, str]:
+        if isinstance(result, Response):
+            return result.status_code, bytes(result.body).decode()
+
+        if isinstance(result, BaseModel):
+            return 200, result.model_dump_json()
+
+        return 200, dumps(jsonable_encoder(result))
+
+    async def compute(
+        self,
+        key: str,
+        function: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale: int,
+        negative: int,
+    ) -> Entry:
+        """
+        Run the handler once across all workers.
+        Workers which lose the lock wait for the winner to publish.
+        """
+
+        token = token_hex(8)
+        locked = True
+        if self.redis:
+            self.entries.pop(key, None)
+            entry = await self.lookup(key)
+            if entry and entry["fresh"] > time():
+                return entry
+
+            try:
+                locked = bool(
+                    await self.redis.set(f"lock:{key}", token, nx=True, px=30_000)
+                )
+            except Exception:
+                logger.exception("Failed to acquire the lock for {}", key)
+
+        if not locked:
+            for _ in range(120):
+                await asyncio.sleep(0.25)
+                self.entries.pop(key, None)
+                entry = await self.lookup(key)
+                if entry and entry["fresh"] > time():
+                    return entry
+
+        records: list[dict] = []
+        collected.set(records)
+        try:
+            status, body = self.serialize(await function())
+        finally:
+            if self.redis and locked:
+                try:
+                    await self.redis.eval(RELEASE_SCRIPT, 1, f"lock:{key}", token)
+                except Exception:
+                    logger.exception("Failed to release the lock for {}", key)
+
+        now = time()
+        if 400 <= status < 500:
+            entry = Entry(
+                status=status,
+                body=body,
+                media=records,
+                fresh=now + negative,
+                stale=now + negative,
+            )
+        else:
+            entry = Entry(
+                status=status,
+                body=body,
+                media=records,
+                fresh=now + ttl,
+                stale=now + ttl + stale,
+            )
+
+        if status < 500:
+            await self.store(key, entry)
+
+        return entry
+
+    def refresh(
+        self,
+        key: str,
+        function: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale: int,
+        negative: int,
+    ) -> asyncio.Task[Entry]:
+        task = self.inflight.get(key)
+        if not task:
+            task = self.inflight[key] = asyncio.create_task(
+                self.compute(key, function, ttl, stale, negative)
+            )
+            task.add_done_callback(
+                lambda task: (
+                    self.inflight.pop(key, None),
+                    task.cancelled() or task.exception(),
+                )
+            )
+
+        return task
+
+    def __call__(
+        self,
+        ttl: int | str,
+        key: str,
+        prefix: str,
+        stale: int | str = "1h",
+        negative: int | str = "2m",
+    ):
+        """
+        Cache a route handler under `prefix` and the formatted `key`.
+        """
+
+        fresh_for, stale_for, negative_for = seconds(ttl), seconds(stale), seconds(negative)
+
+        def decorator(function: Callable[..., Awaitable[Any]]):
+            signature = inspect.signature(function)
+
+            @wraps(function)
+            async def wrapper(*args, **kwargs) -> Response:
+                bound = signature.bind(*args, **kwargs)
+                ident = f"{prefix}:{key.format(**bound.arguments)}"
+                counters = self.counters[prefix]
+
+                def call() -> Awaitable[Any]:
+                    return function(*args, **kwargs)
+
+                entry = await self.lookup(ident)
+                now = time()
+                if entry and entry["fresh"] > now:
+                    state = "hit"
+                elif entry and entry["stale"] > now:
+                    state = "stale"
+                    self.refresh(ident, call, fresh_for, stale_for, negative_for)
+                else:
+                    state = "miss"
+                    entry = await asyncio.shield(
+                        self.refresh(ident, call, fresh_for, stale_for, negative_for)
+                    )
+
+                counters[state] += 1
+                if 400 <= entry["status"] < 500:
+                    counters["negative"] += 1
+
+                records = collected.get()
+                if records is not None:
+                    records.extend(entry["media"])
+
+                return Response(
+                    entry["body"],
+                    status_code=entry["status"],
+                    media_type="application/json",
+                    headers={"X-Cache": state.upper()},
+                )
+
+            return wrapper
+
+        return decorator
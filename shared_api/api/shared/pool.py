@@ -0,0 +1,235 @@
+"""
+A warm Playwright page pool.
+
+The bot and the shared API deploy separately, so both carry this
+module unchanged. Edit it in one place and copy it to the other.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from logging import getLogger
+from time import perf_counter
+from typing import TYPE_CHECKING, AsyncGenerator, List, Set
+
+if TYPE_CHECKING:
+    from playwright.async_api import BrowserContext, Page, Route
+
+log = getLogger("browser/pool")
+
+BLOCKED_RESOURCES = frozenset(("image", "media", "font"))
+MEMORY_LIMIT = 256 * 1024 * 1024
+RESPAWN_ATTEMPTS = 5
+
+
+class PooledPage:
+    """
+    A warm page and the bookkeeping used to decide when to recycle it.
+    """
+
+    page: Page
+    context: BrowserContext
+    uses: int
+    block: bool
+
+    def __init__(self, page: Page, context: BrowserContext) -> None:
+        self.page = page
+        self.context = context
+        self.uses = 0
+        self.block = True
+
+    def __repr__(self) -> str:
+        return f"<PooledPage uses={self.uses} closed={self.page.is_closed()}>"
+
+    async def intercept(self, route: Route) -> None:
+        if self.block and route.request.resource_type in BLOCKED_RESOURCES:
+            return await route.abort()
+
+        await route.continue_()
+
+
+class PoolMetrics:
+    borrows: int
+    recycled: int
+    waited: float
+    held: float
+    max_wait: float
+
+    def __init__(self) -> None:
+        self.borrows = 0
+        self.recycled = 0
+        self.waited = 0
+        self.held = 0
+        self.max_wait = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"<PoolMetrics borrows={self.borrows} recycled={self.recycled}"
+            f" avg_wait={self.average_wait:.3f}s avg_held={self.average_held:.3f}s>"
+        )
+
+    @property
+    def average_wait(self) -> float:
+        return self.waited / self.borrows if self.borrows else 0
+
+    @property
+    def average_held(self) -> float:
+        return self.held / self.borrows if self.borrows else 0
+
+    def record(self, waited: float, held: float) -> None:
+        self.borrows += 1
+        self.waited += waited
+        self.held += held
+        self.max_wait = max(self.max_wait, waited)
+
+
+class PagePool:
+    """
+    Pages spread across several browser contexts, handed out from a queue.
+
+    Pages are created ahead of time with route interception installed,
+    so borrowers skip the page setup and any images, fonts or media.
+    A page is replaced after `max_uses` borrows or once its JavaScript
+    heap grows past the limit. Borrowers give up after `timeout` seconds.
+    """
+
+    queue: asyncio.Queue[PooledPage]
+    contexts: List[BrowserContext]
+
+    def __init__(
+        self,
+        size: int,
+        *,
+        max_uses: int = 50,
+        timeout: float = 30.0,
+    ) -> None:
+        self.size = size
+        self.max_uses = max_uses
+        self.timeout = timeout
+        self.queue = asyncio.Queue()
+        self.contexts = []
+        self.pages: List[PooledPage] = []
+        self.releasing: Set[asyncio.Task] = set()
+        self.metrics = PoolMetrics()
+
+    def __repr__(self) -> str:
+        return (
+            f"<PagePool available={self.queue.qsize()}/{self.size}"
+            f" contexts={len(self.contexts)} {self.metrics!r}>"
+        )
+
+    async def fill(self, contexts: List[BrowserContext]) -> None:
+        self.contexts = list(contexts)
+        await asyncio.gather(
+            *(
+                self.spawn(self.contexts[index % len(self.contexts)])
+                for index in range(self.size)
+            )
+        )
+
+    async def clear(self) -> None:
+        from playwright.async_api import Error
+
+        for pooled in self.pages:
+            with suppress(Error):
+                await pooled.page.close()
+
+        self.pages.clear()
+        self.contexts.clear()
+        self.queue = asyncio.Queue()
+
+    async def spawn(self, context: BrowserContext) -> None:
+        page = await context.new_page()
+        pooled = PooledPage(page, context)
+        await page.route("**/*", pooled.intercept)
+        self.pages.append(pooled)
+        self.queue.put_nowait(pooled)
+
+    async def respawn(self, pooled: PooledPage) -> None:
+        """
+        Open a replacement page, falling back to the other contexts
+        and backing off until one of them accepts it.
+        """
+
+        contexts = [pooled.context] + [
+            context for context in self.contexts if context is not pooled.context
+        ]
+        for attempt in range(RESPAWN_ATTEMPTS):
+            for context in contexts:
+                try:
+                    return await self.spawn(context)
+                except Exception as exc:
+                    log.warning("Failed to open a replacement page: %s", exc)
+
+            await asyncio.sleep(2**attempt)
+
+        log.error("Gave up replacing a page, the pool is down to %s.", len(self.pages))
+
+    async def recycle(self, pooled: PooledPage) -> None:
+        from playwright.async_api import Error
+
+        self.metrics.recycled += 1
+        with suppress(ValueError):
+            self.pages.remove(pooled)
+
+        with suppress(Error):
+            await pooled.page.close()
+
+        await self.respawn(pooled)
+
+    async def should_recycle(self, pooled: PooledPage) -> bool:
+        from playwright.async_api import Error
+
+        if pooled.page.is_closed() or pooled.uses >= self.max_uses:
+            return True
+
+        try:
+            await pooled.page.goto("about:blank")
+            heap = await pooled.page.evaluate(
+                "() => performance.memory ? performance.memory.usedJSHeapSize : 0"
+            )
+        except Error:
+            return True
+
+        return heap > MEMORY_LIMIT
+
+    async def release(self, pooled: PooledPage) -> None:
+        try:
+            if await self.should_recycle(pooled):
+                await self.recycle(pooled)
+            else:
+                self.queue.put_nowait(pooled)
+        except Exception:
+            log.exception("Failed to release a page back to the pool.")
+            with suppress(ValueError):
+                self.pages.remove(pooled)
+
+            await self.respawn(pooled)
+
+    @asynccontextmanager
+    async def borrow(self, *, block: bool = True) -> AsyncGenerator[Page, None]:
+        """
+        Borrow a warm page from the pool.
+        Images, fonts and media are aborted unless `block` is disabled.
+        """
+
+        queued = perf_counter()
+        pooled = await asyncio.wait_for(self.queue.get(), self.timeout)
+        borrowed = perf_counter()
+        pooled.uses += 1
+        pooled.block = block
+        try:
+            yield pooled.page
+        finally:
+            held = perf_counter() - borrowed
+            self.metrics.record(borrowed - queued, held)
+            log.debug(
+                "Released page after %.3fs, waited %.3fs for it (%r).",
+                held,
+                borrowed - queued,
+                self,
+            )
+            task = asyncio.create_task(self.release(pooled))
+            self.releasing.add(task)
+            task.add_done_callback(self.releasing.discard)
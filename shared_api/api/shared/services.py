@@ -6,10 +6,10 @@ from urllib.parse import urlparse, unquote as url_unescape
 from typing import TYPE_CHECKING, Optional
 from pydantic import BaseModel, Field, computed_field
 from .browser import BrowserManager
+from .cache import ResponseCache
+from .storage import MediaStore, PassiveCache
 from os import environ as env
 from xxhash import xxh32_hexdigest
-from cashews import cache
-from collections import defaultdict
 from ujson import loads
 import asyncio
 import sys
@@ -34,16 +34,32 @@ class Media(BaseModel):
     def url(self) -> str:
         return f"{services.base_url}/media/{self.filename}"
 
+CACHE_ROOT = Path(env.get("CACHE_ROOT", ".cache"))
+
+
 class Services:
     app: FastAPI
     session: ClientSession
     browser: BrowserManager
-    passive_cache: dict[str, Media] = {}  # redistribution cache
-    lock: dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+    passive_cache: PassiveCache = PassiveCache(  # redistribution cache
+        CACHE_ROOT / "passive.json",
+        capacity=int(env.get("PASSIVE_CACHE_SIZE", 250_000)),
+    )
+    media: MediaStore = MediaStore(
+        CACHE_ROOT / "media",
+        capacity=int(env.get("MEDIA_CACHE_BYTES", 2 * 1024**3)),
+    )
+    cache: ResponseCache = ResponseCache(
+        capacity=int(env.get("RESPONSE_CACHE_SIZE", 2048)),
+    )
+    tasks: set[asyncio.Task] = set()
 
     async def setup(self, app: FastAPI):
-        cache.setup("mem://")
         self.app = app
+        await self.cache.setup(env.get("REDIS_URL"))
+        self.media.load()
+        self.passive_cache.load(Media)
+        self.tasks.add(asyncio.create_task(self.passive_cache.persist()))
         self.session = ClientSession(
             cookies=CookieJar(),
             headers=DEFAULT_HEADERS,
@@ -59,12 +75,14 @@ class Services:
     def keys(self) -> dict[str, str]:
         return loads(open("keys.json", "r").read())
 
-    @property
-    def cache(self):
-        return cache
-
     async def close(self):
+        for task in self.tasks:
+            task.cancel()
+
+        self.passive_cache.save()
+        await self.cache.close()
         await self.session.close()
+        await self.browser.cleanup()
 
     def passive_save(
         self,
@@ -85,6 +103,7 @@ class Services:
         filename = f"{prefix}{xxh32_hexdigest(filename)}{extension}"
         media = Media(filename=filename, original_url=url, kwargs=kwargs)
         self.passive_cache[filename] = media
+        self.cache.collect(media)
         return media
 
 
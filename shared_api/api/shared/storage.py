@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from collections import OrderedDict
+from pathlib import Path
+from secrets import token_hex
+from typing import TYPE_CHECKING, List, Optional
+
+from loguru import logger
+from ujson import dumps, loads
+
+if TYPE_CHECKING:
+    from .services import Media
+
+
+class MediaStore:
+    """
+    A size bounded, least recently used file cache for proxied media.
+    Entries are written to a temporary file and renamed once complete,
+    so a partially streamed body is never served.
+    """
+
+    def __init__(self, root: Path, capacity: int) -> None:
+        self.root = root
+        self.capacity = capacity
+        self.entries: OrderedDict[str, int] = OrderedDict()
+        self.size = 0
+
+    def __repr__(self) -> str:
+        return f"<MediaStore entries={len(self.entries)} size={self.size}/{self.capacity}>"
+
+    def load(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        files = sorted(
+            (path for path in self.root.iterdir() if path.is_file()),
+            key=lambda path: path.stat().st_atime,
+        )
+        for path in files:
+            if path.suffix == ".part":
+                path.unlink(missing_ok=True)
+                continue
+
+            size = path.stat().st_size
+            self.entries[path.name] = size
+            self.size += size
+
+        self.evict()
+        logger.info(f"Loaded {len(self.entries)} cached media files ({self.size} bytes)")
+
+    def path(self, filename: str) -> Path:
+        return self.root / Path(filename).name
+
+    def get(self, filename: str) -> Optional[Path]:
+        if filename not in self.entries:
+            return None
+
+        path = self.path(filename)
+        if not path.exists():
+            self.size -= self.entries.pop(filename)
+            return None
+
+        self.entries.move_to_end(filename)
+        return path
+
+    def reserve(self) -> Path:
+        return self.root / f"{token_hex(8)}.part"
+
+    def commit(self, filename: str, part: Path) -> None:
+        size = part.stat().st_size
+        if size > self.capacity:
+            part.unlink(missing_ok=True)
+            return
+
+        os.replace(part, self.path(filename))
+        if filename in self.entries:
+            self.size -= self.entries.pop(filename)
+
+        self.entries[filename] = size
+        self.size += size
+        self.evict()
+
+    def evict(self) -> None:
+        while self.size > self.capacity and self.entries:
+            filename, size = self.entries.popitem(last=False)
+            self.size -= size
+            self.path(filename).unlink(missing_ok=True)
+
+
+class PassiveCache:
+    """
+    A bounded mapping of issued media filenames to their upstream.
+    The mapping is snapshotted to disk so issued URLs survive restarts,
+    serialising and writing the snapshot off the event loop.
+    """
+
+    def __init__(self, path: Path, capacity: int) -> None:
+        self.path = path
+        self.capacity = capacity
+        self.entries: OrderedDict[str, Media] = OrderedDict()
+        self.dirty = False
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, filename: str) -> bool:
+        return filename in self.entries
+
+    def __setitem__(self, filename: str, media: Media) -> None:
+        self.entries[filename] = media
+        self.entries.move_to_end(filename)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+        self.dirty = True
+
+    def get(self, filename: str) -> Optional[Media]:
+        media = self.entries.get(filename)
+        if media:
+            self.entries.move_to_end(filename)
+
+        return media
+
+    def load(self, model: type[Media]) -> None:
+        if not self.path.exists():
+            return
+
+        try:
+            records = loads(self.path.read_text())
+        except ValueError:
+            logger.warning("Discarding an unreadable passive cache snapshot")
+            return
+
+        for record in records[-self.capacity :]:
+            media = model(**record)
+            self.entries[media.filename] = media
+
+        logger.info(f"Restored {len(self.entries)} passive cache entries")
+
+    def snapshot(self) -> Optional[List[Media]]:
+        if not self.dirty:
+            return None
+
+        self.dirty = False
+        return list(self.entries.values())
+
+    def write(self, records: List[Media]) -> None:
+        data = dumps(
+            [
+                {
+                    "filename": media.filename,
+                    "original_url": media.original_url,
+                    "kwargs": media.kwargs,
+                }
+                for media in records
+            ]
+        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        part = self.path.with_suffix(".part")
+        part.write_text(data)
+        os.replace(part, self.path)
+
+    def save(self) -> None:
+        if (records := self.snapshot()) is not None:
+            self.write(records)
+
+    async def persist(self, interval: int = 60) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            if (records := self.snapshot()) is not None:
+                await asyncio.to_thread(self.write, records)
@@ -0,0 +1,112 @@
+"""
+Compare `extract_json` against the previous BeautifulSoup walk.
+
+Usage:
+    python -m benchmarks.extract_json <key> <page.html> [<page.html> ...]
+
+Pages can be saved from a scrape with `await page.content()`.
+"""
+
+import sys
+import tracemalloc
+from collections import deque
+from pathlib import Path
+from time import perf_counter
+from typing import Callable
+
+from bs4 import BeautifulSoup
+from ujson import dumps, loads
+
+from api.shared import EXTRACTED, extract_json
+
+ROUNDS = 50
+
+
+def legacy_extract_json(data, key_ident: str, soap=True):
+    def seq_checker(value):
+        if len(value) == 1:
+            value = [value]
+        to_check = deque(value)
+
+        def mapping_checker(value: dict):
+            for v in value.values():
+                if type(v) == list:
+                    to_check.extend(v)
+                    continue
+                if type(v) == dict:
+                    to_check.append(v)
+                    continue
+                if type(v) == str:
+                    try:
+                        data = loads(v)
+                        to_check.append(data)
+                    except Exception:
+                        continue
+
+        while to_check:
+            item = to_check.pop()
+            if type(item) == list:
+                to_check.extend(item)
+                continue
+            if type(item) == dict:
+                if key_ident in item:
+                    return item
+                item = mapping_checker(item)
+            if type(item) == str:
+                try:
+                    item = loads(item)
+                    to_check.append(item)
+                except Exception:
+                    continue
+
+        return None
+
+    if soap:
+        soup = BeautifulSoup(data, "lxml")
+        for x in soup.find_all("script"):
+            try:
+                result = seq_checker(loads(x.decode_contents()))
+            except Exception:
+                continue
+            if result:
+                return dumps(result)
+
+    return False
+
+
+def measure(function: Callable[[], object]) -> tuple[float, int]:
+    tracemalloc.start()
+    started = perf_counter()
+    for _ in range(ROUNDS):
+        function()
+
+    elapsed = (perf_counter() - started) / ROUNDS
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(key: str, paths: list[str]) -> None:
+    print(f"{'page':<32} {'variant':<10} {'time':>10} {'peak':>12}")
+    for path in paths:
+        html = Path(path).read_text()
+        scan = extract_json.__wrapped__
+        variants = {
+            "legacy": lambda: legacy_extract_json(html, key),
+            "scan": lambda: (EXTRACTED.clear(), scan(html, key)),
+            "memoized": lambda: scan(html, key),
+        }
+        for name, function in variants.items():
+            elapsed, peak = measure(function)
+            print(
+                f"{Path(path).name:<32} {name:<10} "
+                f"{elapsed * 1000:>8.2f}ms {peak / 1024:>10.1f}KiB"
+            )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(1)
+
+    main(sys.argv[1], sys.argv[2:])
@@ -1,7 +1,11 @@
-from typing import Literal
-from aiohttp import ClientSession
+import asyncio
+from typing import TYPE_CHECKING, List, Literal, Set
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
 from .routes import Instagram, TikTok
 
+if TYPE_CHECKING:
+    from .batch import Coalescer
+
 
 class SharedAPI:
     """A high performance API for retrieving Social Media data."""
@@ -10,13 +14,23 @@ class SharedAPI:
     session: ClientSession
     instagram: Instagram
     tiktok: TikTok
+    tasks: Set[asyncio.Task]
+    coalescers: List["Coalescer"]
 
-    def __init__(self, api_key: str) -> None:
+    def __init__(self, api_key: str, connections: int = 32) -> None:
         self.api_key = api_key
         self.session = ClientSession(
             base_url="https://shared.egirl.software",
             headers={"Authorization": api_key},
+            connector=TCPConnector(
+                limit=connections,
+                keepalive_timeout=60,
+                ttl_dns_cache=300,
+            ),
+            timeout=ClientTimeout(total=60),
         )
+        self.tasks = set()
+        self.coalescers = []
         self.instagram = Instagram(self)
         self.tiktok = TikTok(self)
 
@@ -35,6 +49,12 @@ class SharedAPI:
             return data
 
     async def close(self) -> None:
-        """Close the API session."""
+        """Close the API session and cancel every pending lookup."""
+
+        for coalescer in self.coalescers:
+            coalescer.close()
+
+        for task in self.tasks:
+            task.cancel()
 
         await self.session.close()
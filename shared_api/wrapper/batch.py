@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Generic, Type, TypeVar
+
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from . import SharedAPI
+
+T = TypeVar("T", bound=BaseModel)
+
+
+class Coalescer(Generic[T]):
+    """
+    Collect lookups made within a short window into one batch request.
+
+    Concurrent calls for the same key share a single future, and a batch
+    is sent early once it reaches the endpoint's size limit.
+    """
+
+    api: SharedAPI
+    endpoint: str
+    model: Type[T]
+
+    def __init__(
+        self,
+        api: SharedAPI,
+        endpoint: str,
+        model: Type[T],
+        *,
+        window: float = 0.025,
+        max_size: int = 25,
+    ) -> None:
+        self.api = api
+        self.endpoint = endpoint
+        self.model = model
+        self.window = window
+        self.max_size = max_size
+        self.pending: Dict[str, asyncio.Future[T]] = {}
+        self.timer: asyncio.TimerHandle | None = None
+        api.coalescers.append(self)
+
+    def __repr__(self) -> str:
+        return f"<Coalescer endpoint={self.endpoint!r} pending={len(self.pending)}>"
+
+    async def get(self, key: str) -> T:
+        future = self.pending.get(key)
+        if not future:
+            future = self.pending[key] = asyncio.get_running_loop().create_future()
+            if len(self.pending) >= self.max_size:
+                self.flush()
+            elif not self.timer:
+                self.timer = asyncio.get_running_loop().call_later(
+                    self.window, self.flush
+                )
+
+        return await asyncio.shield(future)
+
+    def flush(self) -> None:
+        if self.timer:
+            self.timer.cancel()
+            self.timer = None
+
+        pending, self.pending = self.pending, {}
+        if pending:
+            task = asyncio.create_task(self.send(pending))
+            self.api.tasks.add(task)
+            task.add_done_callback(self.api.tasks.discard)
+            task.add_done_callback(lambda _: self.cancel(pending))
+
+    def close(self) -> None:
+        """Cancel the timer and every lookup that hasn't been sent."""
+
+        if self.timer:
+            self.timer.cancel()
+            self.timer = None
+
+        pending, self.pending = self.pending, {}
+        self.cancel(pending)
+
+    @staticmethod
+    def cancel(pending: Dict[str, asyncio.Future[T]]) -> None:
+        for future in pending.values():
+            future.cancel()
+
+    async def send(self, pending: Dict[str, asyncio.Future[T]]) -> None:
+        try:
+            data = await self.api.request(
+                "POST",
+                self.endpoint,
+                json={"usernames": list(pending)},
+            )
+        except Exception as exc:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(exc)
+
+            return
+
+        results = data.get("results", {})
+        for key, future in pending.items():
+            if future.done():
+                continue
+
+            result = results.get(key)
+            if not result:
+                future.set_exception(ValueError("The API didn't return this item"))
+            elif "error" in result:
+                future.set_exception(ValueError(result["error"]))
+            else:
+                future.set_result(self.model(**result))
+
+
+async def gather_mapping(
+    keys: list[str],
+    fetch: Callable[[str], Awaitable[T]],
+) -> Dict[str, T | Exception]:
+    results = await asyncio.gather(*(fetch(key) for key in keys), return_exceptions=True)
+    return dict(zip(keys, results))  # type: ignore
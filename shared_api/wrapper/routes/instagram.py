@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, List
+from ..batch import Coalescer, gather_mapping
 from .model import InstagramUser, InstagramStoryResponse, Post, Highlight
 
 if TYPE_CHECKING:
@@ -8,9 +9,11 @@ if TYPE_CHECKING:
 
 class Instagram:
     api: SharedAPI
+    coalescer: Coalescer[InstagramUser]
 
     def __init__(self, api: SharedAPI) -> None:
         self.api = api
+        self.coalescer = Coalescer(api, "/instagram/users:batch", InstagramUser)
 
     async def post(self, url: str) -> Post:
         """Fetch an Instagram post."""
@@ -21,8 +24,12 @@ class Instagram:
     async def user(self, username: str) -> InstagramUser:
         """Fetch an Instagram user's profile."""
 
-        data = await self.api.request("GET", f"/instagram/{username}")
-        return InstagramUser(**data)
+        return await self.coalescer.get(username)
+
+    async def users(self, usernames: List[str]) -> Dict[str, InstagramUser | Exception]:
+        """Fetch several Instagram users' profiles."""
+
+        return await gather_mapping(usernames, self.coalescer.get)
 
     async def story(self, username: str) -> InstagramStoryResponse:
         """Fetch an Instagram user's story."""
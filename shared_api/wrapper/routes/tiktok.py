@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, List
+from ..batch import Coalescer, gather_mapping
 from .model import TikTokUser, TikTokPostsResponse, TikTokPost
 
 if TYPE_CHECKING:
@@ -8,21 +9,37 @@ if TYPE_CHECKING:
 
 class TikTok:
     api: SharedAPI
+    user_coalescer: Coalescer[TikTokUser]
+    posts_coalescer: Coalescer[TikTokPostsResponse]
 
     def __init__(self, api: SharedAPI) -> None:
         self.api = api
+        self.user_coalescer = Coalescer(api, "/tiktok/users:batch", TikTokUser)
+        self.posts_coalescer = Coalescer(
+            api, "/tiktok/posts:batch", TikTokPostsResponse
+        )
 
     async def user(self, username: str) -> TikTokUser:
         """Fetch a a TikTok user's profile."""
 
-        data = await self.api.request("GET", f"/tiktok/{username}")
-        return TikTokUser(**data)
+        return await self.user_coalescer.get(username)
+
+    async def users(self, usernames: List[str]) -> Dict[str, TikTokUser | Exception]:
+        """Fetch several TikTok users' profiles."""
+
+        return await gather_mapping(usernames, self.user_coalescer.get)
 
     async def posts(self, username: str) -> TikTokPostsResponse:
         """Fetch a TikTok user's posts."""
 
-        data = await self.api.request("GET", f"/tiktok/{username}/posts")
-        return TikTokPostsResponse(**data)
+        return await self.posts_coalescer.get(username)
+
+    async def many_posts(
+        self, usernames: List[str]
+    ) -> Dict[str, TikTokPostsResponse | Exception]:
+        """Fetch the posts of several TikTok users."""
+
+        return await gather_mapping(usernames, self.posts_coalescer.get)
 
     async def reposts(self, username: str) -> TikTokPostsResponse:
         """Fetch a TikTok user's reposts."""
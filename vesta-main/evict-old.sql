@@ -6198,6 +6198,13 @@ ALTER TABLE ONLY voicemaster.configuration
     ADD CONSTRAINT configuration_pkey PRIMARY KEY (guild_id);
 
 
+--
+-- Name: businesses_balance_idx; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX businesses_balance_idx ON public.businesses USING btree (balance DESC);
+
+
 --
 -- Name: idx_invite_tracking_joined_at; Type: INDEX; Schema: public; Owner: postgres
 --
@@ -6219,6 +6226,18 @@ CREATE UNIQUE INDEX mod_pkey ON public.mod USING btree (guild_id, user_id);
 CREATE INDEX user_votes_time_idx ON public.user_votes USING btree (last_vote_time);
 
 
+--
+-- Name: cases_guild_id_idx; Type: INDEX; Schema: public; Owner: postgres
+--
+-- Existing databases keep one counter row per guild before indexing:
+-- DELETE FROM public.cases a USING public.cases b
+-- WHERE a.guild_id = b.guild_id
+-- AND (COALESCE(a.count, 0), a.ctid) < (COALESCE(b.count, 0), b.ctid);
+--
+
+CREATE UNIQUE INDEX cases_guild_id_idx ON public.cases USING btree (guild_id);
+
+
 --
 -- Name: custom_commands_lookup_idx; Type: INDEX; Schema: stats; Owner: postgres
 --
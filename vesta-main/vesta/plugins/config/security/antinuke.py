@@ -20,6 +20,7 @@ from vesta.framework import Context, Vesta
 from vesta.framework.discord import FlagConverter
 from vesta.framework.tools.conversion import Status, Duration
 from vesta.framework.tools.formatter import plural
+from vesta.shared.clients.codec import MSGPACK, Namespace
 
 from humanize import naturaldelta
 from pydantic import BaseConfig, BaseModel, validator
@@ -30,6 +31,8 @@ from datetime import datetime, timezone
 
 log = getLogger("vesta/nuke")
 
+CACHE = Namespace("antinuke", MSGPACK, hasher=xxh32_hexdigest)
+
 
 class Flags(FlagConverter):
     threshold: Range[int, 1, 12] = flag(
@@ -177,8 +180,7 @@ class Settings(BaseModel):
         Revalidate the settings for a guild.
         This will update the cache in redis.
         """
-        key = xxh32_hexdigest(f"antinuke:{guild.id}")
-        await bot.redis.delete(key)
+        await bot.redis.delete(CACHE.key(guild.id))
 
         record = await bot.pool.fetchrow(
             """
@@ -192,7 +194,7 @@ class Settings(BaseModel):
             return
 
         settings = cls(**record, guild=guild)
-        await bot.redis.set(key, settings.dict(exclude={"guild"}))
+        await bot.redis.store(CACHE, guild.id, settings.dict(exclude={"guild"}))
         return settings
 
     @classmethod
@@ -201,10 +203,9 @@ class Settings(BaseModel):
         Fetch the settings for a guild.
         This will cache the settings in redis.
         """
-        key = xxh32_hexdigest(f"antinuke:{guild.id}")
         cached = cast(
             Optional[dict],
-            await bot.redis.get(key),
+            await bot.redis.fetch(CACHE, guild.id),
         )
         if cached:
             return cls(**cached, guild=guild)
@@ -228,7 +229,7 @@ class Settings(BaseModel):
             )
 
         settings = cls(**record or {}, guild=guild)
-        await bot.redis.set(key, settings.dict(exclude={"guild"}))
+        await bot.redis.store(CACHE, guild.id, settings.dict(exclude={"guild"}))
         return settings
 
     class Config(BaseConfig):
@@ -0,0 +1,196 @@
+"""
+Typed values for Redis.
+
+The bot and vesta deploy separately, so both carry this
+module unchanged. Edit it in one place and copy it to the other.
+"""
+
+from __future__ import annotations
+
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+import msgpack
+import orjson
+from zstandard import ZstdCompressor, ZstdDecompressor
+
+COMPRESSED = 0x80
+COMPRESSION_THRESHOLD = 1024
+INTEGER_PATTERN = re.compile(r"-?(?:0|[1-9][0-9]*)")
+
+compressor = ZstdCompressor(level=3)
+decompressor = ZstdDecompressor()
+
+
+class Codec(ABC):
+    """
+    Serialize the values stored under a key namespace.
+
+    Every encoded payload starts with a single tag byte which
+    identifies the codec and whether the body was compressed.
+    Values written before the codec layer never start with a tag,
+    so they are still readable through `legacy`.
+    """
+
+    tag: int
+
+    @abstractmethod
+    def dumps(self, value: Any) -> bytes:
+        ...
+
+    @abstractmethod
+    def loads(self, data: bytes) -> Any:
+        ...
+
+
+class StringCodec(Codec):
+    tag = 0x01
+
+    def dumps(self, value: Any) -> bytes:
+        return str(value).encode("utf-8")
+
+    def loads(self, data: bytes) -> str:
+        return data.decode("utf-8")
+
+
+class IntegerCodec(Codec):
+    tag = 0x02
+
+    def dumps(self, value: Any) -> bytes:
+        return int(value).to_bytes(8, "big", signed=True)
+
+    def loads(self, data: bytes) -> int:
+        return int.from_bytes(data, "big", signed=True)
+
+
+class MsgPackCodec(Codec):
+    tag = 0x03
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, datetime=True, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, timestamp=3, raw=False)
+
+
+class JSONCodec(Codec):
+    tag = 0x04
+
+    def dumps(self, value: Any) -> bytes:
+        return orjson.dumps(value)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+STRING = StringCodec()
+INTEGER = IntegerCodec()
+MSGPACK = MsgPackCodec()
+JSON = JSONCodec()
+
+CODECS: Dict[int, Codec] = {
+    codec.tag: codec for codec in (STRING, INTEGER, MSGPACK, JSON)
+}
+
+
+def legacy(data: bytes | str) -> Any:
+    """
+    Decode a value written by the untyped `Redis.set`.
+
+    It only JSON encoded dicts and lists, so any other
+    value is returned as it was stored, besides integers.
+    Numeric strings which `str(int)` wouldn't produce, such as
+    "007", are kept as strings.
+    """
+
+    if isinstance(data, bytes):
+        data = data.decode("utf-8")
+
+    if INTEGER_PATTERN.fullmatch(data):
+        return int(data)
+
+    if data[:1] in ("{", "["):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+
+    return data
+
+
+def is_legacy(data: bytes) -> bool:
+    return not data or (data[0] & ~COMPRESSED) not in CODECS
+
+
+def encode(
+    codec: Codec,
+    value: Any,
+    threshold: Optional[int] = COMPRESSION_THRESHOLD,
+) -> bytes:
+    body = codec.dumps(value)
+    tag = codec.tag
+
+    if threshold is not None and len(body) >= threshold:
+        body = compressor.compress(body)
+        tag |= COMPRESSED
+
+    return bytes((tag,)) + body
+
+
+def decode(data: Optional[bytes | str]) -> Any:
+    if data is None:
+        return None
+
+    if isinstance(data, str):
+        return legacy(data)
+
+    if is_legacy(data):
+        return legacy(data)
+
+    tag, body = data[0], data[1:]
+    if tag & COMPRESSED:
+        body = decompressor.decompress(body)
+
+    return CODECS[tag & ~COMPRESSED].loads(body)
+
+
+@dataclass(frozen=True)
+class Namespace:
+    """
+    A family of keys which share a codec and expiry.
+
+    `hasher` keeps the historical hashed key names intact,
+    which lets existing keys migrate in place.
+    """
+
+    prefix: str
+    codec: Codec
+    ttl: Optional[int] = None
+    threshold: Optional[int] = COMPRESSION_THRESHOLD
+    hasher: Optional[Callable[[str], str]] = None
+
+    def key(self, ident: Any) -> str:
+        key = f"{self.prefix}:{ident}"
+        return self.hasher(key) if self.hasher else key
+
+    def encode(self, value: Any) -> bytes:
+        return encode(self.codec, value, self.threshold)
+
+    def decode(self, data: Optional[bytes | str]) -> Any:
+        return decode(data)
+
+
+__all__ = (
+    "Codec",
+    "Namespace",
+    "STRING",
+    "INTEGER",
+    "MSGPACK",
+    "JSON",
+    "encode",
+    "decode",
+    "legacy",
+    "is_legacy",
+)
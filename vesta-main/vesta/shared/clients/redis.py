@@ -2,23 +2,25 @@ from __future__ import annotations
 
 import time
 
-from contextlib import suppress
 from datetime import timedelta
 from hashlib import sha1
-from json import JSONDecodeError, dumps, loads
 from logging import getLogger
 from types import TracebackType
-from typing import Any, List, Literal, Optional, Union
+from typing import Any, Dict, List, Literal, Optional, Union
 from xxhash import xxh32_hexdigest
 
+import orjson
 from redis.asyncio import Redis as DefaultRedis
 from redis.asyncio.connection import BlockingConnectionPool
 from redis.asyncio.lock import Lock
 from redis.backoff import EqualJitterBackoff
+from redis.client import NEVER_DECODE
 from redis.exceptions import NoScriptError
 from redis.retry import Retry
 from redis.typing import AbsExpiryT, EncodableT, ExpiryT, FieldT, KeyT
 
+from .codec import Namespace, is_legacy, legacy
+
 log = getLogger("vesta/redis")
 
 
@@ -105,7 +107,7 @@ class Redis(DefaultRedis):
         pxat: Union[AbsExpiryT, None] = None,
     ) -> bool | Any:
         if isinstance(value, (dict, list)):
-            value = dumps(value, separators=(",", ":"))
+            value = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
 
         return await super().set(name, value, ex, px, nx, xx, keepttl, get, exat, pxat)
 
@@ -118,13 +120,7 @@ class Redis(DefaultRedis):
         if not validate or output is None:
             return output
 
-        if output.isnumeric():
-            return int(output)
-
-        with suppress(JSONDecodeError):
-            return loads(output)
-
-        return output
+        return legacy(output)
 
     async def getdel(
         self,
@@ -139,13 +135,7 @@ class Redis(DefaultRedis):
         if not validate or output is None:
             return output
 
-        if output.isnumeric():
-            return int(output)
-
-        with suppress(JSONDecodeError):
-            return loads(output)
-
-        return output
+        return legacy(output)
 
     async def sadd(
         self,
@@ -174,17 +164,7 @@ class Redis(DefaultRedis):
         result = []
 
         for value in output:
-            value = value.decode("utf-8")
-
-            if value.isnumeric():
-                result.append(int(value))
-                continue
-
-            with suppress(JSONDecodeError):
-                result.append(loads(value))
-                continue
-
-            result.append(value)
+            result.append(legacy(value))
 
         return result
 
@@ -227,6 +207,131 @@ class Redis(DefaultRedis):
     ) -> List:
         return await super().lrange(name, start, end)  # type: ignore
 
+    async def store(
+        self,
+        namespace: Namespace,
+        ident: Any,
+        value: Any,
+        ex: Optional[ExpiryT] = None,
+    ) -> bool:
+        """
+        Encode and store a value under a typed namespace.
+        """
+
+        return await super().set(
+            namespace.key(ident),
+            namespace.encode(value),
+            ex=ex or namespace.ttl,
+        )
+
+    async def fetch(
+        self,
+        namespace: Namespace,
+        ident: Any,
+    ) -> Optional[Any]:
+        """
+        Fetch and decode a value from a typed namespace.
+        Legacy values are rewritten with the namespace codec.
+        """
+
+        key = namespace.key(ident)
+        output = await self.execute_command("GET", key, **{NEVER_DECODE: []})
+        if output is None:
+            return None
+
+        value = namespace.decode(output)
+        if is_legacy(output):
+            await super().set(key, namespace.encode(value), keepttl=True, xx=True)
+
+        return value
+
+    async def fetch_many(
+        self,
+        namespace: Namespace,
+        *idents: Any,
+    ) -> List[Optional[Any]]:
+        """
+        Fetch several values from a typed namespace in one round trip.
+        Legacy values are rewritten with the namespace codec, like `fetch`.
+        """
+
+        if not idents:
+            return []
+
+        keys = [namespace.key(ident) for ident in idents]
+        output = await self.execute_command("MGET", *keys, **{NEVER_DECODE: []})
+        values = [namespace.decode(value) for value in output]
+
+        stale = [
+            (key, value)
+            for key, data, value in zip(keys, output, values)
+            if data is not None and is_legacy(data)
+        ]
+        if stale:
+            async with self.pipeline(transaction=False) as pipe:
+                for key, value in stale:
+                    pipe.set(key, namespace.encode(value), keepttl=True, xx=True)
+
+                await pipe.execute()
+
+        return values
+
+    async def fetch_range(
+        self,
+        namespace: Namespace,
+        ident: Any,
+        start: int,
+        end: int,
+    ) -> List[Any]:
+        """
+        Fetch and decode a slice of a list in a typed namespace.
+        """
+
+        output = await self.execute_command(
+            "LRANGE",
+            namespace.key(ident),
+            start,
+            end,
+            **{NEVER_DECODE: []},
+        )
+        return [namespace.decode(value) for value in output]
+
+    async def migrate(
+        self,
+        namespace: Namespace,
+        count: int = 500,
+    ) -> Dict[str, int]:
+        """
+        Rewrite every legacy string value in a namespace with its codec.
+        Hashed namespaces can't be scanned and migrate lazily through `fetch`.
+        """
+
+        if namespace.hasher:
+            raise ValueError("Hashed namespaces migrate lazily on fetch")
+
+        stats = {"scanned": 0, "migrated": 0}
+        async for key in self.scan_iter(match=f"{namespace.prefix}:*", count=count, _type="string"):
+            stats["scanned"] += 1
+            output = await self.execute_command("GET", key, **{NEVER_DECODE: []})
+            if output is None or not is_legacy(output):
+                continue
+
+            await super().set(
+                key,
+                namespace.encode(legacy(output)),
+                keepttl=True,
+                xx=True,
+            )
+            stats["migrated"] += 1
+
+        log.info(
+            "Migrated %s of %s keys in the %s namespace.",
+            stats["migrated"],
+            stats["scanned"],
+            namespace.prefix,
+        )
+        return stats
+
     async def ratelimited(
         self,
         resource: str,